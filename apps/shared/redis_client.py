@@ -34,6 +34,14 @@ class InMemoryRedis:
         self._kv[key] = value
         return True
 
+    def incr(self, key: str, amount: int = 1):
+        value = int(self._kv.get(key, 0)) + amount
+        self._kv[key] = str(value)
+        return value
+
+    def mget(self, keys: List[str]):
+        return [self._kv.get(k) for k in keys]
+
     def delete(self, key: str):
         self._kv.pop(key, None)
         self._lists.pop(key, None)
@@ -284,6 +292,18 @@ class RedisOperations:
         """按分数范围删除有序集合元素"""
         self.client.zremrangebyscore(key, min_score, max_score)
 
+    # === 计数器操作 ===
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        """键值自增"""
+        return self.client.incr(key, amount)
+
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        """批量获取键值"""
+        if not keys:
+            return []
+        return self.client.mget(keys)
+
     # === 通用操作 ===
 
     async def delete(self, *keys: str):
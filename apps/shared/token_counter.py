@@ -43,6 +43,20 @@ class TokenCounter:
             other_chars = len(text) - chinese_chars
             return int(chinese_chars / 1.5 + other_chars / 4)
 
+    def truncate_text(self, text: str, max_tokens: int) -> str:
+        """截断文本到不超过 max_tokens 个 token"""
+        if not text or max_tokens <= 0:
+            return ""
+        try:
+            tokens = self.encoding.encode(text)
+            if len(tokens) <= max_tokens:
+                return text
+            return self.encoding.decode(tokens[:max_tokens])
+        except Exception as e:
+            logger.error(f"Token truncate error: {e}")
+            # 回退到按字符粗略截断（按中文约1.5字符/token估算）
+            return text[: int(max_tokens * 1.5)]
+
     def count_message(self, message: Dict) -> int:
         """计算单条消息的 token 数"""
         if not message:
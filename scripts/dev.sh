@@ -12,7 +12,7 @@ cd "$PROJECT_ROOT"
 
 echo -e "${GREEN}=== rshAnyGen 本地开发环境启动（Python + Node）===${NC}"
 
-mkdir -p logs/{gateway,orchestrator,skills,rag,webui} logs/pids
+mkdir -p logs/{gateway,orchestrator,skills,rag,rag_worker,webui} logs/pids
 
 get_port() {
   local key="$1"
@@ -77,6 +77,17 @@ start_uvicorn_app() {
   echo -e "${GREEN}${name} 启动完成 (PID: $pid)，日志: $log${NC}"
 }
 
+start_python_worker() {
+  local name="$1"
+  local module="$2"
+  local log="logs/${name}/${name}.log"
+  echo -e "${YELLOW}启动 ${name} (${module})...${NC}"
+  bash -c "source venv/bin/activate && PYTHONPATH=. python -m ${module}" &
+  local pid=$!
+  echo "$pid" > "logs/pids/${name}.pid"
+  echo -e "${GREEN}${name} 启动完成 (PID: $pid)，日志: $log${NC}"
+}
+
 start_web_ui() {
   local port="$1"
   local log="logs/webui/webui.log"
@@ -100,6 +111,7 @@ start_python_module "gateway" "apps.gateway.main" "$PORT_GATEWAY"
 start_python_module "orchestrator" "apps.orchestrator.main" "$PORT_ORCH"
 start_uvicorn_app "skills" "services.skills_registry.api.main:app" "$PORT_SKILLS"
 start_uvicorn_app "rag" "services.rag_pipeline.server:app" "$PORT_RAG"
+start_python_worker "rag_worker" "services.rag_pipeline.worker"
 
 echo -e "${YELLOW}启动前端 Web UI...${NC}"
 start_web_ui "$PORT_WEBUI"
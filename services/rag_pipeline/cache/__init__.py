@@ -0,0 +1,6 @@
+"""Retrieval Cache Module"""
+
+from .result_cache import ResultCache
+from .semantic_cache import SemanticCache
+
+__all__ = ["ResultCache", "SemanticCache"]
@@ -0,0 +1,279 @@
+"""Result Cache - Generation-versioned cache for retrieval results"""
+
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import List, Dict, Any, Optional
+import hashlib
+import json
+import logging
+import unicodedata
+
+from ..store.vector_store import SearchResult
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """Cache of search results keyed by query and knowledge base generations
+
+    Every knowledge base has a generation counter that is bumped on each ingest
+    or delete. The generations of the queried KBs are part of the cache key, so
+    a change to a KB makes its old entries unreachable (they age out of the
+    LRU / expire in Redis) while entries for unchanged KBs keep hitting.
+    Generations live in Redis when the Redis tier is enabled, so that every
+    process sees the same invalidations.
+    """
+
+    ALL_KBS = "*"
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """Initialize result cache
+
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config or {}
+        cache_config = self.config.get("result_cache", {})
+
+        self.enabled = cache_config.get("enabled", True)
+        self.max_entries = cache_config.get("max_entries", 1024)
+        self.key_prefix = cache_config.get("key_prefix", "rag")
+
+        redis_config = cache_config.get("redis", {})
+        self.redis_enabled = redis_config.get("enabled", False)
+        self.redis_ttl = redis_config.get("ttl", 3600)
+        self.max_changes = redis_config.get("max_changes", 1000)
+
+        self._entries: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._redis = None
+
+        self.hits = 0
+        self.misses = 0
+
+    def _get_redis(self):
+        if self._redis is None:
+            from apps.shared.redis_client import get_redis
+
+            self._redis = get_redis()
+        return self._redis
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Normalize a query for cache lookup (width, case and whitespace)
+
+        Args:
+            query: Raw query
+
+        Returns:
+            Normalized query
+        """
+        return " ".join(unicodedata.normalize("NFKC", query).casefold().split())
+
+    def _generation_key(self, kb_id: str) -> str:
+        return f"{self.key_prefix}:gen:{kb_id}"
+
+    def _changes_key(self, kb_id: str) -> str:
+        return f"{self.key_prefix}:changes:{kb_id}"
+
+    async def get_generations(self, kb_ids: List[str]) -> Dict[str, int]:
+        """Get the current generation of each KB
+
+        Args:
+            kb_ids: Knowledge Base IDs
+
+        Returns:
+            Mapping of kb_id to generation
+        """
+        if self.redis_enabled:
+            try:
+                values = await self._get_redis().mget([self._generation_key(k) for k in kb_ids])
+                return {kb_id: int(value or 0) for kb_id, value in zip(kb_ids, values)}
+            except Exception as e:
+                logger.warning(f"Failed to read KB generations from Redis: {e}")
+        return {kb_id: self._generations.get(kb_id, 0) for kb_id in kb_ids}
+
+    async def bump(self, kb_id: str, doc_id: Optional[str] = None) -> None:
+        """Invalidate cached results of a KB by advancing its generation
+
+        Queries without a KB filter span every KB, so the "all KBs" generation
+        is advanced as well. In Redis each new generation is also recorded as
+        a change naming the KB and document, which lets other processes update
+        their keyword index for that document only (see get_changes).
+
+        Args:
+            kb_id: Knowledge Base ID that changed
+            doc_id: Document that changed (None if the whole KB changed)
+        """
+        for key in (kb_id, self.ALL_KBS):
+            self._generations[key] = self._generations.get(key, 0) + 1
+            if self.redis_enabled:
+                try:
+                    redis = self._get_redis()
+                    generation = await redis.incr(self._generation_key(key))
+                    changes_key = self._changes_key(key)
+                    await redis.rpush_json(
+                        changes_key, {"generation": generation, "kb_id": kb_id, "doc_id": doc_id}
+                    )
+                    await redis.trim_list(changes_key, -self.max_changes, -1)
+                except Exception as e:
+                    logger.warning(f"Failed to bump KB generation in Redis: {e}")
+
+    async def get_changes(self, kb_id: str, since: int, until: int) -> Optional[List[Dict[str, Any]]]:
+        """Get the changes that advanced a generation from since to until
+
+        Args:
+            kb_id: Knowledge Base ID (ALL_KBS for the changes of every KB)
+            since: Generation already applied
+            until: Current generation
+
+        Returns:
+            Changes with kb_id and doc_id in generation order, or None if any
+            of them is missing (trimmed, not recorded yet or Redis disabled)
+        """
+        if not self.redis_enabled:
+            return None
+        try:
+            entries = await self._get_redis().lrange_json(self._changes_key(kb_id), 0, -1)
+        except Exception as e:
+            logger.warning(f"Failed to read KB changes from Redis: {e}")
+            return None
+        changes = sorted(
+            (e for e in entries if since < e.get("generation", 0) <= until),
+            key=lambda e: e["generation"],
+        )
+        if [e["generation"] for e in changes] != list(range(since + 1, until + 1)):
+            return None
+        return changes
+
+    async def invalidate_all(self) -> None:
+        """Invalidate every cached result (used when the affected KBs are unknown)"""
+        await self.bump("__epoch__")
+
+    async def make_key(
+        self,
+        query: str,
+        kb_ids: Optional[List[str]],
+        top_k: int,
+        rerank: bool,
+    ) -> Optional[str]:
+        """Build the cache key for a search
+
+        The key captures the KB generations at lookup time, so results computed
+        while an ingest is running are stored under a key that is already stale.
+
+        Args:
+            query: Search query
+            kb_ids: Knowledge Base IDs filter
+            top_k: Number of results
+            rerank: Whether reranking is applied
+
+        Returns:
+            Cache key, or None if caching is disabled
+        """
+        if not self.enabled:
+            return None
+
+        scope = await self.scope_key(kb_ids, top_k, rerank)
+        raw = json.dumps([self.normalize_query(query), scope], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def scope_key(
+        self,
+        kb_ids: Optional[List[str]],
+        top_k: int,
+        rerank: bool,
+    ) -> str:
+        """Build the query-independent part of a cache key
+
+        Two searches with the same scope key run against identical KB content
+        with identical result shape.
+
+        Args:
+            kb_ids: Knowledge Base IDs filter
+            top_k: Number of results
+            rerank: Whether reranking is applied
+
+        Returns:
+            Scope key
+        """
+        scope = sorted(set(kb_ids)) if kb_ids else [self.ALL_KBS]
+        generations = await self.get_generations(scope + ["__epoch__"])
+        return json.dumps([sorted(generations.items()), top_k, bool(rerank)], ensure_ascii=False)
+
+    async def get(self, key: Optional[str]) -> Optional[List[SearchResult]]:
+        """Look up cached results
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached results, or None on a miss
+        """
+        if key is None:
+            return None
+
+        entries = self._entries.get(key)
+        if entries is not None:
+            self._entries.move_to_end(key)
+        elif self.redis_enabled:
+            try:
+                data = await self._get_redis().get_json(f"{self.key_prefix}:result:{key}")
+                if data is not None:
+                    entries = data.get("results", [])
+                    self._store_local(key, entries)
+            except Exception as e:
+                logger.warning(f"Failed to read result cache from Redis: {e}")
+
+        if entries is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return [SearchResult(**entry) for entry in entries]
+
+    async def set(self, key: Optional[str], results: List[SearchResult]) -> None:
+        """Store results under a key
+
+        Args:
+            key: Cache key from make_key
+            results: Search results to cache
+        """
+        if key is None:
+            return
+
+        entries = [asdict(r) for r in results]
+        self._store_local(key, entries)
+
+        if self.redis_enabled:
+            try:
+                await self._get_redis().set_json(
+                    f"{self.key_prefix}:result:{key}", {"results": entries}, ex=self.redis_ttl
+                )
+            except Exception as e:
+                logger.warning(f"Failed to write result cache to Redis: {e}")
+
+    def clear(self) -> None:
+        """Drop all entries held by this process"""
+        self._entries.clear()
+        self._generations["__epoch__"] = self._generations.get("__epoch__", 0) + 1
+
+    def _store_local(self, key: str, entries: List[Dict[str, Any]]) -> None:
+        self._entries[key] = entries
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics
+
+        Returns:
+            Dictionary with hits, misses, hit rate and size
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._entries),
+        }
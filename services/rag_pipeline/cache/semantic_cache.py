@@ -0,0 +1,206 @@
+"""Semantic Cache - Serve paraphrased repeat queries from cached results"""
+
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import List, Dict, Any, Optional, Tuple
+import logging
+import random
+
+import numpy as np
+
+from ..store.vector_store import SearchResult
+
+logger = logging.getLogger(__name__)
+
+
+class _ScopeIndex:
+    """Flat cosine index over the cached query embeddings of one scope"""
+
+    def __init__(self):
+        self.entry_ids: List[int] = []
+        self.vectors: List[np.ndarray] = []
+        self._matrix: Optional[np.ndarray] = None
+
+    def add(self, entry_id: int, vector: np.ndarray) -> None:
+        self.entry_ids.append(entry_id)
+        self.vectors.append(vector)
+        self._matrix = None
+
+    def remove(self, entry_id: int) -> None:
+        idx = self.entry_ids.index(entry_id)
+        del self.entry_ids[idx]
+        del self.vectors[idx]
+        self._matrix = None
+
+    def nearest(self, vector: np.ndarray) -> Tuple[Optional[int], float]:
+        if not self.entry_ids:
+            return None, 0.0
+        if self._matrix is None:
+            self._matrix = np.vstack(self.vectors)
+        similarities = self._matrix @ vector
+        best = int(np.argmax(similarities))
+        return self.entry_ids[best], float(similarities[best])
+
+
+class SemanticCache:
+    """Cache of search results looked up by query embedding similarity
+
+    Entries are partitioned by scope (KB set, KB generations, top_k, rerank),
+    so a hit is only possible against results computed on identical KB
+    content. Within a scope, the nearest cached query by cosine similarity is
+    returned if it clears the threshold. A sample of hits is audited by
+    re-running the search, to measure how often a hit returns different
+    results than a fresh search would have.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """Initialize semantic cache
+
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config or {}
+        cache_config = self.config.get("semantic_cache", {})
+
+        self.enabled = cache_config.get("enabled", False)
+        self.threshold = cache_config.get("threshold", 0.95)
+        self.max_entries = cache_config.get("max_entries", 2048)
+        self.audit_rate = cache_config.get("audit_rate", 0.05)
+        self.audit_min_overlap = cache_config.get("audit_min_overlap", 0.6)
+
+        self._scopes: Dict[str, _ScopeIndex] = {}
+        # entry_id -> (scope, query, results); ordered for LRU eviction
+        self._entries: "OrderedDict[int, Tuple[str, str, List[Dict[str, Any]]]]" = OrderedDict()
+        self._next_id = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.audits = 0
+        self.false_hits = 0
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            # Zero vectors come from failed embedding calls and match nothing
+            return None
+        return vector / norm
+
+    def lookup(
+        self,
+        scope: str,
+        query_embedding: List[float],
+    ) -> Optional[Tuple[List[SearchResult], str, float]]:
+        """Find cached results for a semantically equivalent query
+
+        Args:
+            scope: Scope key of the search
+            query_embedding: Query vector
+
+        Returns:
+            (results, cached query, similarity) on a hit, otherwise None
+        """
+        vector = self._normalize(query_embedding)
+        index = self._scopes.get(scope)
+        if vector is None or index is None:
+            self.misses += 1
+            return None
+
+        entry_id, similarity = index.nearest(vector)
+        if entry_id is None or similarity < self.threshold:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(entry_id)
+        _scope, cached_query, entries = self._entries[entry_id]
+        self.hits += 1
+        return [SearchResult(**entry) for entry in entries], cached_query, similarity
+
+    def add(
+        self,
+        scope: str,
+        query: str,
+        query_embedding: List[float],
+        results: List[SearchResult],
+    ) -> None:
+        """Cache the results of a search
+
+        Args:
+            scope: Scope key of the search
+            query: Query text (kept for audit logs)
+            query_embedding: Query vector
+            results: Search results
+        """
+        vector = self._normalize(query_embedding)
+        if vector is None:
+            return
+
+        entry_id = self._next_id
+        self._next_id += 1
+
+        self._scopes.setdefault(scope, _ScopeIndex()).add(entry_id, vector)
+        self._entries[entry_id] = (scope, query, [asdict(r) for r in results])
+
+        while len(self._entries) > self.max_entries:
+            old_id, (old_scope, _query, _results) = self._entries.popitem(last=False)
+            index = self._scopes[old_scope]
+            index.remove(old_id)
+            if not index.entry_ids:
+                del self._scopes[old_scope]
+
+    def should_audit(self) -> bool:
+        """Decide whether a hit should be verified against a fresh search"""
+        return self.audit_rate > 0 and random.random() < self.audit_rate
+
+    def record_audit(
+        self,
+        query: str,
+        cached_query: str,
+        cached: List[SearchResult],
+        fresh: List[SearchResult],
+    ) -> bool:
+        """Record the outcome of a hit audit
+
+        Args:
+            query: Query that hit the cache
+            cached_query: Query the cached results were computed for
+            cached: Results served from the cache
+            fresh: Results of a fresh search for the query
+
+        Returns:
+            True if the hit was a false hit
+        """
+        self.audits += 1
+        cached_ids = {r.chunk_id for r in cached}
+        fresh_ids = {r.chunk_id for r in fresh}
+        if not cached_ids and not fresh_ids:
+            return False
+
+        overlap = len(cached_ids & fresh_ids) / max(len(cached_ids), len(fresh_ids))
+        if overlap < self.audit_min_overlap:
+            self.false_hits += 1
+            logger.warning(
+                f"Semantic cache false hit: '{query}' served results of '{cached_query}' "
+                f"(overlap {overlap:.2f})"
+            )
+            return True
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics
+
+        Returns:
+            Dictionary with hit rate and audit results
+        """
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "audits": self.audits,
+            "false_hits": self.false_hits,
+            "false_hit_rate": self.false_hits / self.audits if self.audits else 0.0,
+            "entries": len(self._entries),
+        }
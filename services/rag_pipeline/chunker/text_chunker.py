@@ -1,10 +1,12 @@
 """Text Chunker - Split documents into chunks for embedding"""
 
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from dataclasses import dataclass
 import logging
 
+from .token_estimator import TokenEstimator, get_token_estimator
+
 logger = logging.getLogger(__name__)
 
 
@@ -47,115 +49,199 @@ class TextChunker:
         # Separators
         self.separators = chunking_config.get("separators", self.DEFAULT_SEPARATORS)
 
-    def chunk(self, text: str, metadata: Optional[Dict[str, Any]] = None) -> List[Chunk]:
+        # Unit of sizes and overlaps: "chars" or "tokens" (of the embedding model)
+        self.size_unit = chunking_config.get("size_unit", "chars")
+        self._estimator: Optional[TokenEstimator] = None
+        if self.size_unit == "tokens":
+            embedding_config = self.config.get("embedding", {})
+            self._estimator = get_token_estimator(
+                chunking_config.get("token_model", embedding_config.get("model"))
+            )
+
+    def chunk(
+        self,
+        text: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        segments: Optional[List[Dict[str, Any]]] = None,
+        start_index: int = 0,
+    ) -> List[Chunk]:
         """Split text into chunks based on configured strategy
 
         Args:
             text: Input text to chunk
             metadata: Optional metadata to attach to chunks
+            segments: Optional structural segments of text (see iter_chunks)
+            start_index: Index of the first (parent) chunk (see iter_chunks)
 
         Returns:
             List of Chunk objects
         """
+        return list(self.iter_chunks(text, metadata, segments, start_index))
+
+    def iter_chunks(
+        self,
+        text: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        segments: Optional[List[Dict[str, Any]]] = None,
+        start_index: int = 0,
+    ) -> Iterator[Chunk]:
+        """Lazily split text into chunks based on configured strategy
+
+        Every chunk carries its character span in the source text as
+        ``char_start`` / ``char_end`` metadata (content == text[char_start:char_end]).
+
+        Segments are dicts with ``start``/``end`` offsets into text and optional
+        ``metadata`` (e.g. sheet row range, slide number), as produced by the
+        loader for spreadsheets and slide decks. Chunks never cross a segment
+        boundary and inherit the segment's metadata.
+
+        A document chunked in several parts (e.g. streamed page windows) passes
+        the index following the last chunk of the previous part as start_index,
+        which keeps chunk IDs unique within the document.
+
+        Args:
+            text: Input text to chunk
+            metadata: Optional metadata to attach to chunks
+            segments: Optional structural segments of text
+            start_index: Index of the first (parent) chunk
+
+        Yields:
+            Chunk objects in document order
+        """
+        if segments is None:
+            segments = [{"start": 0, "end": len(text or "")}]
+
         if self.strategy == "parent_child":
-            return self._chunk_parent_child(text, metadata)
+            return self._chunk_parent_child(text, metadata, segments, start_index)
         elif self.strategy == "simple":
-            return self._chunk_simple(text, metadata)
+            return self._chunk_simple(text, metadata, segments, start_index)
         else:
             logger.warning(f"Unknown strategy {self.strategy}, falling back to simple")
-            return self._chunk_simple(text, metadata)
+            return self._chunk_simple(text, metadata, segments, start_index)
+
+    def _iter_segment_spans(
+        self,
+        text: str,
+        segments: List[Dict[str, Any]],
+        chunk_size: int,
+        overlap: int,
+    ) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """Yield (start, end, segment metadata) spans, split within each segment"""
+        for segment in segments:
+            segment_metadata = segment.get("metadata") or {}
+            for start, end in self._iter_spans(
+                text, chunk_size, overlap, segment["start"], segment["end"]
+            ):
+                yield start, end, segment_metadata
 
     def _chunk_parent_child(
-        self, text: str, metadata: Optional[Dict[str, Any]] = None
-    ) -> List[Chunk]:
+        self,
+        text: str,
+        metadata: Optional[Dict[str, Any]],
+        segments: List[Dict[str, Any]],
+        start_index: int = 0,
+    ) -> Iterator[Chunk]:
         """Create parent-child chunks
 
         Parent chunks are larger for context, child chunks are smaller for precise retrieval.
+        Each parent is followed by its children.
 
         Args:
             text: Input text
             metadata: Optional metadata
+            segments: Structural segments of text
+            start_index: Index of the first chunk
 
-        Returns:
-            List of parent and child chunks
+        Yields:
+            Parent and child chunks
         """
-        if not text or not text.strip():
-            return []
-
-        chunks = []
-
-        # First create parent chunks
-        parent_chunks = self._split_recursive(text, self.parent_size, self.parent_overlap)
-
-        # Then create child chunks from each parent
-        for i, parent_content in enumerate(parent_chunks):
+        # Whitespace-only text has no chunks (checked without copying the text)
+        if not text or self._trim_span(text, 0, len(text)) is None:
+            return
+
+        # Parent spans first, then child spans inside each parent span
+        for i, (parent_start, parent_end, segment_metadata) in enumerate(
+            self._iter_segment_spans(text, segments, self.parent_size, self.parent_overlap),
+            start_index,
+        ):
             parent_id = f"parent_{i}"
 
-            # Add parent chunk
-            chunks.append(
-                Chunk(
-                    content=parent_content,
-                    chunk_id=parent_id,
-                    metadata={**(metadata or {}), "chunk_type": "parent", "parent_index": i},
-                )
+            yield Chunk(
+                content=text[parent_start:parent_end],
+                chunk_id=parent_id,
+                metadata={
+                    **(metadata or {}),
+                    **segment_metadata,
+                    "chunk_type": "parent",
+                    "parent_index": i,
+                    "char_start": parent_start,
+                    "char_end": parent_end,
+                },
             )
 
-            # Create child chunks from this parent
-            child_chunks = self._split_recursive(
-                parent_content, self.child_size, self.child_overlap
-            )
-            
-            # If split recursive returned empty or only one chunk same as parent
-            # we should still keep at least one child if it makes sense, 
-            # but usually we want smaller chunks.
-            # If parent is small enough, it might be its own child.
-            if not child_chunks and parent_content:
-                 child_chunks = [parent_content]
-
-            for j, child_content in enumerate(child_chunks):
-                chunks.append(
-                    Chunk(
-                        content=child_content,
-                        chunk_id=f"child_{i}_{j}",
-                        parent_id=parent_id,
-                        metadata={
-                            **(metadata or {}),
-                            "chunk_type": "child",
-                            "parent_index": i,
-                            "child_index": j,
-                        },
-                    )
+            # A parent span is never empty, so it yields at least one child
+            for j, (child_start, child_end) in enumerate(
+                self._iter_spans(
+                    text, self.child_size, self.child_overlap, parent_start, parent_end
+                )
+            ):
+                yield Chunk(
+                    content=text[child_start:child_end],
+                    chunk_id=f"child_{i}_{j}",
+                    parent_id=parent_id,
+                    metadata={
+                        **(metadata or {}),
+                        **segment_metadata,
+                        "chunk_type": "child",
+                        "parent_index": i,
+                        "child_index": j,
+                        "char_start": child_start,
+                        "char_end": child_end,
+                    },
                 )
-
-        return chunks
 
     def _chunk_simple(
-        self, text: str, metadata: Optional[Dict[str, Any]] = None
-    ) -> List[Chunk]:
+        self,
+        text: str,
+        metadata: Optional[Dict[str, Any]],
+        segments: List[Dict[str, Any]],
+        start_index: int = 0,
+    ) -> Iterator[Chunk]:
         """Simple chunking strategy
 
         Args:
             text: Input text
             metadata: Optional metadata
+            segments: Structural segments of text
+            start_index: Index of the first chunk
 
-        Returns:
-            List of chunks
+        Yields:
+            Chunks
         """
-        chunks_text = self._split_recursive(text, self.child_size, self.child_overlap)
-
-        return [
-            Chunk(
-                content=chunk,
+        if not text:
+            return
+
+        for i, (start, end, segment_metadata) in enumerate(
+            self._iter_segment_spans(text, segments, self.child_size, self.child_overlap),
+            start_index,
+        ):
+            yield Chunk(
+                content=text[start:end],
                 chunk_id=f"chunk_{i}",
-                metadata={**(metadata or {}), "chunk_type": "simple", "index": i},
+                metadata={
+                    **(metadata or {}),
+                    **segment_metadata,
+                    "chunk_type": "simple",
+                    "index": i,
+                    "char_start": start,
+                    "char_end": end,
+                },
             )
-            for i, chunk in enumerate(chunks_text)
-        ]
 
     def _split_recursive(
         self, text: str, chunk_size: int, overlap: int
     ) -> List[str]:
-        """Recursively split text using separators
+        """Split text using separators
 
         Args:
             text: Input text
@@ -165,75 +251,119 @@ class TextChunker:
         Returns:
             List of text chunks
         """
-        if len(text) <= chunk_size:
-            return [text] if text.strip() else []
+        return [text[start:end] for start, end in self._iter_spans(text, chunk_size, overlap)]
+
+    def _iter_spans(
+        self,
+        text: str,
+        chunk_size: int,
+        overlap: int,
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> Iterator[Tuple[int, int]]:
+        """Yield whitespace-trimmed (start, end) chunk spans of text[start:end]
+
+        Works on offsets into the original string, so no intermediate copies
+        are made, and every separator search is bounded to the current window.
+        The next chunk starts at the last separator inside the overlap region
+        (at most 2 * overlap back from the split), which keeps the overlap
+        sentence-aligned while guaranteeing forward progress.
 
-        chunks = []
-        remaining = text
+        Args:
+            text: Input text
+            chunk_size: Target chunk size (in size_unit)
+            overlap: Overlap between chunks (in size_unit)
+            start: Offset to start at
+            end: Offset to stop at (defaults to the end of text)
 
-        while remaining:
-            # If remaining text is short enough, take it all
-            if len(remaining) <= chunk_size:
-                chunks.append(remaining)
-                break
+        Yields:
+            (start, end) character offsets into text
+        """
+        end = len(text) if end is None else end
+        pos = start
 
-            # Find best split point
-            split_point = self._find_split_point(remaining[:chunk_size])
+        while pos < end:
+            window_end = self._window_end(text, pos, end, chunk_size)
 
-            if split_point == 0:
+            # If remaining text is short enough, take it all
+            if window_end >= end:
+                span = self._trim_span(text, pos, end)
+                if span:
+                    yield span
+                return
+
+            # Find best split point inside the window
+            split = self._find_split_in(text, pos, window_end)
+            if split == pos:
                 # No good split point, force split at chunk_size
-                split_point = chunk_size
-
-            chunks.append(remaining[:split_point].strip())
-
-            # Calculate next start with overlap
-            if split_point > overlap:
-                raw_next_start = split_point - overlap
-            else:
-                raw_next_start = split_point
-            
-            # Adjust next_start to align with sentence boundaries
-            # Find the best split point in the overlap region
-            adjusted_start = raw_next_start
-            if split_point > overlap and raw_next_start > 0:
-                # Look for separators in the text before raw_next_start
-                # This ensures the next chunk starts after a separator
-                boundary_search_text = remaining[:raw_next_start]
-                # Reuse find_split_point which finds the last separator
-                best_boundary = self._find_split_point(boundary_search_text)
-                if best_boundary > 0:
-                    adjusted_start = best_boundary
-            
-            # Ensure we make progress to avoid infinite loop
-            if adjusted_start == 0:
-                adjusted_start = split_point
-
-            remaining = remaining[adjusted_start:]
-
-        return [c for c in chunks if c.strip()]
-
-    def _find_split_point(self, text: str) -> int:
-        """Find the best split point in text using separators
+                split = window_end
+
+            span = self._trim_span(text, pos, split)
+            if span:
+                yield span
+
+            # Calculate next start with overlap, aligned to a separator if possible
+            next_start = split
+            char_overlap = overlap
+            if self._estimator is not None:
+                # Overlap in tokens, converted with this window's chars-per-token ratio
+                char_overlap = int(overlap * (window_end - pos) / chunk_size)
+            if split - pos > char_overlap > 0:
+                raw_next = split - char_overlap
+                lower = max(pos + 1, split - 2 * char_overlap)
+                boundary = self._find_split_in(text, lower, raw_next)
+                next_start = boundary if boundary > lower else raw_next
+
+            pos = next_start
+
+    def _window_end(self, text: str, start: int, end: int, chunk_size: int) -> int:
+        """End offset of a chunk_size window starting at start"""
+        if self._estimator is not None:
+            return self._estimator.advance(text, start, end, chunk_size)
+        return min(end, start + chunk_size)
+
+    @staticmethod
+    def _trim_span(text: str, start: int, end: int) -> Optional[Tuple[int, int]]:
+        """Shrink a span to exclude surrounding whitespace (None if nothing is left)"""
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        return (start, end) if start < end else None
+
+    def _find_split_in(self, text: str, start: int, end: int) -> int:
+        """Find the best split point in text[start:end] using separators
 
         Args:
-            text: Text to find split point in
+            text: Text to search
+            start: Window start offset
+            end: Window end offset
 
         Returns:
-            Index of best split point
+            Offset just after the last occurrence of the highest-priority
+            separator, or start if no separator occurs in the window
         """
-        # Try each separator in order
         for separator in self.separators:
             if not separator:
                 continue
 
-            # Find last occurrence of separator
-            idx = text.rfind(separator)
+            idx = text.rfind(separator, start, end)
             if idx != -1:
                 # Split after the separator
                 return idx + len(separator)
 
-        # No separator found, return 0 to indicate force split
-        return 0
+        return start
+
+    def _find_split_point(self, text: str) -> int:
+        """Find the best split point in text using separators
+
+        Args:
+            text: Text to find split point in
+
+        Returns:
+            Index of best split point, 0 if there is none
+        """
+        return self._find_split_in(text, 0, len(text))
 
     def merge_chunks(self, chunks: List[Chunk], max_size: int = 4000) -> List[str]:
         """Merge chunks back together (useful for context reconstruction)
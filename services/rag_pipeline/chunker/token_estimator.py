@@ -0,0 +1,138 @@
+"""Token Estimator - Measure and cut text in embedding-model tokens"""
+
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Upper bound of characters per token, used to size the window that is encoded
+MAX_CHARS_PER_TOKEN = 8
+
+
+class TokenEstimator:
+    """Token counting for chunk sizing and batch packing
+
+    Backed by the shared tiktoken-based TokenCounter. When the encoding is not
+    available (e.g. offline without a cached BPE file) it falls back to the
+    same heuristic TokenCounter uses: about 1.5 CJK characters or 4 other
+    characters per token.
+    """
+
+    def __init__(self, model: str = "text-embedding-v3"):
+        """Initialize token estimator
+
+        Args:
+            model: Model name used to pick the encoding
+        """
+        self.model = model
+        self._encoding = None
+        self._loaded = False
+
+    def _get_encoding(self):
+        if not self._loaded:
+            self._loaded = True
+            try:
+                from apps.shared.token_counter import get_token_counter
+
+                self._encoding = get_token_counter(self.model).encoding
+            except Exception as e:
+                logger.warning(f"Token encoding unavailable, estimating tokens heuristically: {e}")
+                self._encoding = None
+        return self._encoding
+
+    @staticmethod
+    def _is_cjk(char: str) -> bool:
+        return "\u4e00" <= char <= "\u9fff"
+
+    @classmethod
+    def _char_cost(cls, char: str) -> float:
+        return 1 / 1.5 if cls._is_cjk(char) else 1 / 4
+
+    def count(self, text: str) -> int:
+        """Count the tokens of a text
+
+        Args:
+            text: Input text
+
+        Returns:
+            Number of tokens
+        """
+        if not text:
+            return 0
+        encoding = self._get_encoding()
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+        chinese_chars = sum(1 for c in text if self._is_cjk(c))
+        return int(chinese_chars / 1.5 + (len(text) - chinese_chars) / 4)
+
+    def advance(self, text: str, start: int, end: int, max_tokens: int) -> int:
+        """Find how far max_tokens reach into text[start:end]
+
+        Only a window proportional to max_tokens is encoded, so the cost does
+        not depend on the length of the remaining text.
+
+        Args:
+            text: Source text
+            start: Start offset
+            end: End offset
+            max_tokens: Token budget
+
+        Returns:
+            Largest offset (<= end) such that text[start:offset] fits the budget
+        """
+        if max_tokens <= 0 or start >= end:
+            return start
+
+        encoding = self._get_encoding()
+        if encoding is None:
+            used = 0.0
+            pos = start
+            while pos < end:
+                used += self._char_cost(text[pos])
+                if used > max_tokens:
+                    break
+                pos += 1
+            return pos
+
+        window = max_tokens * MAX_CHARS_PER_TOKEN
+        while True:
+            window_end = min(end, start + window)
+            tokens = encoding.encode(text[start:window_end], disallowed_special=())
+            if len(tokens) > max_tokens:
+                # Offset of the first token past the budget
+                _decoded, offsets = encoding.decode_with_offsets(tokens[: max_tokens + 1])
+                cut = start + offsets[max_tokens]
+                return cut if cut > start else start + 1
+            if window_end == end:
+                return end
+            window *= 2
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut a text to at most max_tokens tokens
+
+        Args:
+            text: Input text
+            max_tokens: Token budget
+
+        Returns:
+            Truncated text
+        """
+        return text[: self.advance(text, 0, len(text), max_tokens)]
+
+
+_estimators = {}
+
+
+def get_token_estimator(model: Optional[str] = None) -> TokenEstimator:
+    """Get a shared token estimator for a model
+
+    Args:
+        model: Model name
+
+    Returns:
+        TokenEstimator instance
+    """
+    key = model or "text-embedding-v3"
+    if key not in _estimators:
+        _estimators[key] = TokenEstimator(key)
+    return _estimators[key]
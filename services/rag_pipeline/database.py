@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, String, Integer, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy import create_engine, Column, String, Integer, DateTime, ForeignKey, Boolean, Text, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from sqlalchemy.sql import func
@@ -49,6 +49,40 @@ class Document(Base):
 
     knowledge_base = relationship("KnowledgeBase", back_populates="documents")
 
+class ParentChunk(Base):
+    """Parent chunks kept out of the vector index (small-to-big retrieval)"""
+    __tablename__ = "parent_chunks"
+
+    key = Column(String, primary_key=True)  # <kb_id>:<doc_id>:<parent_id>
+    kb_id = Column(String, nullable=False, index=True)
+    doc_id = Column(String, nullable=False, index=True)
+    content = Column(Text, nullable=False)
+    chunk_metadata = Column(JSON, nullable=True)
+
+class IngestionJob(Base):
+    """Durable ingestion job, claimed and run by the ingestion workers"""
+    __tablename__ = "ingestion_jobs"
+
+    id = Column(String, primary_key=True)
+    kb_id = Column(String, nullable=False, index=True)
+    doc_id = Column(String, nullable=False, index=True)
+    file_path = Column(Text, nullable=True)  # document file, or
+    text = Column(Text, nullable=True)  # raw text to ingest
+    job_metadata = Column(JSON, nullable=True)
+    status = Column(String, default="queued", index=True)  # queued/running/succeeded/failed/cancelled
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    next_run_at = Column(DateTime, default=datetime.utcnow, index=True)
+    cancel_requested = Column(Boolean, default=False)
+    progress = Column(JSON, nullable=True)  # chunks created/embedded/inserted so far
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    worker_id = Column(String, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
 # Global engine and session factory
 engine = None
 SessionLocal = None
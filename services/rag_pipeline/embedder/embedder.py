@@ -1,12 +1,14 @@
 """Embedder - Generate embeddings for text using various providers"""
 
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 import httpx
 
 from langchain_openai import OpenAIEmbeddings
 
+from ..chunker.token_estimator import get_token_estimator
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,6 +29,8 @@ class Embedder:
         self.model = embedding_config.get("model", "text-embedding-v3")
         self.dimension = embedding_config.get("dimension", 1024)
         self.batch_size = embedding_config.get("batch_size", 32)
+        # Provider limit on total input tokens per request (0 = count limit only)
+        self.max_batch_tokens = embedding_config.get("max_batch_tokens", 0)
 
         # Provider-specific configs
         self.qwen_config = embedding_config.get("qwen", {})
@@ -90,6 +94,43 @@ class Embedder:
         """
         return len(vector) == self.dimension
 
+    def _batch_ranges(self, texts: List[str]) -> List[Tuple[int, int]]:
+        """Pack consecutive texts into request batches
+
+        A batch closes when it reaches batch_size texts or when the next text
+        would push it over max_batch_tokens.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            (start, end) index ranges into texts
+        """
+        if not self.max_batch_tokens:
+            return [(i, min(i + self.batch_size, len(texts))) for i in range(0, len(texts), self.batch_size)]
+
+        estimator = get_token_estimator(self.model)
+        ranges = []
+        start = 0
+        batch_tokens = 0
+        for i, text in enumerate(texts):
+            tokens = estimator.count(text)
+            if i > start and (i - start >= self.batch_size or batch_tokens + tokens > self.max_batch_tokens):
+                ranges.append((start, i))
+                start = i
+                batch_tokens = 0
+            batch_tokens += tokens
+        if start < len(texts):
+            ranges.append((start, len(texts)))
+        return ranges
+
+    async def _batches(self, texts: List[str]) -> List[Tuple[int, int]]:
+        """Batch ranges of texts, packed by tokens in a thread when max_batch_tokens is set"""
+        if not self.max_batch_tokens:
+            return self._batch_ranges(texts)
+        # Token counting is CPU-bound, keep it off the event loop
+        return await asyncio.to_thread(self._batch_ranges, texts)
+
     async def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for multiple documents
 
@@ -185,9 +226,9 @@ class Embedder:
 
         all_embeddings_map = {}
         async with httpx.AsyncClient(timeout=60.0) as client:
-            for i in range(0, len(valid_texts), self.batch_size):
-                batch = valid_texts[i : i + self.batch_size]
-                batch_start_idx = i
+            ranges = await self._batches(valid_texts)
+            for batch_start_idx, batch_end_idx in ranges:
+                batch = valid_texts[batch_start_idx:batch_end_idx]
                 payload = {
                     "model": self.model,
                     "input": batch if len(batch) > 1 else batch[0],
@@ -230,10 +271,10 @@ class Embedder:
         all_embeddings_map = {}
         
         # Process in batches
-        for i in range(0, len(valid_texts), self.batch_size):
-            batch = valid_texts[i : i + self.batch_size]
-            batch_start_idx = i
-            logger.debug(f"Embedding batch {i // self.batch_size + 1}, size: {len(batch)}")
+        ranges = await self._batches(valid_texts)
+        for batch_start_idx, batch_end_idx in ranges:
+            batch = valid_texts[batch_start_idx:batch_end_idx]
+            logger.debug(f"Embedding batch at {batch_start_idx}, size: {len(batch)}")
 
             try:
                 # Use asyncio to run the sync embedding in a thread
@@ -269,10 +310,10 @@ class Embedder:
         all_embeddings_map = {}
         
         # Process in batches
-        for i in range(0, len(valid_texts), self.batch_size):
-            batch = valid_texts[i : i + self.batch_size]
-            batch_start_idx = i
-            logger.debug(f"Embedding batch {i // self.batch_size + 1}, size: {len(batch)}")
+        ranges = await self._batches(valid_texts)
+        for batch_start_idx, batch_end_idx in ranges:
+            batch = valid_texts[batch_start_idx:batch_end_idx]
+            logger.debug(f"Embedding batch at {batch_start_idx}, size: {len(batch)}")
 
             try:
                 # Use asyncio to run the sync embedding in a thread
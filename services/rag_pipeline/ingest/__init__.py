@@ -0,0 +1,8 @@
+"""Ingestion Module"""
+
+from .preprocess import PreprocessPool
+from .dedup import NearDuplicateDetector
+from .stages import StagedIngestor, IngestJob
+from .scheduler import FairScheduler
+
+__all__ = ["PreprocessPool", "NearDuplicateDetector", "StagedIngestor", "IngestJob", "FairScheduler"]
@@ -0,0 +1,340 @@
+"""Dedup - Near-duplicate chunk detection with MinHash LSH"""
+
+from typing import List, Dict, Any, Optional, Tuple
+import logging
+import threading
+import zlib
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime for the universal hash family used by MinHash; 31 bits keep
+# (a * x + b) within uint64
+_PRIME = (1 << 31) - 1
+
+
+class _KBIndex:
+    """MinHash signatures and LSH band buckets of one knowledge base"""
+
+    def __init__(self):
+        self.signatures: Dict[str, np.ndarray] = {}
+        self.doc_keys: Dict[str, List[str]] = {}
+        self.buckets: Dict[Tuple[int, bytes], List[str]] = {}
+
+    def add(self, key: str, doc_id: str, signature: np.ndarray, bands: int) -> None:
+        self.signatures[key] = signature
+        self.doc_keys.setdefault(doc_id, []).append(key)
+        for band, band_bytes in enumerate(np.split(signature, bands)):
+            self.buckets.setdefault((band, band_bytes.tobytes()), []).append(key)
+
+    def candidates(self, signature: np.ndarray, bands: int) -> set:
+        found = set()
+        for band, band_bytes in enumerate(np.split(signature, bands)):
+            found.update(self.buckets.get((band, band_bytes.tobytes()), ()))
+        return found
+
+    def get_signatures(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        return {key: self.signatures[key] for key in keys if key in self.signatures}
+
+    def remove_doc(self, doc_id: str, bands: int) -> int:
+        keys = self.doc_keys.pop(doc_id, [])
+        for key in keys:
+            signature = self.signatures.pop(key)
+            for band, band_bytes in enumerate(np.split(signature, bands)):
+                bucket_key = (band, band_bytes.tobytes())
+                bucket = self.buckets.get(bucket_key)
+                if bucket is not None:
+                    bucket.remove(key)
+                    if not bucket:
+                        del self.buckets[bucket_key]
+        return len(keys)
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+
+class _RedisKBIndex:
+    """MinHash signatures and LSH band buckets of one knowledge base in Redis
+
+    Shared by the API server and every ingestion worker, so a document
+    deleted through the server is forgotten by the workers as well.
+    """
+
+    def __init__(self, client, prefix: str):
+        self.client = client
+        self.prefix = prefix
+
+    def _signature_key(self, key: str) -> str:
+        return f"{self.prefix}:sig:{key}"
+
+    def _bucket_key(self, band: int, band_bytes: np.ndarray) -> str:
+        return f"{self.prefix}:band:{band}:{band_bytes.tobytes().hex()}"
+
+    def _doc_key(self, doc_id: str) -> str:
+        return f"{self.prefix}:doc:{doc_id}"
+
+    def add(self, key: str, doc_id: str, signature: np.ndarray, bands: int) -> None:
+        self.client.set(self._signature_key(key), signature.tobytes().hex())
+        for band, band_bytes in enumerate(np.split(signature, bands)):
+            self.client.sadd(self._bucket_key(band, band_bytes), key)
+        self.client.sadd(self._doc_key(doc_id), key)
+        self.client.sadd(f"{self.prefix}:docs", doc_id)
+        self.client.incr(f"{self.prefix}:count", 1)
+
+    def candidates(self, signature: np.ndarray, bands: int) -> set:
+        found = set()
+        for band, band_bytes in enumerate(np.split(signature, bands)):
+            found.update(self.client.smembers(self._bucket_key(band, band_bytes)))
+        return found
+
+    def get_signatures(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        if not keys:
+            return {}
+        values = self.client.mget([self._signature_key(k) for k in keys])
+        return {
+            key: np.frombuffer(bytes.fromhex(value), dtype=np.uint32)
+            for key, value in zip(keys, values)
+            if value
+        }
+
+    def remove_doc(self, doc_id: str, bands: int) -> int:
+        keys = sorted(self.client.smembers(self._doc_key(doc_id)))
+        for key, signature in self.get_signatures(keys).items():
+            for band, band_bytes in enumerate(np.split(signature, bands)):
+                self.client.srem(self._bucket_key(band, band_bytes), key)
+        for key in keys:
+            self.client.delete(self._signature_key(key))
+        self.client.delete(self._doc_key(doc_id))
+        self.client.srem(f"{self.prefix}:docs", doc_id)
+        if keys:
+            self.client.incr(f"{self.prefix}:count", -len(keys))
+        return len(keys)
+
+    def drop(self, bands: int) -> None:
+        for doc_id in sorted(self.client.smembers(f"{self.prefix}:docs")):
+            self.remove_doc(doc_id, bands)
+        self.client.delete(f"{self.prefix}:count")
+
+    def __len__(self) -> int:
+        return int(self.client.get(f"{self.prefix}:count") or 0)
+
+
+class NearDuplicateDetector:
+    """Per-KB near-duplicate detection over character shingles
+
+    Each chunk gets a MinHash signature of its character shingles (which
+    suits Chinese and English alike). LSH banding finds candidate matches
+    among the chunks already indexed in the same knowledge base, and a
+    candidate is a near-duplicate when the estimated Jaccard similarity
+    reaches the threshold. Depending on the configured action duplicates are
+    skipped (not embedded or stored), linked (not embedded or stored, with a
+    link to the original reported) or down-weighted (stored with a lower
+    retrieval score weight).
+
+    With dedup.redis enabled the index is kept in Redis per knowledge base
+    and shared by all processes, so chunks indexed by one ingestion worker
+    are seen by the others and documents deleted through the API server are
+    forgotten everywhere. Otherwise it is held in process memory and is
+    rebuilt from ingests after a restart.
+    """
+
+    ACTIONS = ("skip", "link", "downweight")
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """Initialize detector
+
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config or {}
+        dedup_config = self.config.get("dedup", {})
+
+        self.enabled = dedup_config.get("enabled", False)
+        self.threshold = dedup_config.get("threshold", 0.85)
+        self.num_perm = dedup_config.get("num_perm", 64)
+        self.bands = dedup_config.get("bands", 16)
+        self.shingle_size = dedup_config.get("shingle_size", 5)
+        self.action = dedup_config.get("action", "skip")
+        self.downweight = dedup_config.get("downweight", 0.5)
+
+        if self.action not in self.ACTIONS:
+            raise ValueError(f"Unknown dedup action: {self.action}")
+        if self.num_perm % self.bands:
+            raise ValueError("dedup.num_perm must be a multiple of dedup.bands")
+
+        redis_config = dedup_config.get("redis", {})
+        self.redis_enabled = redis_config.get("enabled", False)
+        key_prefix = self.config.get("result_cache", {}).get("key_prefix", "rag")
+        self.key_prefix = f"{key_prefix}:dedup"
+
+        embedding_config = self.config.get("embedding", {})
+        self.vector_bytes = embedding_config.get("dimension", 1024) * 4
+
+        rng = np.random.default_rng(1)
+        self._a = rng.integers(1, _PRIME, size=self.num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=self.num_perm, dtype=np.uint64)
+
+        self._indexes: Dict[str, Any] = {}
+        self._redis = None
+        self._lock = threading.Lock()
+
+        self.duplicates = 0
+        self.bytes_saved = 0
+
+    def _get_redis(self):
+        if self._redis is None:
+            from apps.shared.redis_client import get_redis
+
+            self._redis = get_redis()
+        return self._redis
+
+    def _index(self, kb_id: str):
+        index = self._indexes.get(kb_id)
+        if index is None:
+            if self.redis_enabled:
+                # Called from worker threads; the wrapped client is synchronous
+                index = _RedisKBIndex(self._get_redis().client, f"{self.key_prefix}:{kb_id}")
+            else:
+                index = _KBIndex()
+            self._indexes[kb_id] = index
+        return index
+
+    def _shingles(self, text: str) -> np.ndarray:
+        normalized = "".join(text.casefold().split())
+        size = self.shingle_size
+        if len(normalized) <= size:
+            grams = {normalized}
+        else:
+            grams = {normalized[i : i + size] for i in range(len(normalized) - size + 1)}
+        return np.fromiter(
+            (zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams)
+        )
+
+    def signature(self, text: str) -> np.ndarray:
+        """Compute the MinHash signature of a text
+
+        Args:
+            text: Chunk text
+
+        Returns:
+            uint32 array of num_perm minimum hashes
+        """
+        shingles = self._shingles(text) % np.uint64(_PRIME)
+        # Universal hashing (a * x + b) mod p, for all permutations at once
+        hashed = (self._a[:, None] * shingles[None, :] + self._b[:, None]) % np.uint64(_PRIME)
+        return hashed.min(axis=1).astype(np.uint32)
+
+    def similarity(self, a: np.ndarray, b: np.ndarray) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return float(np.mean(a == b))
+
+    def process(
+        self,
+        kb_id: str,
+        doc_id: str,
+        chunks: List[Any],
+    ) -> Tuple[List[Any], Dict[str, Any]]:
+        """Detect near-duplicates among chunks about to be indexed
+
+        Chunks that are kept are added to the KB index, so duplicates within
+        the same document are caught as well.
+
+        Args:
+            kb_id: Knowledge Base ID
+            doc_id: Document ID
+            chunks: Chunks to be embedded and indexed
+
+        Returns:
+            (chunks to index, report with duplicate count, links and bytes saved)
+        """
+        report = {"action": self.action, "duplicates": 0, "bytes_saved": 0, "links": []}
+        if not self.enabled or not chunks:
+            return chunks, report
+
+        kept = []
+        with self._lock:
+            index = self._index(kb_id)
+
+            for chunk in chunks:
+                signature = self.signature(chunk.content)
+                match, best = None, 0.0
+                candidates = sorted(index.candidates(signature, self.bands))
+                for candidate, candidate_signature in index.get_signatures(candidates).items():
+                    sim = self.similarity(signature, candidate_signature)
+                    if sim > best:
+                        match, best = candidate, sim
+
+                key = f"{doc_id}:{chunk.chunk_id}"
+                if match is None or best < self.threshold:
+                    index.add(key, doc_id, signature, self.bands)
+                    kept.append(chunk)
+                    continue
+
+                report["duplicates"] += 1
+                if self.action == "downweight":
+                    chunk.metadata = {
+                        **(chunk.metadata or {}),
+                        "near_duplicate_of": match,
+                        "score_weight": self.downweight,
+                    }
+                    kept.append(chunk)
+                    continue
+
+                report["bytes_saved"] += len(chunk.content.encode("utf-8")) + self.vector_bytes
+                if self.action == "link":
+                    report["links"].append(
+                        {"chunk_id": chunk.chunk_id, "duplicate_of": match, "similarity": best}
+                    )
+
+        self.duplicates += report["duplicates"]
+        self.bytes_saved += report["bytes_saved"]
+        if report["duplicates"]:
+            logger.info(
+                f"Found {report['duplicates']} near-duplicate chunks in {doc_id} (kb_id={kb_id}, "
+                f"action={self.action}, {report['bytes_saved']} bytes saved)"
+            )
+        return kept, report
+
+    def remove_document(self, kb_id: str, doc_id: str) -> int:
+        """Forget the chunks of a deleted document
+
+        Args:
+            kb_id: Knowledge Base ID
+            doc_id: Document ID
+
+        Returns:
+            Number of chunks removed
+        """
+        if not self.enabled:
+            return 0
+        with self._lock:
+            index = self._index(kb_id) if self.redis_enabled else self._indexes.get(kb_id)
+            return index.remove_doc(doc_id, self.bands) if index is not None else 0
+
+    def drop_kb(self, kb_id: str) -> None:
+        """Forget all chunks of a deleted knowledge base
+
+        Args:
+            kb_id: Knowledge Base ID
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if self.redis_enabled:
+                self._index(kb_id).drop(self.bands)
+            self._indexes.pop(kb_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get detector statistics
+
+        Returns:
+            Dictionary with duplicate count and storage saved
+        """
+        return {
+            "enabled": self.enabled,
+            "action": self.action,
+            "duplicates": self.duplicates,
+            "bytes_saved": self.bytes_saved,
+            "indexed_chunks": sum(len(i) for i in self._indexes.values()),
+        }
@@ -0,0 +1,56 @@
+"""Incremental - Content-addressed chunk IDs for re-indexing changed documents"""
+
+import hashlib
+from typing import List, Dict, Any, Iterable, Set
+
+from ..chunker.text_chunker import Chunk
+
+
+def assign_content_ids(chunks: List[Chunk], doc_id: str, occurrences: Dict[str, int]) -> None:
+    """Replace positional chunk IDs with IDs derived from the chunk content
+
+    An ID hashes the document ID, the chunk's parent ID and its content, so
+    it stays the same when text elsewhere in the document is edited. A child
+    whose parent changed gets a new ID, which keeps its parent_key valid.
+    Repeated content in one document is told apart by its occurrence count.
+
+    Args:
+        chunks: Chunks of one document (or page window), parents before their
+            children; updated in place
+        doc_id: Document ID
+        occurrences: Times each content ID was issued so far in the document;
+            shared by all windows of a document and updated in place
+    """
+    parent_ids: Dict[str, str] = {}
+    for chunk in chunks:
+        is_parent = (chunk.metadata or {}).get("chunk_type") == "parent"
+        parent_id = parent_ids.get(chunk.parent_id, chunk.parent_id) if chunk.parent_id else ""
+        digest = hashlib.sha1(
+            "\x00".join((doc_id, parent_id, chunk.content)).encode("utf-8")
+        ).hexdigest()[:16]
+        content_id = f"{'parent' if is_parent else 'chunk'}_{digest}"
+
+        seen = occurrences.get(content_id, 0)
+        occurrences[content_id] = seen + 1
+        if seen:
+            content_id = f"{content_id}_{seen}"
+
+        if is_parent:
+            parent_ids[chunk.chunk_id] = content_id
+        elif chunk.parent_id:
+            chunk.parent_id = parent_id
+        chunk.chunk_id = content_id
+
+
+def stale_parent_keys(indexed: Dict[str, Dict[str, Any]], kept: Iterable[str]) -> Set[str]:
+    """Parent keys referenced by the indexed chunks but not by the new version
+
+    Args:
+        indexed: Metadata of the previously indexed chunks by chunk ID
+        kept: Parent keys referenced by the chunks of the new version
+
+    Returns:
+        Parent keys to delete from the doc store
+    """
+    previous = {m.get("parent_key") for m in indexed.values() if m.get("parent_key")}
+    return previous - set(kept)
@@ -0,0 +1,379 @@
+"""Job Queue - Durable ingestion jobs in a PostgreSQL table"""
+
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+import logging
+import uuid
+
+from sqlalchemy import and_, func, or_
+
+from .. import database
+from ..database import IngestionJob
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+class JobQueue:
+    """Ingestion jobs stored in the ingestion_jobs table
+
+    The API server enqueues jobs; ingestion workers claim them with
+    SELECT ... FOR UPDATE SKIP LOCKED, so each job runs on one worker at a
+    time. A running job holds a lease that its worker renews with
+    heartbeats; a job whose lease expired (worker crashed or was killed) is
+    claimed again. Failed attempts are retried with exponential backoff up to
+    max_attempts.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, session_factory=None):
+        """Initialize job queue
+
+        Args:
+            config: Configuration dictionary
+            session_factory: SQLAlchemy session factory (the service database if None)
+        """
+        self.config = config or {}
+        jobs_config = self.config.get("ingestion", {}).get("jobs", {})
+
+        self.max_attempts = jobs_config.get("max_attempts", 3)
+        self.backoff_seconds = jobs_config.get("backoff_seconds", 10)
+        self.max_backoff_seconds = jobs_config.get("max_backoff_seconds", 600)
+        self.lease_seconds = jobs_config.get("lease_seconds", 120)
+
+        self._session_factory = session_factory
+
+    def session(self):
+        """Open a session on the database holding the jobs and their documents
+
+        Returns:
+            SQLAlchemy session (use as a context manager)
+        """
+        if self._session_factory is None:
+            if database.SessionLocal is None:
+                database.init_db()
+            self._session_factory = database.SessionLocal
+        return self._session_factory()
+
+    @staticmethod
+    def _to_dict(job: IngestionJob) -> Dict[str, Any]:
+        return {
+            "id": job.id,
+            "kb_id": job.kb_id,
+            "doc_id": job.doc_id,
+            "file_path": job.file_path,
+            "text": job.text,
+            "metadata": job.job_metadata or {},
+            "status": job.status,
+            "attempts": job.attempts,
+            "max_attempts": job.max_attempts,
+            "cancel_requested": bool(job.cancel_requested),
+            "progress": job.progress or {},
+            "result": job.result,
+            "error": job.error,
+            "worker_id": job.worker_id,
+            "next_run_at": job.next_run_at.isoformat() if job.next_run_at else None,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        }
+
+    def enqueue(
+        self,
+        kb_id: str,
+        doc_id: str,
+        file_path: Optional[str] = None,
+        text: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Add an ingestion job
+
+        Args:
+            kb_id: Knowledge Base ID
+            doc_id: Document ID
+            file_path: Path of the document to ingest
+            text: Raw text to ingest instead of a file
+            metadata: Optional metadata to attach
+
+        Returns:
+            The queued job
+        """
+        if (file_path is None) == (text is None):
+            raise ValueError("A job ingests either a file or a text")
+
+        with self.session() as db:
+            job = IngestionJob(
+                id=str(uuid.uuid4()),
+                kb_id=kb_id,
+                doc_id=doc_id,
+                file_path=file_path,
+                text=text,
+                job_metadata=metadata or {},
+                status="queued",
+                attempts=0,
+                max_attempts=self.max_attempts,
+                next_run_at=datetime.utcnow(),
+                cancel_requested=False,
+                progress={},
+            )
+            db.add(job)
+            db.commit()
+            return self._to_dict(job)
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Take the next due job, or one whose worker stopped heartbeating
+
+        Args:
+            worker_id: ID of the claiming worker
+
+        Returns:
+            The claimed job (now running), or None if nothing is due
+        """
+        with self.session() as db:
+            while True:
+                now = datetime.utcnow()
+                job = (
+                    db.query(IngestionJob)
+                    .filter(or_(
+                        and_(IngestionJob.status == "queued", IngestionJob.next_run_at <= now),
+                        and_(
+                            IngestionJob.status == "running",
+                            IngestionJob.heartbeat_at < now - timedelta(seconds=self.lease_seconds),
+                        ),
+                    ))
+                    .order_by(IngestionJob.next_run_at)
+                    .with_for_update(skip_locked=True)
+                    .first()
+                )
+                if job is None:
+                    return None
+
+                if job.cancel_requested:
+                    job.status = "cancelled"
+                    job.finished_at = now
+                    db.commit()
+                    continue
+                if job.status == "running" and job.attempts >= job.max_attempts:
+                    logger.warning(f"Ingestion job {job.id} lost its worker on the last attempt")
+                    job.status = "failed"
+                    job.error = f"Worker {job.worker_id} stopped responding"
+                    job.finished_at = now
+                    db.commit()
+                    continue
+
+                job.status = "running"
+                job.attempts += 1
+                job.worker_id = worker_id
+                job.heartbeat_at = now
+                job.started_at = now
+                db.commit()
+                return self._to_dict(job)
+
+    def _owned(self, db, job_id: str, worker_id: str) -> Optional[IngestionJob]:
+        job = db.get(IngestionJob, job_id, with_for_update=True)
+        if job is None or job.status != "running" or job.worker_id != worker_id:
+            # The lease expired and another worker took the job over
+            return None
+        return job
+
+    def heartbeat(self, job_id: str, worker_id: str, progress: Dict[str, Any]) -> bool:
+        """Renew the lease of a running job and record its progress
+
+        Args:
+            job_id: Job ID
+            worker_id: ID of the worker running the job
+            progress: Progress counters
+
+        Returns:
+            True if the worker should stop (cancellation requested or lease lost)
+        """
+        with self.session() as db:
+            job = self._owned(db, job_id, worker_id)
+            if job is None:
+                return True
+            job.heartbeat_at = datetime.utcnow()
+            job.progress = progress
+            db.commit()
+            return bool(job.cancel_requested)
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        """Mark a job succeeded
+
+        Returns:
+            False if the job is no longer owned by the worker, or its
+            cancellation was requested (the worker then discards its chunks)
+        """
+        with self.session() as db:
+            job = self._owned(db, job_id, worker_id)
+            if job is None or job.cancel_requested:
+                return False
+            job.status = "succeeded"
+            job.result = result
+            job.error = None
+            job.finished_at = datetime.utcnow()
+            db.commit()
+            return True
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> Optional[str]:
+        """Record a failed attempt, scheduling a retry if attempts remain
+
+        Args:
+            job_id: Job ID
+            worker_id: ID of the worker running the job
+            error: Error message
+
+        Returns:
+            New status ("queued" for a retry or "failed"), or None if the job
+            is no longer owned by the worker
+        """
+        with self.session() as db:
+            job = self._owned(db, job_id, worker_id)
+            if job is None:
+                return None
+            now = datetime.utcnow()
+            job.error = error
+            if job.attempts < job.max_attempts and not job.cancel_requested:
+                delay = min(self.backoff_seconds * 2 ** (job.attempts - 1), self.max_backoff_seconds)
+                job.status = "queued"
+                job.next_run_at = now + timedelta(seconds=delay)
+                logger.info(f"Ingestion job {job_id} failed (attempt {job.attempts}), retrying in {delay}s")
+            else:
+                job.status = "failed"
+                job.finished_at = now
+            db.commit()
+            return job.status
+
+    def mark_cancelled(self, job_id: str, worker_id: str) -> bool:
+        """Mark a running job cancelled after its worker stopped it"""
+        with self.session() as db:
+            job = self._owned(db, job_id, worker_id)
+            if job is None:
+                return False
+            job.status = "cancelled"
+            job.finished_at = datetime.utcnow()
+            db.commit()
+            return True
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a job
+
+        A queued job is cancelled at once; a running job is flagged and
+        stopped by its worker at the next heartbeat. Finished jobs are left
+        unchanged.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            The job, or None if it does not exist
+        """
+        with self.session() as db:
+            job = db.get(IngestionJob, job_id, with_for_update=True)
+            if job is None:
+                return None
+            if job.status == "queued":
+                job.status = "cancelled"
+                job.finished_at = datetime.utcnow()
+            elif job.status == "running":
+                job.cancel_requested = True
+            db.commit()
+            return self._to_dict(job)
+
+    def cancel_active(self, kb_id: str, doc_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Cancel the queued and running jobs of a document or a whole KB
+
+        Used before the document or KB is deleted, so that no worker indexes
+        it again afterwards.
+
+        Args:
+            kb_id: Knowledge Base ID
+            doc_id: Document ID (all documents of the KB if None)
+
+        Returns:
+            The jobs that were cancelled or flagged for cancellation
+        """
+        with self.session() as db:
+            query = db.query(IngestionJob).filter(
+                IngestionJob.kb_id == kb_id,
+                IngestionJob.status.in_(("queued", "running")),
+            )
+            if doc_id is not None:
+                query = query.filter(IngestionJob.doc_id == doc_id)
+            jobs = query.with_for_update().all()
+            now = datetime.utcnow()
+            for job in jobs:
+                if job.status == "queued":
+                    job.status = "cancelled"
+                    job.finished_at = now
+                else:
+                    job.cancel_requested = True
+            db.commit()
+            return [self._to_dict(job) for job in jobs]
+
+    def active_job(self, kb_id: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Get the queued or running job of a document, if any
+
+        Args:
+            kb_id: Knowledge Base ID
+            doc_id: Document ID
+
+        Returns:
+            The oldest unfinished job of the document, or None
+        """
+        with self.session() as db:
+            job = (
+                db.query(IngestionJob)
+                .filter(
+                    IngestionJob.kb_id == kb_id,
+                    IngestionJob.doc_id == doc_id,
+                    IngestionJob.status.in_(("queued", "running")),
+                )
+                .order_by(IngestionJob.created_at)
+                .first()
+            )
+            return self._to_dict(job) if job is not None else None
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job by ID"""
+        with self.session() as db:
+            job = db.get(IngestionJob, job_id)
+            return self._to_dict(job) if job is not None else None
+
+    def list(
+        self,
+        kb_id: Optional[str] = None,
+        doc_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """List jobs, newest first
+
+        Args:
+            kb_id: Only jobs of this Knowledge Base
+            doc_id: Only jobs of this document
+            status: Only jobs in this status
+            limit: Maximum number of jobs
+
+        Returns:
+            Jobs
+        """
+        with self.session() as db:
+            query = db.query(IngestionJob)
+            if kb_id is not None:
+                query = query.filter(IngestionJob.kb_id == kb_id)
+            if doc_id is not None:
+                query = query.filter(IngestionJob.doc_id == doc_id)
+            if status is not None:
+                query = query.filter(IngestionJob.status == status)
+            jobs = query.order_by(IngestionJob.created_at.desc()).limit(limit).all()
+            return [self._to_dict(job) for job in jobs]
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Number of jobs in each status"""
+        with self.session() as db:
+            rows = (
+                db.query(IngestionJob.status, func.count(IngestionJob.id))
+                .group_by(IngestionJob.status)
+                .all()
+            )
+            return {status: count for status, count in rows}
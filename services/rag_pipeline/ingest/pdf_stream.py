@@ -0,0 +1,50 @@
+"""PDF Stream - Helpers for page-window PDF ingestion"""
+
+from bisect import bisect_right
+from typing import List, Dict, Any
+
+from ..chunker.text_chunker import Chunk
+
+
+def next_chunk_index(chunks: List[Chunk], start_index: int) -> int:
+    """Index to pass as start_index when chunking the next window
+
+    Args:
+        chunks: Chunks of the current window
+        start_index: start_index the current window was chunked with
+
+    Returns:
+        One past the highest parent (or simple chunk) index in chunks
+    """
+    indexes = [
+        (c.metadata or {}).get("parent_index", (c.metadata or {}).get("index"))
+        for c in chunks
+    ]
+    indexes = [i for i in indexes if i is not None]
+    return max(indexes) + 1 if indexes else start_index
+
+
+def annotate_window(chunks: List[Chunk], window: Dict[str, Any]) -> None:
+    """Attach page numbers and document-level offsets to the chunks of a window
+
+    Args:
+        chunks: Chunks of the window text (char offsets relative to the window)
+        window: Window from DocumentLoader.iter_pdf_windows, or a whole loaded
+            PDF document (which has "pages" and no offset)
+    """
+    pages = window["pages"]
+    if not pages:
+        return
+    starts = [start for _page, start, _end in pages]
+
+    def page_at(pos: int) -> int:
+        return pages[max(bisect_right(starts, pos) - 1, 0)][0]
+
+    offset = window.get("offset", 0)
+    for chunk in chunks:
+        metadata = chunk.metadata
+        start, end = metadata["char_start"], metadata["char_end"]
+        metadata["page_start"] = page_at(start)
+        metadata["page_end"] = page_at(max(end - 1, start))
+        metadata["char_start"] = start + offset
+        metadata["char_end"] = end + offset
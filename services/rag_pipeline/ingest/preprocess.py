@@ -0,0 +1,221 @@
+"""Preprocess - Load, parse and chunk documents off the event loop"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Optional, Tuple
+import logging
+
+from ..loader.document_loader import DocumentLoader
+from ..chunker.text_chunker import TextChunker, Chunk
+from .pdf_stream import annotate_window
+
+logger = logging.getLogger(__name__)
+
+# Per-process loader and chunker, created once by the pool initializer
+_worker_loader: Optional[DocumentLoader] = None
+_worker_chunker: Optional[TextChunker] = None
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    global _worker_loader, _worker_chunker
+    # Already in a worker process: parse in place rather than in a nested pool
+    _worker_loader = DocumentLoader(config, use_pool=False)
+    _worker_chunker = TextChunker(config)
+
+
+def _merge_metadata(
+    doc: Dict[str, Any], metadata: Dict[str, Any], kb_id: str
+) -> Dict[str, Any]:
+    doc_metadata = {**metadata, **doc.get("metadata", {})}
+    doc_metadata["kb_id"] = kb_id  # Add kb_id to metadata for BM25/Storage
+    return doc_metadata
+
+
+def _compact(chunk: Chunk, doc_metadata: Dict[str, Any]) -> Tuple:
+    """Chunk as a tuple carrying only the metadata that differs from the document's"""
+    extra = {
+        key: value
+        for key, value in (chunk.metadata or {}).items()
+        if key not in doc_metadata or doc_metadata[key] != value
+    }
+    return chunk.content, chunk.chunk_id, chunk.parent_id, extra
+
+
+def _expand(record: Tuple, doc_metadata: Dict[str, Any]) -> Chunk:
+    content, chunk_id, parent_id, extra = record
+    return Chunk(
+        content=content,
+        chunk_id=chunk_id,
+        parent_id=parent_id,
+        metadata={**doc_metadata, **extra},
+    )
+
+
+def _preprocess(file_path: str, metadata: Dict[str, Any], kb_id: str) -> Dict[str, Any]:
+    """Load and chunk one document inside a pool worker
+
+    Returns:
+        Dict with the document type, document metadata and compact chunk records
+    """
+    doc = asyncio.run(_worker_loader.load(file_path))
+    doc_metadata = _merge_metadata(doc, metadata, kb_id)
+    chunks = _worker_chunker.chunk(doc["content"], doc_metadata, doc.get("segments"))
+    if doc.get("pages"):
+        annotate_window(chunks, doc)
+    return {
+        "type": doc.get("type"),
+        "metadata": doc_metadata,
+        "chunks": [_compact(c, doc_metadata) for c in chunks],
+    }
+
+
+def _chunk(part: Dict[str, Any], doc_metadata: Dict[str, Any], start_index: int) -> List[Tuple]:
+    """Chunk loaded text inside a pool worker
+
+    Returns:
+        Compact chunk records
+    """
+    chunks = _worker_chunker.chunk(part["content"], doc_metadata, part.get("segments"), start_index)
+    if part.get("pages"):
+        annotate_window(chunks, part)
+    return [_compact(c, doc_metadata) for c in chunks]
+
+
+class PreprocessPool:
+    """Process pool for the load-parse-chunk stage of ingestion
+
+    Parsing and chunking are CPU-bound, so running them on the event loop
+    stalls every search served by the same process. With workers > 0 each
+    document is loaded and chunked in a worker process, which sends back
+    compact chunk records (the full document text never crosses the process
+    boundary); the load stage of staged ingestion goes through process().
+    chunk() runs only the chunking of an already loaded PDF page window, as
+    streamed ingestion produces them. With workers = 0 the loader runs
+    in-process and chunking runs in a thread.
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        loader: Optional[DocumentLoader] = None,
+        chunker: Optional[TextChunker] = None,
+    ):
+        """Initialize preprocess pool
+
+        Args:
+            config: Configuration dictionary
+            loader: Loader used when running in-process
+            chunker: Chunker used when running in-process
+        """
+        self.config = config or {}
+        preprocess_config = self.config.get("ingestion", {}).get("preprocess", {})
+
+        self.workers = preprocess_config.get("workers", 0)
+        self.loader = loader or DocumentLoader(config)
+        self.chunker = chunker or TextChunker(config)
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.config,),
+            )
+            logger.info(f"Started preprocess pool with {self.workers} workers")
+        return self._executor
+
+    def start(self) -> None:
+        """Spawn pool workers ahead of first use"""
+        if self.workers > 0:
+            self._get_executor()
+
+    async def process(
+        self,
+        file_path: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        kb_id: str = "default",
+    ) -> Tuple[Dict[str, Any], List[Chunk]]:
+        """Load and chunk a document
+
+        Args:
+            file_path: Path to the document
+            metadata: Optional metadata to attach
+            kb_id: Knowledge Base ID
+
+        Returns:
+            (document info with type and metadata, chunks)
+        """
+        metadata = metadata or {}
+
+        if self.workers <= 0:
+            doc = await self.loader.load(file_path)
+            doc_metadata = _merge_metadata(doc, metadata, kb_id)
+            chunks = await asyncio.to_thread(
+                self.chunker.chunk, doc["content"], doc_metadata, doc.get("segments")
+            )
+            if doc.get("pages"):
+                annotate_window(chunks, doc)
+            return {"type": doc.get("type"), "metadata": doc_metadata}, chunks
+
+        loop = asyncio.get_running_loop()
+        try:
+            record = await loop.run_in_executor(
+                self._get_executor(), _preprocess, file_path, metadata, kb_id
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory), start a fresh pool next time
+            logger.error(f"Preprocess pool broke while processing {file_path}")
+            self.shutdown()
+            raise
+
+        doc_metadata = record["metadata"]
+        chunks = [_expand(r, doc_metadata) for r in record["chunks"]]
+        return {"type": record["type"], "metadata": doc_metadata}, chunks
+
+    async def chunk(
+        self,
+        doc: Dict[str, Any],
+        doc_metadata: Dict[str, Any],
+        start_index: int = 0,
+    ) -> List[Chunk]:
+        """Chunk an already loaded document or PDF page window
+
+        Args:
+            doc: Document (or window) with content and optional segments,
+                pages and offset
+            doc_metadata: Metadata to attach to the chunks
+            start_index: Index of the first chunk
+
+        Returns:
+            Chunks, annotated with page numbers when doc has pages
+        """
+        if self.workers <= 0:
+            chunks = await asyncio.to_thread(
+                self.chunker.chunk, doc["content"], doc_metadata, doc.get("segments"), start_index
+            )
+            if doc.get("pages"):
+                annotate_window(chunks, doc)
+            return chunks
+
+        # Only what chunking needs crosses the process boundary
+        part = {key: doc[key] for key in ("content", "segments", "pages", "offset") if key in doc}
+        loop = asyncio.get_running_loop()
+        try:
+            records = await loop.run_in_executor(
+                self._get_executor(), _chunk, part, doc_metadata, start_index
+            )
+        except BrokenProcessPool:
+            logger.error("Preprocess pool broke while chunking")
+            self.shutdown()
+            raise
+
+        return [_expand(r, doc_metadata) for r in records]
+
+    def shutdown(self) -> None:
+        """Stop pool workers"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,125 @@
+"""Scheduler - Fair admission of documents into ingestion across KBs"""
+
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Dict, Any, AsyncIterator, Deque, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FairScheduler:
+    """Limit concurrent document ingestion globally and per KB
+
+    Documents waiting for a slot are queued per KB, and freed slots are
+    handed out round-robin over the KBs with waiting documents, so a bulk
+    import into one KB gets at most max_documents_per_kb slots and other KBs
+    are served in turn instead of after its whole backlog.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """Initialize scheduler
+
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config or {}
+        scheduler_config = self.config.get("ingestion", {}).get("scheduler", {})
+
+        self.max_documents = max(1, scheduler_config.get("max_documents", 8))
+        self.max_per_kb = max(1, scheduler_config.get("max_documents_per_kb", 4))
+
+        self.active: Dict[str, int] = {}
+        # KB -> waiting futures; KB order is the round-robin order
+        self.waiting: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self.total_active = 0
+
+        self.admitted = 0
+        self.waited = 0
+
+    @asynccontextmanager
+    async def slot(self, kb_id: str) -> AsyncIterator[None]:
+        """Hold an ingestion slot for one document of a KB
+
+        Args:
+            kb_id: Knowledge Base ID
+        """
+        await self._acquire(kb_id)
+        try:
+            yield
+        finally:
+            self._release(kb_id)
+
+    def _eligible(self, kb_id: str) -> bool:
+        return self.total_active < self.max_documents and self.active.get(kb_id, 0) < self.max_per_kb
+
+    def _grant(self, kb_id: str) -> None:
+        self.active[kb_id] = self.active.get(kb_id, 0) + 1
+        self.total_active += 1
+        self.admitted += 1
+
+    async def _acquire(self, kb_id: str) -> None:
+        # Go straight in only if no one is queued ahead
+        if self._eligible(kb_id) and not self.waiting:
+            self._grant(kb_id)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self.waiting.setdefault(kb_id, deque()).append(future)
+        self.waited += 1
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the cancellation: hand the slot on
+                self._release(kb_id)
+            else:
+                queue = self.waiting.get(kb_id)
+                if queue is not None and future in queue:
+                    queue.remove(future)
+                    if not queue:
+                        del self.waiting[kb_id]
+            raise
+
+    def _release(self, kb_id: str) -> None:
+        self.active[kb_id] -= 1
+        if not self.active[kb_id]:
+            del self.active[kb_id]
+        self.total_active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant free slots to waiting KBs in round-robin order"""
+        while self.total_active < self.max_documents:
+            kb_id = next((kb for kb in self.waiting if self._eligible(kb)), None)
+            if kb_id is None:
+                return
+
+            queue = self.waiting.pop(kb_id)
+            future = queue.popleft()
+            if queue:
+                # The KB goes to the back of the rotation
+                self.waiting[kb_id] = queue
+            if future.done():
+                # Cancelled while waiting
+                continue
+            self._grant(kb_id)
+            future.set_result(None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler statistics
+
+        Returns:
+            Dictionary with limits, active and waiting documents per KB
+        """
+        return {
+            "max_documents": self.max_documents,
+            "max_documents_per_kb": self.max_per_kb,
+            "active": self.total_active,
+            "active_by_kb": dict(self.active),
+            "waiting_by_kb": {kb: len(queue) for kb, queue in self.waiting.items()},
+            "admitted": self.admitted,
+            "waited": self.waited,
+        }
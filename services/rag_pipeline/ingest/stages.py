@@ -0,0 +1,543 @@
+"""Stages - Overlapped producer/consumer ingestion pipeline"""
+
+import asyncio
+import contextvars
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Awaitable, Callable, Set
+import logging
+import time
+
+from ..chunker.text_chunker import Chunk
+from .incremental import assign_content_ids, stale_parent_keys
+from .pdf_stream import next_chunk_index
+
+logger = logging.getLogger(__name__)
+
+STAGE_NAMES = ("load", "chunk", "embed", "insert", "keyword")
+
+DEFAULT_CONCURRENCY = {"load": 2, "chunk": 2, "embed": 4, "insert": 2, "keyword": 1}
+
+# Stages whose running handlers may be cancelled with their job; the others
+# write to the stores from threads, which cannot be interrupted
+INTERRUPTIBLE_STAGES = ("load", "embed")
+
+# Stage whose worker is running the current handler
+_current_stage: contextvars.ContextVar = contextvars.ContextVar("current_stage", default=None)
+
+
+class IngestJob:
+    """One document (file or raw text) moving through the stages
+
+    The job finishes when no item of it is queued or being processed in any
+    stage. The first stage error fails the job; its remaining items are
+    dropped as they are dequeued.
+    """
+
+    def __init__(
+        self,
+        kb_id: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        file_path: Optional[str] = None,
+        text: Optional[str] = None,
+        doc_id: Optional[str] = None,
+        stream: bool = False,
+        incremental: Optional[bool] = None,
+    ):
+        """Initialize job
+
+        Args:
+            kb_id: Knowledge Base ID
+            metadata: Optional metadata to attach
+            file_path: Path of the document to load
+            text: Raw text to ingest instead of a file
+            doc_id: Document ID (derived from the metadata or file name if None)
+            stream: Load the PDF page window by window
+            incremental: Diff against the indexed version of the document
+                (the ingestor's setting if None)
+        """
+        self.kb_id = kb_id
+        self.metadata = metadata or {}
+        self.file_path = file_path
+        self.text = text
+        self.doc_id = doc_id
+        self.stream = stream
+        self.incremental = incremental
+
+        self.doc_metadata: Dict[str, Any] = {}
+        self.doc_type: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+        self.chunks_total = 0
+        self.chunks_created = 0
+        self.chunks_embedded = 0
+        self.chunks_inserted = 0
+        self.parents_stored = 0
+        self.dedup: Dict[str, Any] = {}
+
+        # Incremental re-indexing: metadata of the chunks already indexed for
+        # the document by chunk ID (None when not incremental), and the chunk
+        # IDs and parent keys of the new version
+        self.indexed: Optional[Dict[str, Dict[str, Any]]] = None
+        self.seen: Set[str] = set()
+        self.parent_keys: Set[str] = set()
+        self.id_occurrences: Dict[str, int] = {}
+        self.chunks_reused = 0
+        self.chunks_deleted = 0
+
+        # Page windows of a streamed PDF, chunked strictly in order
+        self.windows = 0
+        self.page_count = 0
+        self.next_window = 0
+        self.next_index = 0
+        self.turn = asyncio.Condition()
+
+        self.inflight = 0
+        self.done: Optional[asyncio.Future] = None
+        # Running handlers of interruptible stages
+        self.handlers: Set[asyncio.Task] = set()
+
+    async def fail(self, error: BaseException) -> None:
+        if self.error is None:
+            self.error = error
+        # Wake windows waiting for their turn so they can be dropped
+        async with self.turn:
+            self.turn.notify_all()
+
+    def cancel_handlers(self) -> None:
+        """Cancel the job's running load and embed handlers"""
+        for handler in list(self.handlers):
+            handler.cancel()
+
+    async def drained(self) -> None:
+        """Wait until no item of the job is queued or being processed
+
+        Cancelling the task awaiting the job does not stop handlers that
+        write to the stores (e.g. a vector store insert in a thread); this
+        waits for those to finish.
+        """
+        if self.done is not None and self.inflight > 0:
+            await asyncio.shield(self.done)
+
+    def progress(self) -> Dict[str, int]:
+        """Live progress counters"""
+        return {
+            "chunks_created": self.chunks_created,
+            "chunks_embedded": self.chunks_embedded,
+            "chunks_inserted": self.chunks_inserted,
+            "chunks_reused": self.chunks_reused,
+            "windows": self.windows,
+            "page_count": self.page_count,
+        }
+
+    def counts(self) -> Dict[str, Any]:
+        """Ingestion counts in the shape of the pipeline's results"""
+        counts = {
+            "chunks_created": self.chunks_created,
+            "chunks_inserted": self.chunks_inserted,
+            "parents_stored": self.parents_stored,
+            "dedup": self.dedup,
+        }
+        if self.indexed is not None:
+            counts["chunks_reused"] = self.chunks_reused
+            counts["chunks_deleted"] = self.chunks_deleted
+        return counts
+
+
+class Stage:
+    """Workers draining a bounded queue of (job, payload) items
+
+    Workers are started when items are queued, up to concurrency, and exit
+    when the queue is empty, so an idle pipeline holds no tasks. Producers
+    block while the queue is full, which bounds the work in flight between
+    two stages; that time is counted as blocked, not busy, for the producing
+    stage, and as producer wait for this one.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[IngestJob, Any], Awaitable[Optional[int]]],
+        concurrency: int,
+        queue_size: int,
+        interruptible: bool = False,
+    ):
+        """Initialize stage
+
+        Args:
+            name: Stage name
+            handler: Coroutine processing one item, returning the number of
+                chunks it handled
+            concurrency: Maximum concurrent workers
+            queue_size: Maximum queued items
+            interruptible: Running handlers are cancelled with their job
+        """
+        self.name = name
+        self.handler = handler
+        self.interruptible = interruptible
+        self.concurrency = max(1, concurrency)
+        self.queue_size = queue_size
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+        self.active = 0
+        self._tasks = set()
+
+        self.items = 0
+        self.chunks = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.producer_wait_seconds = 0.0
+        self.peak_depth = 0
+        self.started_at: Optional[float] = None
+
+    async def put(self, job: IngestJob, payload: Any) -> None:
+        job.inflight += 1
+        start = time.perf_counter()
+        await self.queue.put((job, payload))
+        waited = time.perf_counter() - start
+        self.producer_wait_seconds += waited
+        producer = _current_stage.get()
+        if producer is not None:
+            producer.blocked_seconds += waited
+        self.peak_depth = max(self.peak_depth, self.queue.qsize())
+        if self.active < self.concurrency:
+            self.active += 1
+            task = asyncio.ensure_future(self._work())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _work(self) -> None:
+        _current_stage.set(self)
+        try:
+            while True:
+                try:
+                    job, payload = self.queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await self._process(job, payload)
+        finally:
+            self.active -= 1
+
+    async def _process(self, job: IngestJob, payload: Any) -> None:
+        if self.started_at is None:
+            self.started_at = time.perf_counter()
+        start = time.perf_counter()
+        try:
+            if job.error is None:
+                handled = await self._run_handler(job, payload)
+                self.chunks += handled or 0
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Ingestion stage {self.name} failed for {job.file_path or job.doc_id}: {e}")
+            await job.fail(e)
+        finally:
+            self.items += 1
+            self.busy_seconds += time.perf_counter() - start
+            job.inflight -= 1
+            if job.inflight == 0 and not job.done.done():
+                job.done.set_result(job)
+
+    async def _run_handler(self, job: IngestJob, payload: Any) -> Optional[int]:
+        if not self.interruptible:
+            return await self.handler(job, payload)
+        handler = asyncio.ensure_future(self.handler(job, payload))
+        job.handlers.add(handler)
+        try:
+            # Waiting (rather than awaiting) keeps this worker running when
+            # only the handler is cancelled
+            await asyncio.wait({handler})
+        finally:
+            job.handlers.discard(handler)
+        return None if handler.cancelled() else handler.result()
+
+    def cancel(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get stage statistics
+
+        utilization is the share of worker capacity spent working (busy but
+        not blocked on the next queue) since the first item. The bottleneck
+        is the stage with utilization near 1.0 whose producers wait on its
+        full queue; raise its concurrency.
+        """
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        working = max(self.busy_seconds - self.blocked_seconds, 0.0)
+        return {
+            "concurrency": self.concurrency,
+            "active": self.active,
+            "queue_depth": self.queue.qsize(),
+            "queue_size": self.queue_size,
+            "peak_queue_depth": self.peak_depth,
+            "items": self.items,
+            "chunks": self.chunks,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "producer_wait_seconds": round(self.producer_wait_seconds, 3),
+            "chunks_per_second": round(self.chunks / working, 1) if working else 0.0,
+            "utilization": round(working / (elapsed * self.concurrency), 3) if elapsed else 0.0,
+        }
+
+
+class StagedIngestor:
+    """Ingestion as overlapping stages: load -> chunk -> embed -> insert -> keyword
+
+    Each stage has its own workers and a bounded input queue, so parsing of
+    one document overlaps with embedding requests and vector store writes of
+    others, and within a document, chunk batches are embedded, inserted and
+    keyword-indexed concurrently. PDF page windows enter the chunk stage one
+    by one, and the bounded queues keep only a few windows in memory.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, pipeline=None):
+        """Initialize staged ingestor
+
+        Args:
+            config: Configuration dictionary
+            pipeline: RAGPipeline whose components run the stages
+        """
+        self.config = config or {}
+        stages_config = self.config.get("ingestion", {}).get("stages", {})
+        concurrency = {**DEFAULT_CONCURRENCY, **stages_config.get("concurrency", {})}
+        queue_size = stages_config.get("queue_size", 8)
+
+        # Chunks per embed/insert/keyword item
+        self.batch_size = stages_config.get("batch_size", 64)
+        self.pipeline = pipeline
+
+        # Content-hashed chunk IDs; a document indexed before is diffed
+        # against its stored chunks and only the changed chunks are embedded
+        incremental_config = self.config.get("ingestion", {}).get("incremental", {})
+        self.incremental = incremental_config.get("enabled", False)
+
+        handlers = {
+            "load": self._load,
+            "chunk": self._chunk,
+            "embed": self._embed,
+            "insert": self._insert,
+            "keyword": self._keyword,
+        }
+        self.stages = {
+            name: Stage(
+                name, handlers[name], concurrency[name], queue_size,
+                interruptible=name in INTERRUPTIBLE_STAGES,
+            )
+            for name in STAGE_NAMES
+        }
+
+    async def run(self, job: IngestJob) -> IngestJob:
+        """Ingest one document through the stages
+
+        Args:
+            job: Job describing the document
+
+        Returns:
+            The finished job with its counts (job.error set if a stage failed)
+        """
+        job.dedup = {"action": self.pipeline.dedup.action, "duplicates": 0, "bytes_saved": 0, "links": []}
+        job.done = asyncio.get_running_loop().create_future()
+        if job.incremental is None:
+            job.incremental = self.incremental
+        try:
+            await self.stages["load"].put(job, None)
+            # Shielded: cancelling the run must not cancel the drain signal
+            await asyncio.shield(job.done)
+            if job.indexed is not None and job.error is None:
+                try:
+                    await self._remove_stale(job)
+                except Exception as e:
+                    await job.fail(e)
+            return job
+        except asyncio.CancelledError:
+            # Items of the job still queued in the stages are dropped and its
+            # running load and embed handlers stopped
+            await job.fail(asyncio.CancelledError())
+            job.cancel_handlers()
+            raise
+
+    async def _load(self, job: IngestJob, _payload: Any) -> None:
+        pipeline = self.pipeline
+
+        if job.text is not None:
+            job.doc_metadata = {**job.metadata, "kb_id": job.kb_id}
+            job.doc_metadata.setdefault("doc_id", job.doc_id)
+            await self._load_indexed(job)
+            await self.stages["chunk"].put(job, {"content": job.text})
+            return
+
+        path = Path(job.file_path)
+        if job.stream:
+            job.doc_metadata = {
+                **job.metadata,
+                "format": path.suffix.lower(),
+                "file_name": path.name,
+                "file_size": path.stat().st_size,
+                "kb_id": job.kb_id,
+            }
+            job.doc_id = job.doc_metadata.get("doc_id") or path.name
+            job.doc_type = "pdf"
+            await self._load_indexed(job)
+
+            windows = pipeline.loader.iter_pdf_windows(path, pipeline.stream_window_pages)
+            try:
+                async for window in windows:
+                    window["seq"] = job.windows
+                    job.windows += 1
+                    job.page_count = window["page_count"]
+                    # Blocks while the chunk queue is full, bounding windows in memory
+                    await self.stages["chunk"].put(job, window)
+            finally:
+                await windows.aclose()
+            return
+
+        # Parsed and chunked in one preprocess call, so with worker processes
+        # the document text never enters this process
+        info, chunks = await pipeline.preprocessor.process(job.file_path, job.metadata, job.kb_id)
+        job.doc_metadata = info["metadata"]
+        job.doc_id = job.doc_metadata.get("doc_id") or path.name
+        job.doc_type = info["type"]
+        await self._load_indexed(job)
+        await self.stages["chunk"].put(job, {"chunks": chunks})
+
+    async def _load_indexed(self, job: IngestJob) -> None:
+        """Fetch the chunks already indexed for the job's document"""
+        if not job.incremental:
+            return
+        pipeline = self.pipeline
+        stored = await asyncio.to_thread(
+            pipeline.vector_store.list_document_chunks, job.doc_id, job.kb_id, pipeline.collection_name
+        )
+        if stored is None:
+            # Without the indexed set the old version could not be cleaned up
+            raise RuntimeError(f"Could not read the indexed chunks of {job.doc_id}")
+        job.indexed = {c["chunk_id"]: c["metadata"] for c in stored}
+        if job.indexed:
+            # The previous version must not make the new one look like a near-duplicate
+            await asyncio.to_thread(pipeline.dedup.remove_document, job.kb_id, job.doc_id)
+
+    async def _chunk(self, job: IngestJob, doc: Dict[str, Any]) -> int:
+        pipeline = self.pipeline
+
+        if "seq" in doc:
+            # Windows continue the chunk numbering of the previous window
+            async with job.turn:
+                await job.turn.wait_for(lambda: job.next_window == doc["seq"] or job.error is not None)
+                if job.error is not None:
+                    return 0
+                try:
+                    chunks = await pipeline.preprocessor.chunk(doc, job.doc_metadata, job.next_index)
+                    job.next_index = next_chunk_index(chunks, job.next_index)
+                    if job.incremental:
+                        # Repeated content is numbered in document order
+                        assign_content_ids(chunks, job.doc_id, job.id_occurrences)
+                finally:
+                    job.next_window += 1
+                    job.turn.notify_all()
+        elif "chunks" in doc:
+            # Chunked by the load stage
+            chunks = doc["chunks"]
+        else:
+            # Raw text is already in this process, chunk it in a thread
+            chunks = await asyncio.to_thread(pipeline.chunker.chunk, doc["content"], job.doc_metadata)
+        if job.incremental and "seq" not in doc:
+            assign_content_ids(chunks, job.doc_id, job.id_occurrences)
+        job.chunks_total += len(chunks)
+
+        # Parents go to the doc store unembedded
+        chunks, parents_stored = await pipeline._store_parents(chunks, job.kb_id, job.doc_id)
+        job.parents_stored += parents_stored
+        job.chunks_created += len(chunks)
+
+        # Near-duplicates of chunks already in the KB are not embedded again
+        chunks, report = await asyncio.to_thread(pipeline.dedup.process, job.kb_id, job.doc_id, chunks)
+        for key in ("duplicates", "bytes_saved"):
+            job.dedup[key] += report[key]
+        job.dedup["links"].extend(report["links"])
+
+        if job.indexed is not None:
+            # Chunks already indexed unchanged are kept as they are
+            job.seen.update(c.chunk_id for c in chunks)
+            job.parent_keys.update(
+                c.metadata["parent_key"] for c in chunks if (c.metadata or {}).get("parent_key")
+            )
+            fresh = [c for c in chunks if c.chunk_id not in job.indexed]
+            job.chunks_reused += len(chunks) - len(fresh)
+            chunks = fresh
+
+        batches = [chunks[i:i + self.batch_size] for i in range(0, len(chunks), self.batch_size)]
+        # The part (document or window) is searchable once all its batches are indexed
+        part = {"remaining": len(batches)}
+        for batch in batches:
+            await self.stages["embed"].put(job, {"chunks": batch, "part": part})
+        return len(chunks)
+
+    async def _embed(self, job: IngestJob, batch: Dict[str, Any]) -> int:
+        chunks: List[Chunk] = batch.pop("chunks")
+        batch["embedded"] = await self.pipeline.embedder.embed_chunks(chunks)
+        job.chunks_embedded += len(chunks)
+        await self.stages["insert"].put(job, batch)
+        return len(chunks)
+
+    async def _insert(self, job: IngestJob, batch: Dict[str, Any]) -> int:
+        pipeline = self.pipeline
+        embedded = batch["embedded"]
+
+        # Sparse term vectors for native keyword search travel with the rows;
+        # tokenizing them is CPU-bound and runs in a thread
+        await asyncio.to_thread(pipeline.retriever.attach_sparse_vectors, embedded)
+        inserted = await asyncio.to_thread(
+            pipeline.vector_store.insert, embedded, pipeline.collection_name, kb_id=job.kb_id
+        )
+        job.chunks_inserted += inserted
+        if inserted < len(embedded):
+            # The vector store reports write errors as a short count; failing
+            # the job retries it and keeps the previous version's chunks
+            raise RuntimeError(f"Inserted {inserted} of {len(embedded)} chunks of {job.doc_id}")
+        await self.stages["keyword"].put(job, batch)
+        return len(embedded)
+
+    async def _keyword(self, job: IngestJob, batch: Dict[str, Any]) -> int:
+        pipeline = self.pipeline
+        embedded = batch["embedded"]
+
+        # Index for BM25 (tokenization runs off the event loop)
+        await asyncio.to_thread(pipeline.retriever.index_documents, embedded)
+
+        part = batch["part"]
+        part["remaining"] -= 1
+        if part["remaining"] == 0:
+            # New content is searchable: invalidate cached results of this KB
+            await pipeline.result_cache.bump(job.kb_id, doc_id=job.doc_id)
+        return len(embedded)
+
+    async def _remove_stale(self, job: IngestJob) -> None:
+        """Delete the chunks and parents the new version no longer has"""
+        pipeline = self.pipeline
+        removed = [chunk_id for chunk_id in job.indexed if chunk_id not in job.seen]
+        if not removed:
+            return
+
+        await asyncio.to_thread(
+            pipeline.vector_store.delete, removed, pipeline.collection_name, doc_id=job.doc_id
+        )
+        pipeline.retriever.remove_chunks(removed, kb_id=job.kb_id)
+        if pipeline.doc_store.enabled:
+            stale = stale_parent_keys(job.indexed, job.parent_keys)
+            await pipeline.doc_store.delete_keys(job.kb_id, job.doc_id, sorted(stale))
+        job.chunks_deleted = len(removed)
+        await pipeline.result_cache.bump(job.kb_id, doc_id=job.doc_id)
+
+    def shutdown(self) -> None:
+        """Cancel running stage workers"""
+        for stage in self.stages.values():
+            stage.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-stage throughput and queue depth
+
+        Returns:
+            Dictionary of stage statistics by stage name
+        """
+        return {name: stage.get_stats() for name, stage in self.stages.items()}
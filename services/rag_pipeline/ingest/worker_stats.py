@@ -0,0 +1,160 @@
+"""Worker Stats - Ingestion statistics reported by worker processes"""
+
+from typing import List, Dict, Any, Optional
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Stage fields that do not add up across workers
+_STAGE_MAX_FIELDS = ("peak_queue_depth",)
+_STAGE_MEAN_FIELDS = ("utilization",)
+
+
+class WorkerStats:
+    """Stage, scheduler and parse cache statistics of the ingestion workers
+
+    Ingestion runs in the worker processes, so their statistics are not
+    visible to the API server. Each worker publishes a snapshot of its own
+    statistics to Redis on every heartbeat, and the server combines the
+    snapshots of the workers that reported recently. A snapshot expires after
+    three heartbeat intervals, so a worker that stopped drops out.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """Initialize worker stats
+
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config or {}
+        jobs_config = self.config.get("ingestion", {}).get("jobs", {})
+        key_prefix = self.config.get("result_cache", {}).get("key_prefix", "rag")
+
+        self.key_prefix = key_prefix
+        self.workers_key = f"{key_prefix}:ingest:workers"
+        self.stale_seconds = 3 * jobs_config.get("heartbeat_interval", 5.0)
+        self._redis = None
+
+    def _get_redis(self):
+        if self._redis is None:
+            from apps.shared.redis_client import get_redis
+
+            self._redis = get_redis()
+        return self._redis
+
+    def _worker_key(self, worker_id: str) -> str:
+        return f"{self.key_prefix}:ingest:worker:{worker_id}"
+
+    async def publish(self, worker_id: str, stats: Dict[str, Any]) -> None:
+        """Record the current statistics of a worker
+
+        Args:
+            worker_id: Worker ID
+            stats: Worker statistics (stages, scheduler, parse_cache, jobs)
+        """
+        try:
+            redis = self._get_redis()
+            await redis.set_json(
+                self._worker_key(worker_id),
+                {**stats, "worker_id": worker_id, "updated_at": time.time()},
+                ex=max(1, int(self.stale_seconds)),
+            )
+            await redis.sadd(self.workers_key, worker_id)
+        except Exception as e:
+            logger.warning(f"Failed to publish stats of ingestion worker {worker_id}: {e}")
+
+    async def remove(self, worker_id: str) -> None:
+        """Forget a worker that stopped
+
+        Args:
+            worker_id: Worker ID
+        """
+        try:
+            redis = self._get_redis()
+            await redis.srem(self.workers_key, worker_id)
+            await redis.delete(self._worker_key(worker_id))
+        except Exception as e:
+            logger.warning(f"Failed to remove stats of ingestion worker {worker_id}: {e}")
+
+    async def collect(self) -> Dict[str, Any]:
+        """Combine the statistics of the live workers
+
+        Returns:
+            Dictionary with per-worker snapshots and the stage, scheduler and
+            parse cache statistics summed over the workers
+        """
+        workers: Dict[str, Dict[str, Any]] = {}
+        try:
+            redis = self._get_redis()
+            worker_ids = sorted(await redis.smembers(self.workers_key))
+            values = await redis.mget([self._worker_key(w) for w in worker_ids])
+            now = time.time()
+            for worker_id, value in zip(worker_ids, values):
+                snapshot = json.loads(value) if value else None
+                if snapshot is None or now - snapshot.get("updated_at", 0) > self.stale_seconds:
+                    await self.remove(worker_id)
+                else:
+                    workers[worker_id] = snapshot
+        except Exception as e:
+            logger.warning(f"Failed to read ingestion worker stats: {e}")
+
+        snapshots = list(workers.values())
+        return {
+            "workers": workers,
+            "stages": self._combine_stages([s.get("stages", {}) for s in snapshots]),
+            "scheduler": self._combine_scheduler([s.get("scheduler", {}) for s in snapshots]),
+            "parse_cache": self._combine_parse_cache([s.get("parse_cache", {}) for s in snapshots]),
+        }
+
+    @staticmethod
+    def _sum_counts(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        total: Dict[str, Any] = {}
+        for item in items:
+            for name, value in item.items():
+                total[name] = total.get(name, 0) + value
+        return total
+
+    @classmethod
+    def _combine_stages(cls, snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
+        combined: Dict[str, List[Dict[str, Any]]] = {}
+        for stages in snapshots:
+            for name, stats in stages.items():
+                combined.setdefault(name, []).append(stats)
+
+        result = {}
+        for name, items in combined.items():
+            stage = cls._sum_counts(
+                [{k: v for k, v in s.items() if k not in _STAGE_MAX_FIELDS + _STAGE_MEAN_FIELDS} for s in items]
+            )
+            for field in _STAGE_MAX_FIELDS:
+                stage[field] = max(s.get(field, 0) for s in items)
+            for field in _STAGE_MEAN_FIELDS:
+                stage[field] = round(sum(s.get(field, 0.0) for s in items) / len(items), 3)
+            for field in ("busy_seconds", "blocked_seconds", "producer_wait_seconds", "chunks_per_second"):
+                if field in stage:
+                    stage[field] = round(stage[field], 3)
+            result[name] = stage
+        return result
+
+    @classmethod
+    def _combine_scheduler(cls, snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
+        scheduler = cls._sum_counts(
+            [{k: v for k, v in s.items() if not isinstance(v, dict)} for s in snapshots]
+        )
+        for field in ("active_by_kb", "waiting_by_kb"):
+            scheduler[field] = cls._sum_counts([s.get(field, {}) for s in snapshots])
+        return scheduler
+
+    @classmethod
+    def _combine_parse_cache(cls, snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
+        hits = sum(s.get("hits", 0) for s in snapshots)
+        misses = sum(s.get("misses", 0) for s in snapshots)
+        total = hits + misses
+        return {
+            "enabled": any(s.get("enabled", False) for s in snapshots),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+        }
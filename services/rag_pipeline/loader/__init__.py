@@ -1,5 +1,8 @@
 """Document Loader Module"""
 
 from .document_loader import DocumentLoader
+from .parse_pool import ParsePool
+from .ocr_pool import OCRPool
+from .parse_cache import ParseCache
 
-__all__ = ["DocumentLoader"]
+__all__ = ["DocumentLoader", "ParsePool", "OCRPool", "ParseCache"]
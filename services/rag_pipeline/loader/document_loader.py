@@ -2,29 +2,97 @@
 
 import asyncio
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, Iterator, List, Optional, Tuple
 import logging
 
+from . import ooxml, pdf_pages
+from .parse_pool import ParsePool
+from .ocr_pool import OCRPool
+from .parse_cache import ParseCache
+
 logger = logging.getLogger(__name__)
 
 
+class SegmentBuilder:
+    """Build document content from structural segments
+
+    Segments (sheet row groups, slides) are joined with blank lines, and the
+    character span of each one in the final content is recorded so the
+    chunker can keep chunks inside segment boundaries.
+    """
+
+    SEPARATOR = "\n\n"
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.segments: List[Dict[str, Any]] = []
+        self._offset = 0
+
+    def add(self, text: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        if self.parts:
+            self._offset += len(self.SEPARATOR)
+        start = self._offset
+        self._offset += len(text)
+        self.parts.append(text)
+        self.segments.append({"start": start, "end": self._offset, "metadata": metadata or {}})
+
+    def content(self) -> str:
+        return self.SEPARATOR.join(self.parts)
+
+
 class DocumentLoader:
     """Document loader supporting multiple formats"""
 
+    # Bump when parser output changes, so cached parse results are not reused
+    VERSION = 1
+
     TEXT_EXTENSIONS = {".txt", ".md", ".rst", ".log"}
     IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".gif", ".tiff"}
     WORD_EXTENSIONS = {".docx", ".doc"}
     EXCEL_EXTENSIONS = {".xlsx", ".xls"}
     POWERPOINT_EXTENSIONS = {".pptx", ".ppt"}
     PDF_EXTENSIONS = {".pdf"}
+    HTML_EXTENSIONS = {".html", ".htm"}
 
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    def __init__(self, config: Optional[Dict[str, Any]] = None, use_pool: bool = True):
         """Initialize document loader
 
         Args:
             config: Configuration dictionary
+            use_pool: Parse files and run OCR in worker process pools (False
+                runs them in threads, e.g. inside a worker process that must
+                not start pools of its own)
         """
         self.config = config or {}
+        loader_config = self.config.get("loader", {})
+
+        # Spreadsheet rows are grouped into segments that repeat the header row
+        self.excel_rows_per_segment = loader_config.get("excel", {}).get("rows_per_segment", 20)
+
+        # docx/pptx/xlsx are read straight from their XML parts; the office
+        # libraries are only used when that fails
+        self.ooxml_fast_path = loader_config.get("ooxml_fast_path", True)
+
+        # PDFs with many pages are extracted in page ranges across the parse pool
+        pdf_config = loader_config.get("pdf", {})
+        self.pdf_parallel_min_pages = pdf_config.get("parallel_min_pages", 32)
+        self.pdf_pages_per_task = pdf_config.get("pages_per_task", 16)
+
+        # CPU-bound parsers run off the event loop
+        self.parse_pool = ParsePool(self.config, loader=self, use_processes=use_pool)
+        # OCR models are loaded once and kept warm
+        self.ocr_pool = OCRPool(self.config, use_processes=use_pool)
+        # Parsed documents are reused across re-indexing and KBs by content hash
+        self.parse_cache = ParseCache(self.config, fingerprint=self._cache_fingerprint())
+
+    def _cache_fingerprint(self) -> str:
+        """Loader version and the settings that change parse output"""
+        return repr((
+            self.VERSION,
+            self.excel_rows_per_segment,
+            self.ooxml_fast_path,
+            sorted(self.ocr_pool.settings.items()),
+        ))
 
     async def load(self, file_path: str) -> Dict[str, Any]:
         """Load document content
@@ -47,26 +115,39 @@ class DocumentLoader:
         ext = path.suffix.lower()
 
         try:
-            if ext in self.TEXT_EXTENSIONS:
-                return await self._load_text(path, ext)
-            elif ext in self.IMAGE_EXTENSIONS:
-                return await self._load_image(path, ext)
-            elif ext in self.WORD_EXTENSIONS:
-                return await self._load_word(path, ext)
-            elif ext in self.EXCEL_EXTENSIONS:
-                return await self._load_excel(path, ext)
-            elif ext in self.PDF_EXTENSIONS:
-                return await self._load_pdf(path, ext)
-            elif ext in self.POWERPOINT_EXTENSIONS:
-                return await self._load_powerpoint(path, ext)
-            elif ext in {".html", ".htm"}:
-                return await self._load_html(path, ext)
-            else:
-                raise ValueError(f"Unsupported file type: {ext}")
+            # Text files are cheaper to read than to look up
+            if not self.parse_cache.enabled or ext in self.TEXT_EXTENSIONS:
+                return await self._load(path, ext)
+
+            digest = await asyncio.to_thread(self.parse_cache.digest, path)
+            doc = await asyncio.to_thread(self.parse_cache.get, digest, path)
+            if doc is None:
+                doc = await self._load(path, ext)
+                await asyncio.to_thread(self.parse_cache.put, digest, doc)
+            return doc
         except Exception as e:
             logger.error(f"Error loading file {file_path}: {e}")
             raise
 
+    async def _load(self, path: Path, ext: str) -> Dict[str, Any]:
+        """Parse a file with the loader for its format"""
+        if ext in self.TEXT_EXTENSIONS:
+            return await self._load_text(path, ext)
+        elif ext in self.IMAGE_EXTENSIONS:
+            return await self._load_image(path, ext)
+        elif ext in self.WORD_EXTENSIONS:
+            return await self.parse_pool.run("word", path, ext)
+        elif ext in self.EXCEL_EXTENSIONS:
+            return await self.parse_pool.run("excel", path, ext)
+        elif ext in self.PDF_EXTENSIONS:
+            return await self._load_pdf(path, ext)
+        elif ext in self.POWERPOINT_EXTENSIONS:
+            return await self.parse_pool.run("powerpoint", path, ext)
+        elif ext in self.HTML_EXTENSIONS:
+            return await self.parse_pool.run("html", path, ext)
+        else:
+            raise ValueError(f"Unsupported file type: {ext}")
+
     async def load_batch(self, file_paths: List[str]) -> List[Dict[str, Any]]:
         """Load multiple documents in batch
 
@@ -76,9 +157,29 @@ class DocumentLoader:
         Returns:
             List of document dictionaries
         """
+        # Files are parsed concurrently, up to the parse pool size
         tasks = [self.load(fp) for fp in file_paths]
         return await asyncio.gather(*tasks, return_exceptions=True)
 
+    def parse(self, kind: str, path: Path, ext: str, *args) -> Any:
+        """Run a format parser synchronously
+
+        Args:
+            kind: Parser name (word, excel, pdf, pdf_pages, powerpoint, html)
+            path: Path to the file
+            ext: File extension
+            *args: Extra parser arguments (page range for pdf_pages)
+
+        Returns:
+            Document dictionary (page list for pdf_pages)
+        """
+        return getattr(self, f"_parse_{kind}")(path, ext, *args)
+
+    async def close(self) -> None:
+        """Stop the parse and OCR pool workers"""
+        self.parse_pool.shutdown()
+        await self.ocr_pool.shutdown()
+
     async def _load_text(self, path: Path, ext: str) -> Dict[str, Any]:
         """Load text-based files
 
@@ -122,64 +223,95 @@ class DocumentLoader:
         Returns:
             Document dictionary with OCR extracted text
         """
+        metadata = {
+            "format": ext,
+            "file_name": path.name,
+            "file_size": path.stat().st_size,
+        }
+
         try:
-            from paddleocr import PaddleOCR
+            result = await self.ocr_pool.recognize(path)
+        except Exception as e:
+            logger.error(f"Error processing image with OCR: {e}")
+            result = {"lines": [], "error": str(e)}
 
-            # Initialize PaddleOCR (use angle classifier for rotated text)
-            ocr = PaddleOCR(
-                use_angle_cls=True,
-                lang="ch",  # Chinese + English
-                show_log=False,
-            )
+        text_parts = result["lines"]
+        metadata["lines_detected"] = len(text_parts)
+        for key in ("note", "error", "skipped", "downscaled"):
+            if result.get(key):
+                metadata[key] = result[key]
 
-            # Run OCR
-            result = ocr.ocr(str(path), cls=True)
+        return {
+            "type": "image",
+            "content": "\n".join(text_parts),
+            "metadata": metadata,
+        }
 
-            # Extract text from OCR result
-            text_parts = []
-            if result and result[0]:
-                for line in result[0]:
-                    if line and len(line) >= 2:
-                        text_parts.append(line[1][0])
+    def _parse_word_ooxml(self, path: Path, ext: str) -> Dict[str, Any]:
+        """Load a .docx by streaming its document part"""
+        paragraphs = [p for p in ooxml.docx_paragraphs(path) if p.strip()]
+        return {
+            "type": "word",
+            "content": "\n".join(paragraphs),
+            "metadata": {
+                "format": ext,
+                "file_name": path.name,
+                "file_size": path.stat().st_size,
+                "paragraph_count": len(paragraphs),
+                "extractor": "ooxml",
+            },
+        }
 
-            content = "\n".join(text_parts)
+    def _parse_excel_ooxml(self, path: Path, ext: str) -> Dict[str, Any]:
+        """Load a .xlsx by streaming its worksheet parts row by row"""
+        sheet_names: List[str] = []
 
-            return {
-                "type": "image",
-                "content": content,
-                "metadata": {
-                    "format": ext,
-                    "file_name": path.name,
-                    "file_size": path.stat().st_size,
-                    "lines_detected": len(text_parts),
-                },
-            }
-        except ImportError:
-            logger.warning("paddleocr not installed. Run: pip install paddleocr")
-            return {
-                "type": "image",
-                "content": "",
-                "metadata": {
-                    "format": ext,
-                    "file_name": path.name,
-                    "file_size": path.stat().st_size,
-                    "note": "paddleocr not installed",
-                },
-            }
-        except Exception as e:
-            logger.error(f"Error processing image with OCR: {e}")
-            return {
-                "type": "image",
-                "content": "",
-                "metadata": {
-                    "format": ext,
-                    "file_name": path.name,
-                    "file_size": path.stat().st_size,
-                    "error": str(e),
-                },
-            }
+        def sheets():
+            for name, rows in ooxml.xlsx_sheets(path):
+                sheet_names.append(name)
+                yield name, rows
 
-    async def _load_word(self, path: Path, ext: str) -> Dict[str, Any]:
+        builder = self._excel_segments(sheets())
+        return {
+            "type": "excel",
+            "content": builder.content(),
+            "segments": builder.segments,
+            "metadata": {
+                "format": path.suffix,
+                "file_name": path.name,
+                "file_size": path.stat().st_size,
+                "sheet_count": len(sheet_names),
+                "segment_count": len(builder.segments),
+                "extractor": "ooxml",
+            },
+        }
+
+    def _parse_powerpoint_ooxml(self, path: Path, ext: str) -> Dict[str, Any]:
+        """Load a .pptx by streaming its slide parts (one segment per slide)"""
+        builder = SegmentBuilder()
+        slide_count = 0
+        for slide_number, texts in ooxml.pptx_slides(path):
+            slide_count = slide_number
+            if texts:
+                builder.add(
+                    f"=== Slide {slide_number} ===\n" + "\n".join(texts),
+                    {"slide": slide_number},
+                )
+
+        return {
+            "type": "powerpoint",
+            "content": builder.content(),
+            "segments": builder.segments,
+            "metadata": {
+                "format": ext,
+                "file_name": path.name,
+                "file_size": path.stat().st_size,
+                "slide_count": slide_count,
+                "extractor": "ooxml",
+            },
+        }
+
+    def _parse_word(self, path: Path, ext: str) -> Dict[str, Any]:
         """Load Word documents
 
         Args:
@@ -189,6 +321,12 @@ class DocumentLoader:
         Returns:
             Document dictionary
         """
+        if self.ooxml_fast_path and ext == ".docx":
+            try:
+                return self._parse_word_ooxml(path, ext)
+            except Exception as e:
+                logger.info(f"Streaming extraction failed for {path.name}, using python-docx: {e}")
+
         try:
             from docx import Document
 
@@ -222,9 +360,74 @@ class DocumentLoader:
             logger.error(f"Error loading Word document: {e}")
             raise
 
-    async def _load_excel(self, path: Path, ext: str) -> Dict[str, Any]:
+    @staticmethod
+    def _workbook_sheets(wb) -> Iterator[Tuple[str, Iterator[Tuple[int, Tuple[Any, ...]]]]]:
+        """(sheet name, numbered rows) of an openpyxl workbook"""
+        for sheet_name in wb.sheetnames:
+            # Use iter_rows to iterate through all rows (streams in read-only mode)
+            yield sheet_name, enumerate(wb[sheet_name].iter_rows(values_only=True), start=1)
+
+    def _excel_segments(self, sheets) -> SegmentBuilder:
+        """Split every sheet into row groups, each headed by the sheet name and header row
+
+        Args:
+            sheets: (sheet name, iterable of (row number, cell values)) pairs
+
+        Returns:
+            Segment builder holding the row groups
+        """
+        builder = SegmentBuilder()
+
+        for sheet_name, rows in sheets:
+            sheet_segments = len(builder.segments)
+            header = None
+            group: List[str] = []
+            group_start = None
+
+            def flush(last_row: int) -> None:
+                lines = [f"=== Sheet: {sheet_name} ===", header] + group
+                builder.add(
+                    "\n".join(lines),
+                    {"sheet": sheet_name, "row_start": group_start, "row_end": last_row},
+                )
+
+            last_row = 0
+            for row_idx, row in rows:
+                # Filter out completely empty rows
+                if not any(cell is not None and str(cell).strip() for cell in row):
+                    continue
+                # Convert to text representation (tab-separated)
+                line = "\t".join(str(cell) if cell is not None else "" for cell in row)
+
+                if header is None:
+                    header = line
+                    continue
+
+                if group_start is None:
+                    group_start = row_idx
+                group.append(line)
+                last_row = row_idx
+
+                if len(group) >= self.excel_rows_per_segment:
+                    flush(last_row)
+                    group = []
+                    group_start = None
+
+            if group:
+                flush(last_row)
+            elif header is not None and len(builder.segments) == sheet_segments:
+                # Header-only sheet
+                builder.add(f"=== Sheet: {sheet_name} ===\n{header}", {"sheet": sheet_name})
+
+        return builder
+
+    def _parse_excel(self, path: Path, ext: str) -> Dict[str, Any]:
         """Load Excel spreadsheets
 
+        Rows are emitted as segments of excel_rows_per_segment rows, each
+        prefixed with the sheet name and header row, so every chunk of a
+        segment keeps its column context.
+
         Args:
             path: Path to the Excel file
             ext: File extension
@@ -232,61 +435,41 @@ class DocumentLoader:
         Returns:
             Document dictionary
         """
+        if self.ooxml_fast_path and ext == ".xlsx":
+            try:
+                return self._parse_excel_ooxml(path, ext)
+            except Exception as e:
+                logger.info(f"Streaming extraction failed for {path.name}, using openpyxl: {e}")
+
         try:
             import openpyxl
 
             wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
-            sheets_data = []
-
-            for sheet_name in wb.sheetnames:
-                sheet = wb[sheet_name]
-                rows = []
-                # Use iter_rows to iterate through all rows
-                for row in sheet.iter_rows(values_only=True):
-                    # Filter out completely empty rows
-                    if any(cell is not None and str(cell).strip() for cell in row):
-                        rows.append([str(cell) if cell is not None else "" for cell in row])
-
-                if rows:
-                    # Convert to text representation (tab-separated)
-                    sheet_text = "\n".join(["\t".join(row) for row in rows])
-                    sheets_data.append(f"=== Sheet: {sheet_name} ===\n{sheet_text}")
-
-            content = "\n\n".join(sheets_data) if sheets_data else ""
-            
+            builder = self._excel_segments(self._workbook_sheets(wb))
+
             # Fallback if no content found (e.g. read_only=True issues with some files)
-            if not content:
-                 # Try loading without read_only
-                 try:
+            if not builder.segments:
+                try:
                     wb.close()
                     wb = openpyxl.load_workbook(path, data_only=True)
-                    sheets_data = []
-                    for sheet_name in wb.sheetnames:
-                        sheet = wb[sheet_name]
-                        rows = []
-                        for row in sheet.iter_rows(values_only=True):
-                            if any(cell is not None and str(cell).strip() for cell in row):
-                                rows.append([str(cell) if cell is not None else "" for cell in row])
-                        if rows:
-                            sheet_text = "\n".join(["\t".join(row) for row in rows])
-                            sheets_data.append(f"=== Sheet: {sheet_name} ===\n{sheet_text}")
-                    content = "\n\n".join(sheets_data) if sheets_data else ""
-                 except Exception as e:
-                     logger.warning(f"Fallback Excel load failed: {e}")
-
-            # If still empty, it might be an issue with TextChunker if content is short
-            # But let's check content first.
+                    builder = self._excel_segments(self._workbook_sheets(wb))
+                except Exception as e:
+                    logger.warning(f"Fallback Excel load failed: {e}")
+
+            content = builder.content()
             if not content.strip():
                 logger.warning(f"Excel file parsed but content is empty: {path}")
 
             return {
                 "type": "excel",
                 "content": content,
+                "segments": builder.segments,
                 "metadata": {
                     "format": path.suffix,
                     "file_name": path.name,
                     "file_size": path.stat().st_size,
                     "sheet_count": len(wb.sheetnames),
+                    "segment_count": len(builder.segments),
                 },
             }
         except ImportError:
@@ -305,7 +488,32 @@ class DocumentLoader:
             logger.error(f"Error loading Excel file: {e}")
             raise
 
-    async def _load_pdf(self, path: Path, ext: str) -> Dict[str, Any]:
+    def _pdf_document(
+        self, path: Path, ext: str, pages: List[Tuple[int, str]], page_count: int
+    ) -> Dict[str, Any]:
+        """Assemble extracted pages (in page order) into a document
+
+        Non-empty pages are joined with blank lines; their spans are returned
+        as "pages" (page number, start, end) so chunks can be mapped to pages.
+        """
+        builder = SegmentBuilder()
+        for page_number, text in pages:
+            if text.strip():
+                builder.add(text, {"page": page_number})
+
+        return {
+            "type": "pdf",
+            "content": builder.content(),
+            "pages": [(seg["metadata"]["page"], seg["start"], seg["end"]) for seg in builder.segments],
+            "metadata": {
+                "format": ext,
+                "file_name": path.name,
+                "file_size": path.stat().st_size,
+                "page_count": page_count,
+            },
+        }
+
+    def _parse_pdf(self, path: Path, ext: str) -> Dict[str, Any]:
         """Load PDF documents
 
         Args:
@@ -316,28 +524,8 @@ class DocumentLoader:
             Document dictionary
         """
         try:
-            import pypdf
-
-            content_parts = []
-            with open(path, "rb") as f:
-                reader = pypdf.PdfReader(f)
-                for page in reader.pages:
-                    text = page.extract_text()
-                    if text.strip():
-                        content_parts.append(text)
-
-            content = "\n\n".join(content_parts)
-
-            return {
-                "type": "pdf",
-                "content": content,
-                "metadata": {
-                    "format": ext,
-                    "file_name": path.name,
-                    "file_size": path.stat().st_size,
-                    "page_count": len(reader.pages),
-                },
-            }
+            pages = pdf_pages.extract_pages(path)
+            return self._pdf_document(path, ext, pages, len(pages))
         except ImportError:
             logger.warning("pypdf not installed. Run: pip install pypdf")
             return {
@@ -354,8 +542,100 @@ class DocumentLoader:
             logger.error(f"Error loading PDF: {e}")
             raise
 
-    async def _load_powerpoint(self, path: Path, ext: str) -> Dict[str, Any]:
-        """Load PowerPoint presentations
+    def _parse_pdf_pages(self, path: Path, ext: str, first: int, last: int) -> List[Tuple[int, str]]:
+        """Extract the text of pages [first, last) of a PDF"""
+        return pdf_pages.extract_pages(path, first, last)
+
+    async def _load_pdf(self, path: Path, ext: str) -> Dict[str, Any]:
+        """Load a PDF, extracting large ones in parallel page ranges
+
+        Args:
+            path: Path to the PDF
+            ext: File extension
+
+        Returns:
+            Document dictionary
+        """
+        if self.parse_pool.workers > 1:
+            try:
+                page_count = await asyncio.to_thread(pdf_pages.page_count, path)
+            except ImportError:
+                page_count = 0
+            if page_count >= self.pdf_parallel_min_pages:
+                pages = await self.extract_pdf_pages(path, 0, page_count)
+                return self._pdf_document(path, ext, pages, page_count)
+        return await self.parse_pool.run("pdf", path, ext)
+
+    async def extract_pdf_pages(self, path: Path, first: int, last: int) -> List[Tuple[int, str]]:
+        """Extract pages [first, last) of a PDF, split across the parse pool
+
+        The range is cut into slices of at most pdf_pages_per_task pages that
+        the pool workers extract concurrently, each from its own mapping of the
+        file; results are reassembled in page order.
+
+        Args:
+            path: Path to the PDF
+            first: Index of the first page (0-based)
+            last: Index after the last page
+
+        Returns:
+            (page number, text) pairs in page order; page numbers are 1-based
+        """
+        workers = max(self.parse_pool.workers, 1)
+        size = max(1, min(self.pdf_pages_per_task, -(-(last - first) // workers)))
+        slices = await asyncio.gather(*(
+            self.parse_pool.run("pdf_pages", path, path.suffix.lower(), start, min(start + size, last))
+            for start in range(first, last, size)
+        ))
+        return [page for pages in slices for page in pages]
+
+    def pdf_page_count(self, path: Path) -> int:
+        """Count the pages of a PDF without extracting text
+
+        Args:
+            path: Path to the PDF
+
+        Returns:
+            Number of pages
+        """
+        return pdf_pages.page_count(path)
+
+    async def iter_pdf_windows(self, path: Path, window_pages: int) -> AsyncIterator[Dict[str, Any]]:
+        """Extract a PDF incrementally, a window of pages at a time
+
+        Windows concatenate to exactly the content _parse_pdf returns for the
+        whole file, so offsets stay comparable between both paths. Only one
+        window of text is held at a time; the pages of a window are extracted
+        in parallel when the parse pool has workers.
+
+        Args:
+            path: Path to the PDF
+            window_pages: Number of pages per window
+
+        Yields:
+            Dicts with the window content, its character offset in the whole
+            document, and (page number, start, end) spans of its non-empty pages
+        """
+        page_count = await asyncio.to_thread(pdf_pages.page_count, path)
+        offset = 0
+        for first in range(0, page_count, window_pages):
+            pages = await self.extract_pdf_pages(path, first, min(first + window_pages, page_count))
+            window = self._pdf_document(path, path.suffix.lower(), pages, page_count)
+            if not window["pages"]:
+                continue
+            if offset:
+                # Separator between this window and the previous one
+                offset += len(SegmentBuilder.SEPARATOR)
+            yield {
+                "content": window["content"],
+                "offset": offset,
+                "pages": window["pages"],
+                "page_count": page_count,
+            }
+            offset += len(window["content"])
+
+    def _parse_powerpoint(self, path: Path, ext: str) -> Dict[str, Any]:
+        """Load PowerPoint presentations (one segment per slide)
 
         Args:
             path: Path to the PowerPoint file
@@ -364,11 +644,18 @@ class DocumentLoader:
         Returns:
             Document dictionary
         """
+        if self.ooxml_fast_path and ext == ".pptx":
+            try:
+                return self._parse_powerpoint_ooxml(path, ext)
+            except Exception as e:
+                logger.info(f"Streaming extraction failed for {path.name}, using python-pptx: {e}")
+
         try:
             from pptx import Presentation
 
             prs = Presentation(path)
-            slides_data = []
+            # One segment per slide
+            builder = SegmentBuilder()
 
             for slide_idx, slide in enumerate(prs.slides):
                 slide_text = []
@@ -377,13 +664,15 @@ class DocumentLoader:
                         slide_text.append(shape.text.strip())
 
                 if slide_text:
-                    slides_data.append(f"=== Slide {slide_idx + 1} ===\n" + "\n".join(slide_text))
-
-            content = "\n\n".join(slides_data)
+                    builder.add(
+                        f"=== Slide {slide_idx + 1} ===\n" + "\n".join(slide_text),
+                        {"slide": slide_idx + 1},
+                    )
 
             return {
                 "type": "powerpoint",
-                "content": content,
+                "content": builder.content(),
+                "segments": builder.segments,
                 "metadata": {
                     "format": ext,
                     "file_name": path.name,
@@ -407,7 +696,7 @@ class DocumentLoader:
             logger.error(f"Error loading PowerPoint file: {e}")
             raise
 
-    async def _load_html(self, path: Path, ext: str) -> Dict[str, Any]:
+    def _parse_html(self, path: Path, ext: str) -> Dict[str, Any]:
         """Load HTML files
 
         Args:
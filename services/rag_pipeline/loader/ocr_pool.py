@@ -0,0 +1,301 @@
+"""OCR Pool - Warm PaddleOCR workers for image ingestion"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Set, Tuple
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+NOT_INSTALLED = "paddleocr not installed"
+
+# Per-process OCR engine, created once by the pool initializer
+_worker_engine = None
+_worker_error: Optional[str] = None
+
+
+def _create_engine(settings: Dict[str, Any]) -> Tuple[Any, Optional[str]]:
+    """Load the PaddleOCR models
+
+    Returns:
+        (engine, None) on success, (None, reason) if OCR is unavailable
+    """
+    try:
+        from paddleocr import PaddleOCR
+    except ImportError:
+        logger.warning("paddleocr not installed. Run: pip install paddleocr")
+        return None, NOT_INSTALLED
+
+    try:
+        engine = PaddleOCR(
+            use_angle_cls=settings["use_angle_cls"],
+            lang=settings["lang"],  # ch: Chinese + English
+            show_log=False,
+        )
+        return engine, None
+    except Exception as e:
+        logger.error(f"Failed to load OCR models: {e}")
+        return None, f"OCR unavailable: {e}"
+
+
+def _prepare(path: str, settings: Dict[str, Any]) -> Tuple[Any, Optional[str], bool]:
+    """Load an image for OCR, filtering out images that cannot contain text
+
+    Returns:
+        (image array or path, skip reason or None, whether it was downscaled)
+    """
+    try:
+        import numpy as np
+        from PIL import Image, ImageStat
+    except ImportError:
+        # Without Pillow the engine reads the file itself, unfiltered
+        return path, None, False
+
+    with Image.open(path) as img:
+        img = img.convert("RGB")
+
+    width, height = img.size
+    if min(width, height) < settings["min_side"]:
+        return None, "too_small", False
+
+    # A near-uniform image (blank page, solid fill) has no text to find
+    if ImageStat.Stat(img.convert("L")).stddev[0] < settings["blank_stddev"]:
+        return None, "blank", False
+
+    scaled = False
+    if max(width, height) > settings["max_side"]:
+        img.thumbnail((settings["max_side"], settings["max_side"]))
+        scaled = True
+
+    # PaddleOCR expects BGR arrays
+    return np.asarray(img)[:, :, ::-1], None, scaled
+
+
+def _recognize(engine, error: Optional[str], paths: List[str], settings: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """OCR a batch of images with a loaded engine
+
+    Returns:
+        One result per path with the text lines, or the reason it was skipped
+    """
+    if engine is None:
+        return [{"lines": [], "note": error} for _ in paths]
+
+    results = []
+    for path in paths:
+        try:
+            image, skipped, scaled = _prepare(path, settings)
+            if skipped:
+                results.append({"lines": [], "skipped": skipped})
+                continue
+
+            result = engine.ocr(image, cls=settings["use_angle_cls"])
+            lines = []
+            if result and result[0]:
+                for line in result[0]:
+                    if line and len(line) >= 2:
+                        lines.append(line[1][0])
+            results.append({"lines": lines, "downscaled": scaled})
+        except Exception as e:
+            logger.error(f"Error processing image with OCR: {e}")
+            results.append({"lines": [], "error": str(e)})
+    return results
+
+
+def _init_worker(settings: Dict[str, Any]) -> None:
+    global _worker_engine, _worker_error
+    _worker_engine, _worker_error = _create_engine(settings)
+
+
+def _ping() -> bool:
+    return _worker_engine is not None
+
+
+def _ocr_batch(paths: List[str], settings: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return _recognize(_worker_engine, _worker_error, paths, settings)
+
+
+class OCRPool:
+    """Long-lived OCR service for the document loader
+
+    Building a PaddleOCR instance loads the detection, classification and
+    recognition models, which takes seconds, so engines are created once and
+    reused: with workers > 0 each worker process loads one at startup, with
+    workers = 0 a single in-process engine is used from a thread.
+
+    Images are queued and sent to the engines in batches of up to batch_size
+    (waiting at most batch_wait_ms to fill a batch). Before inference, images
+    that are too small or near-uniform are skipped, and images larger than
+    max_side are downscaled, which bounds detection time.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, use_processes: bool = True):
+        """Initialize OCR pool
+
+        Args:
+            config: Configuration dictionary
+            use_processes: Allow worker processes (disabled for loaders that
+                already run inside a worker)
+        """
+        self.config = config or {}
+        ocr_config = self.config.get("loader", {}).get("ocr", {})
+
+        self.workers = ocr_config.get("workers", 0) if use_processes else 0
+        self.batch_size = ocr_config.get("batch_size", 8)
+        self.batch_wait = ocr_config.get("batch_wait_ms", 20) / 1000
+        self.timeout = ocr_config.get("timeout", 300)
+        self.settings = {
+            "lang": ocr_config.get("lang", "ch"),
+            "use_angle_cls": ocr_config.get("use_angle_cls", True),
+            "min_side": ocr_config.get("min_side", 16),
+            "max_side": ocr_config.get("max_side", 2048),
+            "blank_stddev": ocr_config.get("blank_stddev", 6.0),
+        }
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._engine = None
+        self._engine_error: Optional[str] = None
+        self._engine_loaded = False
+        self._engine_lock = threading.Lock()
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.images = 0
+        self.batches = 0
+        self.skipped = 0
+        self.downscaled = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.settings,),
+            )
+            logger.info(f"Started OCR pool with {self.workers} workers")
+        return self._executor
+
+    def _reset_executor(self, broken: Optional[ProcessPoolExecutor] = None) -> None:
+        """Stop the pool workers; the next batch starts a fresh pool
+
+        Args:
+            broken: Only reset if this is still the current executor (a batch
+                failing on a pool that was already replaced leaves it alone)
+        """
+        if self._executor is None or (broken is not None and self._executor is not broken):
+            return
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    def _local_batch(self, paths: List[str]) -> List[Dict[str, Any]]:
+        with self._engine_lock:
+            if not self._engine_loaded:
+                self._engine, self._engine_error = _create_engine(self.settings)
+                self._engine_loaded = True
+            return _recognize(self._engine, self._engine_error, paths, self.settings)
+
+    def start(self) -> None:
+        """Spawn the workers and load their models ahead of first use"""
+        if self.workers > 0:
+            executor = self._get_executor()
+            for _ in range(self.workers):
+                executor.submit(_ping)
+
+    async def recognize(self, path: Path) -> Dict[str, Any]:
+        """OCR one image (batched with concurrent requests)
+
+        Args:
+            path: Path to the image
+
+        Returns:
+            Dict with the recognized text lines; "skipped" names the reason an
+            image was filtered out, "note"/"error" explain a failed OCR
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._batcher = loop.create_task(self._run_batcher())
+
+        future = loop.create_future()
+        await self._queue.put((str(path), future))
+        return await asyncio.wait_for(future, self.timeout or None)
+
+    async def _run_batcher(self) -> None:
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            # Batches run concurrently, one per free worker
+            task = loop.create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        paths = [path for path, _future in batch]
+        executor = None
+        try:
+            if self.workers > 0:
+                loop = asyncio.get_running_loop()
+                executor = self._get_executor()
+                results = await loop.run_in_executor(executor, _ocr_batch, paths, self.settings)
+            else:
+                results = await asyncio.to_thread(self._local_batch, paths)
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                # A worker died (e.g. out of memory): fail this batch and start
+                # a fresh pool for the next one, the batcher keeps running
+                logger.error("OCR pool broke, restarting")
+                self._reset_executor(broken=executor)
+            for _path, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.images += len(results)
+        self.skipped += sum(1 for r in results if r.get("skipped"))
+        self.downscaled += sum(1 for r in results if r.get("downscaled"))
+        for (_path, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def shutdown(self) -> None:
+        """Stop the batcher, wait for the running batches and stop the pool workers"""
+        if self._batcher is not None:
+            self._batcher.cancel()
+            self._batcher = None
+            self._loop = None
+        loop = asyncio.get_running_loop()
+        running = [task for task in self._batch_tasks if task.get_loop() is loop]
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        self._reset_executor()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics
+
+        Returns:
+            Dictionary with images processed, batches, skips and downscales
+        """
+        return {
+            "workers": self.workers,
+            "images": self.images,
+            "batches": self.batches,
+            "skipped": self.skipped,
+            "downscaled": self.downscaled,
+        }
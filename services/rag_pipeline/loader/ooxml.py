@@ -0,0 +1,273 @@
+"""OOXML - Streaming text extraction from docx, pptx and xlsx packages
+
+Reads the XML parts straight from the zip package with iterparse, clearing
+elements as soon as they are consumed, so memory stays proportional to one
+paragraph, shape or row rather than to the whole document object model that
+python-docx, python-pptx and openpyxl build.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import posixpath
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+S = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# Built-in number formats that display dates or times
+_DATE_FORMAT_IDS = set(range(14, 23)) | {45, 46, 47}
+_DATE_CODE = re.compile(r"[dmyhs]", re.IGNORECASE)
+_EXCEL_EPOCH = datetime(1899, 12, 30)
+
+
+def _relationships(package: zipfile.ZipFile, part: str) -> Dict[str, str]:
+    """Map relationship IDs of a part to the package paths they target"""
+    directory, name = posixpath.split(part)
+    rels_part = posixpath.join(directory, "_rels", f"{name}.rels")
+    root = ET.fromstring(package.read(rels_part))
+    targets = {}
+    for rel in root.iter(f"{REL}Relationship"):
+        target = rel.get("Target", "")
+        # Targets are relative to the part's directory, or absolute within the package
+        targets[rel.get("Id")] = (
+            target.lstrip("/") if target.startswith("/")
+            else posixpath.normpath(posixpath.join(directory, target))
+        )
+    return targets
+
+
+# === docx ===
+
+
+def docx_paragraphs(path) -> Iterator[str]:
+    """Yield the text of the body paragraphs of a Word document
+
+    Like python-docx's Document.paragraphs, paragraphs in tables and text
+    boxes are not included.
+
+    Args:
+        path: Path to the .docx file
+
+    Yields:
+        Paragraph text (may be empty)
+    """
+    skip = (f"{W}tbl", f"{W}txbxContent")
+    with zipfile.ZipFile(path) as package, package.open("word/document.xml") as part:
+        nested = 0
+        parts: List[str] = []
+        for event, elem in ET.iterparse(part, events=("start", "end")):
+            tag = elem.tag
+            if tag in skip:
+                nested += 1 if event == "start" else -1
+                if event == "end":
+                    elem.clear()
+                continue
+            if event == "start" or nested:
+                continue
+
+            if tag == f"{W}t":
+                parts.append(elem.text or "")
+            elif tag == f"{W}tab":
+                parts.append("\t")
+            elif tag in (f"{W}br", f"{W}cr"):
+                parts.append("\n")
+            elif tag == f"{W}p":
+                yield "".join(parts)
+                parts = []
+                elem.clear()
+
+
+# === pptx ===
+
+
+def _slide_parts(package: zipfile.ZipFile) -> List[str]:
+    """Slide part paths in presentation order"""
+    rels = _relationships(package, "ppt/presentation.xml")
+    root = ET.fromstring(package.read("ppt/presentation.xml"))
+    return [rels[sld.get(f"{R}id")] for sld in root.iter(f"{P}sldId")]
+
+
+def pptx_slides(path) -> Iterator[Tuple[int, List[str]]]:
+    """Yield the text of every text body (shape, table cell) of each slide
+
+    Args:
+        path: Path to the .pptx file
+
+    Yields:
+        (slide number, texts of the non-empty text bodies in document order)
+    """
+    bodies = (f"{P}txBody", f"{A}txBody")
+    with zipfile.ZipFile(path) as package:
+        for number, slide_part in enumerate(_slide_parts(package), start=1):
+            texts: List[str] = []
+            paragraphs: List[str] = []
+            parts: List[str] = []
+            with package.open(slide_part) as part:
+                for _event, elem in ET.iterparse(part):
+                    tag = elem.tag
+                    if tag == f"{A}t":
+                        parts.append(elem.text or "")
+                    elif tag == f"{A}br":
+                        parts.append("\n")
+                    elif tag == f"{A}p":
+                        paragraphs.append("".join(parts))
+                        parts = []
+                    elif tag in bodies:
+                        text = "\n".join(paragraphs).strip()
+                        if text:
+                            texts.append(text)
+                        paragraphs = []
+                        elem.clear()
+            yield number, texts
+
+
+# === xlsx ===
+
+
+def _shared_strings(package: zipfile.ZipFile) -> List[str]:
+    if "xl/sharedStrings.xml" not in package.namelist():
+        return []
+    strings: List[str] = []
+    parts: List[str] = []
+    phonetic = 0
+    with package.open("xl/sharedStrings.xml") as part:
+        for event, elem in ET.iterparse(part, events=("start", "end")):
+            tag = elem.tag
+            if tag == f"{S}rPh":
+                # Phonetic guides are not part of the cell value
+                phonetic += 1 if event == "start" else -1
+            elif event == "end" and tag == f"{S}t" and not phonetic:
+                parts.append(elem.text or "")
+            elif event == "end" and tag == f"{S}si":
+                strings.append("".join(parts))
+                parts = []
+                elem.clear()
+    return strings
+
+
+def _date_styles(package: zipfile.ZipFile) -> List[bool]:
+    """For each cell style index, whether it formats numbers as dates"""
+    if "xl/styles.xml" not in package.namelist():
+        return []
+    root = ET.fromstring(package.read("xl/styles.xml"))
+    custom = {
+        int(fmt.get("numFmtId")): fmt.get("formatCode", "")
+        for fmt in root.iter(f"{S}numFmt")
+    }
+    cell_xfs = root.find(f"{S}cellXfs")
+    if cell_xfs is None:
+        return []
+
+    def is_date(fmt_id: int) -> bool:
+        if fmt_id in custom:
+            # Drop quoted literals and [color]/[locale] sections before looking for date codes
+            code = re.sub(r'"[^"]*"|\[[^\]]*\]', "", custom[fmt_id])
+            return bool(_DATE_CODE.search(code))
+        return fmt_id in _DATE_FORMAT_IDS
+
+    return [is_date(int(xf.get("numFmtId", 0))) for xf in cell_xfs.iter(f"{S}xf")]
+
+
+def _from_excel(value: float) -> Any:
+    """Convert an Excel serial date the way openpyxl does (millisecond precision)"""
+    day, fraction = divmod(value, 1)
+    diff = timedelta(milliseconds=round(fraction * 86400 * 1000))
+    if 0 < value < 1:
+        return (_EXCEL_EPOCH + diff).time()
+    # Serials before 1900-03-01 account for Excel's non-existent 1900-02-29
+    epoch = _EXCEL_EPOCH + timedelta(days=1) if value < 60 else _EXCEL_EPOCH
+    return epoch + timedelta(days=day) + diff
+
+
+def _column_index(ref: str) -> int:
+    """Zero-based column index of a cell reference such as "AB12\""""
+    index = 0
+    for char in ref:
+        if not char.isalpha():
+            break
+        index = index * 26 + (ord(char.upper()) - 64)
+    return index - 1
+
+
+def _cell_value(cell_type: Optional[str], raw: Optional[str], inline: str, shared: List[str], is_date: bool) -> Any:
+    if cell_type == "inlineStr":
+        return inline
+    if raw is None:
+        return None
+    if cell_type == "s":
+        return shared[int(raw)]
+    if cell_type == "b":
+        return raw == "1"
+    if cell_type in ("str", "e"):
+        return raw
+    if is_date:
+        return _from_excel(float(raw))
+    # Same rule as openpyxl: integers unless written with a decimal point or exponent
+    return float(raw) if "." in raw or "E" in raw.upper() else int(raw)
+
+
+def _iter_rows(
+    package: zipfile.ZipFile, sheet_part: str, shared: List[str], date_styles: List[bool]
+) -> Iterator[Tuple[int, Tuple[Any, ...]]]:
+    with package.open(sheet_part) as part:
+        values: Dict[int, Any] = {}
+        inline: List[str] = []
+        row_number = 0
+        # Rows are padded to the sheet's used range, as openpyxl does
+        min_width = 0
+        for _event, elem in ET.iterparse(part):
+            tag = elem.tag
+            if tag == f"{S}dimension":
+                min_width = _column_index(elem.get("ref", "A1").split(":")[-1]) + 1
+            elif tag == f"{S}t":
+                # Inline string text (<c t="inlineStr"><is><t>)
+                inline.append(elem.text or "")
+            elif tag == f"{S}c":
+                style = int(elem.get("s", 0))
+                is_date = style < len(date_styles) and date_styles[style]
+                v = elem.find(f"{S}v")
+                ref = elem.get("r")
+                column = _column_index(ref) if ref else len(values)
+                values[column] = _cell_value(
+                    elem.get("t"), v.text if v is not None else None, "".join(inline), shared, is_date
+                )
+                inline = []
+                elem.clear()
+            elif tag == f"{S}row":
+                row_number = int(elem.get("r", row_number + 1))
+                width = max(max(values) + 1 if values else 0, min_width)
+                yield row_number, tuple(values.get(i) for i in range(width))
+                values = {}
+                elem.clear()
+
+
+def xlsx_sheets(path) -> Iterator[Tuple[str, Iterator[Tuple[int, Tuple[Any, ...]]]]]:
+    """Yield every worksheet with a lazy iterator over its rows
+
+    Cell values are the cached results (like openpyxl's data_only=True):
+    strings, numbers, booleans, and datetimes for date-formatted numbers.
+
+    Args:
+        path: Path to the .xlsx file
+
+    Yields:
+        (sheet name, iterator of (row number, cell values)); empty rows may be
+        omitted, rows span the sheet's used range
+    """
+    with zipfile.ZipFile(path) as package:
+        shared = _shared_strings(package)
+        date_styles = _date_styles(package)
+        rels = _relationships(package, "xl/workbook.xml")
+        workbook = ET.fromstring(package.read("xl/workbook.xml"))
+        for sheet in workbook.iter(f"{S}sheet"):
+            target = rels.get(sheet.get(f"{R}id"))
+            if target is None or not target.startswith("xl/worksheets/"):
+                # Chart sheets and dialog sheets hold no cells
+                continue
+            yield sheet.get("name"), _iter_rows(package, target, shared, date_styles)
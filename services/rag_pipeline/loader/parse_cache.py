@@ -0,0 +1,161 @@
+"""Parse Cache - Content-addressed on-disk cache of parsed documents"""
+
+from pathlib import Path
+from typing import Dict, Any, Optional
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+
+
+class ParseCache:
+    """Cache of loader output keyed by file content
+
+    Entries are keyed by the sha256 of the file and a fingerprint of the
+    loader version and the settings that shape its output, so re-indexing a
+    file, re-chunking it with new settings, or uploading the same file into
+    another KB reuses the parse (and OCR) result, while a loader upgrade or
+    a settings change misses. Entries are gzip-compressed JSON files; the
+    least recently used ones are removed once max_size_mb is exceeded.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, fingerprint: str = ""):
+        """Initialize parse cache
+
+        Args:
+            config: Configuration dictionary
+            fingerprint: Loader version and output settings, part of every key
+        """
+        self.config = config or {}
+        cache_config = self.config.get("loader", {}).get("cache", {})
+
+        self.enabled = cache_config.get("enabled", False)
+        self.path = Path(cache_config.get("path", "parse_cache"))
+        if not self.path.is_absolute():
+            self.path = PROJECT_ROOT / self.path
+        self.max_size = cache_config.get("max_size_mb", 2048) * 1024 * 1024
+        self.fingerprint = hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:16]
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(path: Path) -> str:
+        """sha256 of a file's content
+
+        Args:
+            path: Path to the file
+
+        Returns:
+            Hex digest
+        """
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(block)
+        return sha.hexdigest()
+
+    def _entry(self, digest: str) -> Path:
+        return self.path / digest[:2] / f"{digest}-{self.fingerprint}.json.gz"
+
+    def get(self, digest: str, path: Path) -> Optional[Dict[str, Any]]:
+        """Look up the parsed document for a file
+
+        Args:
+            digest: sha256 of the file
+            path: Path of the file (its name and size replace the cached ones)
+
+        Returns:
+            Document dictionary, or None on a miss
+        """
+        entry = self._entry(digest)
+        try:
+            with gzip.open(entry, "rt", encoding="utf-8") as f:
+                doc = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logger.warning(f"Dropping unreadable parse cache entry {entry.name}: {e}")
+            entry.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+        # Mark as recently used for eviction
+        os.utime(entry)
+        self.hits += 1
+        doc["metadata"] = {
+            **doc.get("metadata", {}),
+            "file_name": path.name,
+            "file_size": path.stat().st_size,
+        }
+        return doc
+
+    def put(self, digest: str, doc: Dict[str, Any]) -> None:
+        """Store a parsed document
+
+        Results that record a failure (missing parser, OCR error) are not
+        cached, so they are retried on the next load.
+
+        Args:
+            digest: sha256 of the file
+            doc: Document dictionary from the loader
+        """
+        metadata = doc.get("metadata", {})
+        if "error" in metadata or "note" in metadata:
+            return
+
+        entry = self._entry(digest)
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial entry
+            fd, tmp = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as f:
+                    f.write(json.dumps(doc, ensure_ascii=False, default=str).encode("utf-8"))
+                os.replace(tmp, entry)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+            self._evict(keep=entry)
+        except Exception as e:
+            logger.warning(f"Failed to write parse cache entry: {e}")
+
+    def _evict(self, keep: Path) -> None:
+        entries = []
+        total = 0
+        for entry in self.path.glob("*/*.json.gz"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+
+        for _mtime, size, entry in sorted(entries):
+            if total <= self.max_size:
+                break
+            if entry == keep:
+                continue
+            entry.unlink(missing_ok=True)
+            total -= size
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics
+
+        Returns:
+            Dictionary with hits and misses
+        """
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,169 @@
+"""Parse Pool - Run CPU-bound document parsers in worker processes"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Per-process loader, created once by the pool initializer
+_worker_loader = None
+
+
+def _init_worker(config: Dict[str, Any], max_memory_mb: int) -> None:
+    global _worker_loader
+    if max_memory_mb > 0:
+        try:
+            import resource
+
+            limit = max_memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError) as e:
+            logger.warning(f"Cannot limit parse worker memory: {e}")
+
+    from .document_loader import DocumentLoader
+
+    _worker_loader = DocumentLoader(config, use_pool=False)
+
+
+def _parse(kind: str, path: str, ext: str, *args) -> Any:
+    return _worker_loader.parse(kind, Path(path), ext, *args)
+
+
+class ParsePool:
+    """Process pool for the format parsers of DocumentLoader
+
+    pypdf, python-docx, openpyxl, python-pptx and BeautifulSoup hold the GIL
+    while parsing, so concurrent loads on the event loop (or in threads) run
+    one at a time. With workers > 0 every parse runs in a worker process,
+    which gives one core per file up to the pool size.
+
+    Each parse has a timeout; a parse that exceeds it is abandoned and the
+    pool is restarted, since a worker stuck in a parser cannot be interrupted
+    otherwise. Loads that were in flight on the restarted pool are retried
+    once. Workers run under an address space limit, so a parser that blows
+    up on a malformed file fails with MemoryError instead of taking the host
+    down. With workers = 0 parsing runs in a thread (timeouts apply, but the
+    parse itself is not interrupted).
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        loader=None,
+        use_processes: bool = True,
+    ):
+        """Initialize parse pool
+
+        Args:
+            config: Configuration dictionary
+            loader: DocumentLoader whose parsers run in threads when no worker
+                processes are used
+            use_processes: Allow worker processes (disabled for loaders that
+                already run inside a worker)
+        """
+        self.config = config or {}
+        pool_config = self.config.get("loader", {}).get("pool", {})
+
+        self.workers = pool_config.get("workers", 0) if use_processes else 0
+        self.timeout = pool_config.get("timeout", 120)
+        self.max_memory_mb = pool_config.get("max_memory_mb", 0)
+        self.loader = loader
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Bumped on every restart, to tell restarts apart from worker crashes
+        self._generation = 0
+
+        self.timeouts = 0
+        self.restarts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.config, self.max_memory_mb),
+            )
+            logger.info(f"Started parse pool with {self.workers} workers")
+        return self._executor
+
+    def _restart(self) -> None:
+        executor = self._executor
+        self._executor = None
+        self._generation += 1
+        self.restarts += 1
+        if executor is not None:
+            # Running parses cannot be cancelled, so stuck workers are killed;
+            # the executor then fails every other pending parse with BrokenProcessPool
+            for process in list((executor._processes or {}).values()):
+                process.terminate()
+            executor.shutdown(wait=False)
+
+    async def run(self, kind: str, path: Path, ext: str, *args) -> Any:
+        """Parse a file
+
+        Args:
+            kind: Parser name (word, excel, pdf, pdf_pages, powerpoint, html)
+            path: Path to the file
+            ext: File extension
+            *args: Extra parser arguments
+
+        Returns:
+            Document dictionary (page list for pdf_pages)
+
+        Raises:
+            TimeoutError: If parsing takes longer than the configured timeout
+        """
+        timeout = self.timeout or None
+
+        if self.workers <= 0:
+            try:
+                return await asyncio.wait_for(
+                    asyncio.to_thread(self.loader.parse, kind, path, ext, *args), timeout
+                )
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise TimeoutError(f"Parsing {path.name} timed out after {self.timeout}s")
+
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            generation = self._generation
+            future = loop.run_in_executor(self._get_executor(), _parse, kind, str(path), ext, *args)
+            try:
+                return await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                logger.error(f"Parsing {path.name} timed out after {self.timeout}s, restarting parse pool")
+                if self._generation == generation:
+                    self._restart()
+                raise TimeoutError(f"Parsing {path.name} timed out after {self.timeout}s")
+            except BrokenProcessPool:
+                if self._generation != generation and attempt == 0:
+                    # The pool was restarted for another file's timeout
+                    continue
+                logger.error(f"Parse pool broke while parsing {path.name}")
+                if self._generation == generation:
+                    self._restart()
+                raise
+
+    def shutdown(self) -> None:
+        """Stop pool workers"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics
+
+        Returns:
+            Dictionary with pool size, timeouts and restarts
+        """
+        return {
+            "workers": self.workers,
+            "timeout": self.timeout,
+            "timeouts": self.timeouts,
+            "restarts": self.restarts,
+        }
@@ -0,0 +1,63 @@
+"""PDF Pages - Page-range text extraction over memory-mapped PDF files"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+import mmap
+
+
+@contextmanager
+def _open(path: Path) -> Iterator[object]:
+    """Open a reader for path over a memory mapping of the file
+
+    Pages share the mapping with the OS page cache, so workers extracting
+    different ranges of one file do not each hold a copy of it. The mapping
+    and file are released when the block exits, so nothing stays open in
+    the calling process between extractions.
+    """
+    import pypdf
+
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            raise ValueError(f"Empty PDF file: {path}")
+        try:
+            yield pypdf.PdfReader(mapped)
+        finally:
+            try:
+                mapped.close()
+            except BufferError:
+                # Still referenced by pypdf objects; released with them
+                pass
+
+
+def page_count(path: Path) -> int:
+    """Count the pages of a PDF
+
+    Args:
+        path: Path to the PDF
+
+    Returns:
+        Number of pages
+    """
+    with _open(path) as reader:
+        return len(reader.pages)
+
+
+def extract_pages(path: Path, first: int = 0, last: Optional[int] = None) -> List[Tuple[int, str]]:
+    """Extract the text of a range of pages
+
+    Args:
+        path: Path to the PDF
+        first: Index of the first page (0-based)
+        last: Index after the last page (None for the end of the document)
+
+    Returns:
+        (page number, text) pairs in page order; page numbers are 1-based
+    """
+    with _open(path) as reader:
+        pages = reader.pages
+        last = len(pages) if last is None else min(last, len(pages))
+        return [(i + 1, pages[i].extract_text() or "") for i in range(first, last)]
@@ -1,7 +1,8 @@
 """RAG Pipeline - Main orchestration layer"""
 
 import asyncio
-from typing import List, Dict, Any, Optional
+import inspect
+from typing import List, Dict, Any, AsyncIterator, Callable, Optional, Set, Tuple
 import logging
 from pathlib import Path
 
@@ -11,6 +12,13 @@ from .embedder.embedder import Embedder
 from .retriever.retriever import Retriever
 from .retriever.reranker import Reranker, NoOpReranker
 from .store.vector_store import VectorStore, SearchResult
+from .store.doc_store import DocStore
+from .cache.result_cache import ResultCache
+from .cache.semantic_cache import SemanticCache
+from .ingest.preprocess import PreprocessPool
+from .ingest.dedup import NearDuplicateDetector
+from .ingest.stages import StagedIngestor, IngestJob
+from .ingest.scheduler import FairScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -29,14 +37,36 @@ class RAGPipeline:
         # Initialize components
         self.loader = DocumentLoader(config)
         self.chunker = TextChunker(config)
+        self.preprocessor = PreprocessPool(config, loader=self.loader, chunker=self.chunker)
         self.embedder = Embedder(config)
         self.vector_store = VectorStore(config)
         self.retriever = Retriever(config)
+        self.result_cache = ResultCache(config)
+        self.semantic_cache = SemanticCache(config)
+        self.doc_store = DocStore(config)
+        self.dedup = NearDuplicateDetector(config)
+        # Load, chunk, embed, insert and keyword-index stages run overlapped
+        self.ingestor = StagedIngestor(config, pipeline=self)
+        # Documents in flight are capped globally and per KB, served round-robin across KBs
+        self.scheduler = FairScheduler(config)
+        # KB generations last seen, to notice changes made by ingestion workers
+        self._kb_generations: Dict[str, int] = {}
+        self._background_tasks = set()
+
+        # Small-to-big retrieval: embed child chunks only, return their parents
+        parent_store_config = self.config.get("parent_store", {})
+        self.parent_fanout = parent_store_config.get("fanout", 3)
+
+        # Page-streaming ingestion for large PDFs
+        stream_config = self.config.get("ingestion", {}).get("streaming", {})
+        self.stream_enabled = stream_config.get("enabled", False)
+        self.stream_window_pages = stream_config.get("window_pages", 20)
+        self.stream_min_pages = stream_config.get("min_pages", 50)
 
         # Initialize reranker
         rerank_config = config.get("reranker", {})
         if rerank_config.get("enabled", False):
-            self.reranker = Reranker(config)
+            self.reranker = Reranker(config, vector_store=self.vector_store)
         else:
             self.reranker = NoOpReranker(config)
 
@@ -55,11 +85,86 @@ class RAGPipeline:
         except Exception as e:
             logger.warning(f"Could not initialize collection: {e}")
 
+    def warmup(self, ingestion: bool = True) -> None:
+        """Preload resources that would otherwise slow down the first request
+
+        Args:
+            ingestion: Also start the parse, OCR and preprocess workers (not
+                needed by a process that only serves searches)
+        """
+        self.retriever.warmup()
+        if ingestion:
+            self.preprocessor.start()
+            self.loader.ocr_pool.start()
+
+    async def close(self) -> None:
+        """Release worker pools and connections"""
+        self.ingestor.shutdown()
+        self.retriever.tokenizer_pool.shutdown()
+        self.preprocessor.shutdown()
+        await self.loader.close()
+        self.doc_store.close()
+        await self.reranker.close()
+
+    async def _store_parents(
+        self,
+        chunks: List[Chunk],
+        kb_id: str,
+        doc_id: str,
+    ) -> Tuple[List[Chunk], int]:
+        """Move parent chunks to the doc store, keeping only children for indexing
+
+        Args:
+            chunks: Parent and child chunks of one document
+            kb_id: Knowledge Base ID
+            doc_id: Document ID
+
+        Returns:
+            (chunks to embed and index, number of parents stored)
+        """
+        if not self.doc_store.enabled:
+            return chunks, 0
+
+        parents = [c for c in chunks if (c.metadata or {}).get("chunk_type") == "parent"]
+        if not parents:
+            return chunks, 0
+
+        records = [
+            {
+                "key": self.doc_store.make_key(kb_id, doc_id, p.chunk_id),
+                "kb_id": kb_id,
+                "doc_id": doc_id,
+                "content": p.content,
+                "metadata": p.metadata,
+            }
+            for p in parents
+        ]
+        stored = await self.doc_store.put_many(records)
+
+        children = [c for c in chunks if (c.metadata or {}).get("chunk_type") != "parent"]
+        for child in children:
+            if child.parent_id:
+                child.metadata = child.metadata or {}
+                child.metadata["parent_key"] = self.doc_store.make_key(kb_id, doc_id, child.parent_id)
+        return children, stored
+
+    async def _should_stream(self, file_path: str) -> bool:
+        if not self.stream_enabled or Path(file_path).suffix.lower() not in DocumentLoader.PDF_EXTENSIONS:
+            return False
+        try:
+            page_count = await asyncio.to_thread(self.loader.pdf_page_count, Path(file_path))
+        except Exception:
+            # Unreadable or pypdf missing: the regular path reports the problem
+            return False
+        return page_count >= self.stream_min_pages
+
     async def ingest_document(
         self,
         file_path: str,
         metadata: Optional[Dict[str, Any]] = None,
         kb_id: str = "default",
+        track: Optional[Callable[[IngestJob], None]] = None,
+        incremental: Optional[bool] = None,
     ) -> Dict[str, Any]:
         """Ingest a single document
 
@@ -67,24 +172,26 @@ class RAGPipeline:
             file_path: Path to the document
             metadata: Optional metadata to attach
             kb_id: Knowledge Base ID
+            track: Called with the job before it starts, to follow its progress
+            incremental: Diff against the indexed version of the document
+                (the ingestion config's setting if None)
 
         Returns:
             Dictionary with ingestion results
         """
         try:
-            # Load document
-            doc = await self.loader.load(file_path)
-            logger.info(f"Loaded document: {file_path}")
-
-            # Prepare metadata
-            doc_metadata = {**(metadata or {}), **doc.get("metadata", {})}
-            doc_metadata["kb_id"] = kb_id # Add kb_id to metadata for BM25/Storage
-
-            # Split into chunks
-            chunks = self.chunker.chunk(doc["content"], doc_metadata)
-            logger.info(f"Created {len(chunks)} chunks")
-
-            if not chunks:
+            async with self.scheduler.slot(kb_id):
+                # Large PDFs enter the stages page window by window
+                stream = await self._should_stream(file_path)
+                job = IngestJob(kb_id, metadata, file_path=file_path, stream=stream, incremental=incremental)
+                if track is not None:
+                    track(job)
+                await self.ingestor.run(job)
+            if job.error is not None:
+                raise job.error
+            logger.info(f"Loaded document: {file_path}, created {job.chunks_total} chunks")
+
+            if not job.chunks_total and not stream:
                 return {
                     "status": "success",
                     "file_path": file_path,
@@ -92,23 +199,16 @@ class RAGPipeline:
                     "message": "No chunks created from document",
                 }
 
-            # Embed chunks
-            embedded_chunks = await self.embedder.embed_chunks(chunks)
-            logger.info(f"Generated {len(embedded_chunks)} embeddings")
-
-            # Insert into vector store
-            inserted = self.vector_store.insert(embedded_chunks, self.collection_name, kb_id=kb_id)
-
-            # Index for BM25
-            self.retriever.index_documents(embedded_chunks)
-
-            return {
+            result = {
                 "status": "success",
                 "file_path": file_path,
-                "chunks_created": len(chunks),
-                "chunks_inserted": inserted,
-                "doc_type": doc.get("type"),
+                **job.counts(),
+                "doc_type": job.doc_type,
             }
+            if stream:
+                result["page_count"] = job.page_count
+                result["windows"] = job.windows
+            return result
 
         except Exception as e:
             logger.error(f"Error ingesting document {file_path}: {e}")
@@ -134,11 +234,10 @@ class RAGPipeline:
         Returns:
             List of ingestion results
         """
-        results = []
-
-        for file_path in file_paths:
-            result = await self.ingest_document(file_path, metadata, kb_id=kb_id)
-            results.append(result)
+        # Documents are submitted together; the scheduler caps how many run at once
+        results = list(await asyncio.gather(*(
+            self.ingest_document(file_path, metadata, kb_id=kb_id) for file_path in file_paths
+        )))
 
         # Summary
         successful = sum(1 for r in results if r.get("status") == "success")
@@ -151,12 +250,44 @@ class RAGPipeline:
 
         return results
 
+    async def iter_ingest_documents(
+        self,
+        file_paths: List[str],
+        metadata: Optional[Dict[str, Any]] = None,
+        kb_id: str = "default",
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Ingest multiple documents, yielding each result as soon as it finishes
+
+        Args:
+            file_paths: List of file paths
+            metadata: Optional metadata to attach to all documents
+            kb_id: Knowledge Base ID
+
+        Yields:
+            Ingestion results in completion order
+        """
+        tasks = [
+            asyncio.ensure_future(self.ingest_document(file_path, metadata, kb_id=kb_id))
+            for file_path in file_paths
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # The consumer stopped early: documents still waiting for a slot are
+            # dropped, admitted ones finish in the stages
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
     async def ingest_text(
         self,
         text: str,
         doc_id: str,
         metadata: Optional[Dict[str, Any]] = None,
         kb_id: str = "default",
+        track: Optional[Callable[[IngestJob], None]] = None,
+        incremental: Optional[bool] = None,
     ) -> Dict[str, Any]:
         """Ingest raw text
 
@@ -165,40 +296,33 @@ class RAGPipeline:
             doc_id: Document ID
             metadata: Optional metadata
             kb_id: Knowledge Base ID
+            track: Called with the job before it starts, to follow its progress
+            incremental: Diff against the indexed version of the document
+                (the ingestion config's setting if None)
 
         Returns:
             Ingestion result
         """
         try:
-            # Prepare metadata
-            doc_metadata = metadata or {}
-            doc_metadata["kb_id"] = kb_id
-
-            # Split into chunks
-            chunks = self.chunker.chunk(text, doc_metadata)
-            logger.info(f"Created {len(chunks)} chunks from text")
-
-            if not chunks:
+            job = IngestJob(kb_id, metadata, text=text, doc_id=doc_id, incremental=incremental)
+            if track is not None:
+                track(job)
+            await self.ingestor.run(job)
+            if job.error is not None:
+                raise job.error
+            logger.info(f"Created {job.chunks_total} chunks from text")
+
+            if not job.chunks_total:
                 return {
                     "status": "success",
                     "doc_id": doc_id,
                     "chunks_created": 0,
                 }
 
-            # Embed chunks
-            embedded_chunks = await self.embedder.embed_chunks(chunks)
-
-            # Insert into vector store
-            inserted = self.vector_store.insert(embedded_chunks, self.collection_name, kb_id=kb_id)
-
-            # Index for BM25
-            self.retriever.index_documents(embedded_chunks)
-
             return {
                 "status": "success",
                 "doc_id": doc_id,
-                "chunks_created": len(chunks),
-                "chunks_inserted": inserted,
+                **job.counts(),
             }
 
         except Exception as e:
@@ -227,23 +351,185 @@ class RAGPipeline:
         Returns:
             List of search results
         """
+        embedding_task = None
         try:
-            # Embed query
-            query_embedding = await self.embedder.embed_query(query)
-
-            # Retrieve using hybrid search (get more for reranking)
-            retrieve_k = top_k * 4 if rerank else top_k
-            results = await self.retriever.retrieve(query, query_embedding, retrieve_k, kb_ids=kb_ids)
-
-            # Apply reranking if requested
-            if rerank:
-                results = await self.reranker.rerank(query, results, top_n=top_k)
-
-            return results[:top_k]
+            cache_key = await self.result_cache.make_key(query, kb_ids, top_k, rerank)
+            cached = await self.result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            # Embed query concurrently with the keyword leg of retrieval
+            embedding_task = asyncio.ensure_future(self.embedder.embed_query(query))
+            query_embedding = embedding_task
+
+            scope = None
+            if self.semantic_cache.enabled:
+                # The semantic lookup needs the embedding before retrieval starts
+                query_embedding = await embedding_task
+                scope = await self.result_cache.scope_key(kb_ids, top_k, rerank)
+                hit = self.semantic_cache.lookup(scope, query_embedding)
+                if hit is not None:
+                    cached, cached_query, _similarity = hit
+                    if self.semantic_cache.should_audit():
+                        self._schedule_semantic_audit(
+                            query, cached_query, cached, query_embedding, top_k, rerank, kb_ids
+                        )
+                    return cached
+
+            results = await self._retrieve(query, query_embedding, top_k, rerank, kb_ids)
+
+            await self.result_cache.set(cache_key, results)
+            if scope is not None:
+                self.semantic_cache.add(scope, query, query_embedding, results)
+            return results
 
         except Exception as e:
             logger.error(f"Error searching: {e}")
             return []
+        finally:
+            if embedding_task is not None and not embedding_task.done():
+                embedding_task.cancel()
+
+    async def _retrieve(
+        self,
+        query: str,
+        query_embedding: Any,
+        top_k: int,
+        rerank: bool,
+        kb_ids: Optional[List[str]],
+    ) -> List[SearchResult]:
+        """Run retrieval and optional reranking, bypassing the caches"""
+        await self._refresh_keyword_shards(kb_ids)
+
+        # Retrieve using hybrid search (get more for reranking)
+        retrieve_k = top_k * 4 if rerank else top_k
+        if self.doc_store.enabled:
+            # Several children usually map to the same parent
+            retrieve_k *= self.parent_fanout
+        results = await self.retriever.retrieve(query, query_embedding, retrieve_k, kb_ids=kb_ids)
+
+        if self.doc_store.enabled:
+            results = await self._expand_parents(results)
+
+        # Apply reranking if requested
+        if rerank:
+            if inspect.isawaitable(query_embedding):
+                query_embedding = await query_embedding
+            results = await self.reranker.rerank(
+                query, results, top_n=top_k, query_embedding=query_embedding, kb_ids=kb_ids
+            )
+
+        return results[:top_k]
+
+    async def _refresh_keyword_shards(self, kb_ids: Optional[List[str]]) -> None:
+        """Bring in-process BM25 shards up to date with changes of other processes
+
+        Ingestion workers write to the vector store and advance KB generations
+        in Redis, recording which document each generation changed. Those
+        documents are reloaded into the resident shards; a shard whose
+        changes cannot all be read (trimmed from Redis) is evicted and
+        hydrated again from the vector store on this search.
+        """
+        if not self.result_cache.redis_enabled or self.retriever.keyword_backend == "native":
+            return
+
+        all_kbs = self.result_cache.ALL_KBS
+        scope = list(kb_ids) if kb_ids else [all_kbs]
+        # An epoch change (deletes whose KBs are unknown) touches every shard
+        generations = await self.result_cache.get_generations(scope + ["__epoch__"])
+        for key, generation in generations.items():
+            seen = self._kb_generations.get(key)
+            self._kb_generations[key] = generation
+            if seen == generation:
+                continue
+            if seen is None:
+                # A shard loaded by a search over all KBs has no generation of
+                # its own yet; it may predate changes, so it is loaded again
+                index = self.retriever.bm25_index
+                if key not in (all_kbs, "__epoch__") and (index.is_hydrated(key) or key in index.summaries):
+                    self.retriever.evict_bm25(key)
+                continue
+
+            changes = None
+            if key != "__epoch__":
+                changes = await self.result_cache.get_changes(key, seen, generation)
+            if changes is None:
+                if key in (all_kbs, "__epoch__"):
+                    # Any KB may have changed or been added
+                    self.retriever.bm25_index.reset_catalog()
+                else:
+                    self.retriever.evict_bm25(key)
+                continue
+
+            changed: Dict[str, Set[Optional[str]]] = {}
+            for change in changes:
+                changed.setdefault(change["kb_id"], set()).add(change["doc_id"])
+            for shard_kb, doc_ids in changed.items():
+                if None in doc_ids:
+                    # The whole KB changed
+                    self.retriever.evict_bm25(shard_kb)
+                else:
+                    await asyncio.to_thread(self.retriever.refresh_documents, shard_kb, sorted(doc_ids))
+
+    async def _expand_parents(self, results: List[SearchResult]) -> List[SearchResult]:
+        """Replace matched child chunks by their deduplicated parent chunks
+
+        A parent scores as its best matching child and keeps the rank of that
+        child. Children whose parent is missing from the doc store are kept.
+
+        Args:
+            results: Child chunk results in rank order
+
+        Returns:
+            Parent results in rank order
+        """
+        keys = [(r.metadata or {}).get("parent_key") for r in results]
+        parents = await self.doc_store.get_many(list({k for k in keys if k}))
+
+        expanded: Dict[str, SearchResult] = {}
+        for result, key in zip(results, keys):
+            parent = parents.get(key) if key else None
+            if parent is None:
+                expanded.setdefault(result.chunk_id, result)
+                continue
+
+            if key in expanded:
+                existing = expanded[key]
+                existing.metadata["matched_children"].append(result.chunk_id)
+                existing.score = max(existing.score, result.score)
+                continue
+
+            expanded[key] = SearchResult(
+                chunk_id=key,
+                content=parent["content"],
+                score=result.score,
+                metadata={**parent.get("metadata", {}), "matched_children": [result.chunk_id]},
+            )
+
+        return list(expanded.values())
+
+    def _schedule_semantic_audit(
+        self,
+        query: str,
+        cached_query: str,
+        cached: List[SearchResult],
+        query_embedding: List[float],
+        top_k: int,
+        rerank: bool,
+        kb_ids: Optional[List[str]],
+    ) -> None:
+        """Verify a semantic cache hit against a fresh search in the background"""
+
+        async def audit():
+            try:
+                fresh = await self._retrieve(query, query_embedding, top_k, rerank, kb_ids)
+                self.semantic_cache.record_audit(query, cached_query, cached, fresh)
+            except Exception as e:
+                logger.warning(f"Semantic cache audit failed: {e}")
+
+        task = asyncio.ensure_future(audit())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
 
     async def ingest_directory(
         self,
@@ -279,7 +565,7 @@ class RAGPipeline:
         file_paths = [str(f) for f in files]
         return await self.ingest_documents(file_paths, metadata, kb_id=kb_id)
 
-    def delete_documents(self, chunk_ids: List[str]) -> int:
+    async def delete_documents(self, chunk_ids: List[str]) -> int:
         """Delete documents by chunk IDs
 
         Args:
@@ -288,7 +574,46 @@ class RAGPipeline:
         Returns:
             Number of chunks deleted
         """
-        return self.vector_store.delete(chunk_ids, self.collection_name)
+        deleted = self.vector_store.delete(chunk_ids, self.collection_name)
+        self.retriever.remove_chunks(chunk_ids)
+        # The affected KBs are unknown here, invalidate every KB in all processes
+        await self.result_cache.invalidate_all()
+        return deleted
+
+    async def delete_document(self, doc_id: str, kb_id: str) -> bool:
+        """Delete all chunks of a document and invalidate its KB
+
+        Args:
+            doc_id: Document ID
+            kb_id: Knowledge Base ID
+
+        Returns:
+            True if successful
+        """
+        deleted = self.vector_store.delete_by_doc_id(doc_id, self.collection_name)
+        self.retriever.remove_document(doc_id, kb_id=kb_id)
+        self.dedup.remove_document(kb_id, doc_id)
+        if self.doc_store.enabled:
+            await self.doc_store.delete_by_doc_id(doc_id)
+        await self.result_cache.bump(kb_id, doc_id=doc_id)
+        return deleted
+
+    async def delete_knowledge_base(self, kb_id: str) -> bool:
+        """Delete all chunks of a knowledge base and invalidate it
+
+        Args:
+            kb_id: Knowledge Base ID
+
+        Returns:
+            True if successful
+        """
+        deleted = self.vector_store.delete_by_kb_id(kb_id, self.collection_name)
+        self.retriever.evict_bm25(kb_id)
+        self.dedup.drop_kb(kb_id)
+        if self.doc_store.enabled:
+            await self.doc_store.delete_by_kb_id(kb_id)
+        await self.result_cache.bump(kb_id)
+        return deleted
 
     def drop_collection(self) -> bool:
         """Drop the entire collection
@@ -309,6 +634,12 @@ class RAGPipeline:
         return {
             "collection_name": self.collection_name,
             "document_count": count,
+            "result_cache": self.result_cache.get_stats(),
+            "semantic_cache": self.semantic_cache.get_stats(),
+            "reranker": self.reranker.get_stats(),
+            "dedup": self.dedup.get_stats(),
+            "ingestion": self.ingestor.get_stats(),
+            "scheduler": self.scheduler.get_stats(),
             "config": {
                 "chunker_strategy": self.chunker.strategy,
                 "embedder_provider": self.embedder.provider,
@@ -1,22 +1,47 @@
 """Reranker - Reorder search results for better relevance"""
 
 import asyncio
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from dataclasses import replace
+from typing import List, Dict, Any, Optional, Tuple
+import hashlib
 import logging
+import zlib
+
+import numpy as np
 
 from ..store.vector_store import SearchResult
+from .tokenizer import tokenize, tokenize_query
 
 logger = logging.getLogger(__name__)
 
 
 class Reranker:
-    """Rerank search results using various methods"""
+    """Rerank search results using various methods
 
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    The "local" provider rescores candidates in-process by exact cosine
+    similarity between the query and the stored chunk vectors, blended with
+    a query-term overlap feature. A remote provider can then be applied as a
+    final stage to the best few local candidates only.
+
+    Remote calls share one pooled HTTP client, reuse cached scores of
+    (query, chunk) pairs seen before, and are bounded by a deadline: when it
+    passes, the incoming (fused) order is returned and the call is left to
+    finish in the background so its scores still reach the cache.
+    """
+
+    QWEN_API_URL = "https://dashscope.aliyuncs.com/api/v1/services/rerank/rerank/v1"
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        vector_store: Optional[Any] = None,
+    ):
         """Initialize reranker
 
         Args:
             config: Configuration dictionary
+            vector_store: Vector store to fetch chunk vectors from (local provider)
         """
         self.config = config or {}
         rerank_config = self.config.get("reranker", self.config)
@@ -26,11 +51,45 @@ class Reranker:
         self.top_n = rerank_config.get("top_n", 5)
         self.api_key = rerank_config.get("api_key", "")
 
+        # Local rerank settings
+        self.vector_store = vector_store
+        self.lexical_weight = rerank_config.get("lexical_weight", 0.2)
+
+        # Optional remote stage after local rerank
+        remote_config = rerank_config.get("remote", {})
+        self.remote_enabled = remote_config.get("enabled", False)
+        self.remote_provider = remote_config.get("provider", "qwen")
+        self.remote_top_k = remote_config.get("top_k", 10)
+
+        # Remote client, score cache and latency budget
+        self.timeout = rerank_config.get("timeout", 30.0)
+        self.max_connections = rerank_config.get("max_connections", 20)
+        deadline_ms = rerank_config.get("deadline_ms", 1500)
+        self.deadline = deadline_ms / 1000.0 if deadline_ms else None
+        self.cache_size = rerank_config.get("cache_size", 4096)
+
+        # Large candidate lists are split into shards scored concurrently
+        self.shard_size = rerank_config.get("shard_size", 16)
+        self.max_concurrency = rerank_config.get("max_concurrency", 4)
+        self.max_doc_tokens = rerank_config.get("max_doc_tokens", 512)
+
+        self._client = None
+        self._token_counter = None
+        self._score_cache: "OrderedDict[Tuple[str, str, int], float]" = OrderedDict()
+        self._background_tasks = set()
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.remote_calls = 0
+        self.deadline_misses = 0
+
     async def rerank(
         self,
         query: str,
         results: List[SearchResult],
         top_n: Optional[int] = None,
+        query_embedding: Optional[List[float]] = None,
+        kb_ids: Optional[List[str]] = None,
     ) -> List[SearchResult]:
         """Rerank search results
 
@@ -38,6 +97,8 @@ class Reranker:
             query: Original search query
             results: Search results to rerank
             top_n: Number of top results to return
+            query_embedding: Query vector (local provider)
+            kb_ids: Knowledge Base IDs searched (local provider)
 
         Returns:
             Reranked search results
@@ -48,14 +109,234 @@ class Reranker:
         n = top_n or self.top_n
         n = min(n, len(results))
 
-        if self.provider == "qwen":
-            return await self._rerank_qwen(query, results, n)
-        elif self.provider == "openai":
-            return await self._rerank_openai(query, results, n)
+        if self.provider == "local":
+            return await self._rerank_local(query, results, n, query_embedding, kb_ids)
+        return await self._rerank_remote(self.provider, query, results, n)
+
+    async def _rerank_remote(
+        self,
+        provider: str,
+        query: str,
+        results: List[SearchResult],
+        top_n: int,
+    ) -> List[SearchResult]:
+        """Rerank with a remote provider within the latency budget
+
+        Args:
+            provider: Remote provider name
+            query: Search query
+            results: Search results
+            top_n: Number of results to return
+
+        Returns:
+            Reranked results, or the incoming order if the deadline passes
+        """
+        task = asyncio.ensure_future(self._call_remote(provider, query, results, top_n))
+        if self.deadline is None:
+            return await task
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), self.deadline)
+        except asyncio.TimeoutError:
+            self.deadline_misses += 1
+            logger.warning(
+                f"Rerank with {provider} missed the {self.deadline:.2f}s deadline, using fused order"
+            )
+            # Let the call finish so its scores are cached for the next search
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+            return results[:top_n]
+
+    async def _call_remote(
+        self,
+        provider: str,
+        query: str,
+        results: List[SearchResult],
+        top_n: int,
+    ) -> List[SearchResult]:
+        if provider == "qwen":
+            return await self._rerank_qwen(query, results, top_n)
+        elif provider == "openai":
+            return await self._rerank_openai(query, results, top_n)
         else:
             # Fallback to original scores
-            logger.warning(f"Unknown rerank provider {self.provider}, using original scores")
-            return results[:n]
+            logger.warning(f"Unknown rerank provider {provider}, using original scores")
+            return results[:top_n]
+
+    def _get_client(self):
+        """Get or create the pooled HTTP client for remote rerank calls"""
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _truncate(self, text: str) -> str:
+        """Cut a candidate to the per-document token budget"""
+        if not self.max_doc_tokens:
+            return text
+        if self._token_counter is None:
+            try:
+                from apps.shared.token_counter import get_token_counter
+
+                self._token_counter = get_token_counter(self.model)
+            except Exception as e:
+                logger.warning(f"Token counter unavailable, rerank candidates are not truncated: {e}")
+                self._token_counter = False
+        if self._token_counter is False:
+            return text
+        return self._token_counter.truncate_text(text, self.max_doc_tokens)
+
+    @staticmethod
+    def _score_key(query_hash: str, result: SearchResult) -> Tuple[str, str, int]:
+        # Content checksum guards against chunk IDs reused across documents or re-ingests
+        return query_hash, result.chunk_id, zlib.crc32(result.content.encode("utf-8"))
+
+    def _cache_get(self, key: Tuple[str, str, int]) -> Optional[float]:
+        score = self._score_cache.get(key)
+        if score is None:
+            self.cache_misses += 1
+            return None
+        self._score_cache.move_to_end(key)
+        self.cache_hits += 1
+        return score
+
+    def _cache_put(self, key: Tuple[str, str, int], score: float) -> None:
+        self._score_cache[key] = score
+        self._score_cache.move_to_end(key)
+        while len(self._score_cache) > self.cache_size:
+            self._score_cache.popitem(last=False)
+
+    async def _rerank_local(
+        self,
+        query: str,
+        results: List[SearchResult],
+        top_n: int,
+        query_embedding: Optional[List[float]],
+        kb_ids: Optional[List[str]],
+    ) -> List[SearchResult]:
+        """Rerank by vector similarity, then optionally by a remote provider
+
+        Args:
+            query: Search query
+            results: Search results
+            top_n: Number of results to return
+            query_embedding: Query vector
+            kb_ids: Knowledge Base IDs searched
+
+        Returns:
+            Reranked results
+        """
+        try:
+            # Vector fetch is a blocking round-trip to the vector DB
+            reranked = await asyncio.to_thread(
+                self._score_local, query, results, query_embedding, kb_ids
+            )
+        except Exception as e:
+            logger.error(f"Error reranking locally: {e}")
+            reranked = results
+
+        if self.remote_enabled:
+            head = reranked[: max(self.remote_top_k, top_n)]
+            return await self._rerank_remote(self.remote_provider, query, head, top_n)
+
+        return reranked[:top_n]
+
+    @staticmethod
+    def _vector_keys(result: SearchResult) -> List[Tuple[str, str]]:
+        """(doc_id, chunk_id) pairs whose vectors represent a result
+
+        Parents from small-to-big retrieval have no vector of their own and
+        are represented by their matched children.
+        """
+        metadata = result.metadata or {}
+        doc_id = metadata.get("doc_id", "")
+        chunk_ids = metadata.get("matched_children") or [result.chunk_id]
+        return [(doc_id, chunk_id) for chunk_id in chunk_ids]
+
+    def _score_local(
+        self,
+        query: str,
+        results: List[SearchResult],
+        query_embedding: Optional[List[float]],
+        kb_ids: Optional[List[str]],
+    ) -> List[SearchResult]:
+        """Score candidates by cosine similarity and query-term overlap
+
+        Args:
+            query: Search query
+            results: Search results
+            query_embedding: Query vector
+            kb_ids: Knowledge Base IDs searched
+
+        Returns:
+            All results sorted by the blended score
+        """
+        if query_embedding is None or self.vector_store is None:
+            logger.warning("Local rerank needs the query embedding and a vector store, keeping fused order")
+            return results
+
+        keys = [self._vector_keys(r) for r in results]
+        chunk_ids = list(dict.fromkeys(chunk_id for pairs in keys for _doc_id, chunk_id in pairs))
+        rows = self.vector_store.get_vectors(chunk_ids, kb_ids=kb_ids)
+
+        # Chunk IDs are only unique within a document, prefer an exact doc match
+        by_doc = {(row["doc_id"], row["chunk_id"]): row["vector"] for row in rows if row.get("vector") is not None}
+        by_chunk = {chunk_id: vector for (_doc_id, chunk_id), vector in by_doc.items()}
+
+        owners, vectors = [], []
+        for i, pairs in enumerate(keys):
+            for doc_id, chunk_id in pairs:
+                vector = by_doc.get((doc_id, chunk_id))
+                if vector is None:
+                    vector = by_chunk.get(chunk_id)
+                if vector is not None:
+                    owners.append(i)
+                    vectors.append(vector)
+
+        if not vectors:
+            logger.warning("No stored vectors found for rerank candidates, keeping fused order")
+            return results
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        query_vector /= max(float(np.linalg.norm(query_vector)), 1e-12)
+
+        # A result scores as its best vector; results without a vector score 0
+        semantic = np.zeros(len(results), dtype=np.float32)
+        np.maximum.at(semantic, np.asarray(owners), matrix @ query_vector)
+
+        scores = semantic
+        query_terms = set(tokenize_query(query))
+        if self.lexical_weight > 0 and query_terms:
+            lexical = np.asarray(
+                [len(query_terms.intersection(tokenize(r.content))) / len(query_terms) for r in results],
+                dtype=np.float32,
+            )
+            scores = (1.0 - self.lexical_weight) * semantic + self.lexical_weight * lexical
+
+        # Near-duplicates keep the downweight they were given at ingest
+        weights = np.asarray(
+            [(r.metadata or {}).get("score_weight", 1.0) for r in results], dtype=np.float32
+        )
+        scores = scores * weights
+
+        order = np.argsort(-scores, kind="stable")
+        # Copies, so the caller's results keep their retrieval scores
+        return [replace(results[int(idx)], score=float(scores[idx])) for idx in order]
 
     async def _rerank_qwen(
         self,
@@ -65,6 +346,12 @@ class Reranker:
     ) -> List[SearchResult]:
         """Rerank using Qwen rerank API
 
+        Only candidates without a cached score for this query are sent, cut
+        to the per-document token budget and split into shards that are
+        scored concurrently. Relevance scores are absolute per (query,
+        document), so shards merge by plain sorting. Candidates of a failed
+        shard keep their fused order after the scored ones.
+
         Args:
             query: Search query
             results: Search results
@@ -74,48 +361,46 @@ class Reranker:
             Reranked results
         """
         try:
-            import httpx
-
-            # Prepare documents
-            documents = [r.content for r in results if r.content]
-
-            if not documents:
-                return results[:top_n]
-
-            # Call Qwen rerank API
-            api_url = "https://dashscope.aliyuncs.com/api/v1/services/rerank/rerank/v1"
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
-
-            payload = {
-                "model": self.model,
-                "query": query,
-                "documents": documents,
-                "top_n": top_n,
-            }
-
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(api_url, json=payload, headers=headers)
-                response.raise_for_status()
-                data = response.json()
-
-            # Extract reranked results
-            if "output" in data and "results" in data["output"]:
-                rerank_indices = [r["index"] for r in data["output"]["results"]]
-                rerank_scores = [r.get("relevance_score", 0.0) for r in data["output"]["results"]]
-
-                # Reorder results
-                reranked = []
-                for idx, score in zip(rerank_indices, rerank_scores):
-                    if idx < len(results):
-                        result = results[idx]
-                        # Update score with rerank score
-                        result.score = score
-                        reranked.append(result)
-
-                return reranked
+            query_hash = hashlib.sha1(query.encode("utf-8")).hexdigest()
+            keys = [self._score_key(query_hash, r) for r in results]
+
+            scores: Dict[int, float] = {}
+            pending = []
+            for i, key in enumerate(keys):
+                score = self._cache_get(key)
+                if score is not None:
+                    scores[i] = score
+                elif results[i].content:
+                    pending.append(i)
+
+            if pending:
+                shard_size = self.shard_size or len(pending)
+                shards = [pending[i : i + shard_size] for i in range(0, len(pending), shard_size)]
+                semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+                async def score_shard(shard: List[int]) -> List[Tuple[int, float]]:
+                    async with semaphore:
+                        documents = [self._truncate(results[i].content) for i in shard]
+                        shard_scores = await self._post_qwen(query, documents)
+                        return [(shard[idx], score) for idx, score in shard_scores if idx < len(shard)]
+
+                shard_results = await asyncio.gather(
+                    *(score_shard(shard) for shard in shards), return_exceptions=True
+                )
+                for shard_result in shard_results:
+                    if isinstance(shard_result, BaseException):
+                        logger.error(f"Error reranking shard with Qwen: {shard_result}")
+                        continue
+                    for i, score in shard_result:
+                        scores[i] = score
+                        self._cache_put(keys[i], score)
+
+            if scores:
+                ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+                # Copies, so a call finishing after its deadline cannot touch returned results
+                reranked = [replace(results[i], score=score) for i, score in ranked]
+                reranked.extend(r for i, r in enumerate(results) if i not in scores)
+                return reranked[:top_n]
 
         except ImportError:
             logger.warning("httpx not installed")
@@ -125,6 +410,39 @@ class Reranker:
         # Fallback to original results
         return results[:top_n]
 
+    async def _post_qwen(self, query: str, documents: List[str]) -> List[Tuple[int, float]]:
+        """Score one shard of documents with the Qwen rerank API
+
+        Args:
+            query: Search query
+            documents: Document texts
+
+        Returns:
+            (document index, relevance score) pairs
+        """
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+
+        # Ask for every score so all of them can be cached
+        payload = {
+            "model": self.model,
+            "query": query,
+            "documents": documents,
+            "top_n": len(documents),
+        }
+
+        self.remote_calls += 1
+        response = await self._get_client().post(self.QWEN_API_URL, json=payload, headers=headers)
+        response.raise_for_status()
+        data = response.json()
+
+        if "output" not in data or "results" not in data["output"]:
+            raise ValueError("Unexpected Qwen rerank response")
+
+        return [(item["index"], item.get("relevance_score", 0.0)) for item in data["output"]["results"]]
+
     async def _rerank_openai(
         self,
         query: str,
@@ -146,6 +464,23 @@ class Reranker:
         logger.warning("OpenAI rerank not implemented, using original scores")
         return results[:top_n]
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Get reranker statistics
+
+        Returns:
+            Dictionary with score cache and deadline counters
+        """
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "provider": self.provider,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_rate": self.cache_hits / lookups if lookups else 0.0,
+            "cache_entries": len(self._score_cache),
+            "remote_calls": self.remote_calls,
+            "deadline_misses": self.deadline_misses,
+        }
+
 
 class NoOpReranker:
     """No-op reranker that just returns top N results by score"""
@@ -164,6 +499,8 @@ class NoOpReranker:
         query: str,
         results: List[SearchResult],
         top_n: Optional[int] = None,
+        query_embedding: Optional[List[float]] = None,
+        kb_ids: Optional[List[str]] = None,
     ) -> List[SearchResult]:
         """Return top N results by original score
 
@@ -171,6 +508,8 @@ class NoOpReranker:
             query: Search query (unused)
             results: Search results
             top_n: Number of results to return
+            query_embedding: Query vector (unused)
+            kb_ids: Knowledge Base IDs searched (unused)
 
         Returns:
             Top N results
@@ -178,3 +517,14 @@ class NoOpReranker:
         n = top_n or self.top_n
         n = min(n, len(results))
         return results[:n]
+
+    async def close(self) -> None:
+        """Nothing to release"""
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get reranker statistics
+
+        Returns:
+            Dictionary with the provider name
+        """
+        return {"provider": "none"}
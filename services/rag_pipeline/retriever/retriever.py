@@ -1,11 +1,16 @@
 """Retriever - Hybrid search with vector and BM25"""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, NamedTuple, Optional, Set, Tuple, Union, Awaitable
 import logging
+import asyncio
+import heapq
+import inspect
 import math
-from collections import defaultdict
+import threading
+from collections import OrderedDict, defaultdict
 
 from ..store.vector_store import VectorStore, SearchResult
+from .tokenizer import TokenizerPool, sparse_vector, tokenize, tokenize_query
 
 logger = logging.getLogger(__name__)
 
@@ -23,54 +28,117 @@ class BM25Index:
         self.k1 = k1
         self.b = b
         self.doc_count = 0
+        self.total_length = 0
         self.doc_lengths_by_id = {}
         self.avg_doc_length = 0
         self.doc_freqs = defaultdict(int)  # Document frequency
         self.inverted_index = defaultdict(lambda: defaultdict(int))  # Term -> Doc -> Count
+        self.doc_terms = {}  # Doc -> Term -> Count, used for removal
         self.doc_contents = {}
         self.doc_metadata = {}
 
-    def index_documents(self, documents: List[Dict[str, Any]]) -> None:
-        """Index documents for BM25 search
+    def index_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        token_lists: Optional[List[List[str]]] = None,
+    ) -> None:
+        """Index documents for BM25 search, replacing any existing content
 
         Args:
             documents: List of documents with chunk_id and content
+            token_lists: Pre-tokenized content, aligned with documents
         """
-        self.doc_count = len(documents)
+        self.doc_count = 0
+        self.total_length = 0
         self.doc_lengths_by_id = {}
+        self.doc_terms = {}
         self.doc_contents = {}
         self.doc_metadata = {}
         self.doc_freqs = defaultdict(int)
         self.inverted_index = defaultdict(lambda: defaultdict(int))
-        total_length = 0
 
-        for doc in documents:
+        self.add_documents(documents, token_lists)
+        logger.info(f"Indexed {self.doc_count} documents for BM25")
+
+    def add_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        token_lists: Optional[List[List[str]]] = None,
+    ) -> None:
+        """Add documents to the index incrementally
+
+        Documents whose chunk_id is already indexed are replaced.
+
+        Args:
+            documents: List of documents with chunk_id and content
+            token_lists: Pre-tokenized content, aligned with documents
+        """
+        for idx, doc in enumerate(documents):
             doc_id = doc.get("chunk_id", "")
+            if doc_id in self.doc_lengths_by_id:
+                self.remove_documents([doc_id])
+
             content = doc.get("content", "")
             metadata = doc.get("metadata")
-            terms = self._tokenize(content)
+            terms = token_lists[idx] if token_lists is not None else self._tokenize(content)
+
+            term_counts = defaultdict(int)
+            for term in terms:
+                term_counts[term] += 1
+
+            for term, count in term_counts.items():
+                self.inverted_index[term][doc_id] = count
+                self.doc_freqs[term] += 1
 
-            doc_length = len(terms)
-            self.doc_lengths_by_id[doc_id] = doc_length
-            total_length += doc_length
+            self.doc_terms[doc_id] = dict(term_counts)
+            self.doc_lengths_by_id[doc_id] = len(terms)
+            self.total_length += len(terms)
+            self.doc_count += 1
             self.doc_contents[doc_id] = content
             if metadata is not None:
                 self.doc_metadata[doc_id] = metadata
 
-            # Track unique terms for this doc
-            seen_terms = set()
+        self._update_avg_length()
 
-            for term in terms:
-                self.inverted_index[term][doc_id] += 1
-                if term not in seen_terms:
-                    self.doc_freqs[term] += 1
-                    seen_terms.add(term)
+    def remove_documents(self, doc_ids: List[str]) -> int:
+        """Remove documents from the index
 
-        self.avg_doc_length = total_length / self.doc_count if self.doc_count > 0 else 0
-        logger.info(f"Indexed {self.doc_count} documents for BM25")
+        Args:
+            doc_ids: Chunk IDs to remove
+
+        Returns:
+            Number of documents removed
+        """
+        removed = 0
+        for doc_id in doc_ids:
+            term_counts = self.doc_terms.pop(doc_id, None)
+            if term_counts is None:
+                continue
+
+            for term in term_counts:
+                postings = self.inverted_index.get(term)
+                if postings is not None:
+                    postings.pop(doc_id, None)
+                    if not postings:
+                        del self.inverted_index[term]
+                self.doc_freqs[term] -= 1
+                if self.doc_freqs[term] <= 0:
+                    del self.doc_freqs[term]
+
+            self.total_length -= self.doc_lengths_by_id.pop(doc_id, 0)
+            self.doc_contents.pop(doc_id, None)
+            self.doc_metadata.pop(doc_id, None)
+            self.doc_count -= 1
+            removed += 1
+
+        self._update_avg_length()
+        return removed
+
+    def _update_avg_length(self) -> None:
+        self.avg_doc_length = self.total_length / self.doc_count if self.doc_count > 0 else 0
 
     def _tokenize(self, text: str) -> List[str]:
-        """Tokenization for Chinese and English using jieba
+        """Tokenize text for indexing and querying
 
         Args:
             text: Input text
@@ -78,35 +146,36 @@ class BM25Index:
         Returns:
             List of tokens
         """
-        try:
-            import jieba
-
-            # Use jieba for Chinese word segmentation
-            words = jieba.lcut(text)
-            # Filter out empty strings and single punctuation
-            tokens = [w.lower().strip() for w in words if w.strip() and len(w.strip()) > 1]
-            return tokens
-        except ImportError:
-            logger.warning("jieba not installed, using basic tokenization. Run: pip install jieba")
-            # Fallback to character-level tokenization
-            tokens = []
-            for char in text:
-                if char.strip():
-                    tokens.append(char.lower())
-            return tokens
+        return tokenize(text)
 
-    def search(self, query: str, top_k: int = 10, kb_ids: Optional[List[str]] = None) -> List[SearchResult]:
-        """Search using BM25 scoring
+    def score(
+        self,
+        terms: List[str],
+        doc_count: Optional[int] = None,
+        doc_freqs: Optional[Dict[str, int]] = None,
+        avg_doc_length: Optional[float] = None,
+    ) -> Dict[str, float]:
+        """Score indexed documents against query terms
+
+        Collection statistics default to this index's own, but can be supplied
+        so that several indexes are scored on a common scale.
 
         Args:
-            query: Search query
-            top_k: Number of results
-            kb_ids: List of Knowledge Base IDs to filter by
+            terms: Tokenized query
+            doc_count: Total number of documents in the collection
+            doc_freqs: Document frequency per term in the collection
+            avg_doc_length: Average document length in the collection
 
         Returns:
-            List of search results with BM25 scores
+            Mapping of chunk_id to BM25 score
         """
-        terms = self._tokenize(query)
+        if doc_count is None:
+            doc_count = self.doc_count
+        if doc_freqs is None:
+            doc_freqs = self.doc_freqs
+        if avg_doc_length is None:
+            avg_doc_length = self.avg_doc_length
+
         scores = defaultdict(float)
 
         for term in terms:
@@ -114,41 +183,419 @@ class BM25Index:
                 continue
 
             # IDF calculation
-            idf = math.log(
-                (self.doc_count - self.doc_freqs[term] + 0.5) / (self.doc_freqs[term] + 0.5) + 1
-            )
+            df = doc_freqs.get(term, 0)
+            idf = math.log((doc_count - df + 0.5) / (df + 0.5) + 1)
 
             for doc_id, term_freq in self.inverted_index[term].items():
-                # Filter by kb_ids if provided
-                if kb_ids:
-                    metadata = self.doc_metadata.get(doc_id, {})
-                    doc_kb_id = metadata.get("kb_id")
-                    if doc_kb_id and doc_kb_id not in kb_ids:
-                        continue
-                
                 # Get doc length
-                doc_length = self.doc_lengths_by_id.get(doc_id, self.avg_doc_length)
+                doc_length = self.doc_lengths_by_id.get(doc_id, avg_doc_length)
 
                 # BM25 score
                 numerator = term_freq * (self.k1 + 1)
                 denominator = term_freq + self.k1 * (
-                    1 - self.b + self.b * (doc_length / self.avg_doc_length)
+                    1 - self.b + self.b * (doc_length / avg_doc_length)
                 )
 
                 scores[doc_id] += idf * (numerator / denominator)
 
+        return scores
+
+    def search(self, query: str, top_k: int = 10, kb_ids: Optional[List[str]] = None) -> List[SearchResult]:
+        """Search using BM25 scoring
+
+        Args:
+            query: Search query
+            top_k: Number of results
+            kb_ids: List of Knowledge Base IDs to filter by
+
+        Returns:
+            List of search results with BM25 scores
+        """
+        scores = self.score(tokenize_query(query))
+
+        # Filter by kb_ids if provided
+        if kb_ids:
+            for doc_id in list(scores):
+                doc_kb_id = self.doc_metadata.get(doc_id, {}).get("kb_id")
+                if doc_kb_id and doc_kb_id not in kb_ids:
+                    del scores[doc_id]
+
         # Sort and return top results
         sorted_results = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:top_k]
 
-        return [
-            SearchResult(
-                chunk_id=doc_id,
-                content=self.doc_contents.get(doc_id, ""),
-                score=score,
-                metadata=self.doc_metadata.get(doc_id),
-            )
-            for doc_id, score in sorted_results
-        ]
+        return [self._to_result(doc_id, score) for doc_id, score in sorted_results]
+
+    def _to_result(self, doc_id: str, score: float) -> SearchResult:
+        return SearchResult(
+            chunk_id=doc_id,
+            content=self.doc_contents.get(doc_id, ""),
+            score=score,
+            metadata=self.doc_metadata.get(doc_id),
+        )
+
+
+class _ShardSummary(NamedTuple):
+    """Collection statistics of a shard evicted by the LRU cap"""
+
+    doc_count: int
+    total_length: int
+    doc_freqs: Dict[str, int]
+
+
+class ShardedBM25Index:
+    """BM25 index sharded by knowledge base
+
+    Each kb_id owns an independent BM25Index, so a query scoped to some KBs
+    only touches their postings. Shards are loaded and evicted independently
+    (LRU when max_shards is set). Collection statistics are merged across the
+    shards a query touches, keeping scores comparable between KBs.
+
+    After a full load the index knows every KB of the collection. A shard
+    dropped by the LRU cap keeps a summary of its statistics (document
+    count, length and document frequencies), so a search over all KBs can
+    merge statistics without the postings and reload only the evicted
+    shards that contain a query term.
+    """
+
+    DEFAULT_KB_ID = "default"
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, max_shards: int = 0):
+        """Initialize sharded BM25 index
+
+        Args:
+            k1: Term frequency saturation parameter
+            b: Length normalization parameter
+            max_shards: Maximum number of resident shards (0 = unlimited)
+        """
+        self.k1 = k1
+        self.b = b
+        self.max_shards = max_shards
+        self.shards: "OrderedDict[str, BM25Index]" = OrderedDict()
+        self.hydrated_shards = set()
+        self.summaries: Dict[str, _ShardSummary] = {}
+        # KBs of the collection; complete once catalog_complete is set
+        self.known_kbs: Set[str] = set()
+        self.catalog_complete = False
+        # Guards shard mutation against concurrent searches from worker threads
+        self._lock = threading.RLock()
+
+    @property
+    def doc_count(self) -> int:
+        return sum(shard.doc_count for shard in self.shards.values())
+
+    def _kb_id_of(self, doc: Dict[str, Any]) -> str:
+        metadata = doc.get("metadata") or {}
+        return metadata.get("kb_id") or doc.get("kb_id") or self.DEFAULT_KB_ID
+
+    def _group_by_kb(
+        self,
+        documents: List[Dict[str, Any]],
+        token_lists: Optional[List[List[str]]] = None,
+    ) -> Dict[str, Tuple[List[Dict[str, Any]], Optional[List[List[str]]]]]:
+        groups = defaultdict(lambda: ([], [] if token_lists is not None else None))
+        for idx, doc in enumerate(documents):
+            docs, tokens = groups[self._kb_id_of(doc)]
+            docs.append(doc)
+            if tokens is not None:
+                tokens.append(token_lists[idx])
+        return groups
+
+    def get_shard(self, kb_id: str, create: bool = False) -> Optional[BM25Index]:
+        """Get the shard for a knowledge base, marking it recently used
+
+        Args:
+            kb_id: Knowledge Base ID
+            create: Create an empty shard if missing
+
+        Returns:
+            Shard index, or None if not resident
+        """
+        shard = self.shards.get(kb_id)
+        if shard is None:
+            if not create:
+                return None
+            shard = BM25Index(k1=self.k1, b=self.b)
+            self.shards[kb_id] = shard
+            # A summary no longer describes a KB that is being changed
+            self.summaries.pop(kb_id, None)
+            self.known_kbs.add(kb_id)
+            self._evict_overflow(keep=kb_id)
+        else:
+            self.shards.move_to_end(kb_id)
+        return shard
+
+    def is_hydrated(self, kb_id: str) -> bool:
+        return kb_id in self.hydrated_shards
+
+    def index_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        token_lists: Optional[List[List[str]]] = None,
+    ) -> None:
+        """Rebuild all shards from a complete document set
+
+        Shards beyond max_shards are evicted while loading and keep their
+        summaries; the KB catalog is complete either way.
+
+        Args:
+            documents: List of documents with chunk_id, content and metadata
+            token_lists: Pre-tokenized content, aligned with documents
+        """
+        with self._lock:
+            self.shards = OrderedDict()
+            self.hydrated_shards = set()
+            self.summaries = {}
+            groups = self._group_by_kb(documents, token_lists)
+            for kb_id, (docs, tokens) in groups.items():
+                self.load_shard(kb_id, docs, tokens)
+            self.known_kbs = set(groups)
+            self.catalog_complete = True
+
+    def add_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        token_lists: Optional[List[List[str]]] = None,
+    ) -> None:
+        """Add documents to their KB shards incrementally
+
+        Args:
+            documents: List of documents with chunk_id, content and metadata
+            token_lists: Pre-tokenized content, aligned with documents
+        """
+        with self._lock:
+            for kb_id, (docs, tokens) in self._group_by_kb(documents, token_lists).items():
+                self.get_shard(kb_id, create=True).add_documents(docs, tokens)
+
+    def load_shard(
+        self,
+        kb_id: str,
+        documents: List[Dict[str, Any]],
+        token_lists: Optional[List[List[str]]] = None,
+    ) -> BM25Index:
+        """Replace a KB shard with a complete document set
+
+        Args:
+            kb_id: Knowledge Base ID
+            documents: All documents of the KB
+            token_lists: Pre-tokenized content, aligned with documents
+
+        Returns:
+            The loaded shard
+        """
+        # Build outside the lock so searches on other shards are not blocked
+        shard = BM25Index(k1=self.k1, b=self.b)
+        shard.index_documents(documents, token_lists)
+        with self._lock:
+            self.shards[kb_id] = shard
+            self.shards.move_to_end(kb_id)
+            self.hydrated_shards.add(kb_id)
+            self.summaries.pop(kb_id, None)
+            self.known_kbs.add(kb_id)
+            self._evict_overflow(keep=kb_id)
+        return shard
+
+    def mark_hydrated(self, kb_id: str) -> None:
+        with self._lock:
+            self.get_shard(kb_id, create=True)
+            self.hydrated_shards.add(kb_id)
+
+    def remove_by_doc_id(self, doc_id: str, kb_id: Optional[str] = None) -> int:
+        """Remove all chunks of a document
+
+        Args:
+            doc_id: Document ID (from chunk metadata)
+            kb_id: Knowledge Base ID of the document (all shards if None)
+
+        Returns:
+            Number of chunks removed
+        """
+        with self._lock:
+            if kb_id is not None:
+                shards = [self.shards[kb_id]] if kb_id in self.shards else []
+                self.summaries.pop(kb_id, None)
+            else:
+                shards = list(self.shards.values())
+                self.summaries.clear()
+
+            removed = 0
+            for shard in shards:
+                chunk_ids = [
+                    chunk_id
+                    for chunk_id, metadata in shard.doc_metadata.items()
+                    if metadata.get("doc_id") == doc_id
+                ]
+                removed += shard.remove_documents(chunk_ids)
+            return removed
+
+    def remove_chunks(self, kb_id: Optional[str], chunk_ids: List[str]) -> int:
+        """Remove chunks from a KB shard
+
+        Args:
+            kb_id: Knowledge Base ID (all shards if None)
+            chunk_ids: Chunk IDs to remove
+
+        Returns:
+            Number of chunks removed
+        """
+        with self._lock:
+            if kb_id is not None:
+                shards = [self.shards[kb_id]] if kb_id in self.shards else []
+                self.summaries.pop(kb_id, None)
+            else:
+                shards = list(self.shards.values())
+                self.summaries.clear()
+            return sum(shard.remove_documents(chunk_ids) for shard in shards)
+
+    def evict(self, kb_id: str) -> bool:
+        """Drop a KB shard from memory because its content is out of date
+
+        The KB stays in the catalog and is loaded again when next searched.
+
+        Args:
+            kb_id: Knowledge Base ID
+
+        Returns:
+            True if a shard was evicted
+        """
+        with self._lock:
+            self.hydrated_shards.discard(kb_id)
+            self.summaries.pop(kb_id, None)
+            self.known_kbs.add(kb_id)
+            if self.shards.pop(kb_id, None) is None:
+                return False
+        logger.debug(f"Evicted BM25 shard for kb_id={kb_id}")
+        return True
+
+    def reset_catalog(self) -> None:
+        """Forget all shards and the KB catalog, so the next full search reloads everything"""
+        with self._lock:
+            self.shards = OrderedDict()
+            self.hydrated_shards = set()
+            self.summaries = {}
+            self.known_kbs = set()
+            self.catalog_complete = False
+
+    def _evict_overflow(self, keep: Optional[str] = None) -> None:
+        if not self.max_shards:
+            return
+        while len(self.shards) > self.max_shards:
+            victim = next(iter(self.shards))
+            if victim == keep:
+                self.shards.move_to_end(victim)
+                victim = next(iter(self.shards))
+            shard = self.shards.pop(victim)
+            if victim in self.hydrated_shards:
+                # Postings are dropped; the statistics stay for searches over all KBs
+                self.hydrated_shards.discard(victim)
+                self.summaries[victim] = _ShardSummary(shard.doc_count, shard.total_length, shard.doc_freqs)
+            logger.debug(f"Evicted BM25 shard for kb_id={victim}")
+
+    def unloaded_kbs(self) -> List[str]:
+        """KBs of the catalog with neither a loaded shard nor a summary"""
+        with self._lock:
+            return sorted(self.known_kbs - self.hydrated_shards - set(self.summaries))
+
+    def collection_stats(self, terms: List[str]) -> Optional[Tuple[int, float, Dict[str, int]]]:
+        """Merge collection statistics over every loaded or summarized KB
+
+        Args:
+            terms: Tokenized query
+
+        Returns:
+            (document count, average document length, document frequency per
+            term), or None if the collection is empty
+        """
+        with self._lock:
+            parts = [self.shards[kb_id] for kb_id in self.hydrated_shards] + list(self.summaries.values())
+            doc_count = sum(p.doc_count for p in parts)
+            if not doc_count:
+                return None
+            avg_doc_length = sum(p.total_length for p in parts) / doc_count
+            doc_freqs = {term: sum(p.doc_freqs.get(term, 0) for p in parts) for term in set(terms)}
+        return doc_count, avg_doc_length, doc_freqs
+
+    def matching_kbs(self, terms: List[str]) -> List[str]:
+        """KBs that contain a query term, loaded shards first
+
+        Args:
+            terms: Tokenized query
+
+        Returns:
+            Knowledge Base IDs to score
+        """
+        with self._lock:
+            loaded = [
+                kb_id for kb_id in self.shards
+                if kb_id in self.hydrated_shards and any(t in self.shards[kb_id].doc_freqs for t in terms)
+            ]
+            evicted = [
+                kb_id for kb_id, summary in self.summaries.items()
+                if any(t in summary.doc_freqs for t in terms)
+            ]
+        return loaded + evicted
+
+    def score_shard(
+        self,
+        kb_id: str,
+        terms: List[str],
+        stats: Tuple[int, float, Dict[str, int]],
+        top_k: int,
+    ) -> List[SearchResult]:
+        """Score one loaded shard on the merged collection statistics
+
+        Args:
+            kb_id: Knowledge Base ID
+            terms: Tokenized query
+            stats: Statistics from collection_stats
+            top_k: Number of results
+
+        Returns:
+            Best results of the shard (empty if it is not loaded)
+        """
+        with self._lock:
+            shard = self.get_shard(kb_id) if self.is_hydrated(kb_id) else None
+            if shard is None:
+                return []
+            doc_count, avg_doc_length, doc_freqs = stats
+            scores = shard.score(terms, doc_count, doc_freqs, avg_doc_length)
+            top = heapq.nlargest(top_k, scores.items(), key=lambda x: x[1])
+            return [shard._to_result(doc_id, score) for doc_id, score in top]
+
+    def search(self, query: str, top_k: int = 10, kb_ids: Optional[List[str]] = None) -> List[SearchResult]:
+        """Search the shards of the given KBs (all resident shards if None)
+
+        Args:
+            query: Search query
+            top_k: Number of results
+            kb_ids: List of Knowledge Base IDs to search
+
+        Returns:
+            List of search results with BM25 scores
+        """
+        terms = tokenize_query(query)
+
+        with self._lock:
+            if kb_ids:
+                shards = [s for s in (self.get_shard(kb_id) for kb_id in kb_ids) if s is not None]
+            else:
+                shards = list(self.shards.values())
+
+            shards = [s for s in shards if s.doc_count > 0]
+            if not shards:
+                return []
+
+            # Merge collection statistics across the shards being queried
+            doc_count = sum(s.doc_count for s in shards)
+            avg_doc_length = sum(s.total_length for s in shards) / doc_count
+            doc_freqs = {term: sum(s.doc_freqs.get(term, 0) for s in shards) for term in set(terms)}
+
+            scored = []
+            for shard in shards:
+                scores = shard.score(terms, doc_count, doc_freqs, avg_doc_length)
+                scored.extend((score, doc_id, shard) for doc_id, score in scores.items())
+
+        top = heapq.nlargest(top_k, scored, key=lambda x: x[0])
+        return [shard._to_result(doc_id, score) for score, doc_id, shard in top]
 
 
 class Retriever:
@@ -169,10 +616,21 @@ class Retriever:
         self.bm25_top_k = retrieval_config.get("bm25_top_k", 50)
         self.fusion_method = retrieval_config.get("fusion_method", "rrf")
         self.rrf_k = retrieval_config.get("rrf_k", 60)
+        self.bm25_max_shards = retrieval_config.get("bm25_max_shards", 0)
+        # "memory": in-process BM25 shards; "native": sparse/full-text search inside the vector DB
+        self.keyword_backend = retrieval_config.get("keyword_backend", "memory")
 
         # Initialize components
         self.vector_store = VectorStore(config)
-        self.bm25_index = BM25Index()
+        self.bm25_index = ShardedBM25Index(max_shards=self.bm25_max_shards)
+        self.tokenizer_pool = TokenizerPool(config)
+
+    def warmup(self) -> None:
+        """Preload the tokenizer dictionary and start tokenizer workers"""
+        self.tokenizer_pool.start()
+
+    def _tokenize_chunks(self, chunks: List[Dict[str, Any]]) -> List[List[str]]:
+        return self.tokenizer_pool.tokenize_many([c.get("content", "") for c in chunks])
 
     def index_documents(self, chunks: List[Dict[str, Any]]) -> None:
         """Index documents for hybrid search
@@ -181,25 +639,143 @@ class Retriever:
             chunks: List of chunks with embeddings and content
         """
         # Note: Vector store insertion is handled by the pipeline
-        
-        # Index for BM25
-        self.bm25_index.index_documents(chunks)
+        if self.keyword_backend == "native":
+            # Keyword index lives in the vector DB, written together with the vectors
+            return
 
-    def hydrate_bm25(self, limit: Optional[int] = None) -> int:
-        if self.bm25_index.doc_count > 0:
+        # Index for BM25 (only the shards of the affected KBs are touched)
+        self.bm25_index.add_documents(chunks, self._tokenize_chunks(chunks))
+
+    def attach_sparse_vectors(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Add sparse term vectors to chunks before vector store insertion
+
+        Only needed for the native keyword backend.
+
+        Args:
+            chunks: Embedded chunk dicts
+
+        Returns:
+            The same chunks, each with a sparse_vector entry
+        """
+        if self.keyword_backend != "native":
+            return chunks
+
+        for chunk, tokens in zip(chunks, self._tokenize_chunks(chunks)):
+            chunk["sparse_vector"] = sparse_vector(tokens)
+        return chunks
+
+    def hydrate_bm25(self, kb_ids: Optional[List[str]] = None, limit: Optional[int] = None) -> int:
+        """Load BM25 shards from the vector store
+
+        Args:
+            kb_ids: Knowledge Base IDs whose shards to load (all KBs if None)
+            limit: Maximum number of chunks to fetch per load
+
+        Returns:
+            Number of documents resident in the BM25 index
+        """
+        if self.keyword_backend == "native":
+            return 0
+
+        if kb_ids:
+            for kb_id in kb_ids:
+                if self.bm25_index.is_hydrated(kb_id):
+                    continue
+                chunks = self.vector_store.fetch_all_chunks(limit=limit, kb_id=kb_id)
+                if chunks is None:
+                    # Store could not be scanned: keep what was indexed in-process
+                    # and try again on the next search
+                    logger.warning(f"Could not load the BM25 shard of kb_id={kb_id}")
+                elif chunks:
+                    self.bm25_index.load_shard(kb_id, chunks, self._tokenize_chunks(chunks))
+                else:
+                    self.bm25_index.mark_hydrated(kb_id)
+            return self.bm25_index.doc_count
+
+        if self.bm25_index.catalog_complete:
             return self.bm25_index.doc_count
 
         chunks = self.vector_store.fetch_all_chunks(limit=limit)
-        if not chunks:
+        if chunks is None:
+            logger.warning("Could not load the BM25 index from the vector store")
+        else:
+            self.bm25_index.index_documents(chunks, self._tokenize_chunks(chunks))
+        return self.bm25_index.doc_count
+
+    def refresh_documents(self, kb_id: str, doc_ids: List[str]) -> bool:
+        """Reload changed documents of a hydrated BM25 shard from the vector store
+
+        Each document's chunks are replaced by what is stored now, so added,
+        re-indexed and deleted documents are all handled alike. Shards that
+        are not hydrated load the current state when next searched; an
+        evicted shard's summary is dropped and a new KB joins the catalog.
+
+        Args:
+            kb_id: Knowledge Base ID
+            doc_ids: IDs of the documents that changed
+
+        Returns:
+            False if the store could not be read (the shard is evicted)
+        """
+        if self.keyword_backend == "native":
+            return True
+        if not self.bm25_index.is_hydrated(kb_id):
+            self.bm25_index.evict(kb_id)
+            return True
+
+        for doc_id in doc_ids:
+            chunks = self.vector_store.fetch_all_chunks(kb_id=kb_id, doc_id=doc_id)
+            if chunks is None:
+                self.bm25_index.evict(kb_id)
+                return False
+            self.bm25_index.remove_by_doc_id(doc_id, kb_id=kb_id)
+            if chunks:
+                self.bm25_index.add_documents(chunks, self._tokenize_chunks(chunks))
+        return True
+
+    def remove_document(self, doc_id: str, kb_id: Optional[str] = None) -> int:
+        """Remove a deleted document from the keyword index
+
+        Args:
+            doc_id: Document ID
+            kb_id: Knowledge Base ID of the document
+
+        Returns:
+            Number of chunks removed
+        """
+        if self.keyword_backend == "native":
             return 0
+        return self.bm25_index.remove_by_doc_id(doc_id, kb_id=kb_id)
 
-        self.bm25_index.index_documents(chunks)
-        return self.bm25_index.doc_count
+    def remove_chunks(self, chunk_ids: List[str], kb_id: Optional[str] = None) -> int:
+        """Remove deleted chunks from the keyword index
+
+        Args:
+            chunk_ids: Chunk IDs
+            kb_id: Knowledge Base ID of the chunks (all shards if None)
+
+        Returns:
+            Number of chunks removed
+        """
+        if self.keyword_backend == "native":
+            return 0
+        return self.bm25_index.remove_chunks(kb_id, chunk_ids)
+
+    def evict_bm25(self, kb_id: str) -> bool:
+        """Drop the BM25 shard of a knowledge base
+
+        Args:
+            kb_id: Knowledge Base ID
+
+        Returns:
+            True if a shard was evicted
+        """
+        return self.bm25_index.evict(kb_id)
 
     async def retrieve(
         self,
         query: str,
-        query_embedding: List[float],
+        query_embedding: Union[List[float], Awaitable[List[float]]],
         top_k: int = 5,
         kb_ids: Optional[List[str]] = None,
     ) -> List[SearchResult]:
@@ -207,7 +783,8 @@ class Retriever:
 
         Args:
             query: Query text
-            query_embedding: Query vector
+            query_embedding: Query vector, or an awaitable resolving to it so the
+                keyword leg can start before the embedding is ready
             top_k: Number of results to return
             kb_ids: List of Knowledge Base IDs to filter by
 
@@ -215,55 +792,139 @@ class Retriever:
             List of search results
         """
         if self.hybrid:
-            return await self._hybrid_retrieve(query, query_embedding, top_k, kb_ids=kb_ids)
+            results = await self._hybrid_retrieve(query, query_embedding, top_k, kb_ids=kb_ids)
         else:
-            return await self._vector_retrieve(query_embedding, top_k, kb_ids=kb_ids)
+            results = await self._vector_retrieve(query_embedding, top_k, kb_ids=kb_ids)
+        return self._apply_score_weights(results)
+
+    @staticmethod
+    def _apply_score_weights(results: List[SearchResult]) -> List[SearchResult]:
+        """Scale scores by the chunks' score_weight (set on near-duplicates at ingest)"""
+        weighted = False
+        for result in results:
+            weight = (result.metadata or {}).get("score_weight")
+            if weight is not None:
+                result.score *= weight
+                weighted = True
+        if weighted:
+            results.sort(key=lambda r: r.score, reverse=True)
+        return results
 
     async def _vector_retrieve(
         self,
-        query_embedding: List[float],
+        query_embedding: Union[List[float], Awaitable[List[float]]],
         top_k: int,
         kb_ids: Optional[List[str]] = None,
     ) -> List[SearchResult]:
         """Vector-only retrieval
 
         Args:
-            query_embedding: Query vector
+            query_embedding: Query vector or an awaitable resolving to it
             top_k: Number of results
             kb_ids: List of Knowledge Base IDs to filter by
 
         Returns:
             List of search results
         """
-        results = self.vector_store.search(query_embedding, top_k=top_k, kb_ids=kb_ids)
-        return results
+        if inspect.isawaitable(query_embedding):
+            query_embedding = await query_embedding
+
+        # The vector DB client is synchronous, run it in a worker thread
+        return await asyncio.to_thread(
+            self.vector_store.search, query_embedding, top_k=top_k, kb_ids=kb_ids
+        )
+
+    def _keyword_search(
+        self,
+        query: str,
+        top_k: int,
+        kb_ids: Optional[List[str]] = None,
+    ) -> List[SearchResult]:
+        """BM25 retrieval, hydrating the requested shards first
+
+        Args:
+            query: Query text
+            top_k: Number of results
+            kb_ids: List of Knowledge Base IDs to filter by
+
+        Returns:
+            List of search results
+        """
+        try:
+            if not kb_ids:
+                return self._search_all_kbs(query, top_k)
+            self.hydrate_bm25(kb_ids=kb_ids)
+            return self.bm25_index.search(query, top_k=top_k, kb_ids=kb_ids)
+        except Exception as e:
+            # Degrade to vector-only results rather than failing the search
+            logger.error(f"BM25 search failed: {e}")
+            return []
+
+    def _search_all_kbs(self, query: str, top_k: int) -> List[SearchResult]:
+        """BM25 retrieval over every KB, one shard at a time
+
+        The collection is scanned once to learn its KBs. Afterwards only KBs
+        whose content changed are loaded again, and a shard evicted by
+        bm25_max_shards is reloaded only if its summary holds a query term.
+
+        Args:
+            query: Query text
+            top_k: Number of results
+
+        Returns:
+            List of search results
+        """
+        index = self.bm25_index
+        self.hydrate_bm25()
+        unloaded = index.unloaded_kbs()
+        if unloaded:
+            self.hydrate_bm25(kb_ids=unloaded)
+
+        terms = tokenize_query(query)
+        stats = index.collection_stats(terms)
+        if stats is None:
+            return []
+
+        results = []
+        for kb_id in index.matching_kbs(terms):
+            if not index.is_hydrated(kb_id):
+                self.hydrate_bm25(kb_ids=[kb_id])
+            results.extend(index.score_shard(kb_id, terms, stats, top_k))
+        return heapq.nlargest(top_k, results, key=lambda r: r.score)
 
     async def _hybrid_retrieve(
         self,
         query: str,
-        query_embedding: List[float],
+        query_embedding: Union[List[float], Awaitable[List[float]]],
         top_k: int,
         kb_ids: Optional[List[str]] = None,
     ) -> List[SearchResult]:
         """Hybrid retrieval combining vector and BM25
 
+        Both legs run concurrently in worker threads; the keyword leg does not
+        wait for the query embedding.
+
         Args:
             query: Query text
-            query_embedding: Query vector
+            query_embedding: Query vector or an awaitable resolving to it
             top_k: Number of results
             kb_ids: List of Knowledge Base IDs to filter by
 
         Returns:
             List of fused search results
         """
-        if self.bm25_index.doc_count == 0:
-            self.hydrate_bm25()
-
-        # Get vector results
-        vector_results = self.vector_store.search(query_embedding, top_k=self.vector_top_k, kb_ids=kb_ids)
+        if self.keyword_backend == "native":
+            return await self._native_hybrid_retrieve(query, query_embedding, top_k, kb_ids=kb_ids)
 
-        # Get BM25 results
-        bm25_results = self.bm25_index.search(query, top_k=self.bm25_top_k, kb_ids=kb_ids)
+        keyword_task = asyncio.ensure_future(
+            asyncio.to_thread(self._keyword_search, query, self.bm25_top_k, kb_ids)
+        )
+        try:
+            vector_results = await self._vector_retrieve(query_embedding, self.vector_top_k, kb_ids=kb_ids)
+        except BaseException:
+            keyword_task.cancel()
+            raise
+        bm25_results = await keyword_task
 
         # Fusion
         if self.fusion_method == "rrf":
@@ -272,6 +933,40 @@ class Retriever:
             # Default to vector results
             return vector_results[:top_k]
 
+    async def _native_hybrid_retrieve(
+        self,
+        query: str,
+        query_embedding: Union[List[float], Awaitable[List[float]]],
+        top_k: int,
+        kb_ids: Optional[List[str]] = None,
+    ) -> List[SearchResult]:
+        """Hybrid retrieval as a single multi-vector query fused by the vector DB
+
+        Args:
+            query: Query text
+            query_embedding: Query vector or an awaitable resolving to it
+            top_k: Number of results
+            kb_ids: List of Knowledge Base IDs to filter by
+
+        Returns:
+            List of fused search results
+        """
+        query_sparse = sparse_vector(tokenize_query(query))
+        if inspect.isawaitable(query_embedding):
+            query_embedding = await query_embedding
+
+        return await asyncio.to_thread(
+            self.vector_store.hybrid_search,
+            query_embedding,
+            query,
+            query_sparse=query_sparse,
+            top_k=top_k,
+            dense_top_k=self.vector_top_k,
+            sparse_top_k=self.bm25_top_k,
+            rrf_k=self.rrf_k,
+            kb_ids=kb_ids,
+        )
+
     def _rrf_fusion(
         self,
         vector_results: List[SearchResult],
@@ -324,4 +1019,4 @@ class Retriever:
 
     def reset(self) -> None:
         """Reset the retriever state"""
-        self.bm25_index = BM25Index()
+        self.bm25_index = ShardedBM25Index(max_shards=self.bm25_max_shards)
@@ -0,0 +1,163 @@
+"""Tokenizer - jieba tokenization for BM25 indexing and querying"""
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+import logging
+import os
+import zlib
+
+logger = logging.getLogger(__name__)
+
+QUERY_CACHE_SIZE = 1024
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokenization for Chinese and English using jieba
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of tokens
+    """
+    try:
+        import jieba
+
+        # Use jieba for Chinese word segmentation
+        words = jieba.lcut(text)
+        # Filter out empty strings and single punctuation
+        tokens = [w.lower().strip() for w in words if w.strip() and len(w.strip()) > 1]
+        return tokens
+    except ImportError:
+        logger.warning("jieba not installed, using basic tokenization. Run: pip install jieba")
+        # Fallback to character-level tokenization
+        tokens = []
+        for char in text:
+            if char.strip():
+                tokens.append(char.lower())
+        return tokens
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def _tokenize_query_cached(query: str) -> Tuple[str, ...]:
+    return tuple(tokenize(query))
+
+
+def tokenize_query(query: str) -> List[str]:
+    """Tokenize a search query in-process, caching repeated queries
+
+    Args:
+        query: Search query
+
+    Returns:
+        List of tokens
+    """
+    return list(_tokenize_query_cached(query))
+
+
+def sparse_vector(tokens: List[str]) -> Dict[str, List]:
+    """Encode tokens as a sparse term-frequency vector
+
+    Terms are hashed to stable 32-bit indices, so ingestion workers and query
+    processes agree on the vocabulary without sharing state.
+
+    Args:
+        tokens: Tokens of a document or query
+
+    Returns:
+        Dict with parallel "indices" and "values" lists
+    """
+    counts: Dict[int, float] = {}
+    for token in tokens:
+        index = zlib.crc32(token.encode("utf-8"))
+        counts[index] = counts.get(index, 0.0) + 1.0
+    return {"indices": list(counts.keys()), "values": list(counts.values())}
+
+
+def warmup() -> bool:
+    """Load the jieba dictionary so the first tokenization is not slow
+
+    Returns:
+        True if jieba is available and initialized
+    """
+    try:
+        import jieba
+
+        jieba.setLogLevel(logging.WARNING)
+        jieba.initialize()
+        return True
+    except ImportError:
+        logger.warning("jieba not installed, skipping dictionary preload")
+        return False
+
+
+def _tokenize_batch(texts: List[str]) -> List[List[str]]:
+    return [tokenize(text) for text in texts]
+
+
+class TokenizerPool:
+    """Process pool for bulk tokenization
+
+    Large document batches (indexing, BM25 hydration) are split into chunks and
+    tokenized by worker processes that each warm the jieba dictionary once on
+    start. Small batches are tokenized in-process, where pool overhead would
+    dominate.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """Initialize tokenizer pool
+
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config or {}
+        retrieval_config = self.config.get("retrieval", self.config)
+        tokenizer_config = retrieval_config.get("tokenizer", {})
+
+        self.workers = tokenizer_config.get("workers", min(4, os.cpu_count() or 1))
+        self.batch_size = tokenizer_config.get("batch_size", 256)
+        self.min_parallel_docs = tokenizer_config.get("min_parallel_docs", 512)
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=warmup)
+            logger.info(f"Started tokenizer pool with {self.workers} workers")
+        return self._executor
+
+    def start(self) -> None:
+        """Warm the local dictionary and spawn pool workers ahead of first use"""
+        warmup()
+        if self.workers > 0:
+            self._get_executor()
+
+    def tokenize_many(self, texts: List[str]) -> List[List[str]]:
+        """Tokenize many texts, in parallel when the batch is large enough
+
+        Args:
+            texts: Texts to tokenize
+
+        Returns:
+            Token lists in input order
+        """
+        if self.workers <= 0 or len(texts) < self.min_parallel_docs:
+            return _tokenize_batch(texts)
+
+        batches = [texts[i : i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        try:
+            token_lists = []
+            for batch_tokens in self._get_executor().map(_tokenize_batch, batches):
+                token_lists.extend(batch_tokens)
+            return token_lists
+        except Exception as e:
+            logger.error(f"Tokenizer pool failed, falling back to in-process tokenization: {e}")
+            self.shutdown()
+            return _tokenize_batch(texts)
+
+    def shutdown(self) -> None:
+        """Stop pool workers"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -2,8 +2,9 @@
 
 import os
 import sys
+from contextlib import asynccontextmanager
 from typing import List, Dict, Any, Optional
-from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks, Form, Query
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uvicorn
@@ -16,9 +17,11 @@ project_root = str(Path(__file__).parent.parent.parent)
 if project_root not in sys.path:
     sys.path.append(project_root)
 
-from apps.shared.config_loader import ConfigLoader
 from apps.shared.logger import LogManager
 from services.rag_pipeline.pipeline import RAGPipeline
+from services.rag_pipeline.settings import load_pipeline_config
+from services.rag_pipeline.ingest.job_queue import JobQueue
+from services.rag_pipeline.ingest.worker_stats import WorkerStats
 
 from services.rag_pipeline.database import init_db, get_db, Document, KnowledgeBase
 from sqlalchemy.orm import Session
@@ -31,69 +34,40 @@ log_manager = LogManager("rag_pipeline")
 logger = log_manager.get_logger()
 
 # Load config
-def _merge_dict(base: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
-    for key, value in updates.items():
-        if isinstance(value, dict) and isinstance(base.get(key), dict):
-            base[key] = _merge_dict(base.get(key, {}), value)
-        else:
-            base[key] = value
-    return base
-
-def _coerce_int(value: Any) -> Any:
-    if isinstance(value, str) and value.isdigit():
-        return int(value)
-    return value
-
-try:
-    config_loader = ConfigLoader()
-    config = config_loader.load_defaults()
-    rag_config = config_loader.load_config("rag")
-    embedding_config = config_loader.load_config("embedding")
-    vector_db_config = config_loader.load_config("vector_db")
-    _merge_dict(config, rag_config)
-
-    embedding_settings = dict(config.get("embedding", {}))
-    active_embedding = embedding_config.get("active_embedding")
-    embedding_providers = embedding_config.get("embedding_providers", {})
-    if active_embedding and active_embedding in embedding_providers:
-        provider_config = dict(embedding_providers.get(active_embedding, {}))
-        embedding_settings["provider"] = active_embedding
-        if "model" in provider_config:
-            embedding_settings["model"] = provider_config.get("model")
-        if "dimension" in provider_config:
-            embedding_settings["dimension"] = _coerce_int(provider_config.get("dimension"))
-        embedding_settings[active_embedding] = provider_config
-    config["embedding"] = embedding_settings
-
-    vector_db_settings = dict(config.get("vector_db", {}))
-    active_vector_db = vector_db_config.get("active")
-    vector_db_providers = vector_db_config.get("providers", {})
-    if active_vector_db and active_vector_db in vector_db_providers:
-        provider_config = dict(vector_db_providers.get(active_vector_db, {}))
-        vector_db_settings.update(provider_config)
-        vector_db_settings["provider"] = active_vector_db
-    if "port" in vector_db_settings:
-        vector_db_settings["port"] = _coerce_int(vector_db_settings.get("port"))
-    if "dimension" in vector_db_settings:
-        if "embedding" in config and "dimension" in config["embedding"]:
-             vector_db_settings["dimension"] = _coerce_int(config["embedding"]["dimension"])
-        else:
-             vector_db_settings["dimension"] = _coerce_int(vector_db_settings.get("dimension"))
-    config["vector_db"] = vector_db_settings
-except Exception as e:
-    logger.warning(f"Failed to load config: {e}. Using defaults.")
-    config = {}
+config = load_pipeline_config()
 
 # Initialize database
 init_db()
 
-# Initialize Pipeline
+# Initialize Pipeline (searches only; ingestion runs in services.rag_pipeline.worker)
 pipeline = RAGPipeline(config)
+job_queue = JobQueue(config)
+worker_stats = WorkerStats(config)
+
+def find_upload(upload_dir: Path, doc: Document) -> Optional[Path]:
+    """Locate the newest uploaded file of a document
+
+    A replaced document's file carries a version suffix, and its previous
+    file stays until the new version is indexed.
+    """
+    file_path = upload_dir / f"{doc.id}_{doc.name}"
+    if file_path.exists():
+        return file_path
+    uploads = list(upload_dir.glob(f"{doc.id}_*"))
+    return max(uploads, key=lambda f: f.stat().st_mtime) if uploads else None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up the tokenizer before serving requests"""
+    pipeline.warmup(ingestion=False)
+    yield
+    await pipeline.close()
 
 app = FastAPI(
     title="RAG Pipeline API",
     description="Document Ingestion and Retrieval API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS
@@ -283,22 +257,24 @@ async def delete_knowledge_base(kb_id: str, db: Session = Depends(get_db)):
     kb = db.query(KnowledgeBase).filter(KnowledgeBase.kb_id == kb_id).first()
     if not kb:
         raise HTTPException(status_code=404, detail="Knowledge base not found")
+
+    # Stop ingestion into the KB; running jobs delete what they inserted
+    job_queue.cancel_active(kb_id)
     
     # 1. Delete all documents files
     docs = db.query(Document).filter(Document.kb_id == kb_id).all()
     upload_dir = Path(project_root) / "uploads"
     for doc in docs:
         try:
-            # Try to delete file
-            file_path = upload_dir / f"{doc.id}_{doc.name}"
-            if file_path.exists():
+            # Try to delete the files, including versions not yet superseded
+            for file_path in upload_dir.glob(f"{doc.id}_*"):
                 os.remove(file_path)
         except Exception as e:
             logger.error(f"Failed to delete file for {doc.id}: {e}")
             
     # 2. Delete from vector store
     try:
-        pipeline.vector_store.delete_by_kb_id(kb_id)
+        await pipeline.delete_knowledge_base(kb_id)
     except Exception as e:
         logger.error(f"Failed to delete vectors for kb {kb_id}: {e}")
         
@@ -383,14 +359,63 @@ async def upload_document(
         error_message=db_doc.error_message
     )
 
+@app.put("/api/v1/kb/{kb_id}/documents/{doc_id}", tags=["Documents"])
+async def replace_document(
+    kb_id: str,
+    doc_id: str,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db)
+):
+    """Upload a new version of a document and queue it for re-indexing
+
+    The new version is diffed against the indexed one: with incremental
+    re-indexing only the chunks that changed are embedded. The previous
+    version's chunks and file stay in place until the worker has indexed the
+    new version.
+    """
+    doc = db.query(Document).filter(Document.id == doc_id, Document.kb_id == kb_id).first()
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    # Two versions indexed at once would interleave their chunks
+    active = job_queue.active_job(kb_id, doc_id)
+    if active is not None:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Document has an unfinished ingestion job {active['id']} ({active['status']}), "
+                   f"cancel it or wait for it to finish",
+        )
+
+    upload_dir = Path(project_root) / "uploads"
+    upload_dir.mkdir(exist_ok=True)
+    # Each version gets its own file, even under an unchanged name; the
+    # previous upload is removed by the worker once this version is indexed
+    file_path = upload_dir / f"{doc_id}_{uuid.uuid4().hex[:8]}_{file.filename}"
+    with open(file_path, "wb") as f:
+        shutil.copyfileobj(file.file, f)
+
+    doc.name = file.filename
+    doc.size = file_path.stat().st_size
+    doc.status = "processing"
+    doc.error_message = None
+    db.commit()
+
+    job = job_queue.enqueue(
+        kb_id,
+        doc_id,
+        file_path=str(file_path),
+        metadata={"original_filename": doc.name},
+    )
+
+    return {"status": "processing_started", "id": doc_id, "job_id": job["id"]}
+
 @app.post("/api/v1/kb/{kb_id}/documents/{doc_id}/index", tags=["Documents"])
 async def index_document(
     kb_id: str,
     doc_id: str,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
-    """Start indexing a previously uploaded document"""
+    """Queue a previously uploaded document for indexing by the ingestion workers"""
     doc = db.query(Document).filter(Document.id == doc_id, Document.kb_id == kb_id).first()
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
@@ -404,18 +429,23 @@ async def index_document(
     
     # Locate file
     upload_dir = Path(project_root) / "uploads"
-    file_path = upload_dir / f"{doc_id}_{doc.name}"
+    file_path = find_upload(upload_dir, doc)
     
-    if not file_path.exists():
+    if file_path is None:
         doc.status = "error"
         doc.error_message = "File not found on server"
         db.commit()
         raise HTTPException(status_code=404, detail="File source not found")
 
-    # Add to background task
-    background_tasks.add_task(process_document_task, str(file_path), doc_id, kb_id)
+    # Hand over to the ingestion workers
+    job = job_queue.enqueue(
+        kb_id,
+        doc_id,
+        file_path=str(file_path),
+        metadata={"original_filename": doc.name},
+    )
     
-    return {"status": "processing_started", "id": doc_id}
+    return {"status": "processing_started", "id": doc_id, "job_id": job["id"]}
 
 @app.delete("/api/v1/documents/{doc_id}", tags=["Documents"])
 async def delete_document(doc_id: str, db: Session = Depends(get_db)):
@@ -426,24 +456,23 @@ async def delete_document(doc_id: str, db: Session = Depends(get_db)):
     
     kb_id = doc.kb_id
     kb = db.query(KnowledgeBase).filter(KnowledgeBase.kb_id == kb_id).first()
+
+    # Stop ingestion of the document; a running job deletes what it inserted
+    job_queue.cancel_active(kb_id, doc_id)
     
     # 1. Delete physical file
     try:
         upload_dir = Path(project_root) / "uploads"
-        file_path = upload_dir / f"{doc_id}_{doc.name}"
-        if file_path.exists():
+        # Includes versions not yet superseded
+        for file_path in upload_dir.glob(f"{doc_id}_*"):
             os.remove(file_path)
             logger.info(f"Deleted file: {file_path}")
-        else:
-            # Fallback
-            for f in upload_dir.glob(f"{doc_id}_*"):
-                os.remove(f)
     except Exception as e:
         logger.error(f"Failed to delete file for {doc_id}: {e}")
     
     # 2. Delete from vector store
     try:
-        pipeline.vector_store.delete_by_doc_id(doc_id)
+        await pipeline.delete_document(doc_id, kb_id)
     except Exception as e:
         logger.error(f"Failed to delete vectors for {doc_id}: {e}")
 
@@ -458,55 +487,53 @@ async def delete_document(doc_id: str, db: Session = Depends(get_db)):
     db.commit()
     return {"status": "success", "id": doc_id}
 
-async def process_document_task(file_path: str, doc_id: str, kb_id: str):
-    """Background task for processing document"""
-    # We need a new DB session for the background task
-    db = next(get_db())
-    doc = db.query(Document).filter(Document.id == doc_id).first()
-    kb = db.query(KnowledgeBase).filter(KnowledgeBase.kb_id == kb_id).first()
-    
-    try:
-        # Ingest
-        result = await pipeline.ingest_document(
-            file_path,
-            metadata={"original_filename": doc.name, "doc_id": doc_id},
-            kb_id=kb_id
-        )
-        
-        # Update DB
-        doc.status = "indexed"
-        chunks_created = result.get("chunks_created", 0)
-        doc.chunks = chunks_created
-        
-        if kb:
-            kb.chunk_count += chunks_created
-            
-        db.commit()
-        logger.info(f"Successfully indexed document {doc_id} into kb {kb_id}")
-        
-    except Exception as e:
-        logger.error(f"Indexing failed for {doc_id}: {e}")
-        doc.status = "error"
-        doc.error_message = str(e)
-        db.commit()
-    finally:
-        db.close()
-
 @app.post("/api/v1/ingest/text", tags=["Ingestion"])
 async def ingest_text(request: IngestTextRequest):
-    """Ingest raw text"""
+    """Queue raw text for ingestion"""
     try:
-        result = await pipeline.ingest_text(
-            request.text,
+        job = job_queue.enqueue(
+            request.kb_id,
             request.doc_id,
-            request.metadata,
-            kb_id=request.kb_id
+            text=request.text,
+            metadata=request.metadata
         )
-        return result
+        return {"status": "queued", "doc_id": request.doc_id, "job_id": job["id"]}
     except Exception as e:
         logger.error(f"Text ingestion failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/v1/jobs", tags=["Ingestion"])
+async def list_jobs(
+    kb_id: Optional[str] = None,
+    doc_id: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500)
+):
+    """List ingestion jobs, newest first"""
+    return job_queue.list(kb_id=kb_id, doc_id=doc_id, status=status, limit=limit)
+
+@app.get("/api/v1/jobs/{job_id}", tags=["Ingestion"])
+async def get_job(job_id: str):
+    """Status, attempts and progress (chunks created, embedded and inserted) of an ingestion job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.post("/api/v1/jobs/{job_id}/cancel", tags=["Ingestion"])
+async def cancel_job(job_id: str, db: Session = Depends(get_db)):
+    """Cancel an ingestion job; a running job stops at its worker's next heartbeat"""
+    job = job_queue.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] == "cancelled":
+        # Cancelled before a worker picked it up
+        doc = db.query(Document).filter(Document.id == job["doc_id"]).first()
+        if doc and doc.status == "processing":
+            doc.status = "uploaded"
+            db.commit()
+    return job
+
 @app.post("/api/v1/search", response_model=List[SearchResultResponse], tags=["Search"])
 async def search(request: SearchRequest):
     """Search for documents"""
@@ -532,6 +559,23 @@ async def search(request: SearchRequest):
         logger.error(f"Search failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/v1/cache/stats", tags=["Search"])
+async def cache_stats():
+    """Hit rates of the retrieval and rerank caches, semantic cache audits and rerank deadline misses"""
+    return {
+        "result_cache": pipeline.result_cache.get_stats(),
+        "semantic_cache": pipeline.semantic_cache.get_stats(),
+        "reranker": pipeline.reranker.get_stats(),
+    }
+
+@app.get("/api/v1/ingest/stats", tags=["Ingestion"])
+async def ingest_stats():
+    """Ingestion jobs by status, and the stage, scheduler and parse cache stats reported by the workers"""
+    return {
+        "jobs": job_queue.count_by_status(),
+        **await worker_stats.collect(),
+    }
+
 @app.get("/api/v1/health", tags=["Health"])
 async def health_check():
     return {"status": "healthy"}
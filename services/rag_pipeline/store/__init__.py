@@ -1,5 +1,6 @@
 """Vector Store Module"""
 
 from .vector_store import VectorStore
+from .doc_store import DocStore
 
-__all__ = ["VectorStore"]
+__all__ = ["VectorStore", "DocStore"]
@@ -0,0 +1,326 @@
+"""Doc Store - Key-value storage for unembedded parent chunks"""
+
+import asyncio
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+import json
+import logging
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+
+
+class DocStore:
+    """Parent chunk store for small-to-big retrieval
+
+    Only child chunks are embedded and indexed; their parents are stored here
+    by key and fetched after search to give the LLM paragraph-level context.
+
+    Records are dicts with key, kb_id, doc_id, content and metadata.
+    Backends: local (SQLite file), redis, postgres.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """Initialize doc store
+
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config or {}
+        store_config = self.config.get("parent_store", {})
+
+        self.enabled = store_config.get("enabled", False)
+        self.backend = store_config.get("backend", "local")
+        self.path = Path(store_config.get("path", "data/parent_store.sqlite3"))
+        if not self.path.is_absolute():
+            self.path = PROJECT_ROOT / self.path
+        self.key_prefix = store_config.get("key_prefix", "rag:parent")
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._redis = None
+
+    @staticmethod
+    def make_key(kb_id: str, doc_id: str, parent_id: str) -> str:
+        """Build a globally unique parent key
+
+        Args:
+            kb_id: Knowledge Base ID
+            doc_id: Document ID
+            parent_id: Parent chunk ID within the document
+
+        Returns:
+            Parent key
+        """
+        return f"{kb_id}:{doc_id}:{parent_id}"
+
+    # === Local (SQLite) backend ===
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS parent_chunks ("
+                "key TEXT PRIMARY KEY, kb_id TEXT, doc_id TEXT, content TEXT, metadata TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_parent_doc ON parent_chunks (doc_id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_parent_kb ON parent_chunks (kb_id)")
+            self._conn.commit()
+        return self._conn
+
+    def _local_put(self, records: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            conn = self._get_conn()
+            conn.executemany(
+                "INSERT OR REPLACE INTO parent_chunks (key, kb_id, doc_id, content, metadata) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        r["key"], r["kb_id"], r["doc_id"], r["content"],
+                        json.dumps(r.get("metadata") or {}, ensure_ascii=False),
+                    )
+                    for r in records
+                ],
+            )
+            conn.commit()
+
+    def _local_get(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            conn = self._get_conn()
+            placeholders = ", ".join("?" for _ in keys)
+            rows = conn.execute(
+                f"SELECT key, kb_id, doc_id, content, metadata FROM parent_chunks WHERE key IN ({placeholders})",
+                keys,
+            ).fetchall()
+        return {
+            row[0]: {
+                "key": row[0],
+                "kb_id": row[1],
+                "doc_id": row[2],
+                "content": row[3],
+                "metadata": json.loads(row[4]) if row[4] else {},
+            }
+            for row in rows
+        }
+
+    def _local_delete(self, column: str, value: str) -> int:
+        with self._lock:
+            conn = self._get_conn()
+            cursor = conn.execute(f"DELETE FROM parent_chunks WHERE {column} = ?", (value,))
+            conn.commit()
+            return cursor.rowcount
+
+    def _local_delete_keys(self, keys: List[str]) -> int:
+        with self._lock:
+            conn = self._get_conn()
+            placeholders = ", ".join("?" for _ in keys)
+            cursor = conn.execute(f"DELETE FROM parent_chunks WHERE key IN ({placeholders})", keys)
+            conn.commit()
+            return cursor.rowcount
+
+    # === Postgres backend ===
+
+    def _pg_put(self, records: List[Dict[str, Any]]) -> None:
+        from ..database import get_db, ParentChunk
+
+        db = next(get_db())
+        try:
+            for r in records:
+                db.merge(
+                    ParentChunk(
+                        key=r["key"], kb_id=r["kb_id"], doc_id=r["doc_id"],
+                        content=r["content"], chunk_metadata=r.get("metadata") or {},
+                    )
+                )
+            db.commit()
+        finally:
+            db.close()
+
+    def _pg_get(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        from ..database import get_db, ParentChunk
+
+        db = next(get_db())
+        try:
+            rows = db.query(ParentChunk).filter(ParentChunk.key.in_(keys)).all()
+            return {
+                row.key: {
+                    "key": row.key,
+                    "kb_id": row.kb_id,
+                    "doc_id": row.doc_id,
+                    "content": row.content,
+                    "metadata": row.chunk_metadata or {},
+                }
+                for row in rows
+            }
+        finally:
+            db.close()
+
+    def _pg_delete(self, column: str, value: str) -> int:
+        from ..database import get_db, ParentChunk
+
+        db = next(get_db())
+        try:
+            deleted = db.query(ParentChunk).filter(getattr(ParentChunk, column) == value).delete()
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+    def _pg_delete_keys(self, keys: List[str]) -> int:
+        from ..database import get_db, ParentChunk
+
+        db = next(get_db())
+        try:
+            deleted = db.query(ParentChunk).filter(ParentChunk.key.in_(keys)).delete()
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+    # === Redis backend ===
+
+    def _get_redis(self):
+        if self._redis is None:
+            from apps.shared.redis_client import get_redis
+
+            self._redis = get_redis()
+        return self._redis
+
+    async def _redis_put(self, records: List[Dict[str, Any]]) -> None:
+        redis = self._get_redis()
+        for r in records:
+            await redis.set_json(f"{self.key_prefix}:{r['key']}", r)
+            await redis.sadd(f"{self.key_prefix}:doc:{r['doc_id']}", r["key"])
+            await redis.sadd(f"{self.key_prefix}:kb:{r['kb_id']}", r["key"])
+
+    async def _redis_get(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        redis = self._get_redis()
+        values = await redis.mget([f"{self.key_prefix}:{key}" for key in keys])
+        return {key: json.loads(value) for key, value in zip(keys, values) if value}
+
+    async def _redis_delete(self, column: str, value: str) -> int:
+        redis = self._get_redis()
+        index_key = f"{self.key_prefix}:{column.split('_')[0]}:{value}"
+        keys = list(await redis.smembers(index_key))
+        if keys:
+            await redis.delete(*[f"{self.key_prefix}:{key}" for key in keys])
+        await redis.delete(index_key)
+        return len(keys)
+
+    async def _redis_delete_keys(self, kb_id: str, doc_id: str, keys: List[str]) -> int:
+        redis = self._get_redis()
+        await redis.delete(*[f"{self.key_prefix}:{key}" for key in keys])
+        await redis.srem(f"{self.key_prefix}:doc:{doc_id}", *keys)
+        await redis.srem(f"{self.key_prefix}:kb:{kb_id}", *keys)
+        return len(keys)
+
+    # === Public API ===
+
+    async def put_many(self, records: List[Dict[str, Any]]) -> int:
+        """Store parent records
+
+        Args:
+            records: Parent records
+
+        Returns:
+            Number of records stored
+        """
+        if not records:
+            return 0
+        if self.backend == "redis":
+            await self._redis_put(records)
+        elif self.backend == "postgres":
+            await asyncio.to_thread(self._pg_put, records)
+        else:
+            await asyncio.to_thread(self._local_put, records)
+        return len(records)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch parent records by key
+
+        Args:
+            keys: Parent keys
+
+        Returns:
+            Mapping of key to record (missing keys are omitted)
+        """
+        if not keys:
+            return {}
+        try:
+            if self.backend == "redis":
+                return await self._redis_get(keys)
+            elif self.backend == "postgres":
+                return await asyncio.to_thread(self._pg_get, keys)
+            else:
+                return await asyncio.to_thread(self._local_get, keys)
+        except Exception as e:
+            logger.error(f"Failed to fetch parent chunks: {e}")
+            return {}
+
+    async def delete_by_doc_id(self, doc_id: str) -> int:
+        """Delete all parents of a document
+
+        Args:
+            doc_id: Document ID
+
+        Returns:
+            Number of records deleted
+        """
+        return await self._delete("doc_id", doc_id)
+
+    async def delete_keys(self, kb_id: str, doc_id: str, keys: List[str]) -> int:
+        """Delete parents of a document by key
+
+        Args:
+            kb_id: Knowledge Base ID
+            doc_id: Document ID
+            keys: Parent keys
+
+        Returns:
+            Number of records deleted
+        """
+        if not keys:
+            return 0
+        try:
+            if self.backend == "redis":
+                return await self._redis_delete_keys(kb_id, doc_id, keys)
+            elif self.backend == "postgres":
+                return await asyncio.to_thread(self._pg_delete_keys, keys)
+            else:
+                return await asyncio.to_thread(self._local_delete_keys, keys)
+        except Exception as e:
+            logger.error(f"Failed to delete parent chunks of {doc_id}: {e}")
+            return 0
+
+    async def delete_by_kb_id(self, kb_id: str) -> int:
+        """Delete all parents of a knowledge base
+
+        Args:
+            kb_id: Knowledge Base ID
+
+        Returns:
+            Number of records deleted
+        """
+        return await self._delete("kb_id", kb_id)
+
+    async def _delete(self, column: str, value: str) -> int:
+        try:
+            if self.backend == "redis":
+                return await self._redis_delete(column, value)
+            elif self.backend == "postgres":
+                return await asyncio.to_thread(self._pg_delete, column, value)
+            else:
+                return await asyncio.to_thread(self._local_delete, column, value)
+        except Exception as e:
+            logger.error(f"Failed to delete parent chunks by {column}={value}: {e}")
+            return 0
+
+    def close(self) -> None:
+        """Close the local store connection"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -42,6 +42,12 @@ class VectorStore:
         self.index_type = vector_db_config.get("index_type", "HNSW")
         self.metric_type = vector_db_config.get("metric_type", "COSINE")
 
+        # Native keyword search (sparse / full-text index inside the vector DB)
+        retrieval_config = self.config.get("retrieval", self.config)
+        self.native_keyword = retrieval_config.get("keyword_backend", "memory") == "native"
+        self.sparse_field = vector_db_config.get("sparse_field", "sparse")
+        self.text_analyzer = vector_db_config.get("text_analyzer", {"type": "chinese"})
+
     def _get_client(self):
         """Get or create vector database client
 
@@ -122,7 +128,6 @@ class VectorStore:
                 
                 # Metadata fields (explicitly defined for better performance, though dynamic is enabled)
                 schema.add_field(field_name="doc_id", datatype=DataType.VARCHAR, max_length=64)
-                schema.add_field(field_name="text", datatype=DataType.VARCHAR, max_length=65535)
 
                 # Index params
                 index_params = client.prepare_index_params()
@@ -133,6 +138,34 @@ class VectorStore:
                     params={"M": 16, "efConstruction": 256}
                 )
 
+                if self.native_keyword:
+                    # Full-text search: Milvus derives BM25 sparse vectors from the text field
+                    from pymilvus import Function, FunctionType
+
+                    schema.add_field(
+                        field_name="text",
+                        datatype=DataType.VARCHAR,
+                        max_length=65535,
+                        enable_analyzer=True,
+                        analyzer_params=self.text_analyzer,
+                    )
+                    schema.add_field(field_name=self.sparse_field, datatype=DataType.SPARSE_FLOAT_VECTOR)
+                    schema.add_function(
+                        Function(
+                            name="text_bm25",
+                            function_type=FunctionType.BM25,
+                            input_field_names=["text"],
+                            output_field_names=[self.sparse_field],
+                        )
+                    )
+                    index_params.add_index(
+                        field_name=self.sparse_field,
+                        index_type="SPARSE_INVERTED_INDEX",
+                        metric_type="BM25",
+                    )
+                else:
+                    schema.add_field(field_name="text", datatype=DataType.VARCHAR, max_length=65535)
+
                 # Create collection
                 client.create_collection(
                     collection_name=name,
@@ -153,9 +186,17 @@ class VectorStore:
                     return True
 
                 # Create collection
+                sparse_vectors_config = None
+                if self.native_keyword:
+                    from qdrant_client.models import SparseVectorParams, Modifier
+
+                    # Qdrant applies IDF server-side; points only carry term frequencies
+                    sparse_vectors_config = {self.sparse_field: SparseVectorParams(modifier=Modifier.IDF)}
+
                 client.create_collection(
                     collection_name=name,
                     vectors_config=VectorParams(size=self.dimension, distance=Distance.COSINE),
+                    sparse_vectors_config=sparse_vectors_config,
                 )
 
                 logger.info(f"Created collection '{name}' with dimension {self.dimension}")
@@ -174,6 +215,7 @@ class VectorStore:
 
         Args:
             chunks: List of chunk dicts with chunk_id, content, embedding, metadata
+                and, for native keyword search on Qdrant, sparse_vector
             collection_name: Name of collection
             kb_id: Knowledge Base ID
 
@@ -223,9 +265,22 @@ class VectorStore:
                     else:
                         point_id = idx
 
+                    vector = chunk["embedding"]
+                    sparse_vector = chunk.get("sparse_vector")
+                    if self.native_keyword and sparse_vector:
+                        from qdrant_client.models import SparseVector
+
+                        vector = {
+                            "": vector,
+                            self.sparse_field: SparseVector(
+                                indices=sparse_vector["indices"],
+                                values=sparse_vector["values"],
+                            ),
+                        }
+
                     point = PointStruct(
                         id=point_id,
-                        vector=chunk["embedding"],
+                        vector=vector,
                         payload={
                             "text": chunk.get("content", ""),
                             "metadata": chunk.get("metadata", {}),
@@ -343,15 +398,137 @@ class VectorStore:
             logger.error(f"Failed to search: {e}")
             return []
 
+    def hybrid_search(
+        self,
+        query_embedding: List[float],
+        query_text: str,
+        query_sparse: Optional[Dict[str, List]] = None,
+        top_k: int = 5,
+        dense_top_k: int = 50,
+        sparse_top_k: int = 50,
+        rrf_k: int = 60,
+        collection_name: Optional[str] = None,
+        kb_ids: Optional[List[str]] = None,
+    ) -> List[SearchResult]:
+        """Dense + keyword search fused server-side with RRF in a single query
+
+        Requires a collection created with keyword_backend: native.
+
+        Args:
+            query_embedding: Query vector
+            query_text: Raw query (Milvus full-text search analyzes it server-side)
+            query_sparse: Query term vector with indices/values (Qdrant)
+            top_k: Number of fused results to return
+            dense_top_k: Candidates from the dense leg
+            sparse_top_k: Candidates from the keyword leg
+            rrf_k: RRF constant (Milvus only; Qdrant uses its built-in constant)
+            collection_name: Name of collection
+            kb_ids: List of Knowledge Base IDs to filter by
+
+        Returns:
+            List of search results
+        """
+        client = self._get_client()
+        name = collection_name or self.collection_name
+
+        try:
+            if self.provider == "milvus":
+                from pymilvus import AnnSearchRequest, RRFRanker
+
+                filter_expr = None
+                if kb_ids:
+                    ids_str = ", ".join([f'"{kid}"' for kid in kb_ids])
+                    filter_expr = f'kb_id in [{ids_str}]'
+
+                dense_request = AnnSearchRequest(
+                    data=[query_embedding],
+                    anns_field="vector",
+                    param={"metric_type": self.metric_type},
+                    limit=dense_top_k,
+                    expr=filter_expr,
+                )
+                sparse_request = AnnSearchRequest(
+                    data=[query_text],
+                    anns_field=self.sparse_field,
+                    param={"metric_type": "BM25"},
+                    limit=sparse_top_k,
+                    expr=filter_expr,
+                )
+
+                results = client.hybrid_search(
+                    collection_name=name,
+                    reqs=[dense_request, sparse_request],
+                    ranker=RRFRanker(rrf_k),
+                    limit=top_k,
+                    output_fields=["text", "metadata", "chunk_id", "kb_id", "doc_id"],
+                )
+
+                return [
+                    SearchResult(
+                        chunk_id=hit.get("chunk_id", str(hit.get("id"))),
+                        content=hit.get("text", ""),
+                        score=hit.get("distance", 0.0),
+                        metadata=hit.get("metadata"),
+                    )
+                    for hit in results[0]
+                ]
+            elif self.provider == "qdrant":
+                from qdrant_client.models import (
+                    Prefetch, FusionQuery, Fusion, SparseVector,
+                    Filter, FieldCondition, MatchAny,
+                )
+
+                query_filter = None
+                if kb_ids:
+                    query_filter = Filter(
+                        must=[FieldCondition(key="kb_id", match=MatchAny(any=kb_ids))]
+                    )
+
+                prefetch = [Prefetch(query=query_embedding, filter=query_filter, limit=dense_top_k)]
+                if query_sparse and query_sparse.get("indices"):
+                    prefetch.append(
+                        Prefetch(
+                            query=SparseVector(
+                                indices=query_sparse["indices"],
+                                values=query_sparse["values"],
+                            ),
+                            using=self.sparse_field,
+                            filter=query_filter,
+                            limit=sparse_top_k,
+                        )
+                    )
+
+                results = client.query_points(
+                    collection_name=name,
+                    prefetch=prefetch,
+                    query=FusionQuery(fusion=Fusion.RRF),
+                    limit=top_k,
+                )
+
+                return [
+                    SearchResult(
+                        chunk_id=hit.payload.get("chunk_id", str(hit.id)),
+                        content=hit.payload.get("text", ""),
+                        score=hit.score,
+                        metadata=hit.payload.get("metadata"),
+                    )
+                    for hit in results.points
+                ]
+        except Exception as e:
+            logger.error(f"Failed to run hybrid search: {e}")
+            return []
+
     def delete(
         self,
         chunk_ids: List[str],
         collection_name: Optional[str] = None,
+        doc_id: Optional[str] = None,
     ) -> int:
         """Delete chunks by IDs
         
         Note: With auto_id=True in Milvus, we usually delete by expression or using the primary key (int64).
         If chunk_ids are string UUIDs, we need to filter by chunk_id field.
+        If doc_id is given, only chunks of that document are deleted.
         """
         client = self._get_client()
         name = collection_name or self.collection_name
@@ -364,6 +541,8 @@ class VectorStore:
                 # Assume chunk_ids are the string identifiers
                 ids_str = ", ".join([f'"{cid}"' for cid in chunk_ids])
                 filter_expr = f'chunk_id in [{ids_str}]'
+                if doc_id is not None:
+                    filter_expr += f' and doc_id == "{doc_id}"'
                 
                 res = client.delete(collection_name=name, filter=filter_expr)
                 # res is usually a mutation result
@@ -371,18 +550,14 @@ class VectorStore:
                 return len(chunk_ids) # Approximate
             elif self.provider == "qdrant":
                 # Qdrant delete by filter if chunk_ids are not point IDs
-                from qdrant_client.models import Filter, FieldCondition, MatchAny
+                from qdrant_client.models import Filter, FieldCondition, MatchAny, MatchValue
                 
+                conditions = [FieldCondition(key="chunk_id", match=MatchAny(any=chunk_ids))]
+                if doc_id is not None:
+                    conditions.append(FieldCondition(key="doc_id", match=MatchValue(value=doc_id)))
                 client.delete(
                     collection_name=name,
-                    points_selector=Filter(
-                        must=[
-                            FieldCondition(
-                                key="chunk_id",
-                                match=MatchAny(any=chunk_ids)
-                            )
-                        ]
-                    )
+                    points_selector=Filter(must=conditions)
                 )
                 logger.info(f"Deleted {len(chunk_ids)} chunks from collection '{name}'")
                 return len(chunk_ids)
@@ -533,12 +708,35 @@ class VectorStore:
         self,
         collection_name: Optional[str] = None,
         limit: Optional[int] = None,
-    ) -> List[Dict[str, Any]]:
+        kb_id: Optional[str] = None,
+        doc_id: Optional[str] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Scan stored chunks (without vectors)
+
+        Args:
+            collection_name: Name of collection
+            limit: Maximum number of chunks to return
+            kb_id: Only return chunks of this Knowledge Base
+            doc_id: Only return chunks of this document
+
+        Returns:
+            List of chunk dicts with chunk_id, content and metadata, or None
+            if the store could not be scanned
+        """
         client = self._get_client()
         name = collection_name or self.collection_name
 
         try:
             if self.provider == "qdrant":
+                from qdrant_client.models import Filter, FieldCondition, MatchValue
+
+                conditions = []
+                if kb_id:
+                    conditions.append(FieldCondition(key="kb_id", match=MatchValue(value=kb_id)))
+                if doc_id:
+                    conditions.append(FieldCondition(key="doc_id", match=MatchValue(value=doc_id)))
+                scroll_filter = Filter(must=conditions) if conditions else None
+
                 chunks = []
                 offset = None
                 page_limit = 256
@@ -551,6 +749,7 @@ class VectorStore:
 
                     points, next_offset = client.scroll(
                         collection_name=name,
+                        scroll_filter=scroll_filter,
                         limit=current_limit,
                         offset=offset,
                         with_payload=True,
@@ -579,7 +778,175 @@ class VectorStore:
 
                 return chunks
             elif self.provider == "milvus":
-                return []
+                conditions = []
+                if kb_id:
+                    conditions.append(f'kb_id == "{kb_id}"')
+                if doc_id:
+                    conditions.append(f'doc_id == "{doc_id}"')
+                iterator = client.query_iterator(
+                    collection_name=name,
+                    batch_size=256,
+                    limit=limit if limit is not None else -1,
+                    filter=" and ".join(conditions),
+                    output_fields=["chunk_id", "text", "kb_id", "metadata"],
+                )
+                chunks = []
+                try:
+                    while True:
+                        rows = iterator.next()
+                        if not rows:
+                            break
+                        for row in rows:
+                            chunks.append(
+                                {
+                                    "chunk_id": row.get("chunk_id", str(row.get("id", ""))),
+                                    "content": row.get("text", ""),
+                                    "kb_id": row.get("kb_id"),
+                                    "metadata": row.get("metadata") or {},
+                                }
+                            )
+                finally:
+                    iterator.close()
+                return chunks
         except Exception as e:
             logger.error(f"Failed to fetch chunks: {e}")
+        return None
+
+    def list_document_chunks(
+        self,
+        doc_id: str,
+        kb_id: str,
+        collection_name: Optional[str] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """List the stored chunks of one document (without content or vectors)
+
+        Args:
+            doc_id: Document ID
+            kb_id: Knowledge Base ID
+            collection_name: Name of collection
+
+        Returns:
+            List of dicts with chunk_id and metadata, or None if the store
+            could not be read
+        """
+        client = self._get_client()
+        name = collection_name or self.collection_name
+
+        try:
+            if self.provider == "milvus":
+                rows = client.query(
+                    collection_name=name,
+                    filter=f'doc_id == "{doc_id}" and kb_id == "{kb_id}"',
+                    output_fields=["chunk_id", "metadata"],
+                )
+                return [
+                    {"chunk_id": row.get("chunk_id", ""), "metadata": row.get("metadata") or {}}
+                    for row in rows
+                ]
+            elif self.provider == "qdrant":
+                from qdrant_client.models import Filter, FieldCondition, MatchValue
+
+                scroll_filter = Filter(must=[
+                    FieldCondition(key="doc_id", match=MatchValue(value=doc_id)),
+                    FieldCondition(key="kb_id", match=MatchValue(value=kb_id)),
+                ])
+                chunks = []
+                offset = None
+                while True:
+                    points, offset = client.scroll(
+                        collection_name=name,
+                        scroll_filter=scroll_filter,
+                        limit=256,
+                        offset=offset,
+                        with_payload=["chunk_id", "metadata"],
+                        with_vectors=False,
+                    )
+                    for point in points:
+                        payload = point.payload or {}
+                        chunks.append({
+                            "chunk_id": payload.get("chunk_id", str(point.id)),
+                            "metadata": payload.get("metadata") or {},
+                        })
+                    if not offset or not points:
+                        break
+                return chunks
+        except Exception as e:
+            logger.error(f"Failed to list chunks of document {doc_id}: {e}")
+            return None
+
+    def get_vectors(
+        self,
+        chunk_ids: List[str],
+        collection_name: Optional[str] = None,
+        kb_ids: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Fetch the stored dense vectors of chunks
+
+        Args:
+            chunk_ids: Chunk IDs to fetch
+            collection_name: Name of collection
+            kb_ids: List of Knowledge Base IDs to filter by
+
+        Returns:
+            List of dicts with chunk_id, doc_id and vector
+        """
+        if not chunk_ids:
+            return []
+
+        client = self._get_client()
+        name = collection_name or self.collection_name
+
+        try:
+            if self.provider == "milvus":
+                ids_str = ", ".join([f'"{cid}"' for cid in chunk_ids])
+                filter_expr = f"chunk_id in [{ids_str}]"
+                if kb_ids:
+                    kb_str = ", ".join([f'"{kid}"' for kid in kb_ids])
+                    filter_expr += f" and kb_id in [{kb_str}]"
+
+                rows = client.query(
+                    collection_name=name,
+                    filter=filter_expr,
+                    output_fields=["chunk_id", "doc_id", "vector"],
+                )
+                return [
+                    {
+                        "chunk_id": row.get("chunk_id", ""),
+                        "doc_id": row.get("doc_id", ""),
+                        "vector": row.get("vector"),
+                    }
+                    for row in rows
+                ]
+            elif self.provider == "qdrant":
+                from qdrant_client.models import Filter, FieldCondition, MatchAny
+
+                conditions = [FieldCondition(key="chunk_id", match=MatchAny(any=chunk_ids))]
+                if kb_ids:
+                    conditions.append(FieldCondition(key="kb_id", match=MatchAny(any=kb_ids)))
+
+                points, _next_offset = client.scroll(
+                    collection_name=name,
+                    scroll_filter=Filter(must=conditions),
+                    limit=len(chunk_ids) * 4,
+                    with_payload=["chunk_id", "doc_id"],
+                    with_vectors=True,
+                )
+
+                vectors = []
+                for point in points:
+                    vector = point.vector
+                    if isinstance(vector, dict):
+                        # Named vectors (native keyword search): dense vector is unnamed
+                        vector = vector.get("")
+                    payload = point.payload or {}
+                    vectors.append(
+                        {
+                            "chunk_id": payload.get("chunk_id", str(point.id)),
+                            "doc_id": payload.get("doc_id", ""),
+                            "vector": vector,
+                        }
+                    )
+                return vectors
+        except Exception as e:
+            logger.error(f"Failed to fetch vectors: {e}")
             return []
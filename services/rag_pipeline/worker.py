@@ -0,0 +1,318 @@
+"""RAG Ingestion Worker - Runs queued ingestion jobs outside the API server
+
+Start with ``python -m services.rag_pipeline.worker``; it launches
+``ingestion.jobs.workers`` processes that each claim jobs from the
+ingestion_jobs table and run them through their own pipeline.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Any, Optional, Set
+import logging
+
+# Add project root to path if running directly
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from apps.shared.logger import LogManager
+from services.rag_pipeline import database
+from services.rag_pipeline.database import Document, KnowledgeBase
+from services.rag_pipeline.ingest.job_queue import JobQueue
+from services.rag_pipeline.ingest.stages import IngestJob
+from services.rag_pipeline.ingest.worker_stats import WorkerStats
+from services.rag_pipeline.pipeline import RAGPipeline
+from services.rag_pipeline.settings import load_pipeline_config
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionWorker:
+    """Claim ingestion jobs and run them, up to concurrency at a time
+
+    While a job runs its lease is renewed with heartbeats that also record
+    its progress. A job whose cancellation was requested is stopped and its
+    partial chunks removed; a failed attempt is handed back to the queue,
+    which retries it with backoff. The worker's stage, scheduler and parse
+    cache statistics are published for the API server on the same interval.
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        pipeline: Optional[RAGPipeline] = None,
+        queue: Optional[JobQueue] = None,
+        worker_id: Optional[str] = None,
+    ):
+        """Initialize worker
+
+        Args:
+            config: Configuration dictionary
+            pipeline: Pipeline to ingest with (built from config if None)
+            queue: Job queue (the service database if None)
+            worker_id: Worker ID recorded on claimed jobs
+        """
+        self.config = config or {}
+        jobs_config = self.config.get("ingestion", {}).get("jobs", {})
+
+        self.concurrency = max(1, jobs_config.get("concurrency", 4))
+        self.poll_interval = jobs_config.get("poll_interval", 1.0)
+        self.heartbeat_interval = jobs_config.get("heartbeat_interval", 5.0)
+
+        self.pipeline = pipeline or RAGPipeline(self.config)
+        self.queue = queue or JobQueue(self.config)
+        self.stats = WorkerStats(self.config)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+        self.tasks: Set[asyncio.Task] = set()
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Claim and run jobs until stop is set, then finish the running ones
+
+        Args:
+            stop: Event that ends the loop (runs forever if None)
+        """
+        stop = stop or asyncio.Event()
+        if not self.pipeline.result_cache.redis_enabled:
+            logger.warning(
+                "result_cache.redis is disabled: search servers will not see "
+                "the KB changes made by this worker until they restart"
+            )
+        self.pipeline.warmup()
+        logger.info(f"Ingestion worker {self.worker_id} started (concurrency={self.concurrency})")
+
+        published_at = 0.0
+        try:
+            while not stop.is_set():
+                if time.monotonic() - published_at >= self.heartbeat_interval:
+                    await self.publish_stats()
+                    published_at = time.monotonic()
+                job = None
+                if len(self.tasks) < self.concurrency:
+                    try:
+                        job = await asyncio.to_thread(self.queue.claim, self.worker_id)
+                    except Exception as e:
+                        logger.error(f"Failed to claim ingestion job: {e}")
+                if job is not None:
+                    task = asyncio.create_task(self.run_job(job))
+                    self.tasks.add(task)
+                    task.add_done_callback(self.tasks.discard)
+                    continue
+                # Nothing due or no free slot: wait for a job to finish or the next poll
+                waiters = {asyncio.ensure_future(stop.wait()), *self.tasks}
+                await asyncio.wait(waiters, timeout=self.poll_interval, return_when=asyncio.FIRST_COMPLETED)
+                for waiter in waiters - self.tasks:
+                    waiter.cancel()
+        finally:
+            if self.tasks:
+                await asyncio.gather(*self.tasks, return_exceptions=True)
+            await self.stats.remove(self.worker_id)
+            logger.info(f"Ingestion worker {self.worker_id} stopped")
+
+    async def publish_stats(self) -> None:
+        """Publish this worker's ingestion statistics for the API server"""
+        await self.stats.publish(self.worker_id, {
+            "running_jobs": len(self.tasks),
+            "stages": self.pipeline.ingestor.get_stats(),
+            "scheduler": self.pipeline.scheduler.get_stats(),
+            "parse_cache": self.pipeline.loader.parse_cache.get_stats(),
+        })
+
+    async def run_job(self, job: Dict[str, Any]) -> str:
+        """Run one claimed job to its next status
+
+        Args:
+            job: Claimed job
+
+        Returns:
+            Status the job was left in (succeeded, queued, failed or cancelled),
+            or "lost" if another worker took it over
+        """
+        job_id, doc_id, kb_id = job["id"], job["doc_id"], job["kb_id"]
+        logger.info(f"Running ingestion job {job_id} for {doc_id} (attempt {job['attempts']})")
+        await asyncio.to_thread(self._update_document, doc_id, status="processing", error_message=None)
+
+        incremental = self.pipeline.ingestor.incremental
+        if not incremental and await asyncio.to_thread(self._indexed_chunks, doc_id):
+            # A new version of an indexed document is diffed against the
+            # previous one, whose chunks stay searchable until it succeeds
+            incremental = True
+
+        if job["attempts"] > 1 and not incremental:
+            # Drop what an earlier attempt inserted before redoing the document
+            # (incremental re-indexing keeps it and diffs against it instead)
+            await self.pipeline.delete_document(doc_id, kb_id)
+
+        tracked: Dict[str, IngestJob] = {}
+        if job["text"] is not None:
+            ingest = self.pipeline.ingest_text(
+                job["text"], doc_id, job["metadata"], kb_id=kb_id, incremental=incremental,
+                track=lambda ingest_job: tracked.setdefault("job", ingest_job),
+            )
+        else:
+            ingest = self.pipeline.ingest_document(
+                job["file_path"], {**job["metadata"], "doc_id": doc_id}, kb_id=kb_id, incremental=incremental,
+                track=lambda ingest_job: tracked.setdefault("job", ingest_job),
+            )
+        task = asyncio.ensure_future(ingest)
+
+        stop = False
+        while not task.done():
+            await asyncio.wait({task}, timeout=self.heartbeat_interval)
+            if task.done():
+                break
+            progress = tracked["job"].progress() if "job" in tracked else {}
+            try:
+                stop = await asyncio.to_thread(self.queue.heartbeat, job_id, self.worker_id, progress)
+            except Exception as e:
+                logger.warning(f"Heartbeat failed for ingestion job {job_id}: {e}")
+                continue
+            if stop:
+                task.cancel()
+                break
+
+        if stop:
+            await asyncio.gather(task, return_exceptions=True)
+            if "job" in tracked:
+                # Stage work already started must land before its chunks are deleted
+                await tracked["job"].drained()
+            return await self._discard(job_id, doc_id, kb_id)
+
+        try:
+            result = task.result()
+        except Exception as e:
+            result = {"status": "error", "error": str(e)}
+
+        if result.get("status") == "error":
+            status = await asyncio.to_thread(self.queue.fail, job_id, self.worker_id, result.get("error", ""))
+            if status is None:
+                return "lost"
+            if status == "failed":
+                await asyncio.to_thread(
+                    self._update_document, doc_id, status="error", error_message=result.get("error")
+                )
+            return status
+
+        if not await asyncio.to_thread(self.queue.complete, job_id, self.worker_id, result):
+            # Cancelled after the last heartbeat (e.g. its document was deleted),
+            # or taken over by another worker
+            return await self._discard(job_id, doc_id, kb_id)
+        await asyncio.to_thread(self._mark_indexed, doc_id, kb_id, result.get("chunks_created", 0))
+        if job["file_path"] is not None:
+            await asyncio.to_thread(self._remove_superseded_uploads, doc_id, job["file_path"])
+        logger.info(f"Successfully indexed document {doc_id} into kb {kb_id}")
+        return "succeeded"
+
+    async def _discard(self, job_id: str, doc_id: str, kb_id: str) -> str:
+        """Mark a stopped job cancelled and delete the chunks it inserted"""
+        if not await asyncio.to_thread(self.queue.mark_cancelled, job_id, self.worker_id):
+            logger.warning(f"Ingestion job {job_id} was taken over by another worker")
+            return "lost"
+        await self.pipeline.delete_document(doc_id, kb_id)
+        await asyncio.to_thread(self._update_document, doc_id, status="uploaded")
+        logger.info(f"Cancelled ingestion job {job_id}")
+        return "cancelled"
+
+    def _update_document(self, doc_id: str, **fields: Any) -> None:
+        with self.queue.session() as db:
+            doc = db.query(Document).filter(Document.id == doc_id).first()
+            if doc is None:
+                # Text ingestion has no document record
+                return
+            for name, value in fields.items():
+                setattr(doc, name, value)
+            db.commit()
+
+    def _indexed_chunks(self, doc_id: str) -> int:
+        with self.queue.session() as db:
+            doc = db.query(Document).filter(Document.id == doc_id).first()
+            return (doc.chunks or 0) if doc is not None else 0
+
+    def _mark_indexed(self, doc_id: str, kb_id: str, chunks_created: int) -> None:
+        with self.queue.session() as db:
+            doc = db.query(Document).filter(Document.id == doc_id).first()
+            if doc is None:
+                return
+            # A re-indexed document replaces the chunks of its previous version
+            previous = doc.chunks or 0
+            doc.status = "indexed"
+            doc.error_message = None
+            doc.chunks = chunks_created
+            kb = db.query(KnowledgeBase).filter(KnowledgeBase.kb_id == kb_id).first()
+            if kb:
+                kb.chunk_count = max(0, kb.chunk_count + chunks_created - previous)
+            db.commit()
+
+    @staticmethod
+    def _remove_superseded_uploads(doc_id: str, file_path: str) -> None:
+        # Uploads are stored under names starting with {doc_id}_; a replaced
+        # document keeps its previous file until the new version is indexed
+        current = Path(file_path)
+        for old_file in current.parent.glob(f"{doc_id}_*"):
+            if old_file != current:
+                try:
+                    old_file.unlink()
+                except OSError as e:
+                    logger.warning(f"Failed to remove superseded upload {old_file}: {e}")
+
+    async def close(self) -> None:
+        """Release the pipeline's worker pools and connections"""
+        await self.pipeline.close()
+
+
+async def _serve(config: Dict[str, Any]) -> None:
+    worker = IngestionWorker(config)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    try:
+        await worker.run(stop)
+    finally:
+        await worker.close()
+
+
+def _run_process(config: Dict[str, Any]) -> None:
+    # Route the pipeline's module loggers to the worker's log files
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    for handler in LogManager("rag_worker").get_logger().handlers:
+        root.addHandler(handler)
+
+    database.init_db()
+    asyncio.run(_serve(config))
+
+
+def main() -> None:
+    """Start the configured number of worker processes and wait for them"""
+    config = load_pipeline_config()
+    workers = max(1, config.get("ingestion", {}).get("jobs", {}).get("workers", 2))
+    if workers == 1:
+        _run_process(config)
+        return
+
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_run_process, args=(config,)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    def forward(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
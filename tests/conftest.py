@@ -41,3 +41,37 @@ def mock_llm_response():
         }],
         "usage": {"total_tokens": 100}
     }
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """生成每页一段文本的简单 PDF（空字符串表示空白页）"""
+
+    def _make(page_texts, name="doc.pdf"):
+        objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+        kids = []
+        for text in page_texts:
+            stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET" if text else ""
+            objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+            objects.append(
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+            )
+            kids.append(f"{len(objects)} 0 R")
+        objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+        data = b"%PDF-1.4\n"
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(len(data))
+            data += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+        xref = len(data)
+        data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+        data += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+        data += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+
+        path = tmp_path / name
+        path.write_bytes(data)
+        return path
+
+    return _make
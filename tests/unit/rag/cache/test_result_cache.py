@@ -0,0 +1,78 @@
+"""Result Cache Unit Tests"""
+
+import pytest
+from services.rag_pipeline.cache.result_cache import ResultCache
+from services.rag_pipeline.store.vector_store import SearchResult
+
+
+@pytest.mark.unit
+class TestResultCache:
+    """Test ResultCache"""
+
+    @pytest.fixture
+    def results(self):
+        return [SearchResult(chunk_id="c1", content="cached", score=0.9, metadata={"kb_id": "kb_a"})]
+
+    def test_normalize_query(self):
+        """Test normalization folds case, width and whitespace"""
+        assert ResultCache.normalize_query("  Hello   ＷＯＲＬＤ ") == "hello world"
+
+    @pytest.mark.asyncio
+    async def test_hit_after_set(self, results):
+        """Test stored results are returned for an equivalent query"""
+        cache = ResultCache()
+
+        key = await cache.make_key("Hello world", ["kb_b", "kb_a"], 5, False)
+        await cache.set(key, results)
+
+        same_key = await cache.make_key("hello  world", ["kb_a", "kb_b"], 5, False)
+        cached = await cache.get(same_key)
+
+        assert cached == results
+        assert cached[0] is not results[0]
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_bump_invalidates_only_changed_kb(self, results):
+        """Test bumping a KB misses its entries but keeps other KBs"""
+        cache = ResultCache()
+
+        key_a = await cache.make_key("q", ["kb_a"], 5, False)
+        key_b = await cache.make_key("q", ["kb_b"], 5, False)
+        key_all = await cache.make_key("q", None, 5, False)
+        for key in (key_a, key_b, key_all):
+            await cache.set(key, results)
+
+        await cache.bump("kb_a")
+
+        assert await cache.get(await cache.make_key("q", ["kb_a"], 5, False)) is None
+        assert await cache.get(await cache.make_key("q", None, 5, False)) is None
+        assert await cache.get(await cache.make_key("q", ["kb_b"], 5, False)) == results
+
+    @pytest.mark.asyncio
+    async def test_key_includes_top_k_and_rerank(self):
+        """Test different top_k or rerank flag give different keys"""
+        cache = ResultCache()
+
+        base = await cache.make_key("q", ["kb_a"], 5, False)
+
+        assert base != await cache.make_key("q", ["kb_a"], 10, False)
+        assert base != await cache.make_key("q", ["kb_a"], 5, True)
+
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        """Test disabled cache never produces keys"""
+        cache = ResultCache({"result_cache": {"enabled": False}})
+
+        assert await cache.make_key("q", None, 5, False) is None
+        assert await cache.get(None) is None
+
+    @pytest.mark.asyncio
+    async def test_lru_bound(self, results):
+        """Test local entries are bounded"""
+        cache = ResultCache({"result_cache": {"max_entries": 2}})
+
+        for i in range(3):
+            await cache.set(await cache.make_key(f"q{i}", None, 5, False), results)
+
+        assert cache.get_stats()["entries"] == 2
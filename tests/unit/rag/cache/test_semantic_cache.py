@@ -0,0 +1,78 @@
+"""Semantic Cache Unit Tests"""
+
+import pytest
+from services.rag_pipeline.cache.semantic_cache import SemanticCache
+from services.rag_pipeline.store.vector_store import SearchResult
+
+
+@pytest.mark.unit
+class TestSemanticCache:
+    """Test SemanticCache"""
+
+    @pytest.fixture
+    def cache(self):
+        return SemanticCache({"semantic_cache": {"enabled": True, "threshold": 0.9, "max_entries": 3}})
+
+    @pytest.fixture
+    def results(self):
+        return [SearchResult(chunk_id="c1", content="cached", score=0.9)]
+
+    def test_init_default_config(self):
+        """Test semantic cache is disabled by default"""
+        cache = SemanticCache()
+
+        assert cache.enabled is False
+        assert cache.threshold == 0.95
+
+    def test_hit_within_threshold(self, cache, results):
+        """Test a near-identical embedding in the same scope hits"""
+        cache.add("scope", "how to reset password", [1.0, 0.0, 0.1], results)
+
+        hit = cache.lookup("scope", [0.98, 0.0, 0.12])
+
+        assert hit is not None
+        cached, cached_query, similarity = hit
+        assert cached == results
+        assert cached_query == "how to reset password"
+        assert similarity > 0.9
+
+    def test_miss_below_threshold(self, cache, results):
+        """Test a dissimilar embedding misses"""
+        cache.add("scope", "q", [1.0, 0.0, 0.0], results)
+
+        assert cache.lookup("scope", [0.0, 1.0, 0.0]) is None
+
+    def test_miss_in_other_scope(self, cache, results):
+        """Test entries never cross scopes (KB set or generation)"""
+        cache.add("scope_gen_1", "q", [1.0, 0.0, 0.0], results)
+
+        assert cache.lookup("scope_gen_2", [1.0, 0.0, 0.0]) is None
+
+    def test_zero_vector_ignored(self, cache, results):
+        """Test zero embeddings are neither cached nor matched"""
+        cache.add("scope", "q", [0.0, 0.0, 0.0], results)
+
+        assert cache.get_stats()["entries"] == 0
+        assert cache.lookup("scope", [0.0, 0.0, 0.0]) is None
+
+    def test_lru_eviction(self, cache, results):
+        """Test oldest entries are evicted over capacity"""
+        for i in range(4):
+            vector = [0.0] * 4
+            vector[i] = 1.0
+            cache.add("scope", f"q{i}", vector, results)
+
+        assert cache.get_stats()["entries"] == 3
+        assert cache.lookup("scope", [1.0, 0.0, 0.0, 0.0]) is None
+
+    def test_record_audit(self, cache, results):
+        """Test audits count false hits by result overlap"""
+        other = [SearchResult(chunk_id="c9", content="other", score=0.5)]
+
+        assert cache.record_audit("q", "q'", results, results) is False
+        assert cache.record_audit("q", "q'", results, other) is True
+
+        stats = cache.get_stats()
+        assert stats["audits"] == 2
+        assert stats["false_hits"] == 1
+        assert stats["false_hit_rate"] == 0.5
@@ -153,3 +153,130 @@ class TestTextChunker:
 
         assert len(chunks) > 1
         assert all(len(c) <= 35 for c in chunks)  # Allow some buffer
+
+    def test_chunk_offsets(self):
+        """Test chunks carry the character span they were cut from"""
+        config = {
+            "chunking": {
+                "strategy": "parent_child",
+                "parent": {"size": 120, "overlap": 20},
+                "child": {"size": 40, "overlap": 10},
+            }
+        }
+        chunker = TextChunker(config)
+
+        text = "  " + "第一句话。第二句话！Third sentence here. " * 12
+        chunks = chunker.chunk(text)
+
+        for c in chunks:
+            assert c.content == text[c.metadata["char_start"]:c.metadata["char_end"]]
+            assert c.content == c.content.strip()
+
+        parents = {c.chunk_id: c for c in chunks if c.metadata["chunk_type"] == "parent"}
+        for c in chunks:
+            if c.parent_id:
+                parent = parents[c.parent_id]
+                assert parent.metadata["char_start"] <= c.metadata["char_start"]
+                assert c.metadata["char_end"] <= parent.metadata["char_end"]
+
+    def test_spans_cover_text_with_bounded_overlap(self):
+        """Test spans advance through the text and respect the size limit"""
+        chunker = TextChunker()
+        text = "这是一个句子。" * 2000
+
+        spans = list(chunker._iter_spans(text, chunk_size=300, overlap=50))
+
+        assert spans[0][0] == 0
+        assert spans[-1][1] == len(text)
+        assert all(end - start <= 300 for start, end in spans)
+        assert all(b[0] > a[0] for a, b in zip(spans, spans[1:]))
+        # Overlap stays within twice the configured overlap
+        assert all(a[1] - b[0] <= 100 for a, b in zip(spans, spans[1:]))
+
+    def test_iter_chunks_is_lazy(self):
+        """Test chunks can be consumed one at a time"""
+        chunker = TextChunker({"chunking": {"strategy": "simple", "child": {"size": 50, "overlap": 0}}})
+
+        chunks = chunker.iter_chunks("This is a test. " * 1000)
+
+        first = next(chunks)
+        assert first.chunk_id == "chunk_0"
+        assert first.metadata["char_start"] == 0
+
+    def test_token_size_unit(self):
+        """Test chunk sizes are measured in tokens when size_unit is tokens"""
+        from services.rag_pipeline.chunker.token_estimator import TokenEstimator
+
+        config = {
+            "chunking": {
+                "strategy": "simple",
+                "size_unit": "tokens",
+                "child": {"size": 20, "overlap": 0},
+            }
+        }
+        chunker = TextChunker(config)
+        # Heuristic estimate (no tiktoken encoding)
+        chunker._estimator = TokenEstimator()
+        chunker._estimator._loaded = True
+
+        chunks = chunker.chunk("这是中文内容" * 20 + " english words " * 20)
+
+        assert len(chunks) > 1
+        assert all(chunker._estimator.count(c.content) <= 20 for c in chunks)
+        # 20 tokens hold ~30 CJK characters but ~80 ASCII characters
+        assert len(chunks[0].content) == 30
+        assert len(chunks[-1].content) > 30
+
+    def test_token_overlap_stable_across_chunks(self):
+        """Test the token overlap is converted per window and does not compound"""
+        from services.rag_pipeline.chunker.token_estimator import TokenEstimator
+
+        config = {
+            "chunking": {
+                "strategy": "simple",
+                "size_unit": "tokens",
+                "child": {"size": 20, "overlap": 5},
+            }
+        }
+        chunker = TextChunker(config)
+        chunker._estimator = TokenEstimator()
+        chunker._estimator._loaded = True
+
+        chunks = chunker.chunk("abcdefgh " * 200)
+        overlaps = [
+            prev.metadata["char_end"] - cur.metadata["char_start"]
+            for prev, cur in zip(chunks, chunks[1:])
+        ]
+
+        assert len(overlaps) > 3
+        assert all(0 < o < len(chunks[0].content) for o in overlaps)
+        assert max(overlaps) - min(overlaps) <= 10
+
+    def test_chunks_respect_segments(self):
+        """Test chunks never cross segment boundaries and inherit segment metadata"""
+        config = {
+            "chunking": {
+                "strategy": "parent_child",
+                "parent": {"size": 500, "overlap": 0},
+                "child": {"size": 100, "overlap": 0},
+            }
+        }
+        chunker = TextChunker(config)
+
+        first = "=== Slide 1 ===\n" + "short slide"
+        second = "=== Slide 2 ===\n" + "另一张幻灯片的内容。" * 5
+        text = first + "\n\n" + second
+        segments = [
+            {"start": 0, "end": len(first), "metadata": {"slide": 1}},
+            {"start": len(first) + 2, "end": len(text), "metadata": {"slide": 2}},
+        ]
+
+        chunks = chunker.chunk(text, {"source": "deck"}, segments=segments)
+
+        parents = [c for c in chunks if c.metadata["chunk_type"] == "parent"]
+        assert [p.metadata["slide"] for p in parents] == [1, 2]
+        assert parents[0].content == first
+        for c in chunks:
+            segment = segments[c.metadata["slide"] - 1]
+            assert segment["start"] <= c.metadata["char_start"] < c.metadata["char_end"] <= segment["end"]
+            assert c.metadata["source"] == "deck"
@@ -0,0 +1,45 @@
+"""Token Estimator Unit Tests"""
+
+import pytest
+from unittest.mock import MagicMock
+from services.rag_pipeline.chunker.token_estimator import TokenEstimator
+
+
+def heuristic_estimator():
+    estimator = TokenEstimator()
+    estimator._loaded = True
+    estimator._encoding = None
+    return estimator
+
+
+@pytest.mark.unit
+class TestTokenEstimator:
+    """Test TokenEstimator"""
+
+    def test_heuristic_count(self):
+        """Test the fallback estimate weighs CJK characters more than others"""
+        estimator = heuristic_estimator()
+
+        assert estimator.count("中文中文中文") == 4
+        assert estimator.count("abcdefgh") == 2
+
+    def test_heuristic_advance(self):
+        """Test advance stops where the budget runs out"""
+        estimator = heuristic_estimator()
+        text = "中文" * 30
+
+        assert estimator.advance(text, 0, len(text), 10) == 15
+        assert estimator.advance(text, 50, len(text), 10) == len(text)
+
+    def test_advance_with_encoding(self):
+        """Test advance cuts at the offset of the first token past the budget"""
+        estimator = TokenEstimator()
+        estimator._loaded = True
+        # One token per two characters
+        encoding = MagicMock()
+        encoding.encode.side_effect = lambda text, **kwargs: list(range((len(text) + 1) // 2))
+        encoding.decode_with_offsets.side_effect = lambda tokens: ("", [2 * t for t in tokens])
+        estimator._encoding = encoding
+
+        assert estimator.advance("x" * 100, 10, 100, 5) == 20
+        assert estimator.truncate("x" * 7, 10) == "x" * 7
@@ -162,3 +162,45 @@ class TestEmbedder:
         embedder = Embedder(config)
 
         assert embedder.openai_config["api_key"] == "sk-test"
+
+    def test_batch_ranges_packed_by_tokens(self):
+        """Test batches close at the count limit or the token limit"""
+        from services.rag_pipeline.chunker.token_estimator import TokenEstimator
+        from unittest.mock import patch
+
+        embedder = Embedder({"embedding": {"batch_size": 3, "max_batch_tokens": 10}})
+        # Heuristic estimate (no tiktoken encoding): 4 ASCII characters per token
+        estimator = TokenEstimator()
+        estimator._loaded = True
+        texts = ["a" * 16, "a" * 16, "a" * 16, "a" * 32, "a" * 4, "a" * 4, "a" * 4, "a" * 4]
+
+        with patch(
+            "services.rag_pipeline.embedder.embedder.get_token_estimator",
+            return_value=estimator,
+        ):
+            ranges = embedder._batch_ranges(texts)
+
+        assert ranges == [(0, 2), (2, 3), (3, 6), (6, 8)]
+
+    def test_batch_ranges_by_count(self):
+        """Test batches only follow batch_size without a token limit"""
+        embedder = Embedder({"embedding": {"batch_size": 2}})
+
+        assert embedder._batch_ranges(["a"] * 5) == [(0, 2), (2, 4), (4, 5)]
+
+    @pytest.mark.asyncio
+    async def test_batches_use_thread_only_for_token_packing(self):
+        """Test only token packing is moved off the event loop"""
+        from unittest.mock import AsyncMock, patch
+
+        embedder = Embedder({"embedding": {"batch_size": 2}})
+        with patch("services.rag_pipeline.embedder.embedder.asyncio.to_thread") as to_thread:
+            assert await embedder._batches(["a"] * 3) == [(0, 2), (2, 3)]
+        to_thread.assert_not_called()
+
+        embedder.max_batch_tokens = 10
+        with patch(
+            "services.rag_pipeline.embedder.embedder.asyncio.to_thread", new_callable=AsyncMock
+        ) as to_thread:
+            await embedder._batches(["a"] * 3)
+        to_thread.assert_awaited_once_with(embedder._batch_ranges, ["a"] * 3)
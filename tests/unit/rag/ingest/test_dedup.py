@@ -0,0 +1,123 @@
+"""Near-Duplicate Detector Unit Tests"""
+
+import pytest
+from apps.shared.redis_client import InMemoryRedis, RedisOperations
+from services.rag_pipeline.chunker.text_chunker import Chunk
+from services.rag_pipeline.ingest.dedup import NearDuplicateDetector
+
+BASE = (
+    "检索增强生成系统先从知识库召回相关文档片段，再交给大模型生成答案。"
+    "文档在入库时被切分为若干分块，每个分块经过向量化后写入向量数据库，"
+    "同时建立关键词索引，以便检索阶段同时利用语义相似度与关键词匹配。"
+    "召回结果经过融合与重排后，按相关度顺序拼接为上下文提供给模型。"
+)
+NEAR = BASE.replace("答案", "答复")
+OTHER = "The quarterly report covers revenue, operating costs and hiring plans for next year."
+
+
+def make_detector(**dedup):
+    return NearDuplicateDetector({"dedup": {"enabled": True, **dedup}, "embedding": {"dimension": 8}})
+
+
+@pytest.mark.unit
+class TestNearDuplicateDetector:
+    """Test NearDuplicateDetector"""
+
+    def test_disabled_passthrough(self):
+        """Test chunks pass through unchanged when disabled"""
+        detector = NearDuplicateDetector({})
+        chunks = [Chunk(content=BASE, chunk_id="chunk_0"), Chunk(content=BASE, chunk_id="chunk_1")]
+
+        kept, report = detector.process("kb", "doc1", chunks)
+
+        assert kept == chunks
+        assert report["duplicates"] == 0
+
+    def test_signature_similarity(self):
+        """Test signatures estimate Jaccard similarity"""
+        detector = make_detector()
+
+        same = detector.similarity(detector.signature(BASE), detector.signature(BASE.upper()))
+        near = detector.similarity(detector.signature(BASE), detector.signature(NEAR))
+        far = detector.similarity(detector.signature(BASE), detector.signature(OTHER))
+
+        assert same == 1.0
+        assert near > 0.85
+        assert far < 0.2
+
+    def test_skip_across_documents(self):
+        """Test near-duplicates of indexed chunks are skipped per KB"""
+        detector = make_detector(action="skip")
+        detector.process("kb", "doc1", [Chunk(content=BASE, chunk_id="chunk_0")])
+
+        kept, report = detector.process(
+            "kb", "doc2", [Chunk(content=NEAR, chunk_id="chunk_0"), Chunk(content=OTHER, chunk_id="chunk_1")]
+        )
+
+        assert [c.chunk_id for c in kept] == ["chunk_1"]
+        assert report["duplicates"] == 1
+        assert report["bytes_saved"] == len(NEAR.encode("utf-8")) + 8 * 4
+
+        # Other knowledge bases are independent
+        kept, report = detector.process("kb_other", "doc2", [Chunk(content=NEAR, chunk_id="chunk_0")])
+        assert len(kept) == 1
+
+    def test_within_document(self):
+        """Test duplicates inside one batch are detected"""
+        detector = make_detector(action="link")
+
+        kept, report = detector.process(
+            "kb", "doc1", [Chunk(content=BASE, chunk_id="chunk_0"), Chunk(content=BASE, chunk_id="chunk_1")]
+        )
+
+        assert [c.chunk_id for c in kept] == ["chunk_0"]
+        assert report["links"] == [{"chunk_id": "chunk_1", "duplicate_of": "doc1:chunk_0", "similarity": 1.0}]
+
+    def test_downweight(self):
+        """Test down-weighted duplicates are kept with a score weight"""
+        detector = make_detector(action="downweight", downweight=0.3)
+        detector.process("kb", "doc1", [Chunk(content=BASE, chunk_id="chunk_0")])
+
+        kept, report = detector.process("kb", "doc2", [Chunk(content=NEAR, chunk_id="chunk_0", metadata={"a": 1})])
+
+        assert len(kept) == 1
+        assert kept[0].metadata == {"a": 1, "near_duplicate_of": "doc1:chunk_0", "score_weight": 0.3}
+        assert report["bytes_saved"] == 0
+
+    def test_remove_document(self):
+        """Test deleted documents no longer match"""
+        detector = make_detector()
+        detector.process("kb", "doc1", [Chunk(content=BASE, chunk_id="chunk_0")])
+
+        assert detector.remove_document("kb", "doc1") == 1
+        kept, _report = detector.process("kb", "doc2", [Chunk(content=NEAR, chunk_id="chunk_0")])
+
+        assert len(kept) == 1
+        assert detector.get_stats()["indexed_chunks"] == 1
+
+    def test_redis_index_shared_across_processes(self):
+        """Test detectors on a shared Redis index see each other's chunks and deletions"""
+        redis = RedisOperations(InMemoryRedis())
+        worker_a, worker_b, server = (make_detector(redis={"enabled": True}) for _ in range(3))
+        for detector in (worker_a, worker_b, server):
+            detector._redis = redis
+
+        worker_a.process("kb", "doc1", [Chunk(content=BASE, chunk_id="chunk_0")])
+        kept, report = worker_b.process("kb", "doc2", [Chunk(content=NEAR, chunk_id="chunk_0")])
+        assert kept == [] and report["duplicates"] == 1
+
+        assert server.remove_document("kb", "doc1") == 1
+        kept, _report = worker_a.process("kb", "doc3", [Chunk(content=NEAR, chunk_id="chunk_0")])
+        assert len(kept) == 1
+        assert worker_b.get_stats()["indexed_chunks"] == 1
+
+        server.drop_kb("kb")
+        kept, _report = worker_b.process("kb", "doc4", [Chunk(content=NEAR, chunk_id="chunk_0")])
+        assert len(kept) == 1
+
+    def test_invalid_config(self):
+        """Test invalid action and band layout are rejected"""
+        with pytest.raises(ValueError):
+            make_detector(action="merge")
+        with pytest.raises(ValueError):
+            make_detector(num_perm=64, bands=10)
@@ -0,0 +1,180 @@
+"""Incremental Re-indexing Unit Tests"""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from services.rag_pipeline.chunker.text_chunker import Chunk
+from services.rag_pipeline.ingest.incremental import assign_content_ids, stale_parent_keys
+from services.rag_pipeline.pipeline import RAGPipeline
+
+PARAGRAPHS = [f"Paragraph {i} talks about topic number {i} in some detail." for i in range(6)]
+
+
+def embed_passthrough(chunks):
+    return [
+        {"chunk_id": c.chunk_id, "content": c.content, "embedding": [0.1], "metadata": c.metadata}
+        for c in chunks
+    ]
+
+
+class FakeVectorStore:
+    """Rows keyed by (doc_id, chunk_id)"""
+
+    def __init__(self):
+        self.rows = {}
+
+    def insert(self, chunks, collection_name=None, kb_id="default"):
+        for chunk in chunks:
+            self.rows[(chunk["metadata"]["doc_id"], chunk["chunk_id"])] = chunk
+        return len(chunks)
+
+    def list_document_chunks(self, doc_id, kb_id, collection_name=None):
+        return [
+            {"chunk_id": chunk_id, "metadata": row["metadata"]}
+            for (row_doc, chunk_id), row in self.rows.items()
+            if row_doc == doc_id
+        ]
+
+    def delete(self, chunk_ids, collection_name=None, doc_id=None):
+        for chunk_id in chunk_ids:
+            self.rows.pop((doc_id, chunk_id), None)
+        return len(chunk_ids)
+
+
+@pytest.mark.unit
+class TestContentIds:
+    """Test assign_content_ids"""
+
+    def test_ids_survive_edits_elsewhere(self):
+        """Test unchanged chunks keep their IDs when another chunk changes"""
+        before = [Chunk(content=text, chunk_id=f"chunk_{i}") for i, text in enumerate(PARAGRAPHS)]
+        edited = PARAGRAPHS[:2] + ["A new paragraph."] + PARAGRAPHS[2:]
+        after = [Chunk(content=text, chunk_id=f"chunk_{i}") for i, text in enumerate(edited)]
+
+        assign_content_ids(before, "doc1", {})
+        assign_content_ids(after, "doc1", {})
+
+        assert {c.chunk_id for c in before} < {c.chunk_id for c in after}
+        other_doc = [Chunk(content=PARAGRAPHS[0], chunk_id="chunk_0")]
+        assign_content_ids(other_doc, "doc2", {})
+        assert other_doc[0].chunk_id != before[0].chunk_id
+
+    def test_repeats_and_parents(self):
+        """Test repeated content gets distinct IDs and children follow their parent's ID"""
+        chunks = [
+            Chunk(content="Header", chunk_id="parent_0", metadata={"chunk_type": "parent"}),
+            Chunk(content="Header", chunk_id="child_0_0", parent_id="parent_0", metadata={"chunk_type": "child"}),
+            Chunk(content="Same", chunk_id="parent_1", metadata={"chunk_type": "parent"}),
+            Chunk(content="Same", chunk_id="parent_2", metadata={"chunk_type": "parent"}),
+        ]
+        assign_content_ids(chunks, "doc1", {})
+
+        ids = [c.chunk_id for c in chunks]
+        assert len(set(ids)) == 4
+        assert chunks[1].parent_id == chunks[0].chunk_id
+        assert ids[3] == f"{ids[2]}_1"
+
+    def test_stale_parent_keys(self):
+        """Test parents no chunk of the new version points to are reported"""
+        indexed = {"a": {"parent_key": "kb:doc:p1"}, "b": {"parent_key": "kb:doc:p2"}, "c": {}}
+
+        assert stale_parent_keys(indexed, ["kb:doc:p2", "kb:doc:p3"]) == {"kb:doc:p1"}
+
+
+@pytest.mark.unit
+class TestIncrementalReindex:
+    """Test re-indexing a changed document through the pipeline"""
+
+    @pytest.fixture
+    def pipeline(self):
+        config = {
+            "chunking": {"strategy": "simple", "child": {"size": 80, "overlap": 0}},
+            "ingestion": {"incremental": {"enabled": True}},
+        }
+        with patch("services.rag_pipeline.pipeline.VectorStore"):
+            pipeline = RAGPipeline(config)
+        pipeline.vector_store = FakeVectorStore()
+        pipeline.embedder.embed_chunks = AsyncMock(side_effect=embed_passthrough)
+        pipeline.retriever.index_documents = Mock()
+        pipeline.retriever.remove_chunks = Mock(return_value=0)
+        return pipeline
+
+    def embedded(self, pipeline):
+        return [c.content for call in pipeline.embedder.embed_chunks.call_args_list for c in call[0][0]]
+
+    @pytest.mark.asyncio
+    async def test_only_changed_chunks_are_embedded(self, pipeline):
+        """Test a re-index embeds new chunks, deletes removed ones and keeps the rest"""
+        first = await pipeline.ingest_text("\n\n".join(PARAGRAPHS), "doc1", kb_id="kb_a")
+        assert first["chunks_reused"] == 0
+        assert len(pipeline.vector_store.rows) == first["chunks_created"] == len(PARAGRAPHS)
+
+        pipeline.embedder.embed_chunks.reset_mock()
+        edited = PARAGRAPHS[:3] + ["Paragraph 3 was rewritten entirely for the new version."] + PARAGRAPHS[5:]
+        result = await pipeline.ingest_text("\n\n".join(edited), "doc1", kb_id="kb_a")
+
+        assert result["status"] == "success"
+        assert self.embedded(pipeline) == [edited[3]]
+        assert result["chunks_inserted"] == 1
+        assert result["chunks_reused"] == 4
+        assert result["chunks_deleted"] == 2
+        assert sorted(row["content"] for row in pipeline.vector_store.rows.values()) == sorted(edited)
+        removed = pipeline.retriever.remove_chunks.call_args[0][0]
+        assert len(removed) == 2
+
+    @pytest.mark.asyncio
+    async def test_unchanged_document_is_not_embedded(self, pipeline):
+        """Test re-indexing identical content does no embedding or deletion"""
+        await pipeline.ingest_text("\n\n".join(PARAGRAPHS), "doc1", kb_id="kb_a")
+        pipeline.embedder.embed_chunks.reset_mock()
+
+        result = await pipeline.ingest_text("\n\n".join(PARAGRAPHS), "doc1", kb_id="kb_a")
+
+        pipeline.embedder.embed_chunks.assert_not_called()
+        assert result["chunks_reused"] == len(PARAGRAPHS)
+        assert result["chunks_deleted"] == 0
+
+    @pytest.mark.asyncio
+    async def test_unreadable_index_fails_the_job(self, pipeline):
+        """Test the job fails rather than duplicating chunks when the indexed set is unknown"""
+        pipeline.vector_store.list_document_chunks = Mock(return_value=None)
+
+        result = await pipeline.ingest_text("\n\n".join(PARAGRAPHS), "doc1", kb_id="kb_a")
+
+        assert result["status"] == "error"
+        pipeline.embedder.embed_chunks.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_insert_keeps_previous_version(self, pipeline):
+        """Test a vector store write failure fails the job without deleting the old chunks"""
+        await pipeline.ingest_text("\n\n".join(PARAGRAPHS), "doc1", kb_id="kb_a")
+        before = dict(pipeline.vector_store.rows)
+
+        # VectorStore.insert logs write errors and returns 0
+        pipeline.vector_store.insert = Mock(return_value=0)
+        edited = ["A replacement opening paragraph."] + PARAGRAPHS[1:]
+        result = await pipeline.ingest_text("\n\n".join(edited), "doc1", kb_id="kb_a")
+
+        assert result["status"] == "error"
+        assert pipeline.vector_store.rows == before
+        pipeline.retriever.remove_chunks.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_stale_parents_removed_from_doc_store(self, pipeline, tmp_path):
+        """Test parents of changed sections are replaced in the doc store"""
+        pipeline.config["parent_store"] = {"enabled": True, "path": str(tmp_path / "parents.sqlite3")}
+        pipeline.doc_store = type(pipeline.doc_store)(pipeline.config)
+        pipeline.chunker.strategy = "parent_child"
+        pipeline.chunker.parent_size, pipeline.chunker.parent_overlap = 130, 0
+
+        await pipeline.ingest_text("\n\n".join(PARAGRAPHS), "doc1", kb_id="kb_a")
+        before = {row["metadata"]["parent_key"] for row in pipeline.vector_store.rows.values()}
+
+        edited = ["An opening paragraph that replaces the first one."] + PARAGRAPHS[1:]
+        await pipeline.ingest_text("\n\n".join(edited), "doc1", kb_id="kb_a")
+        after = {row["metadata"]["parent_key"] for row in pipeline.vector_store.rows.values()}
+
+        assert before & after and before - after
+        stored = await pipeline.doc_store.get_many(sorted(before | after))
+        assert set(stored) == after
+        pipeline.doc_store.close()
@@ -0,0 +1,157 @@
+"""Ingestion Job Queue Unit Tests"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from services.rag_pipeline.database import Base, IngestionJob
+from services.rag_pipeline.ingest.job_queue import JobQueue
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine, tables=[IngestionJob.__table__])
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+@pytest.fixture
+def queue(session_factory):
+    return JobQueue(
+        {"ingestion": {"jobs": {"max_attempts": 2, "backoff_seconds": 10, "lease_seconds": 60}}},
+        session_factory=session_factory,
+    )
+
+
+def age_heartbeat(session_factory, job_id, seconds):
+    with session_factory() as db:
+        job = db.get(IngestionJob, job_id)
+        job.heartbeat_at = datetime.utcnow() - timedelta(seconds=seconds)
+        db.commit()
+
+
+def make_due(session_factory, job_id):
+    with session_factory() as db:
+        db.get(IngestionJob, job_id).next_run_at = datetime.utcnow()
+        db.commit()
+
+
+@pytest.mark.unit
+class TestJobQueue:
+    """Test JobQueue"""
+
+    def test_enqueue_requires_file_or_text(self, queue):
+        """Test a job ingests exactly one of a file and a text"""
+        with pytest.raises(ValueError):
+            queue.enqueue("kb_a", "doc1")
+        with pytest.raises(ValueError):
+            queue.enqueue("kb_a", "doc1", file_path="/tmp/a.pdf", text="a")
+
+    def test_claim_runs_each_job_once(self, queue):
+        """Test claimed jobs are running and not handed out again"""
+        first = queue.enqueue("kb_a", "doc1", file_path="/tmp/a.pdf")
+        second = queue.enqueue("kb_a", "doc2", text="hello")
+
+        claimed = [queue.claim("w1"), queue.claim("w2")]
+
+        assert [job["id"] for job in claimed] == [first["id"], second["id"]]
+        assert all(job["status"] == "running" and job["attempts"] == 1 for job in claimed)
+        assert queue.claim("w3") is None
+
+    def test_progress_and_completion(self, queue):
+        """Test heartbeats record progress and only the owner completes the job"""
+        job = queue.enqueue("kb_a", "doc1", file_path="/tmp/a.pdf")
+        queue.claim("w1")
+
+        assert queue.heartbeat(job["id"], "w1", {"chunks_embedded": 64}) is False
+        assert queue.get(job["id"])["progress"] == {"chunks_embedded": 64}
+        assert queue.complete(job["id"], "w2", {}) is False
+        assert queue.complete(job["id"], "w1", {"chunks_created": 100}) is True
+
+        done = queue.get(job["id"])
+        assert done["status"] == "succeeded"
+        assert done["result"] == {"chunks_created": 100}
+
+    def test_retry_with_backoff_then_fail(self, queue, session_factory):
+        """Test a failed attempt is retried after the backoff until max_attempts"""
+        job = queue.enqueue("kb_a", "doc1", file_path="/tmp/a.pdf")
+        queue.claim("w1")
+
+        assert queue.fail(job["id"], "w1", "embedding service down") == "queued"
+        retry = queue.get(job["id"])
+        assert retry["error"] == "embedding service down"
+        assert datetime.fromisoformat(retry["next_run_at"]) > datetime.utcnow() + timedelta(seconds=5)
+        assert queue.claim("w1") is None
+
+        make_due(session_factory, job["id"])
+        assert queue.claim("w1")["attempts"] == 2
+        assert queue.fail(job["id"], "w1", "embedding service down") == "failed"
+        assert queue.get(job["id"])["finished_at"] is not None
+
+    def test_cancel(self, queue):
+        """Test a queued job is cancelled at once and a running one is flagged"""
+        running = queue.enqueue("kb_a", "doc1", file_path="/tmp/a.pdf")
+        queued = queue.enqueue("kb_a", "doc2", file_path="/tmp/b.pdf")
+        queue.claim("w1")
+
+        assert queue.cancel(running["id"])["status"] == "running"
+        assert queue.heartbeat(running["id"], "w1", {}) is True
+        assert queue.mark_cancelled(running["id"], "w1") is True
+        assert queue.get(running["id"])["status"] == "cancelled"
+
+        assert queue.cancel(queued["id"])["status"] == "cancelled"
+        assert queue.claim("w1") is None
+        assert queue.cancel("missing") is None
+
+    def test_cancel_active_jobs_of_document_and_kb(self, queue):
+        """Test deleting a document or KB cancels its unfinished jobs"""
+        running = queue.enqueue("kb_a", "doc1", file_path="/tmp/a.pdf")
+        queue.claim("w1")
+        queued = queue.enqueue("kb_a", "doc1", text="new text")
+        other_doc = queue.enqueue("kb_a", "doc2", text="other")
+        other_kb = queue.enqueue("kb_b", "doc3", text="other")
+
+        cancelled = queue.cancel_active("kb_a", "doc1")
+
+        assert {job["id"] for job in cancelled} == {running["id"], queued["id"]}
+        assert queue.get(queued["id"])["status"] == "cancelled"
+        # The running job is stopped by its worker, and cannot complete
+        assert queue.complete(running["id"], "w1", {}) is False
+        assert queue.get(other_doc["id"])["status"] == "queued"
+
+        # The running job stays flagged until its worker stops it
+        assert {job["id"] for job in queue.cancel_active("kb_a")} == {running["id"], other_doc["id"]}
+        assert queue.get(other_kb["id"])["status"] == "queued"
+
+    def test_stale_lease_reclaimed(self, queue, session_factory):
+        """Test a job whose worker stopped heartbeating is taken over"""
+        job = queue.enqueue("kb_a", "doc1", file_path="/tmp/a.pdf")
+        queue.claim("w1")
+        age_heartbeat(session_factory, job["id"], 120)
+
+        reclaimed = queue.claim("w2")
+
+        assert reclaimed["worker_id"] == "w2"
+        assert reclaimed["attempts"] == 2
+        # The old worker lost its lease
+        assert queue.heartbeat(job["id"], "w1", {}) is True
+        assert queue.complete(job["id"], "w1", {}) is False
+
+        age_heartbeat(session_factory, job["id"], 120)
+        assert queue.claim("w3") is None
+        assert queue.get(job["id"])["status"] == "failed"
+
+    def test_list_and_counts(self, queue):
+        """Test jobs are filtered by KB and status and counted by status"""
+        queue.enqueue("kb_a", "doc1", file_path="/tmp/a.pdf")
+        queue.enqueue("kb_b", "doc2", file_path="/tmp/b.pdf")
+        queue.claim("w1")
+
+        assert [job["doc_id"] for job in queue.list(kb_id="kb_b")] == ["doc2"]
+        assert [job["doc_id"] for job in queue.list(status="running")] == ["doc1"]
+        assert queue.count_by_status() == {"running": 1, "queued": 1}
@@ -0,0 +1,44 @@
+"""PDF Stream Helper Unit Tests"""
+
+import pytest
+from services.rag_pipeline.chunker.text_chunker import TextChunker
+from services.rag_pipeline.ingest.pdf_stream import annotate_window, next_chunk_index
+
+
+@pytest.mark.unit
+class TestPdfStream:
+    """Test page-window helpers"""
+
+    @pytest.fixture
+    def window(self):
+        content = "a" * 40 + "\n\n" + "b" * 40
+        return {"content": content, "offset": 100, "pages": [(7, 0, 40), (8, 42, 82)], "page_count": 9}
+
+    def test_annotate_window(self, window):
+        """Test chunks get page ranges and document-level offsets"""
+        chunker = TextChunker({"chunking": {"strategy": "simple", "child": {"size": 50, "overlap": 0}}})
+        chunks = chunker.chunk(window["content"])
+
+        annotate_window(chunks, window)
+
+        assert [(c.metadata["page_start"], c.metadata["page_end"]) for c in chunks] == [(7, 7), (8, 8)]
+        assert chunks[1].metadata["char_start"] == 142
+        assert chunks[1].metadata["char_end"] == 182
+
+    def test_next_chunk_index(self, window):
+        """Test chunk numbering continues across windows"""
+        chunker = TextChunker({
+            "chunking": {
+                "strategy": "parent_child",
+                "parent": {"size": 50, "overlap": 0},
+                "child": {"size": 20, "overlap": 0},
+            }
+        })
+        first = chunker.chunk(window["content"])
+        start = next_chunk_index(first, 0)
+        second = chunker.chunk(window["content"], start_index=start)
+
+        assert start == 2
+        assert second[0].chunk_id == "parent_2"
+        assert second[1].chunk_id == "child_2_0"
+        assert next_chunk_index([], 5) == 5
@@ -0,0 +1,79 @@
+"""Preprocess Pool Unit Tests"""
+
+import pytest
+from services.rag_pipeline.ingest.preprocess import PreprocessPool
+
+
+@pytest.mark.unit
+class TestPreprocessPool:
+    """Test PreprocessPool"""
+
+    @pytest.fixture
+    def config(self):
+        return {
+            "chunking": {
+                "strategy": "parent_child",
+                "parent": {"size": 200, "overlap": 0},
+                "child": {"size": 60, "overlap": 0},
+            }
+        }
+
+    @pytest.fixture
+    def document(self, tmp_path):
+        path = tmp_path / "doc.txt"
+        path.write_text("这是一段测试文本。" * 60, encoding="utf-8")
+        return str(path)
+
+    @pytest.mark.asyncio
+    async def test_in_process(self, config, document):
+        """Test loading and chunking without worker processes"""
+        pool = PreprocessPool(config)
+
+        doc, chunks = await pool.process(document, {"source": "test"}, kb_id="kb_a")
+
+        assert doc["type"] == "text"
+        assert doc["metadata"]["kb_id"] == "kb_a"
+        assert doc["metadata"]["source"] == "test"
+        assert chunks and all(c.metadata["kb_id"] == "kb_a" for c in chunks)
+
+    @pytest.mark.asyncio
+    async def test_worker_pool_matches_in_process(self, config, document):
+        """Test worker processes return the same chunks as in-process chunking"""
+        expected_doc, expected = await PreprocessPool(config).process(document, {"source": "test"}, "kb_a")
+
+        pool = PreprocessPool({**config, "ingestion": {"preprocess": {"workers": 1}}})
+        try:
+            doc, chunks = await pool.process(document, {"source": "test"}, "kb_a")
+        finally:
+            pool.shutdown()
+
+        assert doc == expected_doc
+        assert chunks == expected
+
+    @pytest.mark.asyncio
+    async def test_worker_pool_propagates_errors(self, config, tmp_path):
+        """Test loader errors in a worker surface to the caller"""
+        pool = PreprocessPool({**config, "ingestion": {"preprocess": {"workers": 1}}})
+        try:
+            with pytest.raises(FileNotFoundError):
+                await pool.process(str(tmp_path / "missing.txt"))
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_chunk_in_worker_matches_in_process(self, config):
+        """Test chunking loaded text in a worker gives the in-process chunks"""
+        doc = {"content": "这是一段测试文本。" * 60, "pages": [(1, 0, 300), (2, 300, 540)], "offset": 10}
+        metadata = {"kb_id": "kb_a", "doc_id": "doc1"}
+        expected = await PreprocessPool(config).chunk(doc, metadata, start_index=3)
+
+        pool = PreprocessPool({**config, "ingestion": {"preprocess": {"workers": 1}}})
+        try:
+            chunks = await pool.chunk(doc, metadata, start_index=3)
+        finally:
+            pool.shutdown()
+
+        assert chunks == expected
+        assert chunks[0].metadata["parent_index"] == 3
+        assert chunks[0].metadata["char_start"] == 10
+        assert chunks[-1].metadata["page_end"] == 2
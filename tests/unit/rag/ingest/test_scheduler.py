@@ -0,0 +1,148 @@
+"""Fair Scheduler Unit Tests"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from services.rag_pipeline.ingest.scheduler import FairScheduler
+from services.rag_pipeline.pipeline import RAGPipeline
+
+
+def make_scheduler(max_documents, max_per_kb):
+    return FairScheduler({
+        "ingestion": {"scheduler": {"max_documents": max_documents, "max_documents_per_kb": max_per_kb}}
+    })
+
+
+@pytest.mark.unit
+class TestFairScheduler:
+    """Test FairScheduler"""
+
+    @pytest.mark.asyncio
+    async def test_caps(self):
+        """Test the global and per-KB limits are never exceeded"""
+        scheduler = make_scheduler(max_documents=3, max_per_kb=2)
+        peak = {"total": 0, "kb_a": 0}
+
+        async def work(kb_id):
+            async with scheduler.slot(kb_id):
+                peak["total"] = max(peak["total"], scheduler.total_active)
+                peak[kb_id] = max(peak.get(kb_id, 0), scheduler.active[kb_id])
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(work("kb_a") for _ in range(6)), *(work("kb_b") for _ in range(3)))
+
+        assert peak["total"] == 3
+        assert peak["kb_a"] == 2
+        assert scheduler.get_stats()["active"] == 0
+        assert scheduler.get_stats()["admitted"] == 9
+
+    @pytest.mark.asyncio
+    async def test_round_robin_across_kbs(self):
+        """Test a KB that arrives behind a bulk import is served in the next free slot"""
+        scheduler = make_scheduler(max_documents=1, max_per_kb=1)
+        order = []
+        release = asyncio.Event()
+
+        async def work(kb_id, n):
+            async with scheduler.slot(kb_id):
+                order.append(f"{kb_id}{n}")
+                if not release.is_set():
+                    await release.wait()
+
+        bulk = [asyncio.ensure_future(work("a", n)) for n in range(4)]
+        await asyncio.sleep(0)
+        others = [asyncio.ensure_future(work("b", 0)), asyncio.ensure_future(work("c", 0))]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*bulk, *others)
+
+        assert order == ["a0", "a1", "b0", "c0", "a2", "a3"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_frees_its_place(self):
+        """Test cancelling a waiting document neither leaks nor blocks slots"""
+        scheduler = make_scheduler(max_documents=1, max_per_kb=1)
+        entered = []
+
+        async def work(name):
+            async with scheduler.slot("kb"):
+                entered.append(name)
+                await asyncio.sleep(0.01)
+
+        first = asyncio.ensure_future(work("first"))
+        await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(work("cancelled"))
+        last = asyncio.ensure_future(work("last"))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await asyncio.gather(first, last, waiting, return_exceptions=True)
+
+        assert entered == ["first", "last"]
+        assert scheduler.get_stats()["active"] == 0
+        assert scheduler.get_stats()["waiting_by_kb"] == {}
+
+
+@pytest.mark.unit
+class TestConcurrentIngest:
+    """Test multi-document ingestion through the scheduler"""
+
+    @pytest.fixture
+    def pipeline(self):
+        config = {
+            "chunking": {"strategy": "simple", "child": {"size": 100, "overlap": 0}},
+            "ingestion": {"scheduler": {"max_documents": 4, "max_documents_per_kb": 2}},
+        }
+        with patch("services.rag_pipeline.pipeline.VectorStore"):
+            pipeline = RAGPipeline(config)
+        pipeline.embedder.embed_chunks = AsyncMock(side_effect=lambda chunks: [
+            {"chunk_id": c.chunk_id, "content": c.content, "embedding": [0.1], "metadata": c.metadata}
+            for c in chunks
+        ])
+        pipeline.vector_store.insert = Mock(side_effect=lambda chunks, *args, **kwargs: len(chunks))
+        pipeline.retriever.index_documents = Mock()
+        return pipeline
+
+    @pytest.fixture
+    def files(self, tmp_path):
+        paths = []
+        for i in range(6):
+            path = tmp_path / f"doc{i}.txt"
+            path.write_text(f"Document {i} content. " * 5, encoding="utf-8")
+            paths.append(str(path))
+        return paths
+
+    @pytest.mark.asyncio
+    async def test_documents_run_concurrently_within_cap(self, pipeline, files):
+        """Test documents of one KB overlap up to the per-KB cap"""
+        running = {"now": 0, "peak": 0}
+        load = pipeline.loader.load
+
+        async def slow_load(path):
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            await asyncio.sleep(0.02)
+            running["now"] -= 1
+            return await load(path)
+
+        pipeline.loader.load = slow_load
+        results = await pipeline.ingest_documents(files, kb_id="kb_a")
+
+        assert [r["file_path"] for r in results] == files
+        assert all(r["status"] == "success" for r in results)
+        assert running["peak"] == 2
+
+    @pytest.mark.asyncio
+    async def test_results_stream_in_completion_order(self, pipeline, files):
+        """Test each result is yielded as its document finishes"""
+        load = pipeline.loader.load
+
+        async def load_slow_first(path):
+            if path == files[0]:
+                await asyncio.sleep(0.05)
+            return await load(path)
+
+        pipeline.loader.load = load_slow_first
+        finished = [r["file_path"] async for r in pipeline.iter_ingest_documents(files[:2], kb_id="kb_a")]
+
+        assert finished == [files[1], files[0]]
@@ -0,0 +1,146 @@
+"""Staged Ingestion Unit Tests"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from services.rag_pipeline.ingest.stages import StagedIngestor, IngestJob
+from services.rag_pipeline.pipeline import RAGPipeline
+
+
+def embed_passthrough(chunks):
+    return [
+        {"chunk_id": c.chunk_id, "content": c.content, "embedding": [0.1], "metadata": c.metadata}
+        for c in chunks
+    ]
+
+
+@pytest.mark.unit
+class TestStagedIngestor:
+    """Test StagedIngestor"""
+
+    @pytest.fixture
+    def make_pipeline(self):
+        def _make(**stages):
+            config = {
+                "chunking": {"strategy": "simple", "child": {"size": 40, "overlap": 0}},
+                "ingestion": {"stages": stages},
+            }
+            with patch("services.rag_pipeline.pipeline.VectorStore"):
+                pipeline = RAGPipeline(config)
+            pipeline.embedder.embed_chunks = AsyncMock(side_effect=embed_passthrough)
+            pipeline.vector_store.insert = Mock(side_effect=lambda chunks, *args, **kwargs: len(chunks))
+            pipeline.retriever.index_documents = Mock()
+            return pipeline
+        return _make
+
+    @pytest.fixture
+    def files(self, tmp_path):
+        paths = []
+        for name in ("a", "b"):
+            path = tmp_path / f"{name}.txt"
+            path.write_text(f"Document {name} sentence number {{}}. " * 30, encoding="utf-8")
+            paths.append(str(path))
+        return paths
+
+    def test_concurrency_config(self):
+        """Test per-stage concurrency overrides the defaults"""
+        ingestor = StagedIngestor({"ingestion": {"stages": {"concurrency": {"embed": 8}, "queue_size": 3}}})
+
+        assert ingestor.stages["embed"].concurrency == 8
+        assert ingestor.stages["load"].concurrency == 2
+        assert ingestor.stages["insert"].queue.maxsize == 3
+
+    @pytest.mark.asyncio
+    async def test_batches_flow_through_all_stages(self, make_pipeline):
+        """Test a document is split into batches that are embedded, inserted and indexed"""
+        pipeline = make_pipeline(batch_size=2)
+
+        result = await pipeline.ingest_text("word " * 60, "doc1", kb_id="kb_a")
+
+        assert result["status"] == "success"
+        assert result["chunks_inserted"] == result["chunks_created"]
+        batches = pipeline.embedder.embed_chunks.call_count
+        assert batches == -(-result["chunks_created"] // 2)
+        assert pipeline.retriever.index_documents.call_count == batches
+
+        stats = pipeline.get_stats()["ingestion"]
+        assert stats["load"]["items"] == 1
+        assert stats["embed"]["items"] == batches
+        assert stats["keyword"]["chunks"] == result["chunks_created"]
+        assert all(s["queue_depth"] == 0 and s["active"] == 0 for s in stats.values())
+
+    @pytest.mark.asyncio
+    async def test_loading_overlaps_embedding(self, make_pipeline, files):
+        """Test the next document is loaded while the previous one is embedded"""
+        pipeline = make_pipeline(concurrency={"load": 1, "embed": 1})
+        events = []
+        load = pipeline.loader.load
+
+        async def tracked_load(path):
+            events.append(("load", path))
+            return await load(path)
+
+        async def slow_embed(chunks):
+            events.append(("embed_start", chunks[0].metadata["file_name"]))
+            await asyncio.sleep(0.05)
+            events.append(("embed_end", chunks[0].metadata["file_name"]))
+            return embed_passthrough(chunks)
+
+        pipeline.loader.load = tracked_load
+        pipeline.embedder.embed_chunks = AsyncMock(side_effect=slow_embed)
+
+        results = await pipeline.ingest_documents(files, kb_id="kb_a")
+
+        assert [r["status"] for r in results] == ["success", "success"]
+        first_embed_end = events.index(("embed_end", "a.txt"))
+        assert events.index(("load", files[1])) < first_embed_end
+
+    @pytest.mark.asyncio
+    async def test_bounded_queues(self, make_pipeline):
+        """Test queues never hold more than queue_size items and producers wait"""
+        pipeline = make_pipeline(batch_size=1, queue_size=2, concurrency={"embed": 1})
+
+        async def slow_embed(chunks):
+            await asyncio.sleep(0.01)
+            return embed_passthrough(chunks)
+
+        pipeline.embedder.embed_chunks = AsyncMock(side_effect=slow_embed)
+        result = await pipeline.ingest_text("word " * 60, "doc1", kb_id="kb_a")
+
+        assert result["chunks_created"] > 4
+        embed = pipeline.ingestor.get_stats()["embed"]
+        assert embed["peak_queue_depth"] == 2
+        assert embed["producer_wait_seconds"] > 0
+        assert pipeline.ingestor.get_stats()["chunk"]["blocked_seconds"] > 0
+
+    @pytest.mark.asyncio
+    async def test_stage_error_fails_job(self, make_pipeline):
+        """Test an error in one batch fails the document and drops its other batches"""
+        pipeline = make_pipeline(batch_size=1, concurrency={"embed": 1})
+        pipeline.embedder.embed_chunks = AsyncMock(side_effect=RuntimeError("embedding service down"))
+
+        result = await pipeline.ingest_text("word " * 60, "doc1", kb_id="kb_a")
+
+        assert result["status"] == "error"
+        assert "embedding service down" in result["error"]
+        assert pipeline.embedder.embed_chunks.call_count == 1
+        pipeline.vector_store.insert.assert_not_called()
+        assert pipeline.ingestor.get_stats()["embed"]["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_pdf_windows_chunked_in_order(self, make_pipeline, make_pdf):
+        """Test concurrent chunk workers keep window chunk numbering contiguous"""
+        pipeline = make_pipeline(concurrency={"chunk": 3})
+        path = make_pdf([f"Page {i}" for i in range(1, 7)])
+        pipeline.stream_window_pages = 1
+
+        job = await pipeline.ingestor.run(IngestJob("kb_a", file_path=str(path), stream=True))
+
+        assert job.error is None
+        assert job.windows == 6
+        inserted = sorted(
+            (chunk for call in pipeline.vector_store.insert.call_args_list for chunk in call[0][0]),
+            key=lambda c: c["metadata"]["page_start"],
+        )
+        assert [c["chunk_id"] for c in inserted] == [f"chunk_{i}" for i in range(6)]
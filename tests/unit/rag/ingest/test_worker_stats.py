@@ -0,0 +1,87 @@
+"""Worker Stats Unit Tests"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from apps.shared.redis_client import InMemoryRedis, RedisOperations
+from services.rag_pipeline.ingest.worker_stats import WorkerStats
+from services.rag_pipeline.pipeline import RAGPipeline
+from services.rag_pipeline.worker import IngestionWorker
+
+
+def make_stats():
+    stats = WorkerStats({"ingestion": {"jobs": {"heartbeat_interval": 5.0}}})
+    stats._redis = RedisOperations(InMemoryRedis())
+    return stats
+
+
+def snapshot(items, peak, utilization, active_by_kb):
+    return {
+        "running_jobs": 1,
+        "stages": {
+            "embed": {
+                "concurrency": 2, "items": items, "chunks": items * 10, "errors": 0,
+                "peak_queue_depth": peak, "utilization": utilization, "busy_seconds": 1.5,
+            }
+        },
+        "scheduler": {"active": sum(active_by_kb.values()), "active_by_kb": active_by_kb, "waiting_by_kb": {}},
+        "parse_cache": {"enabled": True, "hits": items, "misses": 1, "hit_rate": 0.5},
+    }
+
+
+@pytest.mark.unit
+class TestWorkerStats:
+    """Test WorkerStats"""
+
+    @pytest.mark.asyncio
+    async def test_collect_combines_workers(self):
+        """Test the stats of all live workers are combined"""
+        stats = make_stats()
+        await stats.publish("w1", snapshot(3, peak=4, utilization=0.2, active_by_kb={"kb_a": 1}))
+        await stats.publish("w2", snapshot(5, peak=2, utilization=0.6, active_by_kb={"kb_a": 1, "kb_b": 2}))
+
+        combined = await stats.collect()
+
+        assert sorted(combined["workers"]) == ["w1", "w2"]
+        embed = combined["stages"]["embed"]
+        assert embed["items"] == 8 and embed["chunks"] == 80 and embed["concurrency"] == 4
+        assert embed["peak_queue_depth"] == 4
+        assert embed["utilization"] == 0.4
+        assert combined["scheduler"]["active"] == 4
+        assert combined["scheduler"]["active_by_kb"] == {"kb_a": 2, "kb_b": 2}
+        assert combined["parse_cache"]["hits"] == 8 and combined["parse_cache"]["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_and_removed_workers_dropped(self):
+        """Test workers that stopped reporting or shut down are left out"""
+        stats = make_stats()
+        await stats.publish("w1", snapshot(3, peak=1, utilization=0.1, active_by_kb={}))
+        await stats.publish("w2", snapshot(5, peak=1, utilization=0.1, active_by_kb={}))
+        await stats.publish("w3", snapshot(7, peak=1, utilization=0.1, active_by_kb={}))
+        old = json.loads(stats._redis.client.get(stats._worker_key("w2")))
+        old["updated_at"] -= 60
+        stats._redis.client.set(stats._worker_key("w2"), json.dumps(old))
+        await stats.remove("w3")
+
+        combined = await stats.collect()
+
+        assert list(combined["workers"]) == ["w1"]
+        assert combined["stages"]["embed"]["items"] == 3
+        assert await stats._redis.smembers(stats.workers_key) == {"w1"}
+
+    @pytest.mark.asyncio
+    async def test_worker_publishes_its_pipeline_stats(self):
+        """Test a worker reports the stats of its own pipeline"""
+        with patch("services.rag_pipeline.pipeline.VectorStore"):
+            pipeline = RAGPipeline({})
+        worker = IngestionWorker({}, pipeline=pipeline, queue=object(), worker_id="w1")
+        worker.stats = make_stats()
+        pipeline.ingestor.stages["embed"].items = 6
+
+        await worker.publish_stats()
+        combined = await worker.stats.collect()
+
+        assert combined["workers"]["w1"]["running_jobs"] == 0
+        assert combined["stages"]["embed"]["items"] == 6
+        assert set(combined["stages"]) == set(pipeline.ingestor.stages)
@@ -92,6 +92,102 @@ class TestDocumentLoaderFormats:
             assert "PowerPoint Content" in result["content"]
             assert result["metadata"]["slide_count"] == 1
 
+    @pytest.mark.asyncio
+    async def test_load_excel_row_group_segments(self, tmp_path):
+        import openpyxl
+
+        xlsx_path = tmp_path / "table.xlsx"
+        wb = openpyxl.Workbook()
+        sheet = wb.active
+        sheet.title = "Orders"
+        sheet.append(["id", "item"])
+        for i in range(5):
+            sheet.append([i, f"item {i}"])
+        wb.save(xlsx_path)
+
+        loader = DocumentLoader({"loader": {"excel": {"rows_per_segment": 2}}})
+        result = await loader.load(str(xlsx_path))
+
+        segments = result["segments"]
+        assert [s["metadata"]["row_start"] for s in segments] == [2, 4, 6]
+        assert result["metadata"]["segment_count"] == 3
+        for segment in segments:
+            text = result["content"][segment["start"]:segment["end"]]
+            # Every row group repeats the sheet name and header row
+            assert text.startswith("=== Sheet: Orders ===\nid\titem\n")
+        assert "item 4" in result["content"][segments[2]["start"]:segments[2]["end"]]
+
+    @pytest.mark.asyncio
+    async def test_load_powerpoint_slide_segments(self, loader, tmp_path):
+        pptx_path = tmp_path / "deck.pptx"
+        pptx_path.touch()
+
+        with patch.dict('sys.modules', {'pptx': MagicMock()}):
+            mock_pptx = sys.modules['pptx']
+            slides = []
+            for text in ["First slide", "Second slide"]:
+                shape = MagicMock()
+                shape.text = text
+                slide = MagicMock()
+                slide.shapes = [shape]
+                slides.append(slide)
+            mock_prs = MagicMock()
+            mock_prs.slides = slides
+            mock_pptx.Presentation.return_value = mock_prs
+
+            result = await loader.load(str(pptx_path))
+
+        segments = result["segments"]
+        assert [s["metadata"]["slide"] for s in segments] == [1, 2]
+        assert result["content"][segments[1]["start"]:segments[1]["end"]] == "=== Slide 2 ===\nSecond slide"
+
+    @pytest.mark.asyncio
+    async def test_iter_pdf_windows(self, loader, make_pdf):
+        """Test page windows reassemble into the whole-document content"""
+        path = make_pdf(["Page one", "", "Page three", "Page four", "Page five"])
+
+        windows = [w async for w in loader.iter_pdf_windows(path, 2)]
+        content = loader.parse("pdf", path, ".pdf")["content"]
+
+        assert [[p[0] for p in w["pages"]] for w in windows] == [[1], [3, 4], [5]]
+        for window in windows:
+            offset = window["offset"]
+            assert content[offset:offset + len(window["content"])] == window["content"]
+        page, start, end = windows[1]["pages"][1]
+        assert windows[1]["content"][start:end] == "Page four"
+        assert loader.pdf_page_count(path) == 5
+
+    def test_pdf_pages_release_file(self, make_pdf):
+        """Test page extraction leaves no file or mapping open in the process"""
+        import os
+        from services.rag_pipeline.loader import pdf_pages
+
+        path = make_pdf(["Page one", "Page two"])
+        before = len(os.listdir("/proc/self/fd"))
+
+        assert pdf_pages.page_count(path) == 2
+        assert pdf_pages.extract_pages(path, 1) == [(2, "Page two")]
+        assert len(os.listdir("/proc/self/fd")) == before
+
+    @pytest.mark.asyncio
+    async def test_load_pdf_parallel_pages(self, make_pdf):
+        """Test large PDFs are extracted in page ranges across workers, in page order"""
+        texts = [f"Page {i}" if i % 4 else "" for i in range(1, 13)]
+        path = make_pdf(texts)
+        loader = DocumentLoader({
+            "loader": {"pool": {"workers": 2}, "pdf": {"parallel_min_pages": 10, "pages_per_task": 4}}
+        })
+        try:
+            result = await loader.load(str(path))
+        finally:
+            await loader.close()
+
+        expected = DocumentLoader().parse("pdf", path, ".pdf")
+        assert result["content"] == expected["content"]
+        assert result["pages"] == expected["pages"]
+        assert [p[0] for p in result["pages"]] == [1, 2, 3, 5, 6, 7, 9, 10, 11]
+        assert result["metadata"]["page_count"] == 12
+
     @pytest.mark.asyncio
     async def test_load_html(self, loader, tmp_path):
         html_path = tmp_path / "test.html"
@@ -0,0 +1,147 @@
+"""OCR Pool Unit Tests"""
+
+import asyncio
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pytest
+from PIL import Image
+from services.rag_pipeline.loader.document_loader import DocumentLoader
+from services.rag_pipeline.loader.ocr_pool import OCRPool
+
+
+class FakeEngine:
+    """Stands in for PaddleOCR and records the image shapes it receives"""
+
+    def __init__(self):
+        self.shapes = []
+
+    def ocr(self, image, cls=True):
+        self.shapes.append(image.shape)
+        return [[[[0, 0], ("识别文字", 0.99)]]]
+
+
+def save_image(path, width, height, blank=False):
+    rng = np.random.default_rng(0)
+    if blank:
+        pixels = np.full((height, width, 3), 255, dtype=np.uint8)
+    else:
+        pixels = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(path)
+    return path
+
+
+@pytest.mark.unit
+class TestOCRPool:
+    """Test OCRPool"""
+
+    @pytest.fixture
+    async def pool(self):
+        pool = OCRPool({"loader": {"ocr": {"max_side": 500, "batch_wait_ms": 50}}})
+        pool._engine = FakeEngine()
+        pool._engine_loaded = True
+        yield pool
+        await pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_batches_and_filters(self, pool, tmp_path):
+        """Test concurrent images are batched, filtered and downscaled"""
+        paths = [
+            save_image(tmp_path / "text.png", 200, 100),
+            save_image(tmp_path / "tiny.png", 8, 8),
+            save_image(tmp_path / "blank.png", 200, 100, blank=True),
+            save_image(tmp_path / "large.png", 1000, 250),
+        ]
+
+        results = await asyncio.gather(*(pool.recognize(p) for p in paths))
+
+        assert results[0]["lines"] == ["识别文字"]
+        assert results[1] == {"lines": [], "skipped": "too_small"}
+        assert results[2] == {"lines": [], "skipped": "blank"}
+        assert results[3]["downscaled"] is True
+        # Only two images reach the engine, the large one at max_side
+        assert pool._engine.shapes == [(100, 200, 3), (125, 500, 3)]
+        assert pool.get_stats()["batches"] == 1
+        assert pool.get_stats()["skipped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_engine_loaded_once(self, tmp_path, monkeypatch):
+        """Test the models are loaded once for all images"""
+        created = []
+
+        def create(settings):
+            created.append(settings)
+            return FakeEngine(), None
+
+        monkeypatch.setattr("services.rag_pipeline.loader.ocr_pool._create_engine", create)
+        pool = OCRPool({"loader": {"ocr": {"batch_wait_ms": 0}}})
+        path = save_image(tmp_path / "text.png", 64, 64)
+        try:
+            for _ in range(3):
+                await pool.recognize(path)
+        finally:
+            await pool.shutdown()
+
+        assert len(created) == 1
+        assert pool.get_stats()["images"] == 3
+
+    @pytest.mark.asyncio
+    async def test_broken_pool_replaces_executor_only(self, tmp_path, monkeypatch):
+        """Test a dead worker fails its batch while the batcher keeps serving"""
+
+        class BrokenExecutor:
+            def __init__(self):
+                self.stopped = False
+
+            def submit(self, fn, *args):
+                raise BrokenProcessPool("worker died")
+
+            def shutdown(self, wait=True, cancel_futures=False):
+                self.stopped = True
+
+        class InlineExecutor(BrokenExecutor):
+            def submit(self, fn, *args):
+                future = Future()
+                future.set_result([{"lines": ["ok"]} for _ in args[0]])
+                return future
+
+        executors = [BrokenExecutor(), InlineExecutor()]
+        created = list(executors)
+        monkeypatch.setattr(
+            "services.rag_pipeline.loader.ocr_pool.ProcessPoolExecutor",
+            lambda **kwargs: created.pop(0),
+        )
+        pool = OCRPool({"loader": {"ocr": {"workers": 1, "batch_wait_ms": 0}}})
+        path = save_image(tmp_path / "text.png", 64, 64)
+        try:
+            with pytest.raises(BrokenProcessPool):
+                await pool.recognize(path)
+            batcher = pool._batcher
+            assert executors[0].stopped
+
+            result = await pool.recognize(path)
+
+            assert result == {"lines": ["ok"]}
+            assert pool._batcher is batcher and not batcher.done()
+        finally:
+            await pool.shutdown()
+
+        assert executors[1].stopped
+        assert not pool._batch_tasks
+
+    @pytest.mark.asyncio
+    async def test_loader_reports_skip(self, tmp_path):
+        """Test the loader records why an image produced no text"""
+        loader = DocumentLoader()
+        loader.ocr_pool._engine = FakeEngine()
+        loader.ocr_pool._engine_loaded = True
+        path = save_image(tmp_path / "blank.png", 100, 100, blank=True)
+        try:
+            result = await loader.load(str(path))
+        finally:
+            await loader.close()
+
+        assert result["content"] == ""
+        assert result["metadata"]["skipped"] == "blank"
+        assert result["metadata"]["lines_detected"] == 0
@@ -0,0 +1,126 @@
+"""Streaming OOXML Extraction Unit Tests"""
+
+import sys
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from services.rag_pipeline.loader import ooxml
+from services.rag_pipeline.loader.document_loader import DocumentLoader
+
+
+@pytest.mark.unit
+class TestOoxml:
+    """Test the iterparse fast path against the office libraries"""
+
+    @pytest.fixture
+    def fast(self):
+        return DocumentLoader()
+
+    @pytest.fixture
+    def fallback(self):
+        return DocumentLoader({"loader": {"ooxml_fast_path": False}})
+
+    @pytest.fixture
+    def docx_path(self, tmp_path):
+        import docx
+
+        document = docx.Document()
+        document.add_paragraph("第一段内容")
+        document.add_paragraph("")
+        paragraph = document.add_paragraph("Second ")
+        paragraph.add_run("paragraph").bold = True
+        table = document.add_table(rows=1, cols=1)
+        table.cell(0, 0).text = "Cell text"
+        document.add_paragraph("After table")
+        path = tmp_path / "doc.docx"
+        document.save(path)
+        return path
+
+    @pytest.fixture
+    def pptx_path(self, tmp_path):
+        from pptx import Presentation
+        from pptx.util import Inches
+
+        prs = Presentation()
+        for title in ("First slide", "Second slide"):
+            slide = prs.slides.add_slide(prs.slide_layouts[5])
+            slide.shapes.title.text = title
+            box = slide.shapes.add_textbox(Inches(1), Inches(2), Inches(4), Inches(1))
+            box.text_frame.text = f"Body of {title.lower()}"
+        prs.slides.add_slide(prs.slide_layouts[6])
+        path = tmp_path / "deck.pptx"
+        prs.save(path)
+        return path
+
+    @pytest.fixture
+    def xlsx_path(self, tmp_path):
+        import openpyxl
+
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = "数据"
+        ws.append(["name", "count", "price", "date"])
+        ws.append(["apple", 3, 1.5, datetime(2024, 5, 1)])
+        ws.append(["pear", 10, 2.25, datetime(2024, 5, 2, 12, 30)])
+        ws.append([])
+        ws.append(["plum", True, None, None])
+        wb.create_sheet("Empty")
+        path = tmp_path / "book.xlsx"
+        wb.save(path)
+        return path
+
+    def test_word_matches_python_docx(self, fast, fallback, docx_path):
+        """Test body paragraphs match python-docx (tables excluded)"""
+        result = fast.parse("word", docx_path, ".docx")
+        expected = fallback.parse("word", docx_path, ".docx")
+
+        assert result["metadata"]["extractor"] == "ooxml"
+        assert result["content"] == expected["content"] == "第一段内容\nSecond paragraph\nAfter table"
+        assert result["metadata"]["paragraph_count"] == expected["metadata"]["paragraph_count"]
+
+    def test_powerpoint_matches_python_pptx(self, fast, fallback, pptx_path):
+        """Test slide segments match python-pptx"""
+        result = fast.parse("powerpoint", pptx_path, ".pptx")
+        expected = fallback.parse("powerpoint", pptx_path, ".pptx")
+
+        assert result["metadata"]["extractor"] == "ooxml"
+        assert result["content"] == expected["content"]
+        assert result["segments"] == expected["segments"]
+        assert result["metadata"]["slide_count"] == expected["metadata"]["slide_count"] == 3
+
+    def test_excel_matches_openpyxl(self, fast, fallback, xlsx_path):
+        """Test row-group segments match openpyxl, including typed values"""
+        result = fast.parse("excel", xlsx_path, ".xlsx")
+        expected = fallback.parse("excel", xlsx_path, ".xlsx")
+
+        assert result["metadata"]["extractor"] == "ooxml"
+        assert result["segments"] == expected["segments"]
+        assert result["content"] == expected["content"]
+        assert "2024-05-02 12:30:00" in result["content"]
+        assert result["metadata"]["sheet_count"] == 2
+
+    def test_xlsx_rows_are_lazy(self, xlsx_path):
+        """Test rows stream with their sheet row numbers"""
+        sheets = ooxml.xlsx_sheets(xlsx_path)
+        name, rows = next(sheets)
+
+        assert name == "数据"
+        assert next(rows) == (1, ("name", "count", "price", "date"))
+        assert next(rows)[1][:3] == ("apple", 3, 1.5)
+        sheets.close()
+
+    def test_fallback_on_invalid_package(self, fast, tmp_path):
+        """Test non-zip files fall back to the office library"""
+        path = tmp_path / "broken.docx"
+        path.write_bytes(b"not a zip")
+
+        with patch.dict("sys.modules", {"docx": MagicMock()}):
+            paragraph = MagicMock()
+            paragraph.text = "From python-docx"
+            sys.modules["docx"].Document.return_value.paragraphs = [paragraph]
+
+            result = fast.parse("word", path, ".docx")
+
+        assert result["content"] == "From python-docx"
+        assert "extractor" not in result["metadata"]
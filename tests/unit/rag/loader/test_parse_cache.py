@@ -0,0 +1,121 @@
+"""Parse Cache Unit Tests"""
+
+import os
+
+import pytest
+from services.rag_pipeline.loader.document_loader import DocumentLoader
+from services.rag_pipeline.loader.parse_cache import ParseCache
+
+
+def cache_config(tmp_path, **loader_config):
+    return {"loader": {"cache": {"enabled": True, "path": str(tmp_path / "cache")}, **loader_config}}
+
+
+@pytest.mark.unit
+class TestParseCache:
+    """Test ParseCache"""
+
+    @pytest.fixture
+    def html_file(self, tmp_path):
+        path = tmp_path / "page.html"
+        path.write_text(
+            "<html><head><title>Cached</title></head><body><p>Body text</p></body></html>",
+            encoding="utf-8",
+        )
+        return path
+
+    @pytest.fixture
+    def count_parses(self, monkeypatch):
+        calls = []
+        original = DocumentLoader._parse_html
+
+        def parse_html(self, path, ext):
+            calls.append(path)
+            return original(self, path, ext)
+
+        monkeypatch.setattr(DocumentLoader, "_parse_html", parse_html)
+        return calls
+
+    def test_disabled_by_default(self):
+        """Test the cache is off unless configured"""
+        assert DocumentLoader().parse_cache.enabled is False
+
+    @pytest.mark.asyncio
+    async def test_second_load_skips_parsing(self, tmp_path, html_file, count_parses):
+        """Test loading the same content again is served from the cache"""
+        loader = DocumentLoader(cache_config(tmp_path))
+        first = await loader.load(str(html_file))
+
+        # Same bytes under another name, as when uploaded into another KB
+        copy = tmp_path / "other_upload.html"
+        copy.write_bytes(html_file.read_bytes())
+        second = await DocumentLoader(cache_config(tmp_path)).load(str(copy))
+
+        assert len(count_parses) == 1
+        assert second["content"] == first["content"]
+        assert second["metadata"]["title"] == "Cached"
+        assert second["metadata"]["file_name"] == "other_upload.html"
+        assert loader.parse_cache.get_stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_content_misses(self, tmp_path, html_file, count_parses):
+        """Test the key follows the file content, not its path"""
+        loader = DocumentLoader(cache_config(tmp_path))
+        await loader.load(str(html_file))
+        html_file.write_text("<html><body><p>Edited</p></body></html>", encoding="utf-8")
+        doc = await loader.load(str(html_file))
+
+        assert len(count_parses) == 2
+        assert "Edited" in doc["content"]
+
+    @pytest.mark.asyncio
+    async def test_loader_settings_are_part_of_key(self, tmp_path, html_file, count_parses, monkeypatch):
+        """Test a loader version or output setting change invalidates entries"""
+        await DocumentLoader(cache_config(tmp_path)).load(str(html_file))
+        await DocumentLoader(cache_config(tmp_path, excel={"rows_per_segment": 5})).load(str(html_file))
+        monkeypatch.setattr(DocumentLoader, "VERSION", DocumentLoader.VERSION + 1)
+        await DocumentLoader(cache_config(tmp_path)).load(str(html_file))
+
+        assert len(count_parses) == 3
+
+    @pytest.mark.asyncio
+    async def test_text_files_not_cached(self, tmp_path):
+        """Test plain text is read directly"""
+        path = tmp_path / "notes.txt"
+        path.write_text("plain text", encoding="utf-8")
+        loader = DocumentLoader(cache_config(tmp_path))
+        await loader.load(str(path))
+
+        assert loader.parse_cache.get_stats()["misses"] == 0
+        assert not (tmp_path / "cache").exists()
+
+    def test_failed_results_not_cached(self, tmp_path):
+        """Test results recording an OCR failure are retried next time"""
+        cache = ParseCache(cache_config(tmp_path))
+        cache.put("ab" * 32, {"content": "", "metadata": {"note": "paddleocr not installed"}})
+
+        assert cache.get("ab" * 32, tmp_path) is None
+
+    def test_corrupt_entry_is_dropped(self, tmp_path, html_file):
+        """Test an unreadable entry counts as a miss and is removed"""
+        cache = ParseCache(cache_config(tmp_path))
+        digest = cache.digest(html_file)
+        cache.put(digest, {"content": "x", "metadata": {}})
+        entry = next((tmp_path / "cache").glob("*/*.json.gz"))
+        entry.write_bytes(b"not gzip")
+
+        assert cache.get(digest, html_file) is None
+        assert not entry.exists()
+
+    def test_evicts_least_recently_used(self, tmp_path, html_file):
+        """Test the oldest entries are removed once over the size limit"""
+        cache = ParseCache(cache_config(tmp_path))
+        cache.max_size = 1  # bytes: keep only the entry just written
+
+        cache.put("aa" * 32, {"content": "first", "metadata": {}})
+        old = next((tmp_path / "cache").glob("*/*.json.gz"))
+        os.utime(old, (0, 0))
+        cache.put("bb" * 32, {"content": "second", "metadata": {}})
+
+        assert not old.exists()
+        assert cache.get("bb" * 32, html_file)["content"] == "second"
@@ -0,0 +1,67 @@
+"""Parse Pool Unit Tests"""
+
+import time
+from pathlib import Path
+
+import pytest
+from services.rag_pipeline.loader.document_loader import DocumentLoader
+from services.rag_pipeline.loader.parse_pool import ParsePool
+
+
+@pytest.mark.unit
+class TestParsePool:
+    """Test ParsePool"""
+
+    @pytest.fixture
+    def html_files(self, tmp_path):
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"page{i}.html"
+            path.write_text(
+                f"<html><head><title>Page {i}</title></head><body><p>Body {i}</p></body></html>",
+                encoding="utf-8",
+            )
+            paths.append(str(path))
+        return paths
+
+    def test_default_runs_in_threads(self):
+        """Test parsing stays in-process unless workers are configured"""
+        assert DocumentLoader().parse_pool.workers == 0
+        loader = DocumentLoader({"loader": {"pool": {"workers": 2}}}, use_pool=False)
+        assert loader.parse_pool.workers == 0
+
+    @pytest.mark.asyncio
+    async def test_load_batch_in_processes(self, html_files):
+        """Test batch loads are parsed by worker processes"""
+        loader = DocumentLoader({"loader": {"pool": {"workers": 2, "max_memory_mb": 1024}}})
+        try:
+            results = await loader.load_batch(html_files)
+        finally:
+            await loader.close()
+
+        assert [r["metadata"]["title"] for r in results] == ["Page 0", "Page 1", "Page 2"]
+        assert "Body 1" in results[1]["content"]
+
+    @pytest.mark.asyncio
+    async def test_timeout(self, html_files, monkeypatch):
+        """Test a parse that exceeds the timeout fails the load"""
+        loader = DocumentLoader({"loader": {"pool": {"timeout": 0.05}}})
+        monkeypatch.setattr(loader, "_parse_html", lambda path, ext: time.sleep(0.3))
+
+        with pytest.raises(TimeoutError):
+            await loader.load(html_files[0])
+        assert loader.parse_pool.get_stats()["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_restart(self, html_files):
+        """Test parsing continues on a fresh pool after a restart"""
+        pool = ParsePool({"loader": {"pool": {"workers": 1}}})
+        try:
+            await pool.run("html", Path(html_files[0]), ".html")
+            pool._restart()
+            result = await pool.run("html", Path(html_files[1]), ".html")
+        finally:
+            pool.shutdown()
+
+        assert result["metadata"]["title"] == "Page 1"
+        assert pool.get_stats()["restarts"] == 1
@@ -1,4 +1,5 @@
 """Reranker Unit Tests"""
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from services.rag_pipeline.retriever.reranker import Reranker, NoOpReranker
@@ -84,7 +85,7 @@ class TestReranker:
         }
 
         with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+            mock_client.return_value.post = AsyncMock(
                 return_value=mock_response
             )
 
@@ -100,7 +101,7 @@ class TestReranker:
         reranker = Reranker(config)
 
         with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+            mock_client.return_value.post = AsyncMock(
                 side_effect=Exception("API error")
             )
 
@@ -111,6 +112,103 @@ class TestReranker:
             assert results[0].chunk_id == "chunk_0"
             assert results[1].chunk_id == "chunk_1"
 
+    @pytest.mark.asyncio
+    async def test_client_reused_and_scores_cached(self, config, sample_results):
+        """Test one pooled client is reused and cached scores are not re-requested"""
+        reranker = Reranker(config)
+
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "output": {
+                "results": [
+                    {"index": 1, "relevance_score": 0.9},
+                    {"index": 0, "relevance_score": 0.5},
+                ]
+            }
+        }
+
+        with patch("httpx.AsyncClient") as mock_client:
+            post = AsyncMock(return_value=mock_response)
+            mock_client.return_value.post = post
+
+            await reranker.rerank("query", sample_results[:2], top_n=2)
+            results = await reranker.rerank("query", sample_results[:2], top_n=2)
+
+            assert mock_client.call_count == 1
+            assert post.call_count == 1
+            assert [r.chunk_id for r in results] == ["chunk_1", "chunk_0"]
+            assert reranker.get_stats()["cache_hits"] == 2
+
+            # Only the unseen candidate is sent
+            mock_response.json.return_value = {"output": {"results": [{"index": 0, "relevance_score": 0.7}]}}
+            results = await reranker.rerank("query", sample_results, top_n=3)
+
+            assert post.call_args.kwargs["json"]["documents"] == ["Third result about deep learning"]
+            assert [r.chunk_id for r in results] == ["chunk_1", "chunk_2", "chunk_0"]
+
+    @pytest.mark.asyncio
+    async def test_deadline_falls_back_to_fused_order(self, config, sample_results):
+        """Test a slow provider is abandoned at the deadline"""
+        config["reranker"]["deadline_ms"] = 20
+        reranker = Reranker(config)
+
+        async def slow_rerank(query, results, top_n):
+            await asyncio.sleep(0.2)
+            return results[::-1][:top_n]
+
+        reranker._rerank_qwen = slow_rerank
+
+        results = await reranker.rerank("query", sample_results, top_n=2)
+
+        assert [r.chunk_id for r in results] == ["chunk_0", "chunk_1"]
+        assert reranker.get_stats()["deadline_misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_sharded_rerank_merges_by_score(self, config):
+        """Test large candidate lists are scored in concurrent shards under the cap"""
+        config["reranker"].update({"shard_size": 4, "max_concurrency": 2, "max_doc_tokens": 0})
+        reranker = Reranker(config)
+        candidates = [
+            SearchResult(chunk_id=f"chunk_{i}", content=f"doc {i}", score=1.0 - i / 100) for i in range(10)
+        ]
+
+        in_flight = 0
+        peak = 0
+        shard_sizes = []
+
+        async def post_qwen(query, documents):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            shard_sizes.append(len(documents))
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            # Score grows with the document number, reversing the fused order
+            return [(idx, int(doc.split()[1]) / 10) for idx, doc in enumerate(documents)]
+
+        reranker._post_qwen = post_qwen
+
+        results = await reranker.rerank("query", candidates, top_n=3)
+
+        assert sorted(shard_sizes) == [2, 4, 4]
+        assert peak == 2
+        assert [r.chunk_id for r in results] == ["chunk_9", "chunk_8", "chunk_7"]
+
+    @pytest.mark.asyncio
+    async def test_candidates_truncated_to_token_budget(self, config, sample_results):
+        """Test candidate texts are cut to max_doc_tokens with the token counter"""
+        config["reranker"]["max_doc_tokens"] = 2
+        reranker = Reranker(config)
+
+        counter = MagicMock()
+        counter.truncate_text.side_effect = lambda text, max_tokens: " ".join(text.split()[:max_tokens])
+        reranker._post_qwen = AsyncMock(return_value=[(0, 0.9)])
+
+        with patch("apps.shared.token_counter.get_token_counter", return_value=counter):
+            await reranker.rerank("query", sample_results[:1], top_n=1)
+
+        assert reranker._post_qwen.call_args[0][1] == ["First result"]
+
 
 @pytest.mark.unit
 class TestNoOpReranker:
@@ -162,3 +260,86 @@ class TestNoOpReranker:
         results = await reranker.rerank("query", [])
 
         assert results == []
+
+
+@pytest.mark.unit
+class TestLocalReranker:
+    """Test local vector-similarity reranking"""
+
+    @pytest.fixture
+    def vector_store(self):
+        store = MagicMock()
+        store.get_vectors.return_value = [
+            {"chunk_id": "chunk_0", "doc_id": "", "vector": [0.0, 1.0]},
+            {"chunk_id": "chunk_1", "doc_id": "", "vector": [1.0, 0.1]},
+            {"chunk_id": "chunk_2", "doc_id": "", "vector": [0.7, 0.7]},
+        ]
+        return store
+
+    @pytest.fixture
+    def sample_results(self):
+        return [
+            SearchResult(chunk_id="chunk_0", content="unrelated text", score=0.9, metadata={}),
+            SearchResult(chunk_id="chunk_1", content="machine learning", score=0.8, metadata={}),
+            SearchResult(chunk_id="chunk_2", content="deep learning", score=0.7, metadata={}),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_rerank_by_cosine(self, vector_store, sample_results):
+        """Test candidates are reordered by similarity to the query vector"""
+        reranker = Reranker({"reranker": {"provider": "local", "lexical_weight": 0}}, vector_store=vector_store)
+
+        results = await reranker.rerank("query", sample_results, top_n=3, query_embedding=[1.0, 0.0])
+
+        assert [r.chunk_id for r in results] == ["chunk_1", "chunk_2", "chunk_0"]
+        assert results[0].score == pytest.approx(1.0 / (1.01 ** 0.5), rel=1e-5)
+
+    @pytest.mark.asyncio
+    async def test_rerank_keeps_duplicate_downweight(self, vector_store, sample_results):
+        """Test near-duplicate weights scale the new score and inputs are left untouched"""
+        reranker = Reranker({"reranker": {"provider": "local", "lexical_weight": 0}}, vector_store=vector_store)
+        sample_results[1].metadata["score_weight"] = 0.5
+
+        results = await reranker.rerank("query", sample_results, top_n=3, query_embedding=[1.0, 0.0])
+
+        assert [r.chunk_id for r in results] == ["chunk_2", "chunk_1", "chunk_0"]
+        assert results[1].score == pytest.approx(0.5 / (1.01 ** 0.5), rel=1e-5)
+        assert [r.score for r in sample_results] == [0.9, 0.8, 0.7]
+
+    @pytest.mark.asyncio
+    async def test_lexical_overlap_breaks_ties(self, sample_results):
+        """Test query-term overlap is blended into the score"""
+        store = MagicMock()
+        store.get_vectors.return_value = [
+            {"chunk_id": c, "doc_id": "", "vector": [1.0, 0.0]} for c in ("chunk_0", "chunk_1", "chunk_2")
+        ]
+        reranker = Reranker({"reranker": {"provider": "local", "lexical_weight": 0.5}}, vector_store=store)
+
+        results = await reranker.rerank("deep learning", sample_results, top_n=1, query_embedding=[1.0, 0.0])
+
+        assert results[0].chunk_id == "chunk_2"
+
+    @pytest.mark.asyncio
+    async def test_keeps_fused_order_without_embedding(self, vector_store, sample_results):
+        """Test the fused order is kept when the query vector is unavailable"""
+        reranker = Reranker({"reranker": {"provider": "local"}}, vector_store=vector_store)
+
+        results = await reranker.rerank("query", sample_results, top_n=2)
+
+        assert [r.chunk_id for r in results] == ["chunk_0", "chunk_1"]
+        vector_store.get_vectors.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_remote_stage_on_head_only(self, vector_store, sample_results):
+        """Test the remote provider only sees the best local candidates"""
+        reranker = Reranker(
+            {"reranker": {"provider": "local", "lexical_weight": 0, "remote": {"enabled": True, "top_k": 2}}},
+            vector_store=vector_store,
+        )
+        reranker._rerank_qwen = AsyncMock(side_effect=lambda query, results, top_n: results[::-1][:top_n])
+
+        results = await reranker.rerank("query", sample_results, top_n=1, query_embedding=[1.0, 0.0])
+
+        head = reranker._rerank_qwen.call_args[0][1]
+        assert [r.chunk_id for r in head] == ["chunk_1", "chunk_2"]
+        assert [r.chunk_id for r in results] == ["chunk_2"]
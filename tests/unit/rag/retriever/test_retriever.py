@@ -1,7 +1,11 @@
 """Retriever Unit Tests"""
 
+import asyncio
+import time
+from unittest.mock import Mock
+
 import pytest
-from services.rag_pipeline.retriever.retriever import Retriever, BM25Index
+from services.rag_pipeline.retriever.retriever import Retriever, BM25Index, ShardedBM25Index
 from services.rag_pipeline.store.vector_store import SearchResult
 
 
@@ -91,6 +95,85 @@ class TestBM25Index:
         assert all(isinstance(t, str) for t in tokens)
 
 
+@pytest.mark.unit
+class TestShardedBM25Index:
+    """Test ShardedBM25Index"""
+
+    @pytest.fixture
+    def docs(self):
+        return [
+            {"chunk_id": "a1", "content": "hello world", "metadata": {"kb_id": "kb_a"}},
+            {"chunk_id": "a2", "content": "goodbye world", "metadata": {"kb_id": "kb_a"}},
+            {"chunk_id": "b1", "content": "hello there", "metadata": {"kb_id": "kb_b"}},
+        ]
+
+    def test_documents_grouped_by_kb(self, docs):
+        """Test documents land in their KB shard"""
+        index = ShardedBM25Index()
+        index.add_documents(docs)
+
+        assert set(index.shards) == {"kb_a", "kb_b"}
+        assert index.shards["kb_a"].doc_count == 2
+        assert index.doc_count == 3
+
+    def test_search_only_touches_requested_shards(self, docs):
+        """Test kb_ids restricts search to those shards"""
+        index = ShardedBM25Index()
+        index.add_documents(docs)
+
+        results = index.search("hello", top_k=5, kb_ids=["kb_b"])
+
+        assert [r.chunk_id for r in results] == ["b1"]
+
+    def test_search_merges_statistics(self, docs):
+        """Test multi-shard scores match a single unsharded index"""
+        sharded = ShardedBM25Index()
+        sharded.add_documents(docs)
+        flat = BM25Index()
+        flat.index_documents(docs)
+
+        sharded_scores = {r.chunk_id: r.score for r in sharded.search("hello world", top_k=5)}
+        flat_scores = {r.chunk_id: r.score for r in flat.search("hello world", top_k=5)}
+
+        assert sharded_scores.keys() == flat_scores.keys()
+        for chunk_id, score in flat_scores.items():
+            assert sharded_scores[chunk_id] == pytest.approx(score)
+
+    def test_lru_eviction(self, docs):
+        """Test least recently used shard is evicted over capacity"""
+        index = ShardedBM25Index(max_shards=1)
+        index.load_shard("kb_a", docs[:2])
+        index.load_shard("kb_b", docs[2:])
+
+        assert list(index.shards) == ["kb_b"]
+        assert not index.is_hydrated("kb_a")
+
+    def test_rebuild_over_cap_keeps_summaries(self, docs):
+        """Test shards evicted while rebuilding keep their statistics and stay in the catalog"""
+        index = ShardedBM25Index(max_shards=1)
+        index.index_documents(docs)
+
+        assert list(index.shards) == ["kb_b"]
+        assert index.catalog_complete
+        assert index.known_kbs == {"kb_a", "kb_b"}
+        assert index.unloaded_kbs() == []
+        assert index.collection_stats(["hello"]) == (3, 2.0, {"hello": 2})
+        assert index.matching_kbs(["goodbye"]) == ["kb_a"]
+
+        index.evict("kb_a")
+        assert index.catalog_complete
+        assert index.unloaded_kbs() == ["kb_a"]
+
+    def test_remove_documents(self, docs):
+        """Test removing documents updates statistics"""
+        index = BM25Index()
+        index.index_documents(docs)
+
+        assert index.remove_documents(["a1", "missing"]) == 1
+        assert index.doc_count == 2
+        assert "a1" not in [r.chunk_id for r in index.search("hello", top_k=5)]
+
+
 @pytest.mark.unit
 class TestRetriever:
     """Test Retriever"""
@@ -216,3 +299,111 @@ class TestRetriever:
 
         assert retriever.hybrid is False
         assert retriever.vector_top_k == 15
+
+    def test_hydrate_bm25_per_kb(self):
+        """Test hydration loads only the requested KB shards"""
+        retriever = Retriever()
+
+        class MockVectorStore:
+            def __init__(self):
+                self.calls = []
+
+            def fetch_all_chunks(self, limit=None, kb_id=None):
+                self.calls.append(kb_id)
+                return [{"chunk_id": f"{kb_id}_1", "content": "text", "metadata": {"kb_id": kb_id}}]
+
+        retriever.vector_store = MockVectorStore()
+
+        retriever.hydrate_bm25(kb_ids=["kb_a"])
+        retriever.hydrate_bm25(kb_ids=["kb_a", "kb_b"])
+
+        assert retriever.vector_store.calls == ["kb_a", "kb_b"]
+        assert set(retriever.bm25_index.shards) == {"kb_a", "kb_b"}
+
+    def test_failed_scan_does_not_mark_hydrated(self):
+        """Test a shard is loaded again after the store could not be scanned"""
+        retriever = Retriever()
+        retriever.vector_store = Mock()
+        retriever.vector_store.fetch_all_chunks.return_value = None
+
+        retriever.hydrate_bm25(kb_ids=["kb_a"])
+        assert not retriever.bm25_index.is_hydrated("kb_a")
+
+        retriever.vector_store.fetch_all_chunks.return_value = [
+            {"chunk_id": "a1", "content": "text", "metadata": {"kb_id": "kb_a"}}
+        ]
+        retriever.hydrate_bm25(kb_ids=["kb_a"])
+        assert retriever.bm25_index.is_hydrated("kb_a")
+        assert retriever.bm25_index.doc_count == 1
+
+    def test_search_all_kbs_over_shard_cap(self):
+        """Test searches over all KBs score every KB and scan the collection only once"""
+        retriever = Retriever({"bm25_max_shards": 1})
+        chunks = {
+            "kb_a": [{"chunk_id": "a1", "content": "apple pie", "metadata": {"kb_id": "kb_a"}}],
+            "kb_b": [{"chunk_id": "b1", "content": "banana bread", "metadata": {"kb_id": "kb_b"}}],
+            "kb_c": [{"chunk_id": "c1", "content": "apple cake", "metadata": {"kb_id": "kb_c"}}],
+        }
+        retriever.vector_store = Mock()
+        retriever.vector_store.fetch_all_chunks.side_effect = lambda limit=None, kb_id=None: (
+            chunks[kb_id] if kb_id else [c for kb_chunks in chunks.values() for c in kb_chunks]
+        )
+
+        first = retriever._keyword_search("apple", top_k=5)
+        second = retriever._keyword_search("apple", top_k=5)
+
+        assert {r.chunk_id for r in first} == {r.chunk_id for r in second} == {"a1", "c1"}
+        kb_scans = [call.kwargs.get("kb_id") for call in retriever.vector_store.fetch_all_chunks.call_args_list]
+        assert kb_scans.count(None) == 1
+        # kb_b holds no query term and is never reloaded
+        assert "kb_b" not in kb_scans
+        assert len(retriever.bm25_index.shards) == 1
+
+    @pytest.mark.asyncio
+    async def test_hybrid_legs_run_concurrently(self):
+        """Test keyword leg runs while the embedding and vector leg are pending"""
+        retriever = Retriever()
+
+        class MockVectorStore:
+            def search(self, query_embedding, top_k=5, kb_ids=None):
+                time.sleep(0.2)
+                return [SearchResult(chunk_id="v1", content="vector", score=0.9)]
+
+            def fetch_all_chunks(self, limit=None, kb_id=None):
+                time.sleep(0.2)
+                return [{"chunk_id": "k1", "content": "keyword hit", "metadata": {"kb_id": kb_id}}]
+
+        async def embed():
+            await asyncio.sleep(0.1)
+            return [0.1] * 4
+
+        retriever.vector_store = MockVectorStore()
+
+        start = time.perf_counter()
+        results = await retriever.retrieve("keyword", embed(), top_k=5, kb_ids=["kb_a"])
+        elapsed = time.perf_counter() - start
+
+        assert {r.chunk_id for r in results} == {"v1", "k1"}
+        assert elapsed < 0.45
+
+    @pytest.mark.asyncio
+    async def test_native_keyword_backend(self):
+        """Test native backend skips in-process BM25 and queries the vector DB once"""
+        retriever = Retriever({"retrieval": {"keyword_backend": "native"}})
+
+        class MockVectorStore:
+            def hybrid_search(self, query_embedding, query_text, query_sparse=None, **kwargs):
+                self.call = (query_text, query_sparse, kwargs)
+                return [SearchResult(chunk_id="c1", content="hit", score=0.03)]
+
+        retriever.vector_store = MockVectorStore()
+        chunks = [{"chunk_id": "c1", "content": "hello world", "metadata": {"kb_id": "kb_a"}}]
+
+        retriever.index_documents(chunks)
+        retriever.attach_sparse_vectors(chunks)
+        results = await retriever.retrieve("hello", [0.1] * 4, top_k=5, kb_ids=["kb_a"])
+
+        assert retriever.bm25_index.doc_count == 0
+        assert chunks[0]["sparse_vector"]["indices"]
+        assert [r.chunk_id for r in results] == ["c1"]
+        assert retriever.vector_store.call[2]["kb_ids"] == ["kb_a"]
@@ -0,0 +1,61 @@
+"""Tokenizer Unit Tests"""
+
+import pytest
+from services.rag_pipeline.retriever.tokenizer import (
+    TokenizerPool,
+    tokenize,
+    tokenize_query,
+    _tokenize_query_cached,
+)
+
+
+@pytest.mark.unit
+class TestTokenizer:
+    """Test tokenization helpers"""
+
+    def test_tokenize_query_matches_tokenize(self):
+        """Test cached query tokenization returns the same tokens"""
+        assert tokenize_query("Hello World 你好世界") == tokenize("Hello World 你好世界")
+
+    def test_tokenize_query_cached(self):
+        """Test repeated queries hit the LRU cache"""
+        _tokenize_query_cached.cache_clear()
+
+        tokenize_query("repeated query")
+        tokenize_query("repeated query")
+
+        assert _tokenize_query_cached.cache_info().hits == 1
+
+
+@pytest.mark.unit
+class TestTokenizerPool:
+    """Test TokenizerPool"""
+
+    def test_init_default_config(self):
+        """Test initialization with default config"""
+        pool = TokenizerPool()
+
+        assert pool.batch_size == 256
+        assert pool.min_parallel_docs == 512
+
+    def test_small_batch_in_process(self):
+        """Test small batches do not start worker processes"""
+        pool = TokenizerPool({"retrieval": {"tokenizer": {"workers": 2}}})
+
+        tokens = pool.tokenize_many(["hello world", "goodbye world"])
+
+        assert tokens == [tokenize("hello world"), tokenize("goodbye world")]
+        assert pool._executor is None
+
+    def test_parallel_preserves_order(self):
+        """Test pooled tokenization keeps input order"""
+        config = {"retrieval": {"tokenizer": {"workers": 2, "batch_size": 2, "min_parallel_docs": 1}}}
+        pool = TokenizerPool(config)
+        texts = [f"document number{i} content" for i in range(7)]
+
+        try:
+            tokens = pool.tokenize_many(texts)
+        finally:
+            pool.shutdown()
+
+        assert tokens == [tokenize(t) for t in texts]
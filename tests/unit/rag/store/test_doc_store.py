@@ -0,0 +1,62 @@
+"""Doc Store Unit Tests"""
+
+import pytest
+from services.rag_pipeline.store.doc_store import DocStore
+
+
+@pytest.mark.unit
+class TestDocStore:
+    """Test DocStore local backend"""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = DocStore({"parent_store": {"enabled": True, "path": str(tmp_path / "parents.sqlite3")}})
+        yield store
+        store.close()
+
+    def _record(self, kb_id, doc_id, parent_id, content="parent text"):
+        return {
+            "key": DocStore.make_key(kb_id, doc_id, parent_id),
+            "kb_id": kb_id,
+            "doc_id": doc_id,
+            "content": content,
+            "metadata": {"chunk_type": "parent"},
+        }
+
+    @pytest.mark.asyncio
+    async def test_put_and_get(self, store):
+        """Test stored parents are fetched by key, missing keys are omitted"""
+        stored = await store.put_many([self._record("kb_a", "doc1", "parent_0", "第一段")])
+        assert stored == 1
+
+        records = await store.get_many(["kb_a:doc1:parent_0", "kb_a:doc1:missing"])
+
+        assert list(records) == ["kb_a:doc1:parent_0"]
+        assert records["kb_a:doc1:parent_0"]["content"] == "第一段"
+        assert records["kb_a:doc1:parent_0"]["metadata"] == {"chunk_type": "parent"}
+
+    @pytest.mark.asyncio
+    async def test_put_replaces_existing(self, store):
+        """Test re-ingesting a document overwrites its parents"""
+        await store.put_many([self._record("kb_a", "doc1", "parent_0", "old")])
+        await store.put_many([self._record("kb_a", "doc1", "parent_0", "new")])
+
+        records = await store.get_many(["kb_a:doc1:parent_0"])
+        assert records["kb_a:doc1:parent_0"]["content"] == "new"
+
+    @pytest.mark.asyncio
+    async def test_delete_by_doc_and_kb(self, store):
+        """Test deleting by document and by knowledge base"""
+        await store.put_many([
+            self._record("kb_a", "doc1", "parent_0"),
+            self._record("kb_a", "doc2", "parent_0"),
+            self._record("kb_b", "doc3", "parent_0"),
+        ])
+
+        assert await store.delete_by_doc_id("doc1") == 1
+        assert await store.delete_by_kb_id("kb_a") == 1
+
+        records = await store.get_many(
+            ["kb_a:doc1:parent_0", "kb_a:doc2:parent_0", "kb_b:doc3:parent_0"]
+        )
+        assert list(records) == ["kb_b:doc3:parent_0"]
@@ -1,5 +1,7 @@
 """Vector Store Unit Tests"""
 
+from unittest.mock import Mock
+
 import pytest
 from services.rag_pipeline.store.vector_store import VectorStore, SearchResult
 
@@ -199,3 +201,67 @@ class TestSearchResult:
         assert result.content == "test content"
         assert result.score == 0.5
         assert result.metadata is None
+
+    def test_native_keyword_config(self):
+        """Test native keyword backend is read from retrieval config"""
+        store = VectorStore({"retrieval": {"keyword_backend": "native"}, "vector_db": {}})
+
+        assert store.native_keyword is True
+        assert store.sparse_field == "sparse"
+
+    def test_hybrid_search_milvus(self):
+        """Test Milvus hybrid search sends dense and BM25 requests in one call"""
+        class MockClient:
+            def hybrid_search(self, collection_name, reqs, ranker, limit, output_fields):
+                self.reqs = reqs
+                return [[{"chunk_id": "c1", "text": "hit", "distance": 0.03, "metadata": {}}]]
+
+        store = VectorStore({"retrieval": {"keyword_backend": "native"}, "vector_db": {"provider": "milvus"}})
+        store._client = MockClient()
+
+        results = store.hybrid_search([0.1] * 4, "query text", top_k=3, kb_ids=["kb_a"])
+
+        assert [r.chunk_id for r in results] == ["c1"]
+        assert [r.anns_field for r in store._client.reqs] == ["vector", "sparse"]
+
+    def test_fetch_all_chunks_milvus(self):
+        """Test Milvus chunks of a KB are scanned page by page with a query iterator"""
+        class MockIterator:
+            def __init__(self):
+                self.pages = [
+                    [{"chunk_id": "c1", "text": "one", "kb_id": "kb_a", "metadata": {"doc_id": "d1"}}],
+                    [{"chunk_id": "c2", "text": "two", "kb_id": "kb_a", "metadata": {"doc_id": "d1"}}],
+                    [],
+                ]
+                self.closed = False
+
+            def next(self):
+                return self.pages.pop(0)
+
+            def close(self):
+                self.closed = True
+
+        class MockClient:
+            def query_iterator(self, **kwargs):
+                self.kwargs = kwargs
+                self.iterator = MockIterator()
+                return self.iterator
+
+        store = VectorStore({"vector_db": {"provider": "milvus"}})
+        store._client = MockClient()
+
+        chunks = store.fetch_all_chunks(kb_id="kb_a")
+
+        assert [c["chunk_id"] for c in chunks] == ["c1", "c2"]
+        assert chunks[0]["content"] == "one"
+        assert store._client.kwargs["filter"] == 'kb_id == "kb_a"'
+        assert store._client.iterator.closed
+
+    def test_fetch_all_chunks_failure_is_none(self):
+        """Test a failed scan is reported as None rather than an empty KB"""
+        client = Mock()
+        client.query_iterator.side_effect = RuntimeError("unavailable")
+        store = VectorStore({"vector_db": {"provider": "milvus"}})
+        store._client = client
+
+        assert store.fetch_all_chunks(kb_id="kb_a") is None
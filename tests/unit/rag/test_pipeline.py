@@ -119,6 +119,32 @@ class TestRAGPipeline:
         assert result["doc_type"] == "text"
         assert result["chunks_inserted"] == 1
 
+    @pytest.mark.asyncio
+    async def test_ingest_document_loads_and_chunks_in_one_call(self, pipeline):
+        """Test the load stage hands the file to the preprocessor, which parses and chunks it"""
+        from services.rag_pipeline.chunker.text_chunker import Chunk
+
+        metadata = {"kb_id": "kb_a", "file_name": "test.txt"}
+        pipeline.preprocessor.process = AsyncMock(return_value=(
+            {"type": "text", "metadata": metadata},
+            [Chunk(content="test content", chunk_id="chunk_0", metadata=metadata)],
+        ))
+        pipeline.preprocessor.chunk = AsyncMock()
+        pipeline.loader.load = AsyncMock()
+        pipeline.embedder.embed_chunks = AsyncMock(return_value=[
+            {"chunk_id": "chunk_0", "embedding": [0.1] * 1024, "content": "test content"}
+        ])
+        pipeline.vector_store.insert = Mock(return_value=1)
+        pipeline.retriever.index_documents = Mock()
+
+        result = await pipeline.ingest_document("/path/to/test.txt", {"source": "test"}, kb_id="kb_a")
+
+        assert result["status"] == "success"
+        assert result["chunks_inserted"] == 1
+        pipeline.preprocessor.process.assert_awaited_once_with("/path/to/test.txt", {"source": "test"}, "kb_a")
+        pipeline.preprocessor.chunk.assert_not_called()
+        pipeline.loader.load.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_ingest_document_with_metadata(self, pipeline):
         """Test document ingestion with custom metadata"""
@@ -197,6 +223,258 @@ class TestRAGPipeline:
         pipeline.embedder.embed_query.assert_called_once_with("test query")
         pipeline.retriever.retrieve.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_search_cached_until_kb_changes(self, pipeline):
+        """Test repeated searches hit the result cache until the KB is ingested into"""
+        from services.rag_pipeline.store.vector_store import SearchResult
+
+        pipeline.embedder.embed_query = AsyncMock(return_value=[0.1] * 1024)
+        pipeline.retriever.retrieve = AsyncMock(return_value=[
+            SearchResult(chunk_id="chunk_0", content="test content", score=0.95),
+        ])
+        pipeline.embedder.embed_chunks = AsyncMock(return_value=[
+            {"chunk_id": "chunk_0", "embedding": [0.1] * 1024, "content": "test"}
+        ])
+        pipeline.vector_store.insert = Mock(return_value=1)
+        pipeline.retriever.index_documents = Mock()
+
+        await pipeline.search("test query", kb_ids=["kb_a"])
+        await pipeline.search("Test  query", kb_ids=["kb_a"])
+        assert pipeline.retriever.retrieve.call_count == 1
+
+        await pipeline.ingest_text("new text", "doc2", kb_id="kb_b")
+        await pipeline.search("test query", kb_ids=["kb_a"])
+        assert pipeline.retriever.retrieve.call_count == 1
+
+        await pipeline.ingest_text("new text", "doc3", kb_id="kb_a")
+        await pipeline.search("test query", kb_ids=["kb_a"])
+        assert pipeline.retriever.retrieve.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_keyword_shard_evicted_when_worker_changes_kb(self, pipeline):
+        """Test a KB whose changes cannot be read evicts its BM25 shard"""
+        pipeline.result_cache.redis_enabled = True
+        generations = {"kb_a": 1, "kb_b": 1, "__epoch__": 0}
+        pipeline.result_cache.get_generations = AsyncMock(
+            side_effect=lambda kb_ids: {kb_id: generations[kb_id] for kb_id in kb_ids}
+        )
+        pipeline.result_cache.get_changes = AsyncMock(return_value=None)
+        pipeline.retriever.evict_bm25 = Mock()
+
+        await pipeline._refresh_keyword_shards(["kb_a", "kb_b"])
+        pipeline.retriever.evict_bm25.assert_not_called()
+
+        generations["kb_a"] = 2
+        await pipeline._refresh_keyword_shards(["kb_a", "kb_b"])
+        pipeline.retriever.evict_bm25.assert_called_once_with("kb_a")
+
+        # Deletes of unknown KBs advance the epoch, which drops every shard
+        pipeline.retriever.bm25_index.index_documents([
+            {"chunk_id": "c1", "content": "hello", "metadata": {"kb_id": "kb_b"}},
+        ])
+        generations["__epoch__"] = 1
+        await pipeline._refresh_keyword_shards(["kb_a", "kb_b"])
+        assert not pipeline.retriever.bm25_index.shards
+        assert not pipeline.retriever.bm25_index.catalog_complete
+
+    @pytest.mark.asyncio
+    async def test_keyword_shard_applies_document_changes(self, pipeline):
+        """Test documents changed by another process are reloaded without rebuilding the shard"""
+        from apps.shared.redis_client import InMemoryRedis, RedisOperations
+        from services.rag_pipeline.cache.result_cache import ResultCache
+
+        redis = RedisOperations(InMemoryRedis())
+        worker_cache = ResultCache({"result_cache": {"redis": {"enabled": True}}})
+        worker_cache._redis = redis
+        pipeline.result_cache.redis_enabled = True
+        pipeline.result_cache._redis = redis
+
+        # A scoped search reads the generation before it loads the shard
+        await pipeline._refresh_keyword_shards(["kb_a"])
+        pipeline.retriever.bm25_index.load_shard("kb_a", [
+            {"chunk_id": "c1", "content": "first document", "metadata": {"kb_id": "kb_a", "doc_id": "doc1"}},
+            {"chunk_id": "c2", "content": "old second", "metadata": {"kb_id": "kb_a", "doc_id": "doc2"}},
+        ])
+
+        await worker_cache.bump("kb_a", doc_id="doc2")
+        await worker_cache.bump("kb_a", doc_id="doc3")
+        stored = {
+            "doc2": [{"chunk_id": "c3", "content": "new second", "metadata": {"kb_id": "kb_a", "doc_id": "doc2"}}],
+            "doc3": [],
+        }
+        pipeline.retriever.vector_store = Mock()
+        pipeline.retriever.vector_store.fetch_all_chunks = Mock(side_effect=lambda kb_id, doc_id: stored[doc_id])
+
+        await pipeline._refresh_keyword_shards(["kb_a"])
+
+        shard = pipeline.retriever.bm25_index.shards["kb_a"]
+        assert pipeline.retriever.bm25_index.is_hydrated("kb_a")
+        assert set(shard.doc_metadata) == {"c1", "c3"}
+        assert [c.kwargs["doc_id"] for c in pipeline.retriever.vector_store.fetch_all_chunks.call_args_list] == ["doc2", "doc3"]
+
+        # Changes trimmed from Redis leave a gap: the shard is rebuilt instead
+        pipeline.result_cache.max_changes = worker_cache.max_changes = 1
+        await worker_cache.bump("kb_a", doc_id="doc1")
+        await worker_cache.bump("kb_a", doc_id="doc2")
+        await pipeline._refresh_keyword_shards(["kb_a"])
+        assert "kb_a" not in pipeline.retriever.bm25_index.shards
+
+    @pytest.mark.asyncio
+    async def test_shard_loaded_by_unscoped_search_refreshed_on_first_scoped_search(self, pipeline):
+        """Test a shard loaded before its KB generation was known is not taken as current"""
+        from apps.shared.redis_client import InMemoryRedis, RedisOperations
+        from services.rag_pipeline.cache.result_cache import ResultCache
+
+        redis = RedisOperations(InMemoryRedis())
+        worker_cache = ResultCache({"result_cache": {"redis": {"enabled": True}}})
+        worker_cache._redis = redis
+        pipeline.result_cache.redis_enabled = True
+        pipeline.result_cache._redis = redis
+
+        stored = [{"chunk_id": "c1", "content": "first document", "metadata": {"kb_id": "kb_x", "doc_id": "doc1"}}]
+        pipeline.retriever.vector_store = Mock()
+        pipeline.retriever.vector_store.fetch_all_chunks = Mock(side_effect=lambda **kwargs: list(stored))
+
+        # An unscoped search loads every shard
+        await pipeline._refresh_keyword_shards(None)
+        pipeline.retriever._keyword_search("document", top_k=5)
+
+        # A worker adds doc2 to kb_x
+        stored.append({"chunk_id": "c2", "content": "second document", "metadata": {"kb_id": "kb_x", "doc_id": "doc2"}})
+        await worker_cache.bump("kb_x", doc_id="doc2")
+
+        await pipeline._refresh_keyword_shards(["kb_x"])
+        results = pipeline.retriever._keyword_search("document", top_k=5, kb_ids=["kb_x"])
+
+        assert {r.chunk_id for r in results} == {"c1", "c2"}
+
+    @pytest.mark.asyncio
+    async def test_search_semantic_cache(self, pipeline):
+        """Test paraphrased queries are served from the semantic cache"""
+        from services.rag_pipeline.store.vector_store import SearchResult
+
+        pipeline.semantic_cache.enabled = True
+        pipeline.semantic_cache.audit_rate = 0
+        pipeline.embedder.embed_query = AsyncMock(return_value=[0.1] * 1024)
+        pipeline.retriever.retrieve = AsyncMock(return_value=[
+            SearchResult(chunk_id="chunk_0", content="test content", score=0.95),
+        ])
+
+        await pipeline.search("how do I reset my password", kb_ids=["kb_a"])
+        results = await pipeline.search("password reset steps", kb_ids=["kb_a"])
+
+        assert [r.chunk_id for r in results] == ["chunk_0"]
+        assert pipeline.retriever.retrieve.call_count == 1
+        assert pipeline.semantic_cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_small_to_big(self, pipeline, tmp_path):
+        """Test only children are indexed and search returns deduplicated parents"""
+        from services.rag_pipeline.chunker.text_chunker import TextChunker
+        from services.rag_pipeline.store.doc_store import DocStore
+        from services.rag_pipeline.store.vector_store import SearchResult
+
+        pipeline.doc_store = DocStore({"parent_store": {"enabled": True, "path": str(tmp_path / "p.db")}})
+        pipeline.chunker = TextChunker({
+            "chunking": {
+                "strategy": "parent_child",
+                "parent": {"size": 200, "overlap": 0},
+                "child": {"size": 50, "overlap": 0},
+            }
+        })
+        pipeline.embedder.embed_chunks = AsyncMock(side_effect=lambda chunks: [
+            {"chunk_id": c.chunk_id, "content": c.content, "embedding": [0.1], "metadata": c.metadata}
+            for c in chunks
+        ])
+        pipeline.vector_store.insert = Mock(side_effect=lambda chunks, *args, **kwargs: len(chunks))
+        pipeline.retriever.index_documents = Mock()
+
+        text = "。".join(f"第{i}句话的内容比较长一些" for i in range(20))
+        result = await pipeline.ingest_text(text, "doc1", kb_id="kb_a")
+
+        assert result["parents_stored"] > 0
+        indexed = pipeline.vector_store.insert.call_args[0][0]
+        assert all(c["metadata"]["chunk_type"] == "child" for c in indexed)
+        assert indexed[0]["metadata"]["parent_key"] == "kb_a:doc1:parent_0"
+
+        pipeline.embedder.embed_query = AsyncMock(return_value=[0.1] * 1024)
+        pipeline.retriever.retrieve = AsyncMock(return_value=[
+            SearchResult(chunk_id="c1", content="child", score=0.9, metadata={"parent_key": "kb_a:doc1:parent_0"}),
+            SearchResult(chunk_id="c2", content="child", score=0.8, metadata={"parent_key": "kb_a:doc1:parent_0"}),
+            SearchResult(chunk_id="c3", content="orphan", score=0.7, metadata={}),
+        ])
+
+        results = await pipeline.search("test query", top_k=5, kb_ids=["kb_a"])
+
+        assert [r.chunk_id for r in results] == ["kb_a:doc1:parent_0", "c3"]
+        assert results[0].score == 0.9
+        assert results[0].metadata["matched_children"] == ["c1", "c2"]
+        assert pipeline.retriever.retrieve.call_args[0][2] == 5 * pipeline.parent_fanout
+
+        pipeline.doc_store.close()
+
+    @pytest.mark.asyncio
+    async def test_ingest_skips_near_duplicates(self, pipeline):
+        """Test near-duplicate chunks are not embedded and storage saved is reported"""
+        from services.rag_pipeline.ingest.dedup import NearDuplicateDetector
+
+        pipeline.dedup = NearDuplicateDetector({"dedup": {"enabled": True}})
+        pipeline.embedder.embed_chunks = AsyncMock(side_effect=lambda chunks: [
+            {"chunk_id": c.chunk_id, "content": c.content, "embedding": [0.1], "metadata": c.metadata}
+            for c in chunks
+        ])
+        pipeline.vector_store.insert = Mock(side_effect=lambda chunks, *args, **kwargs: len(chunks))
+        pipeline.retriever.index_documents = Mock()
+
+        text = "知识库中的同一段说明文字被多份文档重复引用。" * 5
+        await pipeline.ingest_text(text, "doc1", kb_id="kb_a")
+        result = await pipeline.ingest_text(text, "doc2", kb_id="kb_a")
+
+        assert result["chunks_created"] == 1
+        assert result["chunks_inserted"] == 0
+        assert result["dedup"]["duplicates"] == 1
+        assert result["dedup"]["bytes_saved"] > 0
+        assert pipeline.get_stats()["dedup"]["duplicates"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ingest_pdf_streaming(self, pipeline, make_pdf):
+        """Test large PDFs are inserted window by window with page metadata"""
+        pipeline.stream_enabled = True
+        pipeline.stream_window_pages = 2
+        pipeline.stream_min_pages = 3
+        pipeline.embedder.embed_chunks = AsyncMock(side_effect=lambda chunks: [
+            {"chunk_id": c.chunk_id, "content": c.content, "embedding": [0.1], "metadata": c.metadata}
+            for c in chunks
+        ])
+        pipeline.vector_store.insert = Mock(side_effect=lambda chunks, *args, **kwargs: len(chunks))
+        pipeline.retriever.index_documents = Mock()
+        pipeline.preprocessor.process = AsyncMock()
+
+        path = make_pdf(["Page one", "Page two", "Page three", "", "Page five"])
+        result = await pipeline.ingest_document(str(path), kb_id="kb_a")
+
+        assert result["status"] == "success"
+        assert result["windows"] == 3
+        assert result["page_count"] == 5
+        pipeline.preprocessor.process.assert_not_called()
+
+        batches = [c[0][0] for c in pipeline.vector_store.insert.call_args_list]
+        assert len(batches) == 3
+        inserted = [chunk for batch in batches for chunk in batch]
+        assert [c["chunk_id"] for c in inserted] == ["chunk_0", "chunk_1", "chunk_2"]
+        assert [c["metadata"]["page_start"] for c in inserted] == [1, 3, 5]
+        assert inserted[0]["metadata"]["page_end"] == 2
+        assert result["chunks_inserted"] == 3
+
+    @pytest.mark.asyncio
+    async def test_small_pdf_not_streamed(self, pipeline, make_pdf):
+        """Test PDFs below min_pages take the regular path"""
+        pipeline.stream_enabled = True
+        pipeline.stream_min_pages = 10
+        path = make_pdf(["Page one"])
+
+        assert await pipeline._should_stream(str(path)) is False
+
     @pytest.mark.asyncio
     async def test_search_error(self, pipeline):
         """Test search with error"""
@@ -230,14 +508,23 @@ class TestRAGPipeline:
         assert result["num_results"] == 1
         assert "formatted_prompt" in result
 
-    def test_delete_documents(self, pipeline):
+    @pytest.mark.asyncio
+    async def test_delete_documents(self, pipeline):
         """Test document deletion"""
         pipeline.vector_store.delete = Mock(return_value=2)
+        pipeline.retriever.bm25_index.add_documents([
+            {"chunk_id": "chunk_0", "content": "hello", "metadata": {"kb_id": "kb_a"}},
+            {"chunk_id": "chunk_2", "content": "hello", "metadata": {"kb_id": "kb_b"}},
+        ])
+        before = await pipeline.result_cache.get_generations(["__epoch__"])
 
-        count = pipeline.delete_documents(["chunk_0", "chunk_1"])
+        count = await pipeline.delete_documents(["chunk_0", "chunk_1"])
 
         assert count == 2
         pipeline.vector_store.delete.assert_called_once()
+        assert pipeline.retriever.bm25_index.doc_count == 1
+        after = await pipeline.result_cache.get_generations(["__epoch__"])
+        assert after["__epoch__"] == before["__epoch__"] + 1
 
     def test_drop_collection(self, pipeline):
         """Test collection deletion"""
@@ -0,0 +1,218 @@
+"""Unit tests for the RAG ingestion worker"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from services.rag_pipeline.database import Base, Document, IngestionJob, KnowledgeBase
+from services.rag_pipeline.ingest.job_queue import JobQueue
+from services.rag_pipeline.pipeline import RAGPipeline
+from services.rag_pipeline.worker import IngestionWorker
+
+
+def embed_passthrough(chunks):
+    return [
+        {"chunk_id": c.chunk_id, "content": c.content, "embedding": [0.1], "metadata": c.metadata}
+        for c in chunks
+    ]
+
+
+@pytest.mark.unit
+class TestIngestionWorker:
+    """Test IngestionWorker"""
+
+    @pytest.fixture
+    def session_factory(self):
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(
+            engine, tables=[IngestionJob.__table__, KnowledgeBase.__table__, Document.__table__]
+        )
+        factory = sessionmaker(bind=engine, expire_on_commit=False)
+        with factory() as db:
+            db.add(KnowledgeBase(id="1", kb_id="kb_a", name="KB A", chunk_count=0))
+            db.add(Document(id="doc1", kb_id="kb_a", name="a.txt", status="processing"))
+            db.commit()
+        return factory
+
+    @pytest.fixture
+    def worker(self, session_factory):
+        config = {
+            "chunking": {"strategy": "simple", "child": {"size": 40, "overlap": 0}},
+            "ingestion": {"jobs": {"max_attempts": 2, "heartbeat_interval": 0.01}},
+        }
+        with patch("services.rag_pipeline.pipeline.VectorStore"):
+            pipeline = RAGPipeline(config)
+        pipeline.embedder.embed_chunks = AsyncMock(side_effect=embed_passthrough)
+        pipeline.vector_store.insert = Mock(side_effect=lambda chunks, *args, **kwargs: len(chunks))
+        pipeline.retriever.index_documents = Mock()
+        pipeline.delete_document = AsyncMock(return_value=True)
+        queue = JobQueue(config, session_factory=session_factory)
+        return IngestionWorker(config, pipeline=pipeline, queue=queue, worker_id="w1")
+
+    def document(self, session_factory):
+        with session_factory() as db:
+            return db.get(Document, "doc1")
+
+    @pytest.mark.asyncio
+    async def test_job_indexes_document(self, worker, session_factory, tmp_path):
+        """Test a file job ingests the document and marks it indexed"""
+        path = tmp_path / "a.txt"
+        path.write_text("Sentence for the worker. " * 20, encoding="utf-8")
+        job = worker.queue.enqueue("kb_a", "doc1", file_path=str(path))
+
+        status = await worker.run_job(worker.queue.claim("w1"))
+
+        assert status == "succeeded"
+        result = worker.queue.get(job["id"])["result"]
+        assert result["chunks_created"] > 0
+        doc = self.document(session_factory)
+        assert doc.status == "indexed"
+        assert doc.chunks == result["chunks_created"]
+        with session_factory() as db:
+            assert db.query(KnowledgeBase).first().chunk_count == result["chunks_created"]
+
+    @pytest.mark.asyncio
+    async def test_replaced_upload_removed_after_success(self, worker, session_factory, tmp_path):
+        """Test a replaced document keeps its previous upload until the new version is indexed"""
+        old = tmp_path / "doc1_old.txt"
+        old.write_text("Old version. " * 10, encoding="utf-8")
+        new = tmp_path / "doc1_new.txt"
+        new.write_text("New version of the document. " * 10, encoding="utf-8")
+        worker.pipeline.embedder.embed_chunks = AsyncMock(side_effect=RuntimeError("embedding service down"))
+        job = worker.queue.enqueue("kb_a", "doc1", file_path=str(new))
+
+        assert await worker.run_job(worker.queue.claim("w1")) == "queued"
+        assert old.exists()
+        assert worker.queue.active_job("kb_a", "doc1")["id"] == job["id"]
+
+        worker.pipeline.embedder.embed_chunks = AsyncMock(side_effect=embed_passthrough)
+        with session_factory() as db:
+            db.get(IngestionJob, job["id"]).next_run_at = datetime.utcnow()
+            db.commit()
+        assert await worker.run_job(worker.queue.claim("w1")) == "succeeded"
+        assert not old.exists() and new.exists()
+        assert worker.queue.active_job("kb_a", "doc1") is None
+
+    @pytest.mark.asyncio
+    async def test_replacement_keeps_previous_chunks_until_indexed(self, worker, session_factory, tmp_path):
+        """Test a new version replaces the indexed chunks only once it succeeds"""
+        with session_factory() as db:
+            db.get(Document, "doc1").chunks = 2
+            db.query(KnowledgeBase).first().chunk_count = 2
+            db.commit()
+        vector_store = worker.pipeline.vector_store
+        vector_store.list_document_chunks = Mock(return_value=[
+            {"chunk_id": "doc1_0", "metadata": {}}, {"chunk_id": "doc1_1", "metadata": {}},
+        ])
+        path = tmp_path / "doc1_1a2b3c4d_a.txt"
+        path.write_text("New version of the document. " * 10, encoding="utf-8")
+        worker.pipeline.embedder.embed_chunks = AsyncMock(side_effect=RuntimeError("embedding service down"))
+        job = worker.queue.enqueue("kb_a", "doc1", file_path=str(path))
+
+        assert await worker.run_job(worker.queue.claim("w1")) == "queued"
+        with session_factory() as db:
+            db.get(IngestionJob, job["id"]).next_run_at = datetime.utcnow()
+            db.commit()
+        # The retry must not wipe the previous version either
+        worker.pipeline.embedder.embed_chunks = AsyncMock(side_effect=embed_passthrough)
+        assert await worker.run_job(worker.queue.claim("w1")) == "succeeded"
+
+        worker.pipeline.delete_document.assert_not_called()
+        removed = vector_store.delete.call_args.args[0]
+        assert sorted(removed) == ["doc1_0", "doc1_1"]
+        doc = self.document(session_factory)
+        assert doc.status == "indexed"
+        with session_factory() as db:
+            assert db.query(KnowledgeBase).first().chunk_count == doc.chunks > 0
+
+    @pytest.mark.asyncio
+    async def test_failed_attempt_is_retried(self, worker, session_factory):
+        """Test an ingestion error requeues the job, then marks the document failed"""
+        worker.pipeline.embedder.embed_chunks = AsyncMock(side_effect=RuntimeError("embedding service down"))
+        job = worker.queue.enqueue("kb_a", "doc1", text="word " * 40)
+
+        assert await worker.run_job(worker.queue.claim("w1")) == "queued"
+        worker.pipeline.delete_document.assert_not_called()
+
+        with session_factory() as db:
+            db.get(IngestionJob, job["id"]).next_run_at = datetime.utcnow()
+            db.commit()
+        assert await worker.run_job(worker.queue.claim("w1")) == "failed"
+        # The second attempt first removed what the first one inserted
+        worker.pipeline.delete_document.assert_awaited_with("doc1", "kb_a")
+        doc = self.document(session_factory)
+        assert doc.status == "error"
+        assert "embedding service down" in doc.error_message
+
+    @pytest.mark.asyncio
+    async def test_cancel_running_job(self, worker, session_factory):
+        """Test a cancellation request stops the job and removes its partial chunks"""
+        started = asyncio.Event()
+
+        async def slow_embed(chunks):
+            started.set()
+            await asyncio.sleep(10)
+            return embed_passthrough(chunks)
+
+        worker.pipeline.embedder.embed_chunks = AsyncMock(side_effect=slow_embed)
+        job = worker.queue.enqueue("kb_a", "doc1", text="word " * 40)
+        running = asyncio.ensure_future(worker.run_job(worker.queue.claim("w1")))
+
+        await started.wait()
+        worker.queue.cancel(job["id"])
+
+        assert await asyncio.wait_for(running, 5) == "cancelled"
+        assert worker.queue.get(job["id"])["status"] == "cancelled"
+        worker.pipeline.delete_document.assert_awaited_once_with("doc1", "kb_a")
+        assert self.document(session_factory).status == "uploaded"
+
+    @pytest.mark.asyncio
+    async def test_cancel_after_last_heartbeat_discards_chunks(self, worker, session_factory):
+        """Test a job cancelled after its last heartbeat does not complete and removes its chunks"""
+        job = worker.queue.enqueue("kb_a", "doc1", text="word " * 40)
+        claimed = worker.queue.claim("w1")
+
+        async def insert_then_cancel(chunks):
+            # The document is deleted while the job writes its last chunks
+            worker.queue.cancel_active("kb_a", "doc1")
+            return embed_passthrough(chunks)
+
+        worker.pipeline.embedder.embed_chunks = AsyncMock(side_effect=insert_then_cancel)
+        worker.heartbeat_interval = 10
+
+        assert await worker.run_job(claimed) == "cancelled"
+        assert worker.queue.get(job["id"])["status"] == "cancelled"
+        worker.pipeline.delete_document.assert_awaited_once_with("doc1", "kb_a")
+
+    @pytest.mark.asyncio
+    async def test_cancel_waits_for_running_inserts(self, worker):
+        """Test chunks of a cancelled job are deleted only after its in-flight inserts landed"""
+        events = []
+        inserting = threading.Event()
+
+        def slow_insert(chunks, *args, **kwargs):
+            inserting.set()
+            time.sleep(0.2)
+            events.append("insert")
+            return len(chunks)
+
+        worker.pipeline.vector_store.insert = Mock(side_effect=slow_insert)
+        worker.pipeline.delete_document = AsyncMock(side_effect=lambda *args: events.append("delete"))
+        job = worker.queue.enqueue("kb_a", "doc1", text="word " * 40)
+        running = asyncio.ensure_future(worker.run_job(worker.queue.claim("w1")))
+
+        await asyncio.to_thread(inserting.wait, 5)
+        worker.queue.cancel(job["id"])
+
+        assert await asyncio.wait_for(running, 5) == "cancelled"
+        assert events[-1] == "delete"
+        assert "insert" in events